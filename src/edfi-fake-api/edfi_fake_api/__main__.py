@@ -0,0 +1,63 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import logging
+import sys
+from timeit import default_timer
+
+from aiohttp import web
+from dotenv import load_dotenv
+
+from edfi_fake_api.app import create_app
+from edfi_fake_api.dataset import generate_dataset
+from edfi_fake_api.helpers.argparser import parse_main_arguments
+from edfi_fake_api.helpers.log_level import LogLevel
+from edfi_fake_api.helpers.main_arguments import MainArguments
+from edfi_fake_api.store import DataStore
+
+logger = logging.getLogger(__name__)
+
+
+def _configure_logging(configuration: MainArguments) -> None:
+    log_level = str(LogLevel.DEBUG if configuration.log_level == LogLevel.VERBOSE else configuration.log_level)
+
+    logging.basicConfig(
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+        ],
+        format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
+        level=log_level,
+    )
+
+    # Logging every request would cost more than serving it
+    if configuration.log_level != LogLevel.VERBOSE:
+        logging.getLogger("aiohttp.access").setLevel(logging.WARNING)
+
+
+def main() -> None:
+    load_dotenv()
+    configuration = parse_main_arguments()
+    _configure_logging(configuration)
+
+    start = default_timer()
+    store = DataStore(configuration.seed)
+    store.load(generate_dataset(configuration.resource_counts, configuration.seed))
+    logger.info(
+        f"Generated {sum(configuration.resource_counts.values())} records of {len(configuration.resource_counts)} "
+        f"resources in {default_timer() - start:.1f} seconds."
+    )
+
+    try:
+        app = create_app(store, configuration)
+    except RuntimeError as err:
+        logger.fatal(err)
+        sys.exit(1)
+
+    logger.info(f"Serving the fake Ed-Fi API on http://{configuration.host}:{configuration.port}/")
+    web.run_app(app, host=configuration.host, port=configuration.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
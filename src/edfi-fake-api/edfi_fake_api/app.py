@@ -0,0 +1,305 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import BasicAuth, web
+from aiohttp.typedefs import Handler, Middleware
+
+from edfi_fake_api.auth import TokenIssuer
+from edfi_fake_api.faults import FaultRule, fault_middleware, load_fault_rules
+from edfi_fake_api.helpers.main_arguments import MainArguments
+from edfi_fake_api.store import DataStore, ResourceCollection
+
+API_VERSION = "7.1"
+DATA_MODEL_VERSION = "5.0.0"
+DEFAULT_LIMIT = 25
+
+# Query parameters that are not filters
+_PAGING_PARAMETERS = {"offset", "limit", "totalCount", "pageToken", "pageSize", "minChangeVersion", "maxChangeVersion"}
+
+
+def _bad_request(message: str) -> web.HTTPBadRequest:
+    return web.HTTPBadRequest(text=json.dumps({"message": message}), content_type="application/json")
+
+
+def _get_int(query: Any, name: str, default: Optional[int], minimum: int = 0) -> Optional[int]:
+    """
+    Reads an integer query parameter.
+
+    Raises
+    -------
+    HTTPBadRequest
+        If the parameter is not an integer of at least `minimum`
+    """
+    text = query.get(name)
+    if text is None:
+        return default
+
+    try:
+        value = int(text)
+    except ValueError:
+        raise _bad_request(f"The value '{text}' is not valid for {name}.")
+    if value < minimum:
+        raise _bad_request(f"{name} must be at least {minimum}.")
+
+    return value
+
+
+def _encode_page_token(start: int, end: int) -> str:
+    return f"{start}-{end}"
+
+
+def _decode_page_token(page_token: str) -> Tuple[int, int]:
+    try:
+        start, end = (int(part) for part in page_token.split("-"))
+    except ValueError:
+        raise _bad_request(f"The page token '{page_token}' is not valid.")
+
+    return start, end
+
+
+class FakeApi:
+    """
+    Request handlers of a stand-in for the Ed-Fi ODS/API: the root and
+    metadata endpoints, client credentials OAuth, and reads and writes of
+    the resources in a `DataStore`.
+    """
+
+    def __init__(self, store: DataStore, tokens: TokenIssuer, max_page_size: int = 500) -> None:
+        self.store = store
+        self.tokens = tokens
+        self.max_page_size = max_page_size
+
+    @web.middleware
+    async def auth_middleware(self, request: web.Request, handler: Handler) -> web.StreamResponse:
+        path = request.path.lower()
+        if (path.startswith("/data/") or path.startswith("/changequeries/")) and not self.tokens.is_valid(
+            request.headers.get("Authorization")
+        ):
+            return web.json_response(
+                {"message": "Authorization denied. The access token is invalid or has expired."}, status=401
+            )
+
+        return await handler(request)
+
+    async def get_root(self, request: web.Request) -> web.Response:
+        base_url = str(request.url.origin())
+        return web.json_response(
+            {
+                "version": API_VERSION,
+                "apiMode": "Sandbox",
+                "dataModels": [{"name": "Ed-Fi", "version": DATA_MODEL_VERSION}],
+                "urls": {
+                    "dependencies": f"{base_url}/metadata/data/v3/dependencies",
+                    "openApiMetadata": f"{base_url}/metadata/",
+                    "oauth": f"{base_url}/oauth/token",
+                    "dataManagementApi": f"{base_url}/data/v3/",
+                    "changeQueries": f"{base_url}/changeQueries/v1/",
+                },
+            }
+        )
+
+    async def get_metadata(self, request: web.Request) -> web.Response:
+        base_url = str(request.url.origin())
+        return web.json_response(
+            [
+                {
+                    "name": "Resources",
+                    "endpointUri": f"{base_url}/metadata/data/v3/resources/swagger.json",
+                    "prefix": "",
+                }
+            ]
+        )
+
+    def _build_swagger(self) -> Dict[str, Any]:
+        paths: Dict[str, Any] = {}
+        for collection in self.store.iter_collections():
+            path = f"/{collection.namespace}/{collection.resource_name}"
+            parameters = [{"name": name, "in": "query", "type": "string"} for name in ("offset", "limit", "totalCount")]
+            parameters += [{"name": name, "in": "query", "type": "string"} for name in sorted(collection.query_fields)]
+
+            paths[path] = {"get": {"parameters": parameters}, "post": {"parameters": []}}
+            paths[f"{path}/{{id}}"] = {
+                "get": {"parameters": [{"name": "id", "in": "path"}]},
+                "put": {"parameters": [{"name": "id", "in": "path"}]},
+                "delete": {"parameters": [{"name": "id", "in": "path"}]},
+            }
+            paths[f"{path}/partitions"] = {"get": {"parameters": [{"name": "number", "in": "query"}]}}
+
+        return {"swagger": "2.0", "info": {"title": "Fake Ed-Fi API", "version": API_VERSION}, "paths": paths}
+
+    async def get_swagger(self, request: web.Request) -> web.Response:
+        body = json.dumps(self._build_swagger(), separators=(",", ":")).encode("utf-8")
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+
+        return web.Response(body=body, content_type="application/json", headers={"ETag": etag})
+
+    async def post_token(self, request: web.Request) -> web.Response:
+        form: Dict[str, Any] = dict(await request.post())
+        if len(form) == 0 and request.content_type == "application/json":
+            form = await request.json()
+
+        key, secret = form.get("client_id"), form.get("client_secret")
+        authorization = request.headers.get("Authorization", "")
+        if authorization.lower().startswith("basic "):
+            credentials = BasicAuth.decode(authorization)
+            key, secret = credentials.login, credentials.password
+
+        if form.get("grant_type") != "client_credentials":
+            return web.json_response({"error": "unsupported_grant_type"}, status=400)
+
+        token = self.tokens.issue(key, secret)
+        if token is None:
+            return web.json_response({"error": "invalid_client"}, status=401)
+
+        return web.json_response({"access_token": token, "expires_in": self.tokens.lifetime, "token_type": "bearer"})
+
+    def _get_collection(self, request: web.Request) -> ResourceCollection:
+        namespace, resource_name = request.match_info["namespace"], request.match_info["resource"]
+        collection = self.store.get_collection(namespace, resource_name)
+
+        # Resources nobody has written to yet are empty rather than missing,
+        # so that any resource the tools know of can be read
+        return collection if collection is not None else ResourceCollection(namespace, resource_name)
+
+    async def get_list(self, request: web.Request) -> web.Response:
+        collection = self._get_collection(request)
+        query = request.query
+
+        page_token = query.get("pageToken")
+        if page_token is not None:
+            return self._get_partition_page(collection, page_token, _get_int(query, "pageSize", DEFAULT_LIMIT, 1) or 1)
+
+        offset = _get_int(query, "offset", 0) or 0
+        limit = _get_int(query, "limit", DEFAULT_LIMIT)
+        if limit is None or limit > self.max_page_size:
+            raise _bad_request(f"Limit must be omitted or set to a value between 0 and {self.max_page_size}.")
+
+        filters = {name: value for name, value in query.items() if name not in _PAGING_PARAMETERS}
+        ids = collection.query(
+            filters, _get_int(query, "minChangeVersion", None), _get_int(query, "maxChangeVersion", None)
+        )
+
+        headers = {}
+        if query.get("totalCount", "").lower() == "true":
+            headers["total-count"] = str(len(ids))
+
+        return web.Response(body=collection.encode_page(ids, offset, limit), content_type="application/json", headers=headers)
+
+    def _get_partition_page(self, collection: ResourceCollection, page_token: str, page_size: int) -> web.Response:
+        start, end = _decode_page_token(page_token)
+        ids = collection.query({})
+        limit = min(page_size, end - start)
+
+        headers = {}
+        if start + limit < min(end, len(ids)):
+            headers["next-page-token"] = _encode_page_token(start + limit, end)
+
+        return web.Response(body=collection.encode_page(ids, start, limit), content_type="application/json", headers=headers)
+
+    async def get_partitions(self, request: web.Request) -> web.Response:
+        collection = self._get_collection(request)
+        number = _get_int(request.query, "number", 1, 1) or 1
+
+        count = len(collection)
+        size = -(-count // number) if count > 0 else 1
+        page_tokens = [_encode_page_token(start, min(start + size, count)) for start in range(0, count, size)]
+        return web.json_response({"pageTokens": page_tokens})
+
+    async def get_item(self, request: web.Request) -> web.Response:
+        body = self._get_collection(request).get(request.match_info["id"])
+        if body is None:
+            return web.json_response({"message": "The specified resource could not be found."}, status=404)
+
+        return web.Response(body=body, content_type="application/json")
+
+    async def _read_record(self, request: web.Request) -> Dict[str, Any]:
+        try:
+            record = await request.json()
+        except ValueError:
+            raise _bad_request("The request body is not valid JSON.")
+        if not isinstance(record, dict):
+            raise _bad_request("The request body must be a JSON object.")
+
+        return record
+
+    def _location(self, request: web.Request, resource_id: str) -> str:
+        namespace, resource_name = request.match_info["namespace"], request.match_info["resource"]
+        return f"{request.url.origin()}/data/v3/{namespace}/{resource_name}/{resource_id}"
+
+    async def post_item(self, request: web.Request) -> web.Response:
+        record = await self._read_record(request)
+        resource_id = self.store.create(request.match_info["namespace"], request.match_info["resource"], record)
+        return web.Response(status=201, headers={"Location": self._location(request, resource_id)})
+
+    async def put_item(self, request: web.Request) -> web.Response:
+        record = await self._read_record(request)
+        resource_id = request.match_info["id"]
+        if not self.store.replace(request.match_info["namespace"], request.match_info["resource"], resource_id, record):
+            return web.json_response({"message": "The specified resource could not be found."}, status=404)
+
+        return web.Response(status=204, headers={"Location": self._location(request, resource_id)})
+
+    async def delete_item(self, request: web.Request) -> web.Response:
+        if not self.store.delete(request.match_info["namespace"], request.match_info["resource"], request.match_info["id"]):
+            return web.json_response({"message": "The specified resource could not be found."}, status=404)
+
+        return web.Response(status=204)
+
+    async def get_available_change_versions(self, request: web.Request) -> web.Response:
+        return web.json_response({"oldestChangeVersion": 0, "newestChangeVersion": self.store.change_version})
+
+
+def get_fault_rules(args: MainArguments) -> List[FaultRule]:
+    """
+    The rules of the fault rules file, followed by a rule for every route
+    when a latency or error rate applies to all of them.
+    """
+    rules = load_fault_rules(args.fault_rules) if args.fault_rules != "" else []
+    if args.latency_ms > 0 or args.error_rate > 0:
+        rules.append(FaultRule(latency_ms=args.latency_ms, error_rate=args.error_rate))
+
+    return rules
+
+
+def create_app(store: DataStore, args: MainArguments) -> web.Application:
+    """
+    Builds the web application serving the store.
+
+    Raises
+    -------
+    RuntimeError
+        If the fault rules file cannot be read
+    """
+    api = FakeApi(store, TokenIssuer(args.key, args.secret, args.token_lifetime), args.max_page_size)
+
+    middlewares: List[Middleware] = [api.auth_middleware]
+    rules = get_fault_rules(args)
+    if len(rules) > 0:
+        middlewares.insert(0, fault_middleware(rules, args.seed))
+
+    app = web.Application(middlewares=middlewares)
+    app.router.add_get("/", api.get_root)
+    app.router.add_get("/metadata/", api.get_metadata)
+    app.router.add_get("/metadata/data/v3/resources/swagger.json", api.get_swagger)
+    app.router.add_post("/oauth/token", api.post_token)
+    app.router.add_post("/oauth/token/", api.post_token)
+    for prefix in ("/changeQueries/v1", "/ChangeQueries/v1"):
+        app.router.add_get(f"{prefix}/availableChangeVersions", api.get_available_change_versions)
+
+    resource = "/data/v3/{namespace}/{resource}"
+    app.router.add_get(resource, api.get_list)
+    app.router.add_post(resource, api.post_item)
+    app.router.add_get(f"{resource}/partitions", api.get_partitions)
+    app.router.add_get(f"{resource}/{{id}}", api.get_item)
+    app.router.add_put(f"{resource}/{{id}}", api.put_item)
+    app.router.add_delete(f"{resource}/{{id}}", api.delete_item)
+
+    return app
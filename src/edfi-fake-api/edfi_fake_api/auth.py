@@ -0,0 +1,56 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import secrets
+from timeit import default_timer
+from typing import Dict, Optional
+
+
+class TokenIssuer:
+    """
+    Issues bearer tokens for client credentials and checks them on later
+    requests. Tokens expire after `lifetime` seconds, so that clients'
+    token refresh can be exercised with a short lifetime.
+
+    Parameters
+    ----------
+    key : str
+        Client id to accept; empty accepts any.
+    secret : str
+        Client secret to accept; empty accepts any.
+    lifetime : int
+        Seconds a token is valid for.
+    """
+
+    def __init__(self, key: str = "", secret: str = "", lifetime: int = 1800) -> None:
+        self.key = key
+        self.secret = secret
+        self.lifetime = lifetime
+        self._expiry_by_token: Dict[str, float] = {}
+
+    def issue(self, key: Optional[str], secret: Optional[str]) -> Optional[str]:
+        """
+        A new token, or None if the credentials are not accepted.
+        """
+        if (self.key != "" and key != self.key) or (self.secret != "" and secret != self.secret):
+            return None
+
+        now = default_timer()
+        # Drop expired tokens so that long runs do not accumulate them
+        self._expiry_by_token = {token: expiry for token, expiry in self._expiry_by_token.items() if expiry > now}
+
+        token = secrets.token_hex(16)
+        self._expiry_by_token[token] = now + self.lifetime
+        return token
+
+    def is_valid(self, authorization: Optional[str]) -> bool:
+        """
+        Whether an Authorization header holds a token that has not expired.
+        """
+        if authorization is None or not authorization.lower().startswith("bearer "):
+            return False
+
+        expiry = self._expiry_by_token.get(authorization[len("bearer "):].strip())
+        return expiry is not None and expiry > default_timer()
@@ -0,0 +1,75 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from datetime import datetime
+import logging
+import os
+import subprocess
+import sys
+
+from dotenv import load_dotenv
+
+from edfi_fake_api.benchmark.results import (
+    BASELINE_FILE,
+    append_history,
+    find_regressions,
+    load_baseline,
+    save_baseline,
+)
+from edfi_fake_api.benchmark.runner import run_benchmark
+from edfi_fake_api.helpers.argparser import parse_benchmark_arguments
+from edfi_fake_api.helpers.benchmark_arguments import SRC_DIR
+from edfi_fake_api.helpers.log_level import LogLevel
+
+logger = logging.getLogger(__name__)
+
+
+def _get_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SRC_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main() -> None:
+    load_dotenv()
+    args = parse_benchmark_arguments()
+    logging.basicConfig(
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+        ],
+        format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
+        level=str(LogLevel.DEBUG if args.log_level == LogLevel.VERBOSE else args.log_level),
+    )
+    logging.getLogger("aiohttp.access").setLevel(logging.WARNING)
+
+    results = run_benchmark(args)
+    append_history(results, args.output, datetime.now().isoformat(timespec="seconds"), _get_commit())
+
+    for result in results:
+        logger.info(f"{result.scenario}: {result.to_dict()}")
+
+    baseline_path = args.baseline or os.path.join(args.output, BASELINE_FILE)
+    if args.update_baseline:
+        save_baseline(results, baseline_path)
+        logger.info(f"Saved the results as the baseline in {baseline_path}.")
+        return
+
+    regressions = find_regressions(results, load_baseline(baseline_path), args.tolerance)
+    for regression in regressions:
+        logger.error(f"Regression in {regression}")
+
+    failed = [result.scenario for result in results if result.run.return_code != 0]
+    if len(failed) > 0:
+        logger.error(f"The {', '.join(failed)} scenarios did not finish cleanly.")
+
+    if len(regressions) > 0 or len(failed) > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import csv
+from dataclasses import dataclass
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+HISTORY_FILE = "history.csv"
+BASELINE_FILE = "baseline.json"
+
+# Metrics compared against the baseline, and whether higher is better
+REGRESSION_METRICS = {
+    "CpuMsPerRequest": False,
+    "CpuBoundRps": True,
+    "MemoryGrowthMB": False,
+}
+
+# Changes in memory smaller than this are noise, whatever the tolerance
+MEMORY_SLACK_MB = 5.0
+
+
+@dataclass
+class Measurement:
+    """
+    Resources used by one run of a tool. CPU and memory are None where the
+    platform cannot report a child process's resource usage.
+    """
+
+    seconds: float
+    cpu_seconds: Optional[float]
+    peak_memory_mb: Optional[float]
+    return_code: int
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    How much client CPU and memory one scenario took per request, net of
+    the tool's startup (`startup`, a run that only prints the tool's help).
+    """
+
+    scenario: str
+    requests: int
+    run: Measurement
+    startup: Measurement
+
+    @property
+    def throughput_rps(self) -> float:
+        return self.requests / self.run.seconds if self.run.seconds > 0 else 0.0
+
+    @property
+    def cpu_ms_per_request(self) -> Optional[float]:
+        if self.run.cpu_seconds is None or self.startup.cpu_seconds is None or self.requests == 0:
+            return None
+
+        return 1000 * max(0.0, self.run.cpu_seconds - self.startup.cpu_seconds) / self.requests
+
+    @property
+    def cpu_bound_rps(self) -> Optional[float]:
+        """
+        Requests per second one core could send, i.e. the rate at which the
+        client rather than the server becomes the bottleneck.
+        """
+        cpu_ms_per_request = self.cpu_ms_per_request
+        if cpu_ms_per_request is None or cpu_ms_per_request == 0:
+            return None
+
+        return 1000 / cpu_ms_per_request
+
+    @property
+    def memory_growth_mb(self) -> Optional[float]:
+        if self.run.peak_memory_mb is None or self.startup.peak_memory_mb is None:
+            return None
+
+        return max(0.0, self.run.peak_memory_mb - self.startup.peak_memory_mb)
+
+    def to_dict(self) -> Dict[str, Any]:
+        def _round(value: Optional[float], digits: int) -> Optional[float]:
+            return round(value, digits) if value is not None else None
+
+        return {
+            "Scenario": self.scenario,
+            "Requests": self.requests,
+            "Seconds": round(self.run.seconds, 3),
+            "ThroughputRps": round(self.throughput_rps, 1),
+            "CpuSeconds": _round(self.run.cpu_seconds, 3),
+            "CpuMsPerRequest": _round(self.cpu_ms_per_request, 4),
+            "CpuBoundRps": _round(self.cpu_bound_rps, 1),
+            "PeakMemoryMB": _round(self.run.peak_memory_mb, 1),
+            "MemoryGrowthMB": _round(self.memory_growth_mb, 1),
+            "ReturnCode": self.run.return_code,
+        }
+
+
+def append_history(results: List[BenchmarkResult], output_dir: str, timestamp: str, commit: str) -> None:
+    """
+    Appends the results to the history file of the output directory, one
+    row per scenario, so that a change can be traced to the run it
+    appeared in.
+    """
+    file_path = os.path.join(output_dir, HISTORY_FILE)
+    rows = [{"Timestamp": timestamp, "Commit": commit, **result.to_dict()} for result in results]
+    if len(rows) == 0:
+        return
+
+    write_header = not os.path.exists(file_path)
+    os.makedirs(output_dir, exist_ok=True)
+    with open(file_path, "a", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        if write_header:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+def load_baseline(file_path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    The baseline results by scenario, or none when there is no baseline yet.
+    """
+    if not os.path.exists(file_path):
+        return {}
+
+    with open(file_path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_baseline(results: List[BenchmarkResult], file_path: str) -> None:
+    """
+    Makes the results the baseline of their scenarios, keeping the baseline
+    of the scenarios not run.
+    """
+    baseline = load_baseline(file_path)
+    baseline.update({result.scenario: result.to_dict() for result in results})
+
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump(baseline, file, indent=2)
+
+
+def find_regressions(
+    results: List[BenchmarkResult], baseline: Dict[str, Dict[str, Any]], tolerance: float
+) -> List[str]:
+    """
+    Describes each metric that is worse than its baseline by more than the
+    tolerance, a fraction of the baseline.
+    """
+    regressions: List[str] = []
+    for result in results:
+        expected = baseline.get(result.scenario)
+        if expected is None:
+            continue
+
+        actual = result.to_dict()
+        for metric, higher_is_better in REGRESSION_METRICS.items():
+            value, base = actual.get(metric), expected.get(metric)
+            if value is None or base is None:
+                continue
+
+            if higher_is_better:
+                worse = value < base * (1 - tolerance)
+            else:
+                worse = value > base * (1 + tolerance)
+                if metric == "MemoryGrowthMB":
+                    worse = worse and value - base > MEMORY_SLACK_MB
+
+            if worse:
+                regressions.append(f"{result.scenario}: {metric} went from {base} to {value}")
+
+    return regressions
@@ -0,0 +1,170 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import asyncio
+import logging
+import os
+import shlex
+import subprocess
+import sys
+import threading
+from timeit import default_timer
+from typing import Dict, List, Optional
+
+from aiohttp import web
+from aiohttp.typedefs import Handler
+
+from edfi_fake_api.app import create_app
+from edfi_fake_api.benchmark.results import BenchmarkResult, Measurement
+from edfi_fake_api.benchmark.scenarios import Scenario, Tool, get_scenarios
+from edfi_fake_api.dataset import generate_dataset
+from edfi_fake_api.helpers.benchmark_arguments import BenchmarkArguments
+from edfi_fake_api.helpers.main_arguments import MainArguments
+from edfi_fake_api.store import DataStore
+
+KEY = "benchmark"
+SECRET = "benchmark"
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundServer:
+    """
+    Serves a fake API from a thread of this process, on a free port, for
+    the duration of a `with` block, counting the requests it answers.
+    """
+
+    def __init__(self, store: DataStore) -> None:
+        self.store = store
+        self.requests = 0
+        self.url = ""
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    @web.middleware
+    async def _count(self, request: web.Request, handler: Handler) -> web.StreamResponse:
+        self.requests += 1
+        return await handler(request)
+
+    def _serve(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        app = create_app(self.store, MainArguments(key=KEY, secret=SECRET))
+        app.middlewares.insert(0, self._count)
+
+        runner = web.AppRunner(app, access_log=None)
+        self._loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        self._loop.run_until_complete(site.start())
+        host, port = runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+        self._ready.set()
+
+        self._loop.run_forever()
+        self._loop.run_until_complete(runner.cleanup())
+        self._loop.close()
+
+    def __enter__(self) -> "BackgroundServer":
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+def _to_mb(max_rss: int) -> float:
+    # Linux reports the maximum resident set size in KB, macOS in bytes
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def measure(command: List[str], cwd: str, log_path: str) -> Measurement:
+    """
+    Runs a command to completion, with its output going to a log file, and
+    measures the wall-clock time, CPU time and peak memory it took.
+    """
+    with open(log_path, "w", encoding="utf-8") as log:
+        start = default_timer()
+        process = subprocess.Popen(command, cwd=cwd, stdout=log, stderr=subprocess.STDOUT)
+
+        if not hasattr(os, "wait4"):
+            return_code = process.wait()
+            return Measurement(default_timer() - start, None, None, return_code)
+
+        _, status, usage = os.wait4(process.pid, 0)
+        seconds = default_timer() - start
+        # Let Popen know the process is gone; as with Popen, a process killed
+        # by a signal has the negative signal number as its return code
+        process.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+
+    return Measurement(seconds, usage.ru_utime + usage.ru_stime, _to_mb(usage.ru_maxrss), process.returncode)
+
+
+def _get_command(args: BenchmarkArguments, tool: Tool) -> List[str]:
+    return shlex.split(args.paging_command if tool == Tool.PAGING else args.performance_command)
+
+
+def _get_dir(args: BenchmarkArguments, tool: Tool) -> str:
+    return args.paging_dir if tool == Tool.PAGING else args.performance_dir
+
+
+def _get_common_arguments(tool: Tool, url: str, output: str) -> List[str]:
+    arguments = ["-b", url, "-k", KEY, "-s", SECRET, "-i", "-o", output]
+    if tool == Tool.PAGING:
+        arguments += ["--metadataCacheDir", ""]
+
+    return arguments
+
+
+def run_scenario(args: BenchmarkArguments, scenario: Scenario, startup: Measurement) -> BenchmarkResult:
+    """
+    Runs one scenario against a fake API serving the scenario's records.
+    """
+    store = DataStore()
+    store.load(generate_dataset(scenario.resource_counts))
+
+    output = os.path.abspath(os.path.join(args.output, scenario.name))
+    os.makedirs(output, exist_ok=True)
+
+    with BackgroundServer(store) as server:
+        command = _get_command(args, scenario.tool) + _get_common_arguments(scenario.tool, server.url, output)
+        run = measure(command + scenario.arguments, _get_dir(args, scenario.tool), os.path.join(output, "run.log"))
+
+    if run.return_code != 0:
+        logger.warning(f"{scenario.name} exited with code {run.return_code}; see {os.path.join(output, 'run.log')}.")
+
+    return BenchmarkResult(scenario.name, server.requests, run, startup)
+
+
+def run_benchmark(args: BenchmarkArguments) -> List[BenchmarkResult]:
+    """
+    Runs each scenario, after measuring the startup of each tool used by
+    running it with `-h`.
+    """
+    scenarios = get_scenarios(args)
+    os.makedirs(args.output, exist_ok=True)
+
+    startup_by_tool: Dict[Tool, Measurement] = {}
+    results: List[BenchmarkResult] = []
+    for scenario in scenarios:
+        startup: Optional[Measurement] = startup_by_tool.get(scenario.tool)
+        if startup is None:
+            startup = measure(
+                _get_command(args, scenario.tool) + ["-h"],
+                _get_dir(args, scenario.tool),
+                os.path.join(args.output, f"{scenario.tool.value}_startup.log"),
+            )
+            startup_by_tool[scenario.tool] = startup
+
+        logger.info(f"Running the {scenario.name} scenario...")
+        result = run_scenario(args, scenario, startup)
+        logger.info(
+            f"  {result.requests} requests in {result.run.seconds:.1f} seconds, "
+            f"{result.cpu_ms_per_request or 0:.3f} ms CPU per request"
+        )
+        results.append(result)
+
+    return results
@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List
+
+from edfi_fake_api.helpers.benchmark_arguments import BenchmarkArguments
+
+SCENARIO_NAMES = ["paging", "filtered_read", "pipeclean", "volume", "change_query"]
+
+
+class Tool(Enum):
+    PAGING = "edfi_paging_test"
+    PERFORMANCE = "edfi_performance_test"
+
+
+@dataclass
+class Scenario:
+    """
+    One path through one of the tools: the tool's arguments, besides the
+    connection and output arguments common to all its runs, and the records
+    the fake API serves while it runs.
+    """
+
+    name: str
+    tool: Tool
+    arguments: List[str]
+    resource_counts: Dict[str, int]
+
+
+def get_scenarios(args: BenchmarkArguments) -> List[Scenario]:
+    """
+    The scenarios to run, in the order given by `args.scenarios`, or every
+    scenario when it is empty.
+    """
+    minutes = str(args.locust_minutes)
+    # The Locust tests create what they need, but read a few shared resources
+    locust_counts = {"schools": 10, "students": 100}
+
+    scenarios = [
+        Scenario(
+            "paging",
+            Tool.PAGING,
+            ["-e", "DEEP_PAGING", "-r", "students", "--pageSize", "25"],
+            {"students": args.paging_records},
+        ),
+        Scenario(
+            "filtered_read",
+            Tool.PAGING,
+            ["-e", "FILTERED_READ", "-r", "students", "--pageSize", "100"],
+            {"students": args.filtered_read_records},
+        ),
+        Scenario(
+            "pipeclean",
+            Tool.PERFORMANCE,
+            ["-t", "PIPECLEAN", "-c", "1", "-r", "1", "-m", minutes, "-d", "-de", "True"],
+            locust_counts,
+        ),
+        Scenario(
+            "volume",
+            Tool.PERFORMANCE,
+            ["-t", "VOLUME", "-c", str(args.volume_users), "-r", str(args.volume_users), "-m", minutes, "-d", "-de", "True"],
+            locust_counts,
+        ),
+        Scenario(
+            "change_query",
+            Tool.PERFORMANCE,
+            ["-t", "CHANGE_QUERY", "-c", "1", "-r", "1", "-m", minutes],
+            {"students": args.paging_records, "schools": 10},
+        ),
+    ]
+
+    if len(args.scenarios) == 0:
+        return scenarios
+
+    by_name = {scenario.name: scenario for scenario in scenarios}
+    return [by_name[name] for name in args.scenarios]
@@ -0,0 +1,195 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from datetime import date, timedelta
+from random import Random
+from typing import Any, Callable, Dict, List
+
+LOCAL_EDUCATION_AGENCY_ID = 255901
+FIRST_SCHOOL_ID = 255901001
+SCHOOL_YEAR = 2022
+
+# Records of each resource in the default dataset, about 100,000 in all,
+# which take a few seconds to generate
+DEFAULT_RESOURCE_COUNTS: Dict[str, int] = {
+    "schools": 50,
+    "staffs": 1000,
+    "students": 20000,
+    "sections": 2000,
+    "studentSchoolAssociations": 20000,
+    "studentSectionAssociations": 60000,
+    "academicWeeks": 1800,
+    "gradingPeriods": 300,
+}
+
+_FIRST_NAMES = ["Avery", "Blake", "Casey", "Devon", "Emerson", "Finley", "Harper", "Jordan", "Kendall", "Logan"]
+_LAST_SURNAMES = ["Garcia", "Johnson", "Kim", "Lopez", "Miller", "Nguyen", "Patel", "Smith", "Williams", "Young"]
+_GRADE_LEVELS = ["Ninth grade", "Tenth grade", "Eleventh grade", "Twelfth grade"]
+_SUBJECTS = ["English Language Arts", "Mathematics", "Science", "Social Studies", "Fine and Performing Arts"]
+
+
+def _descriptor(namespace: str, value: str) -> str:
+    return f"uri://ed-fi.org/{namespace}#{value}"
+
+
+def _date(days: int) -> str:
+    return (date(SCHOOL_YEAR - 1, 8, 1) + timedelta(days=days)).isoformat()
+
+
+class _Generator:
+    """
+    Builds the records of one resource from their index, with references to
+    records of the other resources so that filters on reference fields find
+    matches.
+    """
+
+    def __init__(self, counts: Dict[str, int], random: Random) -> None:
+        self.counts = counts
+        self.random = random
+
+    def _pick(self, resource_name: str) -> int:
+        return self.random.randrange(max(1, self.counts.get(resource_name, 1)))
+
+    def _school_id(self) -> int:
+        return FIRST_SCHOOL_ID + self._pick("schools")
+
+    def _student_unique_id(self) -> str:
+        return str(100000 + self._pick("students"))
+
+    def _section_reference(self) -> Dict[str, Any]:
+        index = self._pick("sections")
+        return {
+            "localCourseCode": f"C{index % 500:03}",
+            "schoolId": FIRST_SCHOOL_ID + index % max(1, self.counts.get("schools", 1)),
+            "schoolYear": SCHOOL_YEAR,
+            "sectionIdentifier": f"S{index:06}",
+            "sessionName": "Fall Semester",
+        }
+
+    def schools(self, index: int) -> Dict[str, Any]:
+        return {
+            "schoolId": FIRST_SCHOOL_ID + index,
+            "nameOfInstitution": f"{_LAST_SURNAMES[index % 10]} {['Elementary', 'Middle', 'High'][index % 3]} School {index}",
+            "localEducationAgencyReference": {"localEducationAgencyId": LOCAL_EDUCATION_AGENCY_ID},
+            "educationOrganizationCategories": [
+                {"educationOrganizationCategoryDescriptor": _descriptor("EducationOrganizationCategoryDescriptor", "School")}
+            ],
+            "gradeLevels": [
+                {"gradeLevelDescriptor": _descriptor("GradeLevelDescriptor", grade)} for grade in _GRADE_LEVELS
+            ],
+        }
+
+    def staffs(self, index: int) -> Dict[str, Any]:
+        return {
+            "staffUniqueId": str(200000 + index),
+            "firstName": self.random.choice(_FIRST_NAMES),
+            "lastSurname": self.random.choice(_LAST_SURNAMES),
+            "birthDate": _date(-self.random.randrange(8000, 20000)),
+            "highestCompletedLevelOfEducationDescriptor": _descriptor("LevelOfEducationDescriptor", "Master's"),
+            "yearsOfPriorProfessionalExperience": self.random.randrange(30),
+        }
+
+    def students(self, index: int) -> Dict[str, Any]:
+        return {
+            "studentUniqueId": str(100000 + index),
+            "firstName": self.random.choice(_FIRST_NAMES),
+            "lastSurname": self.random.choice(_LAST_SURNAMES),
+            "birthDate": _date(-self.random.randrange(5000, 7000)),
+            "birthCity": "Grand Bend",
+        }
+
+    def sections(self, index: int) -> Dict[str, Any]:
+        return {
+            "sectionIdentifier": f"S{index:06}",
+            "courseOfferingReference": {
+                "localCourseCode": f"C{index % 500:03}",
+                "schoolId": FIRST_SCHOOL_ID + index % max(1, self.counts.get("schools", 1)),
+                "schoolYear": SCHOOL_YEAR,
+                "sessionName": "Fall Semester",
+            },
+            "academicSubjectDescriptor": _descriptor("AcademicSubjectDescriptor", self.random.choice(_SUBJECTS)),
+            "availableCredits": 1,
+            "sequenceOfCourse": 1,
+        }
+
+    def studentSchoolAssociations(self, index: int) -> Dict[str, Any]:
+        return {
+            "schoolReference": {"schoolId": self._school_id()},
+            "studentReference": {"studentUniqueId": self._student_unique_id()},
+            "entryDate": _date(self.random.randrange(30)),
+            "entryGradeLevelDescriptor": _descriptor("GradeLevelDescriptor", self.random.choice(_GRADE_LEVELS)),
+        }
+
+    def studentSectionAssociations(self, index: int) -> Dict[str, Any]:
+        return {
+            "sectionReference": self._section_reference(),
+            "studentReference": {"studentUniqueId": self._student_unique_id()},
+            "beginDate": _date(self.random.randrange(30)),
+            "homeroomIndicator": self.random.random() < 0.1,
+        }
+
+    def academicWeeks(self, index: int) -> Dict[str, Any]:
+        week = index % 36
+        return {
+            "schoolReference": {"schoolId": FIRST_SCHOOL_ID + index // 36 % max(1, self.counts.get("schools", 1))},
+            "weekIdentifier": f"Week {week + 1}",
+            "beginDate": _date(week * 7),
+            "endDate": _date(week * 7 + 4),
+            "totalInstructionalDays": 5,
+        }
+
+    def gradingPeriods(self, index: int) -> Dict[str, Any]:
+        period = index % 6
+        return {
+            "schoolReference": {"schoolId": FIRST_SCHOOL_ID + index // 6 % max(1, self.counts.get("schools", 1))},
+            "gradingPeriodDescriptor": _descriptor("GradingPeriodDescriptor", f"Grading Period {period + 1}"),
+            "periodSequence": period + 1,
+            "schoolYearTypeReference": {"schoolYear": SCHOOL_YEAR},
+            "beginDate": _date(period * 30),
+            "endDate": _date(period * 30 + 29),
+            "totalInstructionalDays": 30,
+        }
+
+    def generic(self, index: int) -> Dict[str, Any]:
+        return {
+            "codeValue": f"Value {index}",
+            "description": f"Synthetic record {index}",
+            "namespace": "uri://ed-fi.org/FakeApi",
+        }
+
+
+def get_generator(counts: Dict[str, int], random: Random, resource_name: str) -> Callable[[int], Dict[str, Any]]:
+    """
+    The function building the records of a resource from their index. Resources
+    without a template of their own get generic records.
+    """
+    generator = _Generator(counts, random)
+    return getattr(generator, resource_name, generator.generic)
+
+
+def generate_dataset(counts: Dict[str, int], seed: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Generates synthetic records for each resource. The same counts and seed
+    always give the same records.
+
+    Parameters
+    ----------
+    counts : Dict[str, int]
+        Number of records of each resource, by resource name.
+    seed : int
+        Seed for the random values.
+
+    Returns
+    -------
+    Dict[str, List[Dict[str, Any]]]
+        The records of each resource, without ids.
+    """
+    random = Random(seed)
+    dataset: Dict[str, List[Dict[str, Any]]] = {}
+    for resource_name, count in counts.items():
+        generate = get_generator(counts, random, resource_name)
+        dataset[resource_name] = [generate(index) for index in range(count)]
+
+    return dataset
@@ -0,0 +1,107 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import asyncio
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+import json
+from random import Random
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+from aiohttp.typedefs import Handler, Middleware
+
+
+@dataclass
+class FaultRule:
+    """
+    Latency and errors to inject into the requests whose method and path
+    match. `path` is a glob pattern, e.g. `/data/v3/ed-fi/students*`, and
+    `method` is an HTTP method or `*` for any.
+    """
+
+    method: str = "*"
+    path: str = "*"
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+
+    def matches(self, method: str, path: str) -> bool:
+        return (self.method == "*" or self.method.upper() == method) and fnmatchcase(path, self.path)
+
+    @staticmethod
+    def from_dict(content: Dict[str, Any]) -> "FaultRule":
+        """
+        Reads a rule from its JSON form, with camelCase keys.
+
+        Raises
+        -------
+        ValueError
+            If a key is unknown or a value is out of range
+        """
+        keys = {
+            "method": "method",
+            "path": "path",
+            "latencyMs": "latency_ms",
+            "jitterMs": "jitter_ms",
+            "errorRate": "error_rate",
+            "errorStatus": "error_status",
+        }
+        unknown = set(content) - set(keys)
+        if len(unknown) > 0:
+            raise ValueError(f"Unknown fault rule keys: {', '.join(sorted(unknown))}")
+
+        rule = FaultRule(**{keys[key]: value for key, value in content.items()})
+        if rule.latency_ms < 0 or rule.jitter_ms < 0:
+            raise ValueError("Fault rule latencies must not be negative")
+        if not 0 <= rule.error_rate <= 1:
+            raise ValueError("Fault rule error rates must be between 0 and 1")
+        if not 400 <= rule.error_status <= 599:
+            raise ValueError("Fault rule error statuses must be between 400 and 599")
+
+        return rule
+
+
+def load_fault_rules(file_path: str) -> List[FaultRule]:
+    """
+    Reads the fault rules from a JSON file holding a list of rules.
+
+    Raises
+    -------
+    RuntimeError
+        If the file cannot be read or holds an invalid rule
+    """
+    try:
+        with open(file_path, encoding="utf-8") as file:
+            return [FaultRule.from_dict(content) for content in json.load(file)]
+    except (OSError, ValueError, TypeError) as err:
+        raise RuntimeError(f"Unable to read the fault rules in {file_path}: {err}") from err
+
+
+def fault_middleware(rules: List[FaultRule], seed: Optional[int] = None) -> Middleware:
+    """
+    Middleware applying the first rule that matches each request: waits for
+    its latency plus up to its jitter, then fails the request with its error
+    status at its error rate.
+    """
+    random = Random(seed)
+
+    @web.middleware
+    async def middleware(request: web.Request, handler: Handler) -> web.StreamResponse:
+        rule = next((rule for rule in rules if rule.matches(request.method, request.path)), None)
+        if rule is None:
+            return await handler(request)
+
+        delay_ms = rule.latency_ms + random.uniform(0, rule.jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+        if rule.error_rate > 0 and random.random() < rule.error_rate:
+            return web.json_response({"message": "Fault injected by the fake API."}, status=rule.error_status)
+
+        return await handler(request)
+
+    return middleware
@@ -0,0 +1,302 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from argparse import ArgumentTypeError
+from typing import Dict
+
+from configargparse import ArgParser  # type: ignore
+
+from edfi_fake_api.benchmark.scenarios import SCENARIO_NAMES
+from edfi_fake_api.dataset import DEFAULT_RESOURCE_COUNTS
+from edfi_fake_api.helpers.benchmark_arguments import BenchmarkArguments
+from edfi_fake_api.helpers.log_level import LogLevel
+from edfi_fake_api.helpers.main_arguments import MainArguments
+
+
+def resource_counts(text: str) -> Dict[str, int]:
+    """
+    Parses record counts by resource name, e.g. `students=1000,schools=10`.
+    """
+    counts: Dict[str, int] = {}
+    for entry in text.split(","):
+        name, _, count = entry.partition("=")
+        try:
+            value = int(count)
+        except ValueError:
+            value = -1
+
+        if name.strip() == "" or value < 0:
+            raise ArgumentTypeError(f"Invalid resource count '{entry}': expected name=count")
+        counts[name.strip()] = value
+
+    return counts
+
+
+def rate(text: str) -> float:
+    try:
+        value = float(text)
+    except ValueError as err:
+        raise ArgumentTypeError(f"Invalid rate '{text}': {err}") from err
+
+    if not 0 <= value <= 1:
+        raise ArgumentTypeError(f"Invalid rate '{text}': must be between 0 and 1")
+
+    return value
+
+
+def parse_main_arguments() -> MainArguments:
+    """
+    Configures the command-line interface.
+
+    Returns
+    -------
+    arguments  : MainArguments
+        A populated `MainArguments` object.
+    """
+
+    parser = ArgParser()
+
+    parser.add(  # type: ignore
+        "--host",
+        help="Interface to listen on",
+        type=str,
+        default="127.0.0.1",
+        env_var="PERF_FAKE_API_HOST",
+    )
+    parser.add(  # type: ignore
+        "-p",
+        "--port",
+        help="Port to listen on",
+        type=int,
+        default=8765,
+        env_var="PERF_FAKE_API_PORT",
+    )
+    parser.add(  # type: ignore
+        "-k",
+        "--key",
+        help="The OAuth key to accept; any key is accepted when empty",
+        type=str,
+        default="",
+        env_var="PERF_API_KEY",
+    )
+    parser.add(  # type: ignore
+        "-s",
+        "--secret",
+        help="The OAuth secret to accept; any secret is accepted when empty",
+        type=str,
+        default="",
+        env_var="PERF_API_SECRET",
+    )
+    parser.add(  # type: ignore
+        "-r",
+        "--resourceCounts",
+        help="Records to generate for each resource, e.g. students=1000,schools=10",
+        type=resource_counts,
+        default=dict(DEFAULT_RESOURCE_COUNTS),
+        env_var="PERF_FAKE_API_RESOURCE_COUNTS",
+    )
+    parser.add(  # type: ignore
+        "--seed",
+        help="Seed for the generated records",
+        type=int,
+        default=0,
+        env_var="PERF_FAKE_API_SEED",
+    )
+    parser.add(  # type: ignore
+        "--maxPageSize",
+        help="Largest limit accepted on a GET request, as the Ed-Fi API's PageSizeLimit",
+        type=int,
+        default=500,
+        env_var="PERF_FAKE_API_MAX_PAGE_SIZE",
+    )
+    parser.add(  # type: ignore
+        "--tokenLifetime",
+        help="Seconds an access token is valid for",
+        type=int,
+        default=1800,
+        env_var="PERF_FAKE_API_TOKEN_LIFETIME",
+    )
+    parser.add(  # type: ignore
+        "--latency",
+        help="Milliseconds added to every response",
+        type=float,
+        default=0.0,
+        env_var="PERF_FAKE_API_LATENCY",
+    )
+    parser.add(  # type: ignore
+        "--errorRate",
+        help="Fraction of requests failed with a 500 error, between 0 and 1",
+        type=rate,
+        default=0.0,
+        env_var="PERF_FAKE_API_ERROR_RATE",
+    )
+    parser.add(  # type: ignore
+        "--faultRules",
+        help="JSON file of latency and error rules for specific routes",
+        type=str,
+        default="",
+        env_var="PERF_FAKE_API_FAULT_RULES",
+    )
+    parser.add(  # type: ignore
+        "-l",
+        "--logLevel",
+        help="Console log level: VERBOSE, DEBUG, INFO, WARN, ERROR",
+        type=LogLevel,
+        choices=list(LogLevel),
+        default=LogLevel.INFO,
+        env_var="PERF_LOG_LEVEL",
+    )
+
+    args_parsed = parser.parse_args()
+
+    return MainArguments(
+        args_parsed.host,
+        args_parsed.port,
+        args_parsed.key,
+        args_parsed.secret,
+        args_parsed.resourceCounts,
+        args_parsed.seed,
+        args_parsed.maxPageSize,
+        args_parsed.tokenLifetime,
+        args_parsed.latency,
+        args_parsed.errorRate,
+        args_parsed.faultRules,
+        args_parsed.logLevel,
+    )
+
+
+def parse_benchmark_arguments() -> BenchmarkArguments:
+    """
+    Configures the command-line interface of the benchmark.
+
+    Returns
+    -------
+    arguments  : BenchmarkArguments
+        A populated `BenchmarkArguments` object.
+    """
+
+    defaults = BenchmarkArguments()
+    parser = ArgParser()
+
+    parser.add(  # type: ignore
+        "-o",
+        "--output",
+        help="Directory for the logs of each run, the history of results and the baseline",
+        type=str,
+        default=defaults.output,
+        env_var="PERF_BENCHMARK_OUTPUT",
+    )
+    parser.add(  # type: ignore
+        "--scenarios",
+        help="Scenarios to run; all when not provided",
+        nargs="+",
+        choices=SCENARIO_NAMES,
+        default=[],
+        env_var="PERF_BENCHMARK_SCENARIOS",
+    )
+    parser.add(  # type: ignore
+        "--pagingCommand",
+        help="Command running the paging test, e.g. the Python of its Poetry environment followed by -m edfi_paging_test",
+        type=str,
+        default=defaults.paging_command,
+        env_var="PERF_BENCHMARK_PAGING_COMMAND",
+    )
+    parser.add(  # type: ignore
+        "--pagingDir",
+        help="Directory to run the paging test in",
+        type=str,
+        default=defaults.paging_dir,
+        env_var="PERF_BENCHMARK_PAGING_DIR",
+    )
+    parser.add(  # type: ignore
+        "--performanceCommand",
+        help="Command running the performance test, e.g. the Python of its Poetry environment followed by -m edfi_performance_test",
+        type=str,
+        default=defaults.performance_command,
+        env_var="PERF_BENCHMARK_PERFORMANCE_COMMAND",
+    )
+    parser.add(  # type: ignore
+        "--performanceDir",
+        help="Directory to run the performance test in",
+        type=str,
+        default=defaults.performance_dir,
+        env_var="PERF_BENCHMARK_PERFORMANCE_DIR",
+    )
+    parser.add(  # type: ignore
+        "--pagingRecords",
+        help="Records read by the paging scenario",
+        type=int,
+        default=defaults.paging_records,
+        env_var="PERF_BENCHMARK_PAGING_RECORDS",
+    )
+    parser.add(  # type: ignore
+        "--filteredReadRecords",
+        help="Records sampled by the filtered read scenario",
+        type=int,
+        default=defaults.filtered_read_records,
+        env_var="PERF_BENCHMARK_FILTERED_READ_RECORDS",
+    )
+    parser.add(  # type: ignore
+        "--locustMinutes",
+        help="Minutes each Locust scenario runs for",
+        type=int,
+        default=defaults.locust_minutes,
+        env_var="PERF_BENCHMARK_LOCUST_MINUTES",
+    )
+    parser.add(  # type: ignore
+        "--volumeUsers",
+        help="Locust users of the volume scenario",
+        type=int,
+        default=defaults.volume_users,
+        env_var="PERF_BENCHMARK_VOLUME_USERS",
+    )
+    parser.add(  # type: ignore
+        "--tolerance",
+        help="Relative change in a metric, between 0 and 1, reported as a regression",
+        type=rate,
+        default=defaults.tolerance,
+        env_var="PERF_BENCHMARK_TOLERANCE",
+    )
+    parser.add(  # type: ignore
+        "--baseline",
+        help="Baseline file to compare against; baseline.json in the output directory when not provided",
+        type=str,
+        default="",
+        env_var="PERF_BENCHMARK_BASELINE",
+    )
+    parser.add(  # type: ignore
+        "--updateBaseline",
+        help="Make the results the new baseline",
+        action="store_true",
+        env_var="PERF_BENCHMARK_UPDATE_BASELINE",
+    )
+    parser.add(  # type: ignore
+        "-l",
+        "--logLevel",
+        help="Console log level: VERBOSE, DEBUG, INFO, WARN, ERROR",
+        type=LogLevel,
+        choices=list(LogLevel),
+        default=LogLevel.INFO,
+        env_var="PERF_LOG_LEVEL",
+    )
+
+    args_parsed = parser.parse_args()
+
+    return BenchmarkArguments(
+        args_parsed.output,
+        args_parsed.scenarios,
+        args_parsed.pagingCommand,
+        args_parsed.pagingDir,
+        args_parsed.performanceCommand,
+        args_parsed.performanceDir,
+        args_parsed.pagingRecords,
+        args_parsed.filteredReadRecords,
+        args_parsed.locustMinutes,
+        args_parsed.volumeUsers,
+        args_parsed.tolerance,
+        args_parsed.baseline,
+        args_parsed.updateBaseline,
+        args_parsed.logLevel,
+    )
@@ -0,0 +1,39 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from dataclasses import dataclass, field
+import os
+import sys
+from typing import List
+
+from edfi_fake_api.helpers.log_level import LogLevel
+
+# The tools' projects are next to this one
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+@dataclass
+class BenchmarkArguments:
+    """
+    Container for holding the benchmark's arguments parsed at the command line.
+    """
+
+    output: str = "benchmark"
+    # Every scenario when empty
+    scenarios: List[str] = field(default_factory=list)
+    paging_command: str = f'"{sys.executable}" -m edfi_paging_test'
+    paging_dir: str = os.path.join(SRC_DIR, "edfi-paging-test")
+    performance_command: str = f'"{sys.executable}" -m edfi_performance_test'
+    performance_dir: str = os.path.join(SRC_DIR, "edfi-performance-test")
+    paging_records: int = 20000
+    filtered_read_records: int = 2000
+    locust_minutes: int = 1
+    volume_users: int = 20
+    # Relative change in a metric taken as a regression
+    tolerance: float = 0.2
+    # Empty for baseline.json in the output directory
+    baseline: str = ""
+    update_baseline: bool = False
+    log_level: LogLevel = LogLevel.INFO
@@ -0,0 +1,32 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from dataclasses import dataclass, field
+from typing import Dict
+
+from edfi_fake_api.dataset import DEFAULT_RESOURCE_COUNTS
+from edfi_fake_api.helpers.log_level import LogLevel
+
+
+@dataclass
+class MainArguments:
+    """
+    Container for holding arguments parsed at the command line.
+    """
+
+    host: str = "127.0.0.1"
+    port: int = 8765
+    # Empty accepts any client credentials
+    key: str = ""
+    secret: str = ""
+    resource_counts: Dict[str, int] = field(default_factory=lambda: dict(DEFAULT_RESOURCE_COUNTS))
+    seed: int = 0
+    max_page_size: int = 500
+    token_lifetime: int = 1800
+    latency_ms: float = 0.0
+    error_rate: float = 0.0
+    # JSON file of per-route fault rules, applied before latency_ms and error_rate
+    fault_rules: str = ""
+    log_level: LogLevel = LogLevel.INFO
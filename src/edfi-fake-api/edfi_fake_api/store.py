@@ -0,0 +1,235 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from datetime import datetime, timezone
+import json
+import time
+from random import Random
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+DEFAULT_NAMESPACE = "ed-fi"
+
+
+def _as_query_value(value: Any) -> Optional[str]:
+    """
+    The text a query parameter must have to match the value, lowercased since
+    the Ed-Fi API's filters are not case sensitive, or None for values that
+    cannot be filtered on.
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None or isinstance(value, (dict, list)):
+        return None
+
+    return str(value).lower()
+
+
+_timestamp_second = -1
+_timestamp = ""
+
+
+def _get_timestamp() -> str:
+    """
+    The current time in the API's `_lastModifiedDate` format, formatted at
+    most once a second since records are written by the thousand.
+    """
+    global _timestamp_second, _timestamp
+
+    second = int(time.time())
+    if second != _timestamp_second:
+        _timestamp_second = second
+        _timestamp = datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    return _timestamp
+
+
+def get_query_values(record: Dict[str, Any]) -> Dict[str, str]:
+    """
+    The values of a record that can be used as query filters: its scalar
+    fields and, as in the Ed-Fi API, the key fields of its references.
+    """
+    values: Dict[str, str] = {}
+    for name, value in record.items():
+        if isinstance(value, dict):
+            for reference_name, reference_value in value.items():
+                query_value = _as_query_value(reference_value)
+                if query_value is not None:
+                    values[reference_name] = query_value
+            continue
+
+        query_value = _as_query_value(value)
+        if query_value is not None and name != "id" and not name.startswith("_"):
+            values[name] = query_value
+
+    return values
+
+
+class ResourceCollection:
+    """
+    The records of one resource, kept encoded as JSON so that a page is
+    served by joining bytes rather than encoding records on every request.
+    Records keep the order they were created in, which is the order they
+    are paged in. The list of ids and the indexes of the filter values,
+    built from the encoded records in a single pass, are built when first
+    needed and dropped on every write.
+    """
+
+    def __init__(self, namespace: str, resource_name: str) -> None:
+        self.namespace = namespace
+        self.resource_name = resource_name
+        self._records: Dict[str, bytes] = {}
+        self._change_versions: Dict[str, int] = {}
+        self._ids: Optional[List[str]] = None
+        self._indexes: Optional[Dict[str, Dict[str, List[str]]]] = None
+        # Fields of every record layout seen, to list as filters in the metadata
+        self._layouts: Set[Tuple[str, ...]] = set()
+        self.query_fields: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, resource_id: str) -> bool:
+        return resource_id in self._records
+
+    def get(self, resource_id: str) -> Optional[bytes]:
+        return self._records.get(resource_id)
+
+    def put(self, resource_id: str, record: Dict[str, Any], change_version: int) -> None:
+        """
+        Creates the record, or replaces it keeping its place in the order.
+        """
+        record = {
+            "id": resource_id,
+            **{name: value for name, value in record.items() if not name.startswith("_") and name != "id"},
+            "_etag": str(change_version),
+            "_lastModifiedDate": _get_timestamp(),
+        }
+
+        layout = tuple(record)
+        if layout not in self._layouts:
+            self._layouts.add(layout)
+            self.query_fields.update(get_query_values(record))
+
+        self._records[resource_id] = json.dumps(record, separators=(",", ":")).encode("utf-8")
+        self._change_versions[resource_id] = change_version
+        self._invalidate()
+
+    def delete(self, resource_id: str) -> bool:
+        if resource_id not in self._records:
+            return False
+
+        del self._records[resource_id]
+        del self._change_versions[resource_id]
+        self._invalidate()
+        return True
+
+    def _invalidate(self) -> None:
+        self._ids = None
+        self._indexes = None
+
+    def _get_ids(self) -> List[str]:
+        if self._ids is None:
+            self._ids = list(self._records)
+        return self._ids
+
+    def _get_index(self, field: str) -> Dict[str, List[str]]:
+        if self._indexes is None:
+            indexes: Dict[str, Dict[str, List[str]]] = {}
+            for resource_id, content in self._records.items():
+                for name, value in get_query_values(json.loads(content)).items():
+                    indexes.setdefault(name, {}).setdefault(value, []).append(resource_id)
+            self._indexes = indexes
+
+        return self._indexes.get(field, {})
+
+    def query(
+        self,
+        filters: Dict[str, str],
+        min_change_version: Optional[int] = None,
+        max_change_version: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Ids of the records matching every filter, in order: the ids of the
+        most selective filter that are also among the ids of the others.
+        """
+        if len(filters) == 0:
+            ids = self._get_ids()
+        else:
+            matches = sorted(
+                (self._get_index(field).get(value.lower(), []) for field, value in filters.items()), key=len
+            )
+            ids = matches[0]
+            for others in matches[1:]:
+                other_ids = set(others)
+                ids = [resource_id for resource_id in ids if resource_id in other_ids]
+
+        if min_change_version is not None or max_change_version is not None:
+            low = min_change_version if min_change_version is not None else 0
+            high = max_change_version if max_change_version is not None else float("inf")
+            ids = [resource_id for resource_id in ids if low <= self._change_versions[resource_id] <= high]
+
+        return ids
+
+    def encode_page(self, ids: List[str], offset: int, limit: int) -> bytes:
+        return b"[" + b",".join(self._records[resource_id] for resource_id in ids[offset:offset + limit]) + b"]"
+
+
+class DataStore:
+    """
+    The resources served by the fake API, by namespace and resource name,
+    with a change version incremented on every write as in the Ed-Fi API's
+    change queries. As in the Ed-Fi API, names are not case sensitive.
+    """
+
+    def __init__(self, seed: int = 0) -> None:
+        self._collections: Dict[Tuple[str, str], ResourceCollection] = {}
+        self._random = Random(seed)
+        self.change_version = 0
+
+    def _new_id(self) -> str:
+        return f"{self._random.getrandbits(128):032x}"
+
+    def load(self, dataset: Dict[str, List[Dict[str, Any]]], namespace: str = DEFAULT_NAMESPACE) -> None:
+        for resource_name, records in dataset.items():
+            for record in records:
+                self.create(namespace, resource_name, record)
+
+    def get_collection(self, namespace: str, resource_name: str) -> Optional[ResourceCollection]:
+        return self._collections.get((namespace.lower(), resource_name.lower()))
+
+    def iter_collections(self) -> Iterator[ResourceCollection]:
+        return iter(self._collections.values())
+
+    def create(self, namespace: str, resource_name: str, record: Dict[str, Any]) -> str:
+        """
+        Adds a record, creating the resource on its first record, and returns
+        the new record's id.
+        """
+        key = (namespace.lower(), resource_name.lower())
+        collection = self._collections.get(key)
+        if collection is None:
+            collection = self._collections[key] = ResourceCollection(namespace, resource_name)
+
+        resource_id = self._new_id()
+        self.change_version += 1
+        collection.put(resource_id, record, self.change_version)
+        return resource_id
+
+    def replace(self, namespace: str, resource_name: str, resource_id: str, record: Dict[str, Any]) -> bool:
+        collection = self.get_collection(namespace, resource_name)
+        if collection is None or resource_id not in collection:
+            return False
+
+        self.change_version += 1
+        collection.put(resource_id, record, self.change_version)
+        return True
+
+    def delete(self, namespace: str, resource_name: str, resource_id: str) -> bool:
+        collection = self.get_collection(namespace, resource_name)
+        if collection is None or not collection.delete(resource_id):
+            return False
+
+        self.change_version += 1
+        return True
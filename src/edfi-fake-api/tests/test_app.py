@@ -0,0 +1,186 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import asyncio
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from edfi_fake_api.app import create_app
+from edfi_fake_api.dataset import generate_dataset
+from edfi_fake_api.helpers.main_arguments import MainArguments
+from edfi_fake_api.store import DataStore
+
+KEY = "key"
+SECRET = "secret"
+STUDENTS = "/data/v3/ed-fi/students"
+
+T = TypeVar("T")
+
+
+def _run(act: Callable[[TestClient, Dict[str, str]], Awaitable[T]], **arguments: Any) -> T:
+    """
+    Runs `act` against a fake API serving 30 students and 3 schools, with
+    the headers of an authorized client.
+    """
+    store = DataStore()
+    store.load(generate_dataset({"students": 30, "schools": 3}))
+    args = MainArguments(key=KEY, secret=SECRET, **arguments)
+
+    async def _scenario() -> T:
+        async with TestClient(TestServer(create_app(store, args))) as client:
+            response = await client.post(
+                "/oauth/token", data={"grant_type": "client_credentials", "client_id": KEY, "client_secret": SECRET}
+            )
+            token = (await response.json())["access_token"]
+            return await act(client, {"Authorization": f"Bearer {token}"})
+
+    return asyncio.run(_scenario())
+
+
+def describe_when_getting_the_root() -> None:
+    def it_points_at_the_other_endpoints() -> None:
+        async def act(client: TestClient, headers: Dict[str, str]) -> Dict[str, Any]:
+            return await (await client.get("/")).json()
+
+        urls = _run(act)["urls"]
+        assert urls["oauth"].endswith("/oauth/token")
+        assert urls["dataManagementApi"].endswith("/data/v3/")
+
+
+def describe_when_getting_a_token() -> None:
+    def describe_given_the_wrong_secret() -> None:
+        def it_is_unauthorized() -> None:
+            async def act(client: TestClient, headers: Dict[str, str]) -> int:
+                response = await client.post(
+                    "/oauth/token", data={"grant_type": "client_credentials", "client_id": KEY, "client_secret": "x"}
+                )
+                return response.status
+
+            assert _run(act) == HTTPStatus.UNAUTHORIZED
+
+    def describe_given_basic_authentication() -> None:
+        def it_issues_a_token() -> None:
+            async def act(client: TestClient, headers: Dict[str, str]) -> int:
+                response = await client.post(
+                    "/oauth/token/",
+                    data={"grant_type": "client_credentials"},
+                    headers={"Authorization": "Basic a2V5OnNlY3JldA=="},
+                )
+                return response.status
+
+            assert _run(act) == HTTPStatus.OK
+
+
+def describe_when_reading_resources() -> None:
+    def describe_given_no_token() -> None:
+        def it_is_unauthorized() -> None:
+            async def act(client: TestClient, headers: Dict[str, str]) -> int:
+                return (await client.get(STUDENTS)).status
+
+            assert _run(act) == HTTPStatus.UNAUTHORIZED
+
+    def describe_given_an_offset_and_limit() -> None:
+        def it_returns_the_page_and_total_count() -> None:
+            async def act(client: TestClient, headers: Dict[str, str]) -> Any:
+                response = await client.get(f"{STUDENTS}?offset=25&limit=10&totalCount=true", headers=headers)
+                return response.headers["total-count"], await response.json()
+
+            total_count, items = _run(act)
+            assert total_count == "30"
+            assert [item["studentUniqueId"] for item in items] == [str(100000 + i) for i in range(25, 30)]
+
+    def describe_given_a_limit_over_the_page_size_limit() -> None:
+        def it_is_a_bad_request() -> None:
+            async def act(client: TestClient, headers: Dict[str, str]) -> int:
+                return (await client.get(f"{STUDENTS}?limit=501", headers=headers)).status
+
+            assert _run(act) == HTTPStatus.BAD_REQUEST
+
+    def describe_given_a_filter() -> None:
+        def it_returns_the_matching_records() -> None:
+            async def act(client: TestClient, headers: Dict[str, str]) -> Any:
+                return await (await client.get(f"{STUDENTS}?studentUniqueId=100007", headers=headers)).json()
+
+            assert [item["studentUniqueId"] for item in _run(act)] == ["100007"]
+
+        def it_ignores_the_case_of_the_resource_name() -> None:
+            async def act(client: TestClient, headers: Dict[str, str]) -> Any:
+                return await (await client.get("/data/v3/ed-fi/Students?studentUniqueId=100007", headers=headers)).json()
+
+            assert len(_run(act)) == 1
+
+    def describe_given_partitions() -> None:
+        def it_reads_every_record_once() -> None:
+            async def act(client: TestClient, headers: Dict[str, str]) -> Any:
+                response = await client.get(f"{STUDENTS}/partitions?number=4", headers=headers)
+                ids = []
+                for page_token in (await response.json())["pageTokens"]:
+                    while page_token is not None:
+                        response = await client.get(f"{STUDENTS}?pageToken={page_token}&pageSize=3", headers=headers)
+                        ids += [item["id"] for item in await response.json()]
+                        page_token = response.headers.get("next-page-token")
+                return ids
+
+            ids = _run(act)
+            assert len(ids) == len(set(ids)) == 30
+
+    def describe_given_resource_metadata() -> None:
+        def it_lists_the_filters_of_each_resource() -> None:
+            async def act(client: TestClient, headers: Dict[str, str]) -> Any:
+                response = await client.get("/metadata/data/v3/resources/swagger.json")
+                return await response.json()
+
+            parameters = _run(act)["paths"]["/ed-fi/schools"]["get"]["parameters"]
+            assert {"schoolId", "nameOfInstitution", "localEducationAgencyId"} <= {p["name"] for p in parameters}
+
+        def it_answers_a_matching_etag_with_not_modified() -> None:
+            async def act(client: TestClient, headers: Dict[str, str]) -> int:
+                response = await client.get("/metadata/data/v3/resources/swagger.json")
+                response = await client.get(
+                    "/metadata/data/v3/resources/swagger.json", headers={"If-None-Match": response.headers["ETag"]}
+                )
+                return response.status
+
+            assert _run(act) == HTTPStatus.NOT_MODIFIED
+
+
+def describe_when_writing_resources() -> None:
+    def it_creates_updates_and_deletes_a_record() -> None:
+        async def act(client: TestClient, headers: Dict[str, str]) -> Any:
+            response = await client.post(f"{STUDENTS}", json={"studentUniqueId": "9"}, headers=headers)
+            location = response.headers["Location"]
+            path = location[location.index("/data/"):]
+            statuses = [response.status]
+
+            response = await client.put(path, json={"studentUniqueId": "9", "firstName": "Kim"}, headers=headers)
+            statuses.append(response.status)
+            first_name = (await (await client.get(path, headers=headers)).json())["firstName"]
+
+            statuses.append((await client.delete(path, headers=headers)).status)
+            statuses.append((await client.get(path, headers=headers)).status)
+            return statuses, first_name
+
+        statuses, first_name = _run(act)
+        assert statuses == [HTTPStatus.CREATED, HTTPStatus.NO_CONTENT, HTTPStatus.NO_CONTENT, HTTPStatus.NOT_FOUND]
+        assert first_name == "Kim"
+
+    def it_advances_the_change_version() -> None:
+        async def act(client: TestClient, headers: Dict[str, str]) -> int:
+            await client.post("/data/v3/ed-fi/courses", json={"courseCode": "ALG-1"}, headers=headers)
+            response = await client.get("/ChangeQueries/v1/availableChangeVersions", headers=headers)
+            return (await response.json())["newestChangeVersion"]
+
+        assert _run(act) == 34
+
+
+def describe_when_a_token_expires() -> None:
+    def it_rejects_the_token() -> None:
+        async def act(client: TestClient, headers: Dict[str, str]) -> int:
+            await asyncio.sleep(0.05)
+            return (await client.get(STUDENTS, headers=headers)).status
+
+        assert _run(act, token_lifetime=0) == HTTPStatus.UNAUTHORIZED
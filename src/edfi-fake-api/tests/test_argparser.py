@@ -0,0 +1,57 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import sys
+
+import pytest
+
+from edfi_fake_api.dataset import DEFAULT_RESOURCE_COUNTS
+from edfi_fake_api.helpers.argparser import parse_benchmark_arguments, parse_main_arguments
+
+
+def describe_when_parsing_arguments() -> None:
+    def describe_given_no_arguments() -> None:
+        def it_serves_the_default_dataset() -> None:
+            sys.argv = ["pytest"]
+
+            assert parse_main_arguments().resource_counts == DEFAULT_RESOURCE_COUNTS
+
+    def describe_given_resource_counts() -> None:
+        def it_parses_them() -> None:
+            sys.argv = ["pytest", "--resourceCounts", "students=1000, schools=10"]
+
+            assert parse_main_arguments().resource_counts == {"students": 1000, "schools": 10}
+
+    def describe_given_an_invalid_resource_count() -> None:
+        def it_should_show_help() -> None:
+            sys.argv = ["pytest", "--resourceCounts", "students"]
+
+            with pytest.raises(SystemExit):
+                parse_main_arguments()
+
+    def describe_given_an_error_rate_over_one() -> None:
+        def it_should_show_help() -> None:
+            sys.argv = ["pytest", "--errorRate", "1.5"]
+
+            with pytest.raises(SystemExit):
+                parse_main_arguments()
+
+
+def describe_when_parsing_benchmark_arguments() -> None:
+    def describe_given_scenarios() -> None:
+        def it_keeps_their_order() -> None:
+            sys.argv = ["pytest", "--scenarios", "volume", "paging", "--tolerance", "0.1"]
+
+            args = parse_benchmark_arguments()
+
+            assert args.scenarios == ["volume", "paging"]
+            assert args.tolerance == 0.1
+
+    def describe_given_an_unknown_scenario() -> None:
+        def it_should_show_help() -> None:
+            sys.argv = ["pytest", "--scenarios", "soak"]
+
+            with pytest.raises(SystemExit):
+                parse_benchmark_arguments()
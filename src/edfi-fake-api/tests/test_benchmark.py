@@ -0,0 +1,126 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import csv
+import os
+import sys
+from urllib.request import urlopen
+
+import pytest
+
+from edfi_fake_api.benchmark.results import (
+    BenchmarkResult,
+    Measurement,
+    append_history,
+    find_regressions,
+    load_baseline,
+    save_baseline,
+)
+from edfi_fake_api.benchmark.runner import BackgroundServer, measure
+from edfi_fake_api.benchmark.scenarios import get_scenarios
+from edfi_fake_api.helpers.benchmark_arguments import BenchmarkArguments
+from edfi_fake_api.store import DataStore
+
+STARTUP = Measurement(seconds=1.0, cpu_seconds=0.5, peak_memory_mb=50.0, return_code=0)
+
+
+def _result(cpu_seconds: float = 2.5, peak_memory_mb: float = 60.0) -> BenchmarkResult:
+    return BenchmarkResult("paging", 1000, Measurement(4.0, cpu_seconds, peak_memory_mb, 0), STARTUP)
+
+
+def describe_when_computing_metrics() -> None:
+    def it_nets_out_the_startup() -> None:
+        result = _result()
+
+        assert result.cpu_ms_per_request == pytest.approx(2.0)
+        assert result.cpu_bound_rps == pytest.approx(500.0)
+        assert result.memory_growth_mb == pytest.approx(10.0)
+        assert result.throughput_rps == pytest.approx(250.0)
+
+    def describe_given_no_resource_usage() -> None:
+        def it_leaves_the_metrics_out() -> None:
+            result = BenchmarkResult("paging", 1000, Measurement(4.0, None, None, 0), STARTUP)
+
+            assert result.to_dict()["CpuMsPerRequest"] is None
+            assert result.to_dict()["MemoryGrowthMB"] is None
+
+
+def describe_when_comparing_with_the_baseline() -> None:
+    def describe_given_a_change_within_the_tolerance() -> None:
+        def it_reports_nothing() -> None:
+            baseline = {"paging": _result(cpu_seconds=2.4).to_dict()}
+
+            assert find_regressions([_result()], baseline, 0.2) == []
+
+    def describe_given_more_cpu_per_request() -> None:
+        def it_reports_the_cpu_metrics() -> None:
+            baseline = {"paging": _result(cpu_seconds=1.5).to_dict()}
+
+            regressions = find_regressions([_result()], baseline, 0.2)
+
+            assert [regression.split(":")[1].split()[0] for regression in regressions] == [
+                "CpuMsPerRequest", "CpuBoundRps"
+            ]
+
+    def describe_given_a_small_memory_growth() -> None:
+        def it_is_noise() -> None:
+            baseline = {"paging": _result(peak_memory_mb=52.0).to_dict()}
+
+            assert find_regressions([_result(peak_memory_mb=56.0)], baseline, 0.2) == []
+
+    def describe_given_no_baseline_for_the_scenario() -> None:
+        def it_reports_nothing() -> None:
+            assert find_regressions([_result()], {}, 0.2) == []
+
+
+def describe_when_storing_results() -> None:
+    def it_appends_to_the_history(tmp_path) -> None:
+        append_history([_result()], str(tmp_path), "2026-10-18T09:30:00", "abc123")
+        append_history([_result()], str(tmp_path), "2026-10-18T10:30:00", "def456")
+
+        with open(os.path.join(tmp_path, "history.csv"), encoding="utf-8") as file:
+            rows = list(csv.DictReader(file))
+        assert [row["Commit"] for row in rows] == ["abc123", "def456"]
+
+    def it_keeps_the_baseline_of_scenarios_not_run(tmp_path) -> None:
+        file_path = os.path.join(tmp_path, "baseline.json")
+        save_baseline([BenchmarkResult("volume", 10, STARTUP, STARTUP)], file_path)
+        save_baseline([_result()], file_path)
+
+        assert set(load_baseline(file_path)) == {"volume", "paging"}
+
+
+def describe_when_selecting_scenarios() -> None:
+    def it_runs_every_scenario_by_default() -> None:
+        assert len(get_scenarios(BenchmarkArguments())) == 5
+
+    def it_keeps_the_order_given() -> None:
+        scenarios = get_scenarios(BenchmarkArguments(scenarios=["volume", "paging"]))
+
+        assert [scenario.name for scenario in scenarios] == ["volume", "paging"]
+
+
+def describe_when_measuring_a_command() -> None:
+    @pytest.mark.skipif(not hasattr(os, "wait4"), reason="resource usage of child processes is POSIX only")
+    def it_measures_cpu_and_memory(tmp_path) -> None:
+        measurement = measure(
+            [sys.executable, "-c", "sum(range(3_000_000)); b = bytearray(50_000_000)"],
+            str(tmp_path),
+            os.path.join(tmp_path, "run.log"),
+        )
+
+        assert measurement.return_code == 0
+        assert measurement.cpu_seconds is not None and measurement.cpu_seconds > 0
+        assert measurement.peak_memory_mb is not None and measurement.peak_memory_mb > 50
+
+
+def describe_when_serving_in_the_background() -> None:
+    def it_counts_the_requests() -> None:
+        with BackgroundServer(DataStore()) as server:
+            for _ in range(3):
+                with urlopen(server.url) as response:
+                    response.read()
+
+        assert server.requests == 3
@@ -0,0 +1,27 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from edfi_fake_api.dataset import FIRST_SCHOOL_ID, generate_dataset
+
+COUNTS = {"schools": 4, "students": 50, "studentSchoolAssociations": 100, "gradeLevelDescriptors": 3}
+
+
+def describe_when_generating_a_dataset() -> None:
+    def it_generates_the_requested_counts() -> None:
+        dataset = generate_dataset(COUNTS)
+
+        assert {name: len(records) for name, records in dataset.items()} == COUNTS
+
+    def it_is_the_same_for_the_same_seed() -> None:
+        assert generate_dataset(COUNTS, seed=3) == generate_dataset(COUNTS, seed=3)
+
+    def it_references_generated_records() -> None:
+        associations = generate_dataset(COUNTS)["studentSchoolAssociations"]
+
+        school_ids = {association["schoolReference"]["schoolId"] for association in associations}
+        assert school_ids <= set(range(FIRST_SCHOOL_ID, FIRST_SCHOOL_ID + 4))
+
+    def it_generates_generic_records_for_other_resources() -> None:
+        assert generate_dataset(COUNTS)["gradeLevelDescriptors"][0]["codeValue"] == "Value 0"
@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import asyncio
+from http import HTTPStatus
+from timeit import default_timer
+from typing import List, Tuple
+
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+import pytest
+
+from edfi_fake_api.faults import FaultRule, fault_middleware
+
+
+def _get_statuses(rules: List[FaultRule], path: str, requests: int) -> Tuple[List[int], float]:
+    """
+    Statuses of `requests` GET requests of `path` through the fault rules,
+    and the seconds they took.
+    """
+    async def ok(request: web.Request) -> web.Response:
+        return web.Response()
+
+    async def _scenario() -> Tuple[List[int], float]:
+        app = web.Application(middlewares=[fault_middleware(rules, seed=1)])
+        app.router.add_get("/{tail:.*}", ok)
+        async with TestClient(TestServer(app)) as client:
+            start = default_timer()
+            statuses = [(await client.get(path)).status for _ in range(requests)]
+            return statuses, default_timer() - start
+
+    return asyncio.run(_scenario())
+
+
+def describe_when_reading_a_rule() -> None:
+    def it_reads_camel_case_keys() -> None:
+        rule = FaultRule.from_dict({"method": "GET", "path": "/data/*", "latencyMs": 20, "errorRate": 0.5})
+
+        assert rule == FaultRule("GET", "/data/*", latency_ms=20, error_rate=0.5)
+
+    def describe_given_an_unknown_key() -> None:
+        def it_raises() -> None:
+            with pytest.raises(ValueError):
+                FaultRule.from_dict({"delay": 20})
+
+    def describe_given_an_error_rate_over_one() -> None:
+        def it_raises() -> None:
+            with pytest.raises(ValueError):
+                FaultRule.from_dict({"errorRate": 2})
+
+
+def describe_when_applying_rules() -> None:
+    def describe_given_a_route_with_latency() -> None:
+        def it_delays_the_route() -> None:
+            _, elapsed = _get_statuses([FaultRule(path="/data/*", latency_ms=50)], "/data/v3/ed-fi/students", 2)
+
+            assert elapsed >= 0.1
+
+        def it_leaves_other_routes_alone() -> None:
+            _, elapsed = _get_statuses([FaultRule(path="/data/*", latency_ms=500)], "/metadata/", 2)
+
+            assert elapsed < 0.5
+
+    def describe_given_an_error_rate() -> None:
+        def it_fails_about_that_share_of_requests() -> None:
+            statuses, _ = _get_statuses([FaultRule(error_rate=0.5, error_status=503)], "/", 200)
+
+            assert 60 < statuses.count(HTTPStatus.SERVICE_UNAVAILABLE) < 140
+            assert set(statuses) == {HTTPStatus.OK, HTTPStatus.SERVICE_UNAVAILABLE}
+
+    def describe_given_overlapping_rules() -> None:
+        def it_applies_the_first_match() -> None:
+            rules = [FaultRule(path="/data/*"), FaultRule(error_rate=1.0)]
+
+            assert _get_statuses(rules, "/data/v3/ed-fi/students", 3)[0] == [HTTPStatus.OK] * 3
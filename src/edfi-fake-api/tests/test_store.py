@@ -0,0 +1,59 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import json
+
+import pytest
+
+from edfi_fake_api.store import ResourceCollection, get_query_values
+
+
+@pytest.fixture
+def collection() -> ResourceCollection:
+    collection = ResourceCollection("ed-fi", "studentSchoolAssociations")
+    for index in range(6):
+        collection.put(
+            str(index),
+            {"schoolReference": {"schoolId": index % 2}, "entryDate": "2021-08-23", "repeat": index % 3 == 0},
+            index,
+        )
+    return collection
+
+
+def describe_when_getting_query_values() -> None:
+    def it_includes_the_keys_of_references() -> None:
+        values = get_query_values({"id": "a", "schoolReference": {"schoolId": 1}, "grades": [9], "isActive": True})
+
+        assert values == {"schoolId": "1", "isActive": "true"}
+
+
+def describe_when_querying() -> None:
+    def it_returns_the_records_matching_every_filter(collection: ResourceCollection) -> None:
+        assert collection.query({"schoolId": "0", "repeat": "True"}) == ["0"]
+
+    def it_filters_on_the_change_version(collection: ResourceCollection) -> None:
+        assert collection.query({}, min_change_version=4) == ["4", "5"]
+
+    def describe_given_a_record_was_deleted() -> None:
+        def it_no_longer_matches(collection: ResourceCollection) -> None:
+            collection.query({"schoolId": "1"})
+            collection.delete("3")
+
+            assert collection.query({"schoolId": "1"}) == ["1", "5"]
+
+    def describe_given_a_record_was_replaced() -> None:
+        def it_keeps_its_place(collection: ResourceCollection) -> None:
+            collection.put("2", {"schoolReference": {"schoolId": 1}}, 7)
+
+            assert collection.query({"schoolId": "1"}) == ["1", "2", "3", "5"]
+
+
+def describe_when_encoding_a_page() -> None:
+    def it_returns_a_json_array_of_the_records(collection: ResourceCollection) -> None:
+        ids = collection.query({})
+        page = json.loads(collection.encode_page(ids, 4, 10))
+
+        assert [record["id"] for record in page] == ["4", "5"]
+        assert page[0]["_etag"] == "4"
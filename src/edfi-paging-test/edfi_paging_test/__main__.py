@@ -11,47 +11,17 @@ from dotenv import load_dotenv
 from errorhandler import ErrorHandler
 
 from edfi_paging_test.helpers.argparser import parse_main_arguments
-from edfi_paging_test.helpers.main_arguments import MainArguments
+from edfi_paging_test.helpers.log_configuration import configure_logging
 from edfi_paging_test.performance_tester import run
-from edfi_paging_test.helpers.log_level import LogLevel
 
 
 logger = logging.getLogger(__name__)
 
 
-def _redefine_debug_as_verbose(configuration: MainArguments, logger: str) -> None:
-    requests_logger = logging.getLogger(logger)
-    if configuration.log_level == LogLevel.VERBOSE:
-        requests_logger.setLevel(logging.DEBUG)
-    else:
-        requests_logger.setLevel(logging.INFO)
-
-
-def _configure_logging(configuration: MainArguments) -> None:
-
-    # Verbose is not a real Python log level, so convert back to DEBUG. Verbose
-    # is used for quieting other loggers when in DEBUG mode.
-    log_level = str(LogLevel.DEBUG if configuration.log_level == LogLevel.VERBOSE else configuration.log_level)
-
-    logging.basicConfig(
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-        ],
-        format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
-        level=log_level,
-    )
-
-    # These two loggers produce far more than we really want to see in debug
-    # mode. Therefore we'll redefine _their_ debug modes as "verbose" for our
-    # purposes.
-    _redefine_debug_as_verbose(configuration, "requests_oauthlib.oauth2_session")
-    _redefine_debug_as_verbose(configuration, "urllib3.connectionpool")
-
-
 async def main() -> None:
     load_dotenv()
     configuration = parse_main_arguments()
-    _configure_logging(configuration)
+    configure_logging(configuration.log_level)
 
     # Important that this comes _after_ the logging configuration
     error_tracker = ErrorHandler()
@@ -0,0 +1,602 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import asyncio
+from base64 import b64encode
+import json
+import logging
+from dataclasses import dataclass
+from http import HTTPStatus
+from timeit import default_timer
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Tuple
+
+import aiohttp
+
+from edfi_paging_test.api.paginated_result import PaginatedResult
+from edfi_paging_test.api.request_client_base import NEXT_PAGE_TOKEN, RequestClientBase
+from edfi_paging_test.api.request_timing import RequestTiming
+from edfi_paging_test.api.retry_policy import Attempt, CircuitBreaker, is_failure
+from edfi_paging_test.api.token_manager import AsyncTokenManager, Credentials, Token, parse_credentials, read_token
+from edfi_paging_test.helpers.main_arguments import MainArguments
+from edfi_paging_test.reporter.paging_request_logger import PaggingRequestLogger
+from edfi_paging_test.reporter.filtered_read_request_logger import FilteredReadRequestLogger
+from edfi_paging_test.reporter.partition_request_logger import PartitionRequestLogger
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AsyncResponse:
+    """
+    Fully read response from the asyncio transport. The body is read inside
+    the request so that the connection goes straight back to the pool.
+    """
+
+    status_code: int
+    headers: Mapping[str, str]
+    content: bytes
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class AsyncRequestClient(RequestClientBase):
+    """
+    The AsyncRequestClient class is the asyncio counterpart of RequestClient.
+    All requests share one pooled, keep-alive aiohttp session, so hundreds of
+    paging and filtered-read requests can be in flight from a single event
+    loop without a thread per request.
+
+    Use as an async context manager so that the session is closed:
+
+        async with AsyncRequestClient(args) as request_client:
+            await request_client.get_all(...)
+
+    Parameters
+    ----------
+    args : MainArguments
+        The parsed command line arguments. `connectionLimit` caps both the
+        size of the connection pool and the number of requests in flight.
+        `key` and `secret` may hold comma separated lists, as with
+        RequestClient.
+    """
+
+    def __init__(self, args: MainArguments) -> None:
+        super().__init__(args)
+
+        self.tokens = AsyncTokenManager(parse_credentials(args.key, args.secret), self._fetch_token)
+        self.connection_limit = args.connectionLimit
+
+        # Created in `open`, because they must belong to the running event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._token_session: Optional[aiohttp.ClientSession] = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._retry_slots: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncRequestClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        # Root metadata is read with a blocking request; resolve it up front,
+        # off the event loop, so that later URL building never blocks.
+        await asyncio.get_running_loop().run_in_executor(None, self._get_api_info)
+
+        connector = aiohttp.TCPConnector(
+            limit=self.connection_limit,
+            ssl=self.verify_cert,
+        )
+        self._session = aiohttp.ClientSession(connector=connector)
+        # Apart from the pooled session, so that refreshing in the background
+        # never waits for a connection behind the requests being measured
+        self._token_session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=1, ssl=self.verify_cert))
+        self._in_flight = asyncio.Semaphore(self.connection_limit)
+        self._retry_slots = asyncio.Semaphore(self.retry_policy.concurrency)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._token_session is not None:
+            await self._token_session.close()
+            self._token_session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        assert self._session is not None, "AsyncRequestClient must be opened before sending requests."
+        return self._session
+
+    def _basic_auth_header(self, credentials: Credentials) -> str:
+        encoded = b64encode(f"{credentials.key}:{credentials.secret}".encode("utf-8")).decode("ascii")
+        return f"Basic {encoded}"
+
+    async def _fetch_token(self, credentials: Credentials) -> Token:
+        logger.debug(f"Authenticating to the ODS/API with key {credentials.key}")
+        start = default_timer()
+        assert self._token_session is not None, "AsyncRequestClient must be opened before sending requests."
+        async with self._token_session.post(
+            self._get_api_info().oauth_url,
+            headers={"Authorization": self._basic_auth_header(credentials)},
+            data={"grant_type": "client_credentials"},
+        ) as response:
+            if response.status >= HTTPStatus.BAD_REQUEST:
+                raise RuntimeError(f"Authentication failed with status {response.status}")
+            return read_token(await response.json(content_type=None), start)
+
+    async def _send(self, url: str, timing: RequestTiming) -> AsyncResponse:
+        token, auth_time = await self.tokens.get_token()
+        timing.auth_time += auth_time
+        timing.token_refreshed = timing.auth_time > 0
+
+        start = default_timer()
+        async with self._get_session().get(
+            url, headers={"Authorization": f"Bearer {token}"}
+        ) as response:
+            # The context is entered as soon as the headers arrive
+            headers_received = default_timer()
+            content = await response.read()
+
+            timing.response_bytes = len(content)
+            timing.time_to_first_byte = headers_received - start
+            timing.transfer_time = default_timer() - headers_received
+
+            if response.status == HTTPStatus.UNAUTHORIZED:
+                self.tokens.invalidate(token)
+            return AsyncResponse(response.status, response.headers, content)
+
+    async def _get(self, url: str, timing: RequestTiming) -> AsyncResponse:
+        """
+        Send an HTTP GET request, with an access token from `tokens`.
+
+        Parameters
+        ----------
+        url : str
+            The absolute url, or a url relative to the api base url.
+        timing : RequestTiming
+            Receives the time to first byte, transfer time and size of the
+            response, and the time spent waiting for a token.
+
+        Returns
+        -------
+        AsyncResponse
+            The fully read response from the server
+        """
+        assert isinstance(
+            self.api_base_url, str
+        ), "Property `api_base_url` should be of type `str`."
+
+        if not url.startswith(self.api_base_url):
+            url = self._urljoin(self.api_base_url, url)
+
+        response = await self._send(url, timing)
+
+        if response.status_code == HTTPStatus.UNAUTHORIZED:
+            response = await self._send(url, timing)
+            # If that fails after authorization, then let it go
+
+        if response.status_code != HTTPStatus.OK:
+            message = response.text.replace("\r", "").replace("\n", "")
+            logger.warning(
+                f"Response {response.status_code} to {url} with message: {message}"
+            )
+
+        return response
+
+    async def _timed_get(
+        self, url: str, timing: RequestTiming, scheduled_at: Optional[float] = None
+    ) -> Tuple[float, AsyncResponse]:
+        assert self._in_flight is not None
+
+        # Wait for a free slot _before_ starting the clock, so that queueing
+        # behind other requests is not counted as request latency; unless the
+        # request was scheduled, in which case the clock started then. Time
+        # spent waiting for an access token is reported apart, as auth time.
+        async with self._in_flight:
+            start = default_timer() if scheduled_at is None else scheduled_at
+            response = await self._get(url, timing)
+            return (default_timer() - start - timing.auth_time, response)
+
+    async def _wait_for_breaker(self, breaker: Optional[CircuitBreaker]) -> None:
+        while breaker is not None:
+            delay = breaker.get_delay()
+            if delay == 0:
+                return
+            await asyncio.sleep(delay)
+
+    async def _get_with_retries(self, url: str, resource: str, scheduled_at: Optional[float] = None) -> List[Attempt]:
+        """
+        Sends the request, and sends it again as long as the retry policy
+        allows. Behaves the same as `RequestClient._get_with_retries`.
+
+        Returns
+        -------
+        List[Attempt]
+            Every attempt, the final one last
+        """
+        assert self._retry_slots is not None
+
+        breaker = self._get_breaker(resource)
+        attempts: List[Attempt] = []
+        backoff = 0.0
+        while True:
+            wait_start = default_timer()
+            await asyncio.sleep(backoff)
+            await self._wait_for_breaker(breaker)
+
+            timing = RequestTiming()
+            try:
+                if len(attempts) == 0:
+                    backoff_time = default_timer() - wait_start
+                    # The wait on the breaker is the backoff time, and not
+                    # part of the elapsed time, even of a scheduled request
+                    start = scheduled_at + backoff_time if scheduled_at is not None else None
+                    with self._track_in_flight(resource):
+                        elapsed, response = await self._timed_get(url, timing, start)
+                else:
+                    async with self._retry_slots:
+                        backoff_time = default_timer() - wait_start
+                        with self._track_in_flight(resource):
+                            elapsed, response = await self._timed_get(url, timing)
+            except Exception:
+                # A request that raises, e.g. on a connection error, failed too;
+                # were it the breaker's probe, the breaker would stay half open
+                if breaker is not None:
+                    breaker.record(True)
+                raise
+
+            if breaker is not None:
+                breaker.record(is_failure(response.status_code))
+
+            number = len(attempts) + 1
+            retry = self.retry_policy.should_retry(response.status_code, number)
+            attempts.append(Attempt(number, elapsed, response, timing, backoff_time, final=not retry))
+            if not retry:
+                return attempts
+
+            backoff = self.retry_policy.get_backoff(number, response.headers.get("Retry-After"))
+            logger.debug(f"Retrying {url} in {backoff:.3f} seconds.")
+
+    async def get_total(self, resource: str) -> int:
+        """
+        Get total resource count by sending an HTTP GET request.
+
+        Parameters
+        ----------
+        resource : str
+            The resource endpoint that you want to request.
+
+        Returns
+        -------
+        int
+            Total resource count
+        """
+        logger.info(f"Getting total count for {resource}.")
+        total_count_url = (
+            f"{self._build_url_for_resource(resource)}?offset=0&limit=0&totalCount=true"
+        )
+
+        logger.debug(f"GET {total_count_url}")
+
+        response = (await self._get_with_retries(total_count_url, resource))[-1].response
+
+        total_count = "total-count"
+        if total_count in response.headers:
+            if self.live_metrics is not None:
+                self.live_metrics.add_expected_records(resource, int(response.headers[total_count]))
+            return int(response.headers[total_count])
+
+        logger.warning(
+            "An API error occurred: total-count was not provided in the API response."
+        )
+        return 0
+
+    async def get_page(
+        self, resource: str, pagingRequestLogger: PaggingRequestLogger, page: int = 1, scheduled_at: Optional[float] = None
+    ) -> PaginatedResult:
+        """Send an HTTP GET request for the next page. See
+        `RequestClient.get_page` for `scheduled_at`.
+
+        Returns
+        -------
+        PaginatedResult
+        """
+
+        next_url = (
+            f"{self._build_url_for_resource(resource)}?"
+            f"{self._build_query_params_for_page(page, self.page_size)}"
+        )
+
+        logger.debug(f"GET {next_url}")
+        attempts = await self._get_with_retries(next_url, resource, scheduled_at)
+        response = attempts[-1].response
+
+        items, count = self._read_items(response, attempts[-1].timing, self.count_only)
+
+        for attempt in attempts:
+            pagingRequestLogger.log_request(
+                resource,
+                next_url,
+                page,
+                self.page_size,
+                count if attempt.final else 0,
+                attempt.elapsed,
+                attempt.response.status_code,
+                attempt.timing.time_to_first_byte,
+                attempt.timing.transfer_time,
+                attempt.timing.response_bytes,
+                attempt.timing.decode_time,
+                attempt.timing.token_refreshed,
+                attempt.timing.auth_time,
+                attempt.number,
+                attempt.backoff_time,
+                attempt.final,
+            )
+
+        return PaginatedResult(
+            resource_name=resource,
+            current_page=page,
+            page_size=self.page_size,
+            api_response=items,
+            status_code=response.status_code,
+            item_count=count,
+        )
+
+    async def iter_pages(self, resource: str, pagingRequestLogger: PaggingRequestLogger) -> AsyncIterator[PaginatedResult]:
+        """
+        Send HTTP GET requests for all pages of a resource, one after another,
+        yielding each page as soon as it arrives. Behaves the same as
+        `RequestClient.iter_pages`.
+
+        Returns
+        -------
+        AsyncIterator[PaginatedResult]
+            The pages of the resource, in page order
+        """
+
+        logger.info(f"Retrieving all {resource} records...")
+
+        page = 0
+        while True:
+            page += 1
+            pagination_result = await self.get_page(resource, pagingRequestLogger, page)
+            yield pagination_result
+
+            # The second page is always requested, even after a short first page
+            if page > 1 and pagination_result.size < self.page_size:
+                break
+
+    async def iter_pages_parallel(
+        self, resource: str, pagingRequestLogger: PaggingRequestLogger, total_count: int, window: int
+    ) -> AsyncIterator[PaginatedResult]:
+        """
+        Send HTTP GET requests for all pages of a resource, keeping up to
+        `window` page requests in flight at once. Behaves the same as
+        `RequestClient.iter_pages_parallel`.
+
+        Returns
+        -------
+        AsyncIterator[PaginatedResult]
+            The pages of the resource, in page order
+        """
+
+        logger.info(f"Retrieving all {resource} records, {window} pages at a time...")
+
+        expected_pages = self._get_page_count(total_count)
+        completed: Dict[int, PaginatedResult] = {}
+        short_page_seen = False
+        next_page_to_request = 1
+        next_page_to_yield = 1
+        in_flight: Dict[asyncio.Future, int] = {}
+
+        try:
+            while True:
+                while len(in_flight) < window and next_page_to_request <= expected_pages and not short_page_seen:
+                    task = asyncio.ensure_future(self.get_page(resource, pagingRequestLogger, next_page_to_request))
+                    in_flight[task] = next_page_to_request
+                    next_page_to_request += 1
+
+                if len(in_flight) == 0:
+                    break
+
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    page = in_flight.pop(task)
+                    completed[page] = task.result()
+                    short_page_seen = short_page_seen or completed[page].size < self.page_size
+
+                while next_page_to_yield in completed:
+                    pagination_result = completed.pop(next_page_to_yield)
+                    next_page_to_yield += 1
+                    yield pagination_result
+
+                    if pagination_result.size < self.page_size:
+                        return
+        finally:
+            # Let discarded pages finish, as the threaded client does, so that
+            # they are still measured and no task is left pending
+            if len(in_flight) > 0:
+                await asyncio.wait(in_flight)
+
+        page = expected_pages
+        while True:
+            page += 1
+            pagination_result = await self.get_page(resource, pagingRequestLogger, page)
+            yield pagination_result
+
+            if pagination_result.size < self.page_size:
+                return
+
+    async def get_partition_page_tokens(self, resource: str, number: int) -> List[str]:
+        """
+        Ask the API to split a resource into `number` partitions. Behaves the
+        same as `RequestClient.get_partition_page_tokens`.
+
+        Returns
+        -------
+        list
+            One page token per partition; empty when the resource cannot be
+            partitioned.
+        """
+        url = self._build_url_for_partitions(resource, number)
+
+        logger.debug(f"GET {url}")
+        response = (await self._get_with_retries(url, resource))[-1].response
+
+        body = response.json() if len(response.content) > 0 and response.status_code == HTTPStatus.OK else None
+        return self._get_partition_page_tokens(resource, response.status_code, body)
+
+    async def get_partition_page(
+        self,
+        resource: str,
+        partitionRequestLogger: PartitionRequestLogger,
+        partition: int,
+        page: int,
+        page_token: str,
+    ) -> Tuple[PaginatedResult, Optional[str]]:
+        """Send an HTTP GET request for one page of a partition.
+
+        Returns
+        -------
+        Tuple[PaginatedResult, Optional[str]]
+            The page, and the token of the next page in the partition if any
+        """
+
+        url = self._build_url_for_partition_page(resource, page_token)
+
+        logger.debug(f"GET {url}")
+        attempts = await self._get_with_retries(url, resource)
+        response = attempts[-1].response
+
+        items, count = self._read_items(response, attempts[-1].timing, self.count_only)
+
+        for attempt in attempts:
+            partitionRequestLogger.log_request(
+                resource,
+                url,
+                partition,
+                page,
+                self.page_size,
+                count if attempt.final else 0,
+                attempt.elapsed,
+                attempt.response.status_code,
+                attempt.timing.time_to_first_byte,
+                attempt.timing.transfer_time,
+                attempt.timing.response_bytes,
+                attempt.timing.decode_time,
+                attempt.timing.token_refreshed,
+                attempt.timing.auth_time,
+                attempt.number,
+                attempt.backoff_time,
+                attempt.final,
+            )
+
+        return (
+            PaginatedResult(
+                resource_name=resource,
+                current_page=page,
+                page_size=self.page_size,
+                api_response=items,
+                status_code=response.status_code,
+                item_count=count,
+            ),
+            response.headers.get(NEXT_PAGE_TOKEN),
+        )
+
+    async def iter_partition_pages(
+        self, resource: str, partitionRequestLogger: PartitionRequestLogger, partition: int, page_token: str
+    ) -> AsyncIterator[PaginatedResult]:
+        """
+        Send HTTP GET requests for all pages of one partition, one after
+        another. Behaves the same as `RequestClient.iter_partition_pages`.
+
+        Returns
+        -------
+        AsyncIterator[PaginatedResult]
+            The pages of the partition, in page order
+        """
+
+        page = 0
+        next_page_token: Optional[str] = page_token
+        while next_page_token is not None:
+            page += 1
+            pagination_result, next_page_token = await self.get_partition_page(
+                resource, partitionRequestLogger, partition, page, next_page_token
+            )
+            yield pagination_result
+
+            if pagination_result.size < self.page_size:
+                break
+
+    async def get_all(self, resource: str, pagingRequestLogger: PaggingRequestLogger) -> List[Dict[str, Any]]:
+        """
+        Send an HTTP GET request for all pages of a resource.
+
+        Returns
+        -------
+        list
+            A list of all parsed results
+        """
+        return self._join_pages([page async for page in self.iter_pages(resource, pagingRequestLogger)])
+
+    async def get_all_parallel(
+        self, resource: str, pagingRequestLogger: PaggingRequestLogger, total_count: int, window: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Send HTTP GET requests for all pages of a resource, with up to `window`
+        pages in flight. See `iter_pages_parallel`.
+
+        Returns
+        -------
+        list
+            A list of all parsed results, in page order
+        """
+        return self._join_pages(
+            [page async for page in self.iter_pages_parallel(resource, pagingRequestLogger, total_count, window)]
+        )
+
+    async def filtered_get(self, resource_name: str, filters: Dict[str, str], limit: int, filteredReadRequestLogger: FilteredReadRequestLogger) -> List[Dict[str, Any]]:
+        """
+        Sends an HTTP GET request to the given resource applying the provider filters.
+
+        Args:
+            resource_name: Name of the resource to query
+            filters: Dictionary of filter name and value
+            limit: Number of entries to retrieve
+
+        Returns:
+            List containing the matching resource entries
+        """
+
+        url = self._build_url_for_filters(resource_name, filters, limit)
+
+        attempts = await self._get_with_retries(url, resource_name)
+
+        items, _ = self._read_items(attempts[-1].response, attempts[-1].timing)
+
+        for attempt in attempts:
+            filteredReadRequestLogger.log_request(
+                resource_name,
+                url,
+                len(filters),
+                attempt.elapsed,
+                attempt.response.status_code,
+                attempt.timing.time_to_first_byte,
+                attempt.timing.transfer_time,
+                attempt.timing.response_bytes,
+                attempt.timing.decode_time,
+                attempt.timing.token_refreshed,
+                attempt.timing.auth_time,
+                attempt.number,
+                attempt.backoff_time,
+                attempt.final,
+            )
+
+        return items
@@ -3,7 +3,7 @@
 # The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
 # See the LICENSE and NOTICES files in the project root for more information.
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 
 class PaginatedResult():
@@ -25,6 +25,9 @@ class PaginatedResult():
         The name used by the API for the current resource.
     current_page : Optional[str]
         The page that you have requested.
+    item_count : Optional[int]
+        Number of items on the page, when they were counted without being
+        decoded and `api_response` is empty.
     """
 
     def __init__(
@@ -34,6 +37,7 @@ class PaginatedResult():
         api_response: List[Dict[str, Any]],
         status_code: int,
         current_page: int = 1,
+        item_count: Optional[int] = None,
     ):
         self.page_size = page_size
         self.current_page = current_page
@@ -46,7 +50,11 @@ class PaginatedResult():
         self._api_response = api_response
         self._resource_name = resource_name
         self.status_code = status_code
+        self._item_count = item_count
 
     @property
     def size(self) -> int:
+        if self._item_count is not None:
+            return self._item_count
+
         return len(self.current_page_items)
@@ -3,130 +3,97 @@
 # The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
 # See the LICENSE and NOTICES files in the project root for more information.
 
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 import logging
+from threading import BoundedSemaphore
+from time import sleep
 import urllib3
-import os
-from typing import Any, Callable, Dict, List, Tuple, TypeVar, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
 from timeit import default_timer
 from http import HTTPStatus
 
-from requests import Response, adapters
+from requests import Response, Session, adapters, post
 from requests.auth import HTTPBasicAuth
-from oauthlib.oauth2 import BackendApplicationClient
-from oauthlib.oauth2 import TokenExpiredError
-from requests_oauthlib import OAuth2Session  # type: ignore
 
 from edfi_paging_test.api.paginated_result import PaginatedResult
-from edfi_paging_test.api.api_info import APIInfo
+from edfi_paging_test.api.request_client_base import NEXT_PAGE_TOKEN, RequestClientBase
+from edfi_paging_test.api.request_timing import RequestTiming
+from edfi_paging_test.api.retry_policy import Attempt, CircuitBreaker, is_failure
+from edfi_paging_test.api.token_manager import Credentials, Token, TokenManager, parse_credentials, read_token
 from edfi_paging_test.helpers.argparser import MainArguments
 from edfi_paging_test.reporter.paging_request_logger import PaggingRequestLogger
 from edfi_paging_test.reporter.filtered_read_request_logger import FilteredReadRequestLogger
-from edfi_paging_test.helpers.api_metadata import get_base_api_response
-from urllib.parse import quote
-
-EDFI_DATA_MODEL_NAME = "ed-fi"
+from edfi_paging_test.reporter.partition_request_logger import PartitionRequestLogger
 
 T = TypeVar("T")
 
 logger = logging.getLogger(__name__)
 
 
-def timeit(callback: Callable[[], T]) -> Tuple[float, T]:
-    start = default_timer()
+def timeit(callback: Callable[[], T], start: Optional[float] = None) -> Tuple[float, T]:
+    """
+    Times the callback, from `start` when given, e.g. the time at which the
+    request was meant to be sent, or else from the call.
+    """
+    start = default_timer() if start is None else start
     response = callback()
     elapsed = default_timer() - start
 
     return (elapsed, response)
 
 
-class RequestClient:
+class RequestClient(RequestClientBase):
     """
     The RequestClient class wraps all the configuration complexity related
     to authentication and http requests
 
     Parameters
     ----------
-    api_key : str
-        The API client key for EdFi.
-    api_secret : str
-        The API client secret for EdFi.
-    api_base_url : [str]
-        The API base url.
+    args : MainArguments
+        The parsed command line arguments. `key` and `secret` may hold comma
+        separated lists, to spread the requests across several clients.
 
     Attributes
     ----------
-    oauth : OAuth2Session
-        The two-legged authenticated OAuth2 session.
+    session : Session
+        The pooled HTTP session.
+    tokens : TokenManager
+        The access tokens of the clients.
     """
 
     def __init__(self, args: MainArguments) -> None:
-        self.api_base_url = args.baseUrl
-        self.page_size = args.pageSize
-
-        self.auth = HTTPBasicAuth(args.key, args.secret)
-        client = BackendApplicationClient(client_id=args.key)
-        self.oauth = OAuth2Session(client=client)
-        self.api_info: Optional[APIInfo] = None
-        # configure connection pool
+        super().__init__(args)
+
+        self.tokens = TokenManager(parse_credentials(args.key, args.secret), self._fetch_token)
+        self.session = Session()
+        # configure connection pool, with room for every page in flight when
+        # fanning out over page offsets
         requests_adapter = adapters.HTTPAdapter(
-            pool_connections=args.connectionLimit, pool_maxsize=args.connectionLimit
+            pool_connections=args.connectionLimit, pool_maxsize=args.connectionLimit * args.page_fan_out
         )
-        self.oauth.mount("http://", requests_adapter)
-        self.oauth.mount("https://", requests_adapter)
-        self.verify_cert = not args.ignoreCertificateErrors
-        # Allow running with an unsecured server
-        if (args.ignoreCertificateErrors):
-            os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"
+        self.session.mount("http://", requests_adapter)
+        self.session.mount("https://", requests_adapter)
+        self._retry_slots = BoundedSemaphore(self.retry_policy.concurrency)
         # Supres insecure request warnings from the console
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-    def _build_url_for_resource(self, resource: str) -> str:
-        endpoint = resource
-        if "/" not in resource:
-            endpoint = EDFI_DATA_MODEL_NAME + "/" + resource
-
-        return self._urljoin(self._get_api_info().data_management_api_url, endpoint)
-
-    def _build_query_params_for_page(self, page_index, page_size: int) -> str:
-        page_offset = (page_index - 1) * page_size
-        return f"offset={page_offset}&limit={page_size}"
-
-    def _get_api_info(self) -> APIInfo:
-        """Send an HTTP GET request for the api root to fetch api metadata.
-
-        Returns
-        -------
-        APIInfo
-        """
-        if self.api_info is None:
-            response = get_base_api_response(self.api_base_url, self.verify_cert)
-            self.api_info = APIInfo(
-                version=response["version"],
-                datamodels=response["dataModels"],
-                urls=response["urls"],
-            )
-        return self.api_info
-
-    def _authorize(self) -> None:
-        logger.debug("Authenticating to the ODS/API")
-        self.oauth.fetch_token(
-            self._get_api_info().oauth_url, auth=self.auth,
-            verify=self.verify_cert
+    def _fetch_token(self, credentials: Credentials) -> Token:
+        logger.debug(f"Authenticating to the ODS/API with key {credentials.key}")
+        start = default_timer()
+        # Outside the session, so that refreshing in the background never
+        # takes a connection from the requests being measured
+        response = post(
+            self._get_api_info().oauth_url,
+            auth=HTTPBasicAuth(credentials.key, credentials.secret),
+            data={"grant_type": "client_credentials"},
+            verify=self.verify_cert,
         )
+        if response.status_code >= HTTPStatus.BAD_REQUEST:
+            raise RuntimeError(f"Authentication failed with status {response.status_code}")
 
-    def _urljoin(self, base_url: str, relative_url: str) -> str:
-        """
-        Combine base and relative URL, preventing double slashes.
+        return read_token(response.json(), start)
 
-        The native urljoin will strip off any endpoint on the base url. For
-        example, urljoin("http://a/b/", "/c") --> "http://a/c", whereas one
-        wants "http://a/b/c".
-        """
-        relative_url = relative_url[1:] if relative_url.startswith("/") else relative_url
-        base_url = base_url[:len(base_url)-1] if base_url.endswith("/") else base_url
-        return f"{base_url}/{relative_url}"
-
-    def _get(self, url: str) -> Response:
+    def _get(self, url: str, timing: RequestTiming) -> Response:
         """
         Send an HTTP GET request.
 
@@ -134,6 +101,9 @@ class RequestClient:
         ----------
         relative_url : str
             The resource endpoint that you want to request.
+        timing : RequestTiming
+            Receives the time to first byte, transfer time and size of the
+            response, and the time spent waiting for a token.
 
         Returns
         -------
@@ -149,25 +119,35 @@ class RequestClient:
             self.api_base_url, str
         ), "Property `api_base_url` should be of type `str`."
 
-        if not self.oauth.authorized:
-            self._authorize()
-
         if not url.startswith(self.api_base_url):
             url = self._urljoin(self.api_base_url, url)
 
-        response: Response
-
         def __get() -> Response:
-            return self.oauth.get(
+            token, auth_time = self.tokens.get_token()
+            timing.auth_time += auth_time
+            timing.token_refreshed = timing.auth_time > 0
+
+            start = default_timer()
+            # Streamed, so that the call returns as soon as the headers arrive
+            response = self.session.get(
                 url=url,
-                auth=self.oauth.auth,
+                headers={"Authorization": f"Bearer {token}"},
                 verify=self.verify_cert,
+                stream=True,
             )
+            headers_received = default_timer()
 
-        try:
-            response = __get()
-        except TokenExpiredError:
-            self._authorize()
+            # Reading the content downloads the body and releases the connection
+            timing.response_bytes = len(response.content)
+            timing.time_to_first_byte = headers_received - start
+            timing.transfer_time = default_timer() - headers_received
+
+            if response.status_code == HTTPStatus.UNAUTHORIZED:
+                self.tokens.invalidate(token)
+            return response
+
+        response = __get()
+        if response.status_code == HTTPStatus.UNAUTHORIZED:
             response = __get()
             # If that fails after authorization, then let it go
 
@@ -179,6 +159,76 @@ class RequestClient:
 
         return response
 
+    def _timed_get(
+        self, url: str, timing: RequestTiming, scheduled_at: Optional[float] = None
+    ) -> Tuple[float, Response]:
+        """
+        Sends the request, timed with `timeit` less the time spent waiting for
+        an access token, which is reported apart as the request's auth time.
+        """
+        elapsed, response = timeit(lambda: self._get(url, timing), scheduled_at)
+
+        return (elapsed - timing.auth_time, response)
+
+    def _wait_for_breaker(self, breaker: Optional[CircuitBreaker]) -> None:
+        while breaker is not None:
+            delay = breaker.get_delay()
+            if delay == 0:
+                return
+            sleep(delay)
+
+    def _get_with_retries(self, url: str, resource: str, scheduled_at: Optional[float] = None) -> List[Attempt]:
+        """
+        Sends the request, and sends it again as long as the retry policy
+        allows, while the circuit breaker of the resource is closed. The first
+        attempt is timed from `scheduled_at` when given, see `get_page`.
+
+        Returns
+        -------
+        List[Attempt]
+            Every attempt, the final one last
+        """
+        breaker = self._get_breaker(resource)
+        attempts: List[Attempt] = []
+        backoff = 0.0
+        while True:
+            wait_start = default_timer()
+            sleep(backoff)
+            self._wait_for_breaker(breaker)
+
+            timing = RequestTiming()
+            try:
+                if len(attempts) == 0:
+                    backoff_time = default_timer() - wait_start
+                    # The wait on the breaker is the backoff time, and not
+                    # part of the elapsed time, even of a scheduled request
+                    start = scheduled_at + backoff_time if scheduled_at is not None else None
+                    with self._track_in_flight(resource):
+                        elapsed, response = self._timed_get(url, timing, start)
+                else:
+                    with self._retry_slots:
+                        backoff_time = default_timer() - wait_start
+                        with self._track_in_flight(resource):
+                            elapsed, response = self._timed_get(url, timing)
+            except Exception:
+                # A request that raises, e.g. on a connection error, failed too;
+                # were it the breaker's probe, the breaker would stay half open
+                if breaker is not None:
+                    breaker.record(True)
+                raise
+
+            if breaker is not None:
+                breaker.record(is_failure(response.status_code))
+
+            number = len(attempts) + 1
+            retry = self.retry_policy.should_retry(response.status_code, number)
+            attempts.append(Attempt(number, elapsed, response, timing, backoff_time, final=not retry))
+            if not retry:
+                return attempts
+
+            backoff = self.retry_policy.get_backoff(number, response.headers.get("Retry-After"))
+            logger.debug(f"Retrying {url} in {backoff:.3f} seconds.")
+
     def get_total(self, resource: str) -> int:
         """
         Get total resource count by sending an HTTP GET request.
@@ -205,10 +255,12 @@ class RequestClient:
 
         logger.debug(f"GET {total_count_url}")
 
-        response = self._get(total_count_url)
+        response = self._get_with_retries(total_count_url, resource)[-1].response
 
         total_count = "total-count"
         if total_count in response.headers:
+            if self.live_metrics is not None:
+                self.live_metrics.add_expected_records(resource, int(response.headers[total_count]))
             return int(response.headers[total_count])
 
         logger.warning(
@@ -216,9 +268,19 @@ class RequestClient:
         )
         return 0
 
-    def get_page(self, resource: str, pagingRequestLogger: PaggingRequestLogger, page: int = 1) -> PaginatedResult:
+    def get_page(
+        self, resource: str, pagingRequestLogger: PaggingRequestLogger, page: int = 1, scheduled_at: Optional[float] = None
+    ) -> PaginatedResult:
         """Send an HTTP GET request for the next page.
 
+        Parameters
+        ----------
+        scheduled_at : Optional[float]
+            `default_timer` time at which the request was meant to be sent.
+            When given, the elapsed time is measured from then rather than
+            from when the request is actually sent, so that time spent
+            waiting for a free thread or connection is included.
+
         Returns
         -------
         PaginatedResult
@@ -230,20 +292,30 @@ class RequestClient:
         )
 
         logger.debug(f"GET {next_url}")
-        elapsed, response = timeit(lambda: self._get(next_url))
-
-        items = response.json() if len(
-            response.text) > 0 and response.status_code == HTTPStatus.OK else []
-
-        pagingRequestLogger.log_request(
-            resource,
-            next_url,
-            page,
-            self.page_size,
-            len(items),
-            elapsed,
-            response.status_code,
-        )
+        attempts = self._get_with_retries(next_url, resource, scheduled_at)
+        response = attempts[-1].response
+
+        items, count = self._read_items(response, attempts[-1].timing, self.count_only)
+
+        for attempt in attempts:
+            pagingRequestLogger.log_request(
+                resource,
+                next_url,
+                page,
+                self.page_size,
+                count if attempt.final else 0,
+                attempt.elapsed,
+                attempt.response.status_code,
+                attempt.timing.time_to_first_byte,
+                attempt.timing.transfer_time,
+                attempt.timing.response_bytes,
+                attempt.timing.decode_time,
+                attempt.timing.token_refreshed,
+                attempt.timing.auth_time,
+                attempt.number,
+                attempt.backoff_time,
+                attempt.final,
+            )
 
         return PaginatedResult(
             resource_name=resource,
@@ -251,40 +323,239 @@ class RequestClient:
             page_size=self.page_size,
             api_response=items,
             status_code=response.status_code,
+            item_count=count,
         )
 
-    def get_all(self, resource: str, pagingRequestLogger: PaggingRequestLogger) -> List[Dict[str, Any]]:
+    def iter_pages(self, resource: str, pagingRequestLogger: PaggingRequestLogger) -> Iterator[PaginatedResult]:
         """
-        Send an HTTP GET request for all pages of a resource.
+        Send HTTP GET requests for all pages of a resource, one after another,
+        yielding each page as soon as it arrives. Paging stops at the first page
+        shorter than the page size.
+
+        Returns
+        -------
+        Iterator[PaginatedResult]
+            The pages of the resource, in page order
+        """
+
+        logger.info(f"Retrieving all {resource} records...")
+
+        page = 0
+        while True:
+            page += 1
+            pagination_result = self.get_page(resource, pagingRequestLogger, page)
+            yield pagination_result
+
+            # The second page is always requested, even after a short first page
+            if page > 1 and pagination_result.size < self.page_size:
+                break
+
+    def iter_pages_parallel(
+        self, resource: str, pagingRequestLogger: PaggingRequestLogger, total_count: int, window: int
+    ) -> Iterator[PaginatedResult]:
+        """
+        Send HTTP GET requests for all pages of a resource, keeping up to
+        `window` page requests in flight at once. Page offsets are derived from
+        the total count. Pages are yielded in page order; at most `window` pages
+        are held back waiting for an earlier page.
+
+        As with `iter_pages`, the first page shorter than the page size marks
+        the end of the resource: no later pages are requested, and later pages
+        that were already in flight are discarded. If every expected page is
+        full, e.g. because records were added after counting, the remaining
+        pages are read sequentially.
 
         Parameters
         ----------
-        page_size : int
-            Number of items per page
+        total_count : int
+            Total resource count, as returned by `get_total`
+        window : int
+            Maximum number of page requests in flight for this resource
 
         Returns
         -------
-        list
-            A list of all parsed results
+        Iterator[PaginatedResult]
+            The pages of the resource, in page order
         """
 
-        logger.info(f"Retrieving all {resource} records...")
+        logger.info(f"Retrieving all {resource} records, {window} pages at a time...")
+
+        expected_pages = self._get_page_count(total_count)
+        completed: Dict[int, PaginatedResult] = {}
+        short_page_seen = False
+        next_page_to_request = 1
+        next_page_to_yield = 1
 
-        pagination_result = self.get_page(resource, pagingRequestLogger, 1)
-        page_items = pagination_result.current_page_items
-        # Assign to empty list if result is not a list, e.g. an error response from the API
-        items: List[Any] = page_items if (isinstance(page_items, list)) else []
+        with ThreadPoolExecutor(max_workers=window) as executor:
+            in_flight: Dict[Future, int] = {}
 
+            while True:
+                while len(in_flight) < window and next_page_to_request <= expected_pages and not short_page_seen:
+                    future = executor.submit(self.get_page, resource, pagingRequestLogger, next_page_to_request)
+                    in_flight[future] = next_page_to_request
+                    next_page_to_request += 1
+
+                if len(in_flight) == 0:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page = in_flight.pop(future)
+                    completed[page] = future.result()
+                    short_page_seen = short_page_seen or completed[page].size < self.page_size
+
+                while next_page_to_yield in completed:
+                    pagination_result = completed.pop(next_page_to_yield)
+                    next_page_to_yield += 1
+                    yield pagination_result
+
+                    if pagination_result.size < self.page_size:
+                        return
+
+        page = expected_pages
         while True:
-            pagination_result = self.get_page(
-                resource, pagingRequestLogger, pagination_result.current_page + 1
+            page += 1
+            pagination_result = self.get_page(resource, pagingRequestLogger, page)
+            yield pagination_result
+
+            if pagination_result.size < self.page_size:
+                return
+
+    def get_partition_page_tokens(self, resource: str, number: int) -> List[str]:
+        """
+        Ask the API to split a resource into `number` partitions of roughly
+        equal size, by sending an HTTP GET request to its partitions endpoint.
+
+        Returns
+        -------
+        list
+            One page token per partition; empty when the resource cannot be
+            partitioned. The API may return fewer partitions than requested.
+        """
+        url = self._build_url_for_partitions(resource, number)
+
+        logger.debug(f"GET {url}")
+        response = self._get_with_retries(url, resource)[-1].response
+
+        body = response.json() if len(response.text) > 0 and response.status_code == HTTPStatus.OK else None
+        return self._get_partition_page_tokens(resource, response.status_code, body)
+
+    def get_partition_page(
+        self,
+        resource: str,
+        partitionRequestLogger: PartitionRequestLogger,
+        partition: int,
+        page: int,
+        page_token: str,
+    ) -> Tuple[PaginatedResult, Optional[str]]:
+        """Send an HTTP GET request for one page of a partition.
+
+        Returns
+        -------
+        Tuple[PaginatedResult, Optional[str]]
+            The page, and the token of the next page in the partition if any
+        """
+
+        url = self._build_url_for_partition_page(resource, page_token)
+
+        logger.debug(f"GET {url}")
+        attempts = self._get_with_retries(url, resource)
+        response = attempts[-1].response
+
+        items, count = self._read_items(response, attempts[-1].timing, self.count_only)
+
+        for attempt in attempts:
+            partitionRequestLogger.log_request(
+                resource,
+                url,
+                partition,
+                page,
+                self.page_size,
+                count if attempt.final else 0,
+                attempt.elapsed,
+                attempt.response.status_code,
+                attempt.timing.time_to_first_byte,
+                attempt.timing.transfer_time,
+                attempt.timing.response_bytes,
+                attempt.timing.decode_time,
+                attempt.timing.token_refreshed,
+                attempt.timing.auth_time,
+                attempt.number,
+                attempt.backoff_time,
+                attempt.final,
             )
-            items.extend(pagination_result.current_page_items)
+
+        return (
+            PaginatedResult(
+                resource_name=resource,
+                current_page=page,
+                page_size=self.page_size,
+                api_response=items,
+                status_code=response.status_code,
+                item_count=count,
+            ),
+            response.headers.get(NEXT_PAGE_TOKEN),
+        )
+
+    def iter_partition_pages(
+        self, resource: str, partitionRequestLogger: PartitionRequestLogger, partition: int, page_token: str
+    ) -> Iterator[PaginatedResult]:
+        """
+        Send HTTP GET requests for all pages of one partition, one after
+        another, following the next page token returned with each page.
+        Paging stops when no next page token is returned, or at the first page
+        shorter than the page size.
+
+        Parameters
+        ----------
+        partition : int
+            Index of the partition, used for reporting only
+        page_token : str
+            Token of the first page of the partition, as returned by
+            `get_partition_page_tokens`
+
+        Returns
+        -------
+        Iterator[PaginatedResult]
+            The pages of the partition, in page order
+        """
+
+        page = 0
+        next_page_token: Optional[str] = page_token
+        while next_page_token is not None:
+            page += 1
+            pagination_result, next_page_token = self.get_partition_page(
+                resource, partitionRequestLogger, partition, page, next_page_token
+            )
+            yield pagination_result
 
             if pagination_result.size < self.page_size:
                 break
 
-        return items
+    def get_all(self, resource: str, pagingRequestLogger: PaggingRequestLogger) -> List[Dict[str, Any]]:
+        """
+        Send an HTTP GET request for all pages of a resource.
+
+        Returns
+        -------
+        list
+            A list of all parsed results
+        """
+        return self._join_pages(self.iter_pages(resource, pagingRequestLogger))
+
+    def get_all_parallel(
+        self, resource: str, pagingRequestLogger: PaggingRequestLogger, total_count: int, window: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Send HTTP GET requests for all pages of a resource, with up to `window`
+        pages in flight. See `iter_pages_parallel`.
+
+        Returns
+        -------
+        list
+            A list of all parsed results, in page order
+        """
+        return self._join_pages(self.iter_pages_parallel(resource, pagingRequestLogger, total_count, window))
 
     def filtered_get(self, resource_name: str, filters: Dict[str, str], limit: int, filteredReadRequestLogger: FilteredReadRequestLogger) -> List[Dict[str, Any]]:
         """
@@ -299,19 +570,28 @@ class RequestClient:
             List containing the matching resource entries
         """
 
-        query_string = '&'.join([f"{key}={quote(str(value))}" for key, value in filters.items()])
-        url = f"{self._build_url_for_resource(resource_name)}?limit={limit}&{query_string}"
-
-        elapsed, response = timeit(lambda: self._get(url))
-
-        items = response.json() if len(response.text) > 0 and response.status_code == HTTPStatus.OK else []
-
-        filteredReadRequestLogger.log_request(
-            resource_name,
-            url,
-            len(filters),
-            elapsed,
-            response.status_code,
-        )
+        url = self._build_url_for_filters(resource_name, filters, limit)
+
+        attempts = self._get_with_retries(url, resource_name)
+
+        items, _ = self._read_items(attempts[-1].response, attempts[-1].timing)
+
+        for attempt in attempts:
+            filteredReadRequestLogger.log_request(
+                resource_name,
+                url,
+                len(filters),
+                attempt.elapsed,
+                attempt.response.status_code,
+                attempt.timing.time_to_first_byte,
+                attempt.timing.transfer_time,
+                attempt.timing.response_bytes,
+                attempt.timing.decode_time,
+                attempt.timing.token_refreshed,
+                attempt.timing.auth_time,
+                attempt.number,
+                attempt.backoff_time,
+                attempt.final,
+            )
 
         return items
@@ -0,0 +1,195 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from contextlib import contextmanager
+from http import HTTPStatus
+import logging
+from math import ceil
+from timeit import default_timer
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from edfi_paging_test.api.api_info import APIInfo
+from edfi_paging_test.api.item_counter import count_items
+from edfi_paging_test.api.paginated_result import PaginatedResult
+from edfi_paging_test.api.request_timing import RequestTiming
+from edfi_paging_test.api.retry_policy import CircuitBreaker, RetryPolicy
+from edfi_paging_test.helpers.api_metadata import get_base_api_response
+from edfi_paging_test.helpers.json_decoder import get_json_loads
+from edfi_paging_test.helpers.main_arguments import MainArguments
+from edfi_paging_test.reporter.live_metrics import LiveMetrics
+
+EDFI_DATA_MODEL_NAME = "ed-fi"
+PAGE_TOKENS = "pageTokens"
+NEXT_PAGE_TOKEN = "next-page-token"
+
+logger = logging.getLogger(__name__)
+
+
+class RequestClientBase:
+    """
+    Configuration and URL building shared by the threaded and the asyncio
+    request clients. Subclasses provide the actual HTTP transport.
+
+    Parameters
+    ----------
+    args : MainArguments
+        The parsed command line arguments.
+    """
+
+    def __init__(self, args: MainArguments) -> None:
+        self.api_base_url = args.baseUrl
+        self.page_size = args.pageSize
+        self.verify_cert = not args.ignoreCertificateErrors
+        self.api_info: Optional[APIInfo] = None
+        self.json_loads = get_json_loads(args.json_decoder)
+        # When set, pages are only counted, straight from the bytes of the
+        # response, and come back without items
+        self.count_only = False
+        self.retry_policy = RetryPolicy.from_arguments(args)
+        self.breaker_threshold = args.breaker_threshold
+        self.breaker_cooldown = args.breaker_cooldown
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        # When set, requests are counted in the live metrics while in flight,
+        # and total counts as the records expected
+        self.live_metrics: Optional[LiveMetrics] = None
+
+    def _build_url_for_resource(self, resource: str) -> str:
+        endpoint = resource
+        if "/" not in resource:
+            endpoint = EDFI_DATA_MODEL_NAME + "/" + resource
+
+        return self._urljoin(self._get_api_info().data_management_api_url, endpoint)
+
+    def _build_query_params_for_page(self, page_index, page_size: int) -> str:
+        page_offset = (page_index - 1) * page_size
+        return f"offset={page_offset}&limit={page_size}"
+
+    def _get_page_count(self, total_count: int) -> int:
+        """
+        Number of pages expected for the given total count. Always at least
+        one, so that an empty resource is still requested once.
+        """
+        return max(1, ceil(total_count / self.page_size))
+
+    def _join_pages(self, pages: Iterable[PaginatedResult]) -> List[Dict[str, Any]]:
+        """
+        Concatenates the items of the given pages.
+        """
+        items: List[Dict[str, Any]] = []
+        for page in pages:
+            # Skip results that are not a list, e.g. an error response from the API
+            if isinstance(page.current_page_items, list):
+                items.extend(page.current_page_items)
+
+        return items
+
+    def _read_items(self, response: Any, timing: RequestTiming, count_only: bool = False) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Reads the items of a successful response, recording the time spent
+        in `timing`. Other responses have no items.
+
+        Parameters
+        ----------
+        count_only : bool
+            Count the items without decoding them, when the response is a
+            JSON array; the items then come back empty.
+
+        Returns
+        -------
+        Tuple[List[Dict[str, Any]], int]
+            The items, and their number
+        """
+        start = default_timer()
+        items: List[Dict[str, Any]] = []
+        count: Optional[int] = None
+        if len(response.content) > 0 and response.status_code == HTTPStatus.OK:
+            count = count_items(response.content) if count_only else None
+            if count is None:
+                items = self.json_loads(response.content)
+        timing.decode_time = default_timer() - start
+
+        return (items, count if count is not None else len(items))
+
+    def _get_breaker(self, resource: str) -> Optional[CircuitBreaker]:
+        """
+        The circuit breaker of a resource, or None when requests are never
+        paused.
+        """
+        if self.breaker_threshold == 0:
+            return None
+
+        breaker = self._breakers.get(resource)
+        if breaker is None:
+            # setdefault is atomic, so that threads racing here share a breaker
+            breaker = self._breakers.setdefault(
+                resource, CircuitBreaker(resource, self.breaker_threshold, self.breaker_cooldown)
+            )
+        return breaker
+
+    @contextmanager
+    def _track_in_flight(self, resource: str) -> Iterator[None]:
+        """
+        Counts a request of the resource as in flight in the live metrics, if
+        any, while it is being sent.
+        """
+        if self.live_metrics is None:
+            yield
+            return
+
+        self.live_metrics.request_started(resource)
+        try:
+            yield
+        finally:
+            self.live_metrics.request_finished(resource)
+
+    def _build_url_for_filters(self, resource: str, filters: Dict[str, str], limit: int) -> str:
+        query_string = '&'.join([f"{key}={quote(str(value))}" for key, value in filters.items()])
+        return f"{self._build_url_for_resource(resource)}?limit={limit}&{query_string}"
+
+    def _build_url_for_partitions(self, resource: str, number: int) -> str:
+        return f"{self._build_url_for_resource(resource)}/partitions?number={number}"
+
+    def _build_url_for_partition_page(self, resource: str, page_token: str) -> str:
+        return f"{self._build_url_for_resource(resource)}?pageToken={quote(page_token)}&pageSize={self.page_size}"
+
+    def _get_partition_page_tokens(self, resource: str, status_code: int, body: Any) -> List[str]:
+        """
+        Reads the page tokens out of a partitions response. Returns an empty
+        list, after logging a warning, when the resource cannot be partitioned.
+        """
+        if status_code == HTTPStatus.OK and isinstance(body, dict) and isinstance(body.get(PAGE_TOKENS), list):
+            return [str(token) for token in body[PAGE_TOKENS]]
+
+        logger.warning(f"Unable to read the partitions of {resource}; the resource will be skipped.")
+        return []
+
+    def _get_api_info(self) -> APIInfo:
+        """Send an HTTP GET request for the api root to fetch api metadata.
+
+        Returns
+        -------
+        APIInfo
+        """
+        if self.api_info is None:
+            response = get_base_api_response(self.api_base_url, self.verify_cert)
+            self.api_info = APIInfo(
+                version=response["version"],
+                datamodels=response["dataModels"],
+                urls=response["urls"],
+            )
+        return self.api_info
+
+    def _urljoin(self, base_url: str, relative_url: str) -> str:
+        """
+        Combine base and relative URL, preventing double slashes.
+
+        The native urljoin will strip off any endpoint on the base url. For
+        example, urljoin("http://a/b/", "/c") --> "http://a/c", whereas one
+        wants "http://a/b/c".
+        """
+        relative_url = relative_url[1:] if relative_url.startswith("/") else relative_url
+        base_url = base_url[:len(base_url)-1] if base_url.endswith("/") else base_url
+        return f"{base_url}/{relative_url}"
@@ -0,0 +1,37 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from dataclasses import dataclass
+
+
+@dataclass
+class RequestTiming:
+    """
+    Where the time of one request went, filled in by the request clients as
+    the request progresses. Times are in seconds.
+
+    Attributes
+    ----------
+    time_to_first_byte : float
+        From sending the request to receiving the response headers: connection
+        setup, the network round trip and the server's own time.
+    transfer_time : float
+        Downloading the response body, after the headers.
+    response_bytes : int
+        Size of the response body.
+    decode_time : float
+        Parsing the response body as JSON.
+    token_refreshed : bool
+        Whether the request had to wait for the client to authenticate first.
+    auth_time : float
+        Waiting for an access token, left out of the request's elapsed time.
+    """
+
+    time_to_first_byte: float = 0.0
+    transfer_time: float = 0.0
+    response_bytes: int = 0
+    decode_time: float = 0.0
+    token_refreshed: bool = False
+    auth_time: float = 0.0
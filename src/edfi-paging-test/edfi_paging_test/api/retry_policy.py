@@ -0,0 +1,155 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from dataclasses import dataclass
+from http import HTTPStatus
+import logging
+from math import ceil
+import random
+import threading
+from timeit import default_timer
+from typing import Any, Optional
+
+from edfi_paging_test.api.request_timing import RequestTiming
+from edfi_paging_test.helpers.main_arguments import MainArguments
+
+# Responses of an overloaded API, worth sending the request again for
+RETRY_STATUSES = {
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+}
+
+# Longest wait before a retry, whatever the backoff or Retry-After header
+MAX_BACKOFF = 30.0
+
+logger = logging.getLogger(__name__)
+
+
+def is_failure(status_code: int) -> bool:
+    return status_code in RETRY_STATUSES
+
+
+@dataclass
+class Attempt:
+    """
+    One attempt at a request. `backoff_time` is the time waited before it,
+    on the backoff, the circuit breaker and the retry concurrency cap; it is
+    not part of `elapsed`. The final attempt is the one whose response the
+    request returns.
+    """
+
+    number: int
+    elapsed: float
+    response: Any
+    timing: RequestTiming
+    backoff_time: float = 0.0
+    final: bool = True
+
+
+@dataclass
+class RetryPolicy:
+    """
+    When and after how long to send a request again. Only responses of an
+    overloaded API, see `RETRY_STATUSES`, are retried, up to `max_retries`
+    times, after a random wait of up to `backoff` seconds doubled on every
+    retry ("full jitter"), or as long as the response's Retry-After header
+    asks for.
+    """
+
+    max_retries: int = 0
+    backoff: float = 0.5
+    # Retries in flight at once, across every resource
+    concurrency: int = 1
+
+    @staticmethod
+    def from_arguments(args: MainArguments) -> "RetryPolicy":
+        return RetryPolicy(
+            args.max_retries,
+            args.retry_backoff,
+            # By default, no more than half the connections are given to retries
+            args.retry_concurrency or max(1, ceil(args.connectionLimit / 2)),
+        )
+
+    def should_retry(self, status_code: int, attempt: int) -> bool:
+        return is_failure(status_code) and attempt <= self.max_retries
+
+    def get_backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Seconds to wait before retrying after the given attempt failed.
+        """
+        if retry_after is not None and retry_after.strip().isdigit():
+            return min(MAX_BACKOFF, float(retry_after))
+
+        return random.uniform(0, min(MAX_BACKOFF, self.backoff * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    Pauses the requests of one resource after `threshold` failed attempts in
+    a row, so that an overloaded API is given time to recover rather than
+    being sent requests bound to fail. Once `cooldown` seconds have passed,
+    one request at a time is let through; the first to succeed resumes the
+    others, and another failure pauses them again.
+
+    Safe to use from any number of threads, and from an event loop, as the
+    lock is never held while waiting.
+    """
+
+    def __init__(self, name: str, threshold: int, cooldown: float) -> None:
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.times_opened = 0
+        self._failures = 0
+        self._open_until = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._failures >= self.threshold
+
+    def get_delay(self) -> float:
+        """
+        Seconds to wait before asking again, or 0 to send the request now.
+        """
+        with self._lock:
+            if not self.is_open:
+                return 0.0
+
+            now = default_timer()
+            if now < self._open_until:
+                return self._open_until - now
+            if self._probing:
+                # Check back often for the outcome of the request let through
+                return self.cooldown / 10
+
+            self._probing = True
+            return 0.0
+
+    def record(self, failed: bool) -> None:
+        with self._lock:
+            if not failed:
+                if self.is_open:
+                    logger.info(f"Resuming the requests of {self.name}.")
+                self._failures = 0
+                self._probing = False
+                return
+
+            was_open = self.is_open
+            self._failures += 1
+            # Requests sent before the breaker opened may still fail while it
+            # is open; only a failed probe pauses the requests again
+            if self.is_open and (not was_open or self._probing):
+                self._open_until = default_timer() + self.cooldown
+                self._probing = False
+                if not was_open:
+                    self.times_opened += 1
+                    logger.warning(
+                        f"Pausing the requests of {self.name} for {self.cooldown} seconds "
+                        f"after {self._failures} failed requests in a row."
+                    )
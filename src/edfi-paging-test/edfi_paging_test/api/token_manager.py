@@ -0,0 +1,304 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import asyncio
+from dataclasses import dataclass
+from itertools import count
+import logging
+from math import inf
+import threading
+from timeit import default_timer
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Share of a token's lifetime left when it is refreshed in the background
+REFRESH_MARGIN = 0.1
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Credentials:
+    key: str
+    secret: str
+
+
+@dataclass
+class Token:
+    """
+    An access token, with the `default_timer` times at which it is due for
+    a refresh and at which it expires.
+    """
+
+    access_token: str
+    refresh_at: float
+    expires_at: float
+
+
+def parse_credentials(keys: str, secrets: str) -> List[Credentials]:
+    """
+    Pairs up comma separated keys and secrets.
+
+    Raises
+    -------
+    ValueError
+        If there are not as many keys as secrets
+    """
+    key_list = [key.strip() for key in keys.split(",")]
+    secret_list = [secret.strip() for secret in secrets.split(",")]
+    if len(key_list) != len(secret_list):
+        raise ValueError(f"There are {len(key_list)} keys but {len(secret_list)} secrets.")
+
+    return [Credentials(key, secret) for key, secret in zip(key_list, secret_list)]
+
+
+def read_token(body: Dict[str, Any], requested_at: float) -> Token:
+    """
+    Reads the token out of an OAuth token response. Its lifetime counts from
+    when it was requested, to be on the safe side; a token without an
+    `expires_in` is only replaced once the API rejects it.
+
+    Raises
+    -------
+    KeyError
+        If the response holds no access token
+    """
+    lifetime = float(body["expires_in"]) if body.get("expires_in") else inf
+
+    return Token(
+        access_token=body["access_token"],
+        refresh_at=requested_at + lifetime * (1 - REFRESH_MARGIN),
+        expires_at=requested_at + lifetime,
+    )
+
+
+class _Slot:
+    """
+    The token of one set of credentials, and whether a request for a new one
+    is in flight.
+    """
+
+    def __init__(self, credentials: Credentials) -> None:
+        self.credentials = credentials
+        self.token: Optional[Token] = None
+        self.refreshing = False
+        # Keeps a background refresh task alive while it runs
+        self.task: Optional[asyncio.Future] = None
+
+
+class TokenManagerBase:
+    """
+    Access tokens for the requests of a request client, one per set of
+    credentials, handed out in turn so that the requests are spread across
+    the credentials.
+
+    A token is refreshed when `REFRESH_MARGIN` of its lifetime is left: the
+    first request to find it so starts the refresh in the background, and it
+    and the requests after it carry on with the current token. Only a request
+    finding no valid token, e.g. the first request or one after the API
+    rejected the token, waits; and however many requests wait, one token
+    request per set of credentials is sent at a time.
+
+    Subclasses provide the waiting and the token requests, for threads or
+    for asyncio.
+    """
+
+    def __init__(self, credentials: List[Credentials]) -> None:
+        self._slots = [_Slot(c) for c in credentials]
+        self._turns = count()
+        self.tokens_fetched = 0
+        self.fetch_seconds = 0.0
+
+    def _next_slot(self) -> _Slot:
+        return self._slots[next(self._turns) % len(self._slots)]
+
+    def _get_valid_token(self, slot: _Slot) -> Tuple[Optional[str], bool]:
+        """
+        The slot's token, if it has not expired, and whether a refresh in the
+        background is due.
+        """
+        now = default_timer()
+        if slot.token is None or now >= slot.token.expires_at:
+            return (None, False)
+
+        refresh_due = now >= slot.token.refresh_at and not slot.refreshing
+        if refresh_due:
+            slot.refreshing = True
+
+        return (slot.token.access_token, refresh_due)
+
+    def _store(self, slot: _Slot, token: Optional[Token], seconds: float) -> None:
+        slot.refreshing = False
+        if token is not None:
+            slot.token = token
+            self.tokens_fetched += 1
+            self.fetch_seconds += seconds
+            logger.debug(f"Fetched a token for key {slot.credentials.key} in {seconds:.3f} seconds.")
+        elif slot.token is not None:
+            # A failed background refresh is not retried until the token expires
+            slot.token.refresh_at = slot.token.expires_at
+
+    def _invalidate(self, access_token: str) -> None:
+        for slot in self._slots:
+            if slot.token is not None and slot.token.access_token == access_token:
+                slot.token = None
+
+
+class TokenManager(TokenManagerBase):
+    """
+    Thread-safe `TokenManagerBase` for `RequestClient`, whose requests are
+    sent from a pool of threads.
+
+    Parameters
+    ----------
+    credentials : List[Credentials]
+        The keys and secrets to request tokens with.
+    fetch_token : Callable[[Credentials], Token]
+        Requests a token from the API.
+    """
+
+    def __init__(self, credentials: List[Credentials], fetch_token: Callable[[Credentials], Token]) -> None:
+        super().__init__(credentials)
+        self.fetch_token = fetch_token
+        self._condition = threading.Condition()
+
+    def _refresh(self, slot: _Slot, background: bool) -> Optional[Token]:
+        start = default_timer()
+        token: Optional[Token] = None
+        try:
+            token = self.fetch_token(slot.credentials)
+        except Exception as err:
+            if not background:
+                raise
+            logger.warning(f"Unable to refresh the token ahead of its expiry: {err}")
+        finally:
+            with self._condition:
+                self._store(slot, token, default_timer() - start)
+                self._condition.notify_all()
+
+        return token
+
+    def get_token(self) -> Tuple[str, float]:
+        """
+        Returns
+        -------
+        Tuple[str, float]
+            An access token, and the seconds spent waiting for it; 0 when a
+            valid token was at hand
+        """
+        start = default_timer()
+        waited = False
+        with self._condition:
+            slot = self._next_slot()
+            while True:
+                access_token, refresh_due = self._get_valid_token(slot)
+                if access_token is not None or not slot.refreshing:
+                    break
+                self._condition.wait()
+                waited = True
+
+            if access_token is None:
+                slot.refreshing = True
+
+        if refresh_due:
+            threading.Thread(target=self._refresh, args=(slot, True), name="token-refresh", daemon=True).start()
+
+        if access_token is None:
+            # This request fetches the token the others are waiting for
+            token = self._refresh(slot, False)
+            assert token is not None
+            return (token.access_token, default_timer() - start)
+
+        return (access_token, default_timer() - start if waited else 0.0)
+
+    def invalidate(self, access_token: str) -> None:
+        """
+        Drops a token the API rejected, so that the next request for it
+        waits for a new one.
+        """
+        with self._condition:
+            self._invalidate(access_token)
+
+
+class AsyncTokenManager(TokenManagerBase):
+    """
+    `TokenManagerBase` for `AsyncRequestClient`, whose requests are sent
+    from one event loop.
+
+    Parameters
+    ----------
+    credentials : List[Credentials]
+        The keys and secrets to request tokens with.
+    fetch_token : Callable[[Credentials], Awaitable[Token]]
+        Requests a token from the API.
+    """
+
+    def __init__(self, credentials: List[Credentials], fetch_token: Callable[[Credentials], Awaitable[Token]]) -> None:
+        super().__init__(credentials)
+        self.fetch_token = fetch_token
+        # Created on first use, as it must belong to the running event loop
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def _refresh(self, slot: _Slot, background: bool) -> Optional[Token]:
+        start = default_timer()
+        token: Optional[Token] = None
+        try:
+            token = await self.fetch_token(slot.credentials)
+        except Exception as err:
+            if not background:
+                raise
+            logger.warning(f"Unable to refresh the token ahead of its expiry: {err}")
+        finally:
+            condition = self._get_condition()
+            async with condition:
+                self._store(slot, token, default_timer() - start)
+                condition.notify_all()
+
+        return token
+
+    async def get_token(self) -> Tuple[str, float]:
+        """
+        Returns
+        -------
+        Tuple[str, float]
+            An access token, and the seconds spent waiting for it; 0 when a
+            valid token was at hand
+        """
+        start = default_timer()
+        waited = False
+        condition = self._get_condition()
+        async with condition:
+            slot = self._next_slot()
+            while True:
+                access_token, refresh_due = self._get_valid_token(slot)
+                if access_token is not None or not slot.refreshing:
+                    break
+                await condition.wait()
+                waited = True
+
+            if access_token is None:
+                slot.refreshing = True
+
+        if refresh_due:
+            slot.task = asyncio.ensure_future(self._refresh(slot, True))
+
+        if access_token is None:
+            # This request fetches the token the others are waiting for
+            token = await self._refresh(slot, False)
+            assert token is not None
+            return (token.access_token, default_timer() - start)
+
+        return (access_token, default_timer() - start if waited else 0.0)
+
+    def invalidate(self, access_token: str) -> None:
+        """
+        Drops a token the API rejected, so that the next request for it
+        waits for a new one.
+        """
+        self._invalidate(access_token)
@@ -7,7 +7,10 @@ import logging
 import requests
 import urllib3
 from functools import cache
-from typing import Any, List, Dict
+from http import HTTPStatus
+from typing import Any, Iterable, List, Dict, Optional
+
+from edfi_paging_test.helpers.metadata_cache import CachedMetadata, MetadataCache
 
 # Supres insecure request warnings from the console
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -81,17 +84,93 @@ def get_resource_metadata_response(api_base_url: str, verify_cert: bool = True)
         The resource metadata response from the server
     """
     logger.debug("Getting resource metadata from the api.")
+    return requests.get(
+        _get_resource_metadata_url(api_base_url, verify_cert),
+        verify=verify_cert
+    ).json()
+
+
+def _get_resource_metadata_url(api_base_url: str, verify_cert: bool = True) -> str:
     openapi_metadata: List[Dict[str, str]] = get_openapi_metadata_response(api_base_url, verify_cert)
     resource_metadata: Dict[str, str] = next(
         filter(lambda x: x["name"] == "Resources", openapi_metadata)
     )
-    return requests.get(
-        resource_metadata["endpointUri"],
-        verify=verify_cert
-    ).json()
+    return resource_metadata["endpointUri"]
+
+
+def _get_resource_metadata(url: str, headers: Dict[str, str], verify_cert: bool) -> requests.Response:
+    try:
+        return requests.get(url, headers=headers, verify=verify_cert)
+    except requests.exceptions.RequestException as e:
+        raise RuntimeError(f"Error: {e}.") from e
 
 
-def get_filters_by_resource_name(api_base_url: str, verify_cert: bool = True) -> Dict[str, List[str]]:
+@cache
+def get_cached_metadata(api_base_url: str, verify_cert: bool, cache_dir: str) -> CachedMetadata:
+    """
+    Gets the filters and partitioned resources of the API, from the on-disk
+    cache for the base URL and API version when the server confirms, with a
+    conditional request, that the resource metadata has not changed. Otherwise
+    the resource metadata is downloaded and analyzed, and the cache updated.
+
+    Parameters
+    ----------
+    api_base_url : str
+        The base URL of the API.
+    verify_cert : bool
+        Whether to verify SSL certificates.
+    cache_dir : str
+        Directory of the metadata cache.
+
+    Returns
+    -------
+    CachedMetadata
+        The analyzed resource metadata
+    """
+    base_api_response = get_base_api_response(api_base_url, verify_cert)
+    api_version = f"{base_api_response.get('version', '')}/{base_api_response.get('build', '')}"
+
+    metadata_cache = MetadataCache(cache_dir)
+    cached = metadata_cache.load(api_base_url, api_version)
+
+    if cached is not None:
+        headers: Dict[str, str] = {}
+        if cached.etag is not None:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified is not None:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        logger.debug("Revalidating the cached resource metadata.")
+        response = _get_resource_metadata(cached.resource_metadata_url, headers, verify_cert)
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            logger.debug("Resource metadata is unchanged, using the cached filters.")
+            return cached
+
+    if cached is None or response.status_code != HTTPStatus.OK:
+        logger.debug("Getting resource metadata from the api.")
+        resource_metadata_url = _get_resource_metadata_url(api_base_url, verify_cert)
+        response = _get_resource_metadata(resource_metadata_url, {}, verify_cert)
+    else:
+        resource_metadata_url = cached.resource_metadata_url
+
+    resource_metadata_response: Dict[str, Dict[str, Any]] = response.json()
+    metadata = CachedMetadata(
+        base_url=api_base_url,
+        api_version=api_version,
+        resource_metadata_url=resource_metadata_url,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        filters_by_resource_name=_build_filters_by_resource_name(resource_metadata_response),
+        partitioned_resource_names=get_partitioned_resources(resource_metadata_response["paths"].keys()),
+    )
+    metadata_cache.save(metadata)
+
+    return metadata
+
+
+def get_filters_by_resource_name(
+    api_base_url: str, verify_cert: bool = True, cache_dir: Optional[str] = None
+) -> Dict[str, List[str]]:
     """
     Analyzes the OpenAPI metadata to determine which filters are available
     for each resource endpoint.
@@ -99,15 +178,21 @@ def get_filters_by_resource_name(api_base_url: str, verify_cert: bool = True) ->
     Args:
         api_base_url (str): Base URL of the Ed-Fi API
         verify_cert (bool): Whether to verify SSL certificates
+        cache_dir (str): Directory of the on-disk metadata cache, or None to
+                         always download the metadata
 
     Returns:
         Dict[str, List[str]]: Dictionary mapping resource names to their
                                     available filters
     """
 
-    resource_metadata_response: Dict[str, Dict[str, Any]
-                                     ] = get_resource_metadata_response(api_base_url, verify_cert)
+    if cache_dir is not None:
+        return get_cached_metadata(api_base_url, verify_cert, cache_dir).filters_by_resource_name
+
+    return _build_filters_by_resource_name(get_resource_metadata_response(api_base_url, verify_cert))
 
+
+def _build_filters_by_resource_name(resource_metadata_response: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
     # filter out paths that are for get by id, deletes, keyChanges or partitions
     operations_by_resource = [(normalize_resource_path(path), operations) for path, operations in resource_metadata_response["paths"].items()
                               if "{id}" not in path
@@ -121,6 +206,37 @@ def get_filters_by_resource_name(api_base_url: str, verify_cert: bool = True) ->
     return filters_by_resource
 
 
+def get_partitioned_resource_names(
+    api_base_url: str, verify_cert: bool = True, cache_dir: Optional[str] = None
+) -> List[str]:
+    """
+    Analyzes the OpenAPI metadata to determine which resources expose a
+    partitions endpoint (available since ODS/API 7.3).
+
+    Args:
+        api_base_url (str): Base URL of the Ed-Fi API
+        verify_cert (bool): Whether to verify SSL certificates
+        cache_dir (str): Directory of the on-disk metadata cache, or None to
+                         always download the metadata
+
+    Returns:
+        List[str]: Normalized names of the resources that can be partitioned
+    """
+
+    if cache_dir is not None:
+        return get_cached_metadata(api_base_url, verify_cert, cache_dir).partitioned_resource_names
+
+    resource_metadata_response: Dict[str, Dict[str, Any]
+                                     ] = get_resource_metadata_response(api_base_url, verify_cert)
+
+    return get_partitioned_resources(resource_metadata_response["paths"].keys())
+
+
+def get_partitioned_resources(paths: Iterable[str]) -> List[str]:
+    suffix = "/partitions"
+    return [normalize_resource_path(path.removesuffix(suffix)) for path in paths if path.endswith(suffix)]
+
+
 def get_filters(operations) -> List[str]:
     pagination_params = {'limit', 'offset', 'totalCount'}
     return [param['name'] for param in operations['get']['parameters']
@@ -3,14 +3,86 @@
 # The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
 # See the LICENSE and NOTICES files in the project root for more information.
 
+from argparse import ArgumentTypeError
+from typing import List
+
 from configargparse import ArgParser  # type: ignore
 
+from edfi_paging_test.api.token_manager import parse_credentials
+from edfi_paging_test.helpers.arrival_profile import ArrivalProfile
+from edfi_paging_test.helpers.json_decoder import JsonDecoder
 from edfi_paging_test.helpers.output_format import OutputFormat
 from edfi_paging_test.helpers.log_level import LogLevel
+from edfi_paging_test.helpers.metadata_cache import DEFAULT_CACHE_DIR
 from edfi_paging_test.helpers.main_arguments import MainArguments
+from edfi_paging_test.helpers.request_engine import RequestEngine
 from edfi_paging_test.helpers.test_type import TestType
 
 
+def arrival_rate(text: str) -> str:
+    """
+    Validates an arrival rate profile, keeping it as text. Empty for none.
+    """
+    if text != "":
+        try:
+            ArrivalProfile.parse(text)
+        except ValueError as err:
+            raise ArgumentTypeError(str(err)) from err
+
+    return text
+
+
+def page_sizes(text: str) -> List[int]:
+    """
+    Parses one page size, or several separated by commas for a sweep.
+    """
+    try:
+        sizes = [int(size) for size in text.split(",")]
+    except ValueError as err:
+        raise ArgumentTypeError(f"Invalid page size '{text}': {err}") from err
+
+    if any(size <= 0 for size in sizes):
+        raise ArgumentTypeError(f"Invalid page size '{text}': page sizes must be greater than 0")
+
+    return sizes
+
+
+def positive_int(text: str) -> int:
+    try:
+        value = int(text)
+    except ValueError as err:
+        raise ArgumentTypeError(f"Invalid number '{text}': {err}") from err
+
+    if value <= 0:
+        raise ArgumentTypeError(f"Invalid number '{text}': must be greater than 0")
+
+    return value
+
+
+def non_negative_int(text: str) -> int:
+    try:
+        value = int(text)
+    except ValueError as err:
+        raise ArgumentTypeError(f"Invalid number '{text}': {err}") from err
+
+    if value < 0:
+        raise ArgumentTypeError(f"Invalid number '{text}': must not be negative")
+
+    return value
+
+
+def positive_float(text: str) -> float:
+    try:
+        value = float(text)
+    except ValueError as err:
+        raise ArgumentTypeError(f"Invalid number '{text}': {err}") from err
+
+    if value <= 0:
+        raise ArgumentTypeError(f"Invalid number '{text}': must be greater than 0")
+
+    return value
+
+
 def parse_main_arguments() -> MainArguments:
     """
     Configures the command-line interface.
@@ -37,7 +109,7 @@ def parse_main_arguments() -> MainArguments:
     parser.add(  # type: ignore
         "-k",
         "--key",
-        help="The web API OAuth key",
+        help="The web API OAuth key, or comma separated keys to spread the requests across several clients",
         type=str,
         required=True,
         env_var="PERF_API_KEY",
@@ -45,7 +117,7 @@ def parse_main_arguments() -> MainArguments:
     parser.add(  # type: ignore
         "-s",
         "--secret",
-        help="The web API OAuth secret",
+        help="The web API OAuth secret, or comma separated secrets in the order of the keys",
         type=str,
         required=True,
         env_var="PERF_API_SECRET",
@@ -76,7 +148,7 @@ def parse_main_arguments() -> MainArguments:
     parser.add(  # type: ignore
         "-t",
         "--contentType",
-        help="CSV or JSON",
+        help="CSV, JSON or PARQUET",
         choices=list(OutputFormat),
         default=OutputFormat.CSV,
         type=OutputFormat,
@@ -92,8 +164,8 @@ def parse_main_arguments() -> MainArguments:
     parser.add(  # type: ignore
         "-p",
         "--pageSize",
-        help="The page size to request. Max: 500.",
-        type=int,
+        help="The page size to request. Max: 500. Several page sizes separated by commas, e.g. 25,100,500, page each resource at every size",
+        type=page_sizes,
         default="100",
         env_var="PERF_API_PAGE_SIZE",
     )
@@ -117,7 +189,7 @@ def parse_main_arguments() -> MainArguments:
     parser.add(  # type: ignore
         "-e",
         "--testType",
-        help="Type of test to run: DEEP_PAGING, FILTERED_READ",
+        help="Type of test to run: DEEP_PAGING, FILTERED_READ, PARTITIONED_PAGING",
         type=TestType,
         choices=list(TestType),
         default=TestType.DEEP_PAGING,
@@ -131,9 +203,155 @@ def parse_main_arguments() -> MainArguments:
         default=6,
         env_var="PERF_FILTER_COMBINATION_SIZE_LIMIT",
     )
+    parser.add(  # type: ignore
+        "--requestEngine",
+        help="HTTP engine used to send requests: THREADS (thread pool) or ASYNC (asyncio with a pooled keep-alive transport)",
+        type=RequestEngine,
+        choices=list(RequestEngine),
+        default=RequestEngine.THREADS,
+        env_var="PERF_REQUEST_ENGINE",
+    )
+    parser.add(  # type: ignore
+        "--pageFanOut",
+        help="Number of page requests to keep in flight for each resource. When greater than 1, the total count is read first and the page offsets are requested concurrently",
+        type=positive_int,
+        default=1,
+        env_var="PERF_PAGE_FAN_OUT",
+    )
+    parser.add(  # type: ignore
+        "--filterSampleSize",
+        help="Number of entries per resource to keep, as a random sample, for choosing filter values. 0 keeps every entry. For use with the 'FILTERED_READ' testType only",
+        type=non_negative_int,
+        default=0,
+        env_var="PERF_FILTER_SAMPLE_SIZE",
+    )
+    parser.add(  # type: ignore
+        "--partitionCount",
+        help="Number of partitions to request from each resource's partitions endpoint. For use with the 'PARTITIONED_PAGING' testType only",
+        type=positive_int,
+        default=10,
+        env_var="PERF_PARTITION_COUNT",
+    )
+    parser.add(  # type: ignore
+        "--detailFlushInterval",
+        help="Seconds between writes of new measurements to the detail file during the run. 0 writes the detail file at the end of the run only",
+        type=non_negative_int,
+        default=5,
+        env_var="PERF_DETAIL_FLUSH_INTERVAL",
+    )
+    parser.add(  # type: ignore
+        "--requestBudget",
+        help="Maximum number of filtered requests per resource, planned to cover every filter and filter pair. 0 queries every filter combination. For use with the 'FILTERED_READ' testType only",
+        type=non_negative_int,
+        default=0,
+        env_var="PERF_REQUEST_BUDGET",
+    )
+    parser.add(  # type: ignore
+        "--arrivalRate",
+        help="Send page requests at a target rate, in requests per second, instead of as fast as the previous requests return. Either a fixed rate, e.g. 50, or a starting rate followed by rate:seconds ramp stages, e.g. 10,100:60,100:300",
+        type=arrival_rate,
+        default="",
+        env_var="PERF_ARRIVAL_RATE",
+    )
+    parser.add(  # type: ignore
+        "--concurrencySearch",
+        help="Search for the concurrency, up to the connection limit, at which paging throughput stops growing. For use with the 'DEEP_PAGING' testType only",
+        action="store_true",  # default false
+        env_var="PERF_CONCURRENCY_SEARCH",
+    )
+    parser.add(  # type: ignore
+        "--searchStepSeconds",
+        help="Seconds spent at each concurrency level of the concurrency search",
+        type=positive_int,
+        default=10,
+        env_var="PERF_SEARCH_STEP_SECONDS",
+    )
+    parser.add(  # type: ignore
+        "--metadataCacheDir",
+        help="Directory for caching the API metadata between runs, revalidated with the server on every run. Empty to download the metadata every time",
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        env_var="PERF_METADATA_CACHE_DIR",
+    )
+    parser.add(  # type: ignore
+        "--resume",
+        help="Name of an interrupted run, i.e. its directory under the output directory, to resume from its checkpoint. Run with the same arguments as the interrupted run",
+        type=str,
+        default="",
+        env_var="PERF_RESUME",
+    )
+    parser.add(  # type: ignore
+        "--jsonDecoder",
+        help="JSON decoder for the records that are kept: AUTO (orjson when installed), JSON (standard library) or ORJSON",
+        type=JsonDecoder,
+        choices=list(JsonDecoder),
+        default=JsonDecoder.AUTO,
+        env_var="PERF_JSON_DECODER",
+    )
+    parser.add(  # type: ignore
+        "--workers",
+        help="Number of processes to spread the requests across, each with its own connections up to the connection limit. Deep paging splits the pages of the resources between them; the other test types split the resources",
+        type=positive_int,
+        default=1,
+        env_var="PERF_WORKERS",
+    )
+    parser.add(  # type: ignore
+        "--maxRetries",
+        help="Number of times a request is sent again after a 429, 502, 503 or 504 response. Every attempt is recorded in the detail output",
+        type=non_negative_int,
+        default=0,
+        env_var="PERF_MAX_RETRIES",
+    )
+    parser.add(  # type: ignore
+        "--retryBackoff",
+        help="Longest wait in seconds before the first retry of a request, doubled on every further retry; the wait is a random time up to it",
+        type=positive_float,
+        default=0.5,
+        env_var="PERF_RETRY_BACKOFF",
+    )
+    parser.add(  # type: ignore
+        "--retryConcurrency",
+        help="Number of retries in flight at once. Defaults to half the connection limit",
+        type=non_negative_int,
+        default=0,
+        env_var="PERF_RETRY_CONCURRENCY",
+    )
+    parser.add(  # type: ignore
+        "--breakerThreshold",
+        help="Number of 429, 502, 503 or 504 responses in a row after which the requests of a resource are paused. 0 to never pause",
+        type=non_negative_int,
+        default=0,
+        env_var="PERF_BREAKER_THRESHOLD",
+    )
+    parser.add(  # type: ignore
+        "--breakerCooldown",
+        help="Seconds the requests of a resource are paused for, before trying one again",
+        type=positive_float,
+        default=5.0,
+        env_var="PERF_BREAKER_COOLDOWN",
+    )
+    parser.add(  # type: ignore
+        "--metricsPort",
+        help="Port to serve live metrics on, at http://localhost:<port>/metrics in the Prometheus text format; 0 to not serve them",
+        type=non_negative_int,
+        default=0,
+        env_var="PERF_METRICS_PORT",
+    )
+    parser.add(  # type: ignore
+        "--snapshotInterval",
+        help="Seconds between snapshots of the live metrics, written to the snapshots file; 0 to not take snapshots",
+        type=non_negative_int,
+        default=0,
+        env_var="PERF_SNAPSHOT_INTERVAL",
+    )
 
     args_parsed = parser.parse_args()
 
+    try:
+        parse_credentials(args_parsed.key, args_parsed.secret)
+    except ValueError as err:
+        parser.error(str(err))
+
     arguments = MainArguments(
         args_parsed.baseUrl,
         args_parsed.connectionLimit,
@@ -144,10 +362,31 @@ def parse_main_arguments() -> MainArguments:
         args_parsed.description,
         args_parsed.contentType,
         args_parsed.resourceList or [],
-        args_parsed.pageSize,
+        args_parsed.pageSize[0],
         args_parsed.logLevel,
         args_parsed.testType,
         args_parsed.combinationSizeLimit,
+        args_parsed.requestEngine,
+        args_parsed.pageFanOut,
+        args_parsed.filterSampleSize,
+        args_parsed.partitionCount,
+        args_parsed.detailFlushInterval,
+        args_parsed.requestBudget,
+        args_parsed.arrivalRate,
+        args_parsed.concurrencySearch,
+        args_parsed.searchStepSeconds,
+        args_parsed.pageSize,
+        args_parsed.metadataCacheDir,
+        args_parsed.resume,
+        args_parsed.jsonDecoder,
+        args_parsed.workers,
+        args_parsed.maxRetries,
+        args_parsed.retryBackoff,
+        args_parsed.retryConcurrency,
+        args_parsed.breakerThreshold,
+        args_parsed.breakerCooldown,
+        args_parsed.metricsPort,
+        args_parsed.snapshotInterval,
     )
 
     return arguments
@@ -0,0 +1,105 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from math import sqrt
+from typing import Iterator, List, Tuple
+
+
+class ArrivalProfile:
+    """
+    Target request rate over time, for sending requests on a fixed schedule
+    (an open model) instead of as fast as the previous requests return.
+
+    The profile starts at `start_rate` requests per second and then goes
+    through each stage in turn, changing the rate linearly to the stage's
+    target rate over the stage's duration. After the last stage the last
+    rate is held for as long as there are requests to send.
+
+    Parameters
+    ----------
+    start_rate : float
+        Requests per second at the start of the run.
+    stages : List[Tuple[float, float]]
+        Target rate, in requests per second, and duration, in seconds, of
+        each stage.
+    """
+
+    def __init__(self, start_rate: float, stages: List[Tuple[float, float]]) -> None:
+        if start_rate < 0 or any(rate < 0 for rate, _ in stages):
+            raise ValueError("Arrival rates cannot be negative.")
+        if any(seconds <= 0 for _, seconds in stages):
+            raise ValueError("Arrival rate stages must last more than 0 seconds.")
+
+        final_rate = stages[-1][0] if len(stages) > 0 else start_rate
+        if final_rate <= 0:
+            raise ValueError("The final arrival rate must be greater than 0.")
+
+        self.start_rate = start_rate
+        self.stages = stages
+
+    @staticmethod
+    def parse(text: str) -> "ArrivalProfile":
+        """
+        Parses a profile given as the starting rate, optionally followed by
+        comma-separated `rate:seconds` stages. For example `50` holds 50
+        requests per second, and `10,100:60,100:300` starts at 10 requests
+        per second, ramps up to 100 over a minute, and holds 100 for five
+        minutes and then for as long as there are requests left.
+
+        Raises
+        -------
+        ValueError
+            If the text is not a valid profile
+        """
+        try:
+            start, *stage_texts = text.split(",")
+            stages = [(float(rate), float(seconds)) for rate, seconds in (stage.split(":") for stage in stage_texts)]
+            return ArrivalProfile(float(start), stages)
+        except ValueError as err:
+            raise ValueError(f"Invalid arrival rate '{text}': {err}") from err
+
+    @property
+    def final_rate(self) -> float:
+        return self.stages[-1][0] if len(self.stages) > 0 else self.start_rate
+
+    def send_times(self) -> Iterator[float]:
+        """
+        Intended send time, in seconds from the start of the run, of each
+        request in turn. Request `n`, counting from 0, is due when the area
+        under the rate line reaches `n`, so the first request is sent at 0.
+        """
+        request = 0
+        stage_start = 0.0
+        arrivals_at_stage_start = 0.0
+        rate = self.start_rate
+
+        for target_rate, seconds in self.stages:
+            acceleration = (target_rate - rate) / seconds
+            arrivals_at_stage_end = arrivals_at_stage_start + (rate + target_rate) / 2 * seconds
+
+            while request < arrivals_at_stage_end:
+                yield stage_start + _time_to_arrivals(rate, acceleration, request - arrivals_at_stage_start)
+                request += 1
+
+            stage_start += seconds
+            arrivals_at_stage_start = arrivals_at_stage_end
+            rate = target_rate
+
+        while True:
+            yield stage_start + (request - arrivals_at_stage_start) / rate
+            request += 1
+
+
+def _time_to_arrivals(rate: float, acceleration: float, arrivals: float) -> float:
+    """
+    Time for `arrivals` requests to arrive at a rate that starts at `rate`
+    and changes by `acceleration` every second; the positive root of
+    rate * t + acceleration / 2 * t^2 = arrivals, in a form that stays
+    accurate when the acceleration is close to 0.
+    """
+    if arrivals <= 0:
+        return 0.0
+
+    return 2 * arrivals / (rate + sqrt(max(rate * rate + 2 * acceleration * arrivals, 0.0)))
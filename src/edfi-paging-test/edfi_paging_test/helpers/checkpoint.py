@@ -0,0 +1,172 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from dataclasses import asdict, dataclass
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from edfi_paging_test.helpers.paging_schedule import PageRange
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+# Bump when the layout of the checkpoint file changes
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+@dataclass
+class RangeProgress:
+    """
+    How far the pages of one `PageRange` have been read: every page before
+    `next_page` has been read, holding `records` records in all.
+    """
+
+    page_range: PageRange
+    next_page: int
+    records: int = 0
+    finished: bool = False
+
+
+class Checkpoint:
+    """
+    Progress of a paging run, saved to the run directory as the run goes so
+    that an interrupted run can be resumed: the page sizes already finished
+    and, for the current page size, the total counts and the progress of each
+    page range. Updated from the event loop and saved from the detail
+    writer's thread, hence the lock.
+    """
+
+    def __init__(self) -> None:
+        self.finished_page_sizes: List[int] = []
+        self.page_size: Optional[int] = None
+        self.total_count_by_resource_name: Dict[str, int] = {}
+        self.ranges: List[RangeProgress] = []
+        self._lock = threading.Lock()
+
+    def start_page_size(
+        self, page_size: int, total_count_by_resource_name: Dict[str, int], page_ranges: List[PageRange]
+    ) -> List[RangeProgress]:
+        with self._lock:
+            self.page_size = page_size
+            self.total_count_by_resource_name = total_count_by_resource_name
+            self.ranges = [RangeProgress(page_range, page_range.first_page) for page_range in page_ranges]
+            return self.ranges
+
+    def get_ranges(self, page_size: int) -> Optional[List[RangeProgress]]:
+        """
+        The progress of the ranges of the given page size, when the run was
+        interrupted while paging at that size.
+        """
+        with self._lock:
+            return self.ranges if self.page_size == page_size else None
+
+    def record_page(self, progress: RangeProgress, records: int) -> None:
+        with self._lock:
+            progress.next_page += 1
+            progress.records += records
+
+    def finish_range(self, progress: RangeProgress) -> None:
+        with self._lock:
+            progress.finished = True
+
+    def finish_page_size(self) -> None:
+        with self._lock:
+            if self.page_size is not None:
+                self.finished_page_sizes.append(self.page_size)
+            self.page_size = None
+            self.total_count_by_resource_name = {}
+            self.ranges = []
+
+    def is_read(self, resource_name: str, page_size: int, page: int) -> bool:
+        """
+        Whether the page was read before the checkpoint was taken.
+        """
+        with self._lock:
+            if page_size in self.finished_page_sizes:
+                return True
+            if page_size != self.page_size:
+                return False
+
+            return any(
+                progress.page_range.resource_name == resource_name
+                and progress.page_range.first_page <= page < progress.next_page
+                for progress in self.ranges
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "formatVersion": CHECKPOINT_FORMAT_VERSION,
+                "finishedPageSizes": list(self.finished_page_sizes),
+                "pageSize": self.page_size,
+                "totalCountByResourceName": dict(self.total_count_by_resource_name),
+                "ranges": [asdict(progress) for progress in self.ranges],
+            }
+
+    @staticmethod
+    def from_dict(content: Dict[str, Any]) -> "Checkpoint":
+        """
+        Raises
+        -------
+        ValueError
+            If the content is not a checkpoint of this format version
+        """
+        if content.get("formatVersion") != CHECKPOINT_FORMAT_VERSION:
+            raise ValueError("The checkpoint was written by an incompatible version of the paging test.")
+
+        checkpoint = Checkpoint()
+        checkpoint.finished_page_sizes = content["finishedPageSizes"]
+        checkpoint.page_size = content["pageSize"]
+        checkpoint.total_count_by_resource_name = content["totalCountByResourceName"]
+        checkpoint.ranges = [
+            RangeProgress(
+                page_range=PageRange(**progress["page_range"]),
+                next_page=progress["next_page"],
+                records=progress["records"],
+                finished=progress["finished"],
+            )
+            for progress in content["ranges"]
+        ]
+        return checkpoint
+
+    @staticmethod
+    def load(run_dir: str) -> "Checkpoint":
+        """
+        Raises
+        -------
+        RuntimeError
+            If the run directory holds no readable checkpoint
+        """
+        file_path = os.path.join(run_dir, CHECKPOINT_FILE)
+        try:
+            with open(file_path, encoding="utf-8") as file:
+                return Checkpoint.from_dict(json.load(file))
+        except (OSError, ValueError, KeyError, TypeError) as err:
+            raise RuntimeError(f"Unable to resume from {file_path}: {err}") from err
+
+    @staticmethod
+    def remove(run_dir: str) -> None:
+        """
+        Removes the checkpoint of a run that has finished.
+        """
+        file_path = os.path.join(run_dir, CHECKPOINT_FILE)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def write_checkpoint(content: Dict[str, Any], run_dir: str) -> None:
+    """
+    Writes checkpoint content, from `Checkpoint.to_dict`, to the run
+    directory, replacing the previous checkpoint in a single step so that a
+    crash never leaves a partial file.
+    """
+    file_path = os.path.join(run_dir, CHECKPOINT_FILE)
+    temporary_path = f"{file_path}.tmp"
+
+    os.makedirs(run_dir, exist_ok=True)
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(content, file)
+    os.replace(temporary_path, file_path)
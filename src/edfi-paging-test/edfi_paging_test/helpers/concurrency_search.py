@@ -0,0 +1,139 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from pandas import DataFrame
+
+# Throughput within this fraction of the best is on the plateau; a step up in
+# concurrency must raise throughput by more than this to count as a gain
+SATURATION_TOLERANCE = 0.1
+
+
+@dataclass
+class ConcurrencyStep:
+    """
+    Measurements of one step of the search, at a fixed concurrency.
+    """
+
+    concurrency: int
+    number_of_requests: int
+    number_of_errors: int
+    seconds: float
+    latencies: Dict[str, float]
+
+    @property
+    def throughput(self) -> float:
+        return self.number_of_requests / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class ConcurrencySearchSummary:
+    saturation_concurrency: int
+    saturation_throughput: float
+    best_concurrency: int
+    best_throughput: float
+    number_of_steps: int
+
+
+class ConcurrencySearch:
+    """
+    Searches for the concurrency at which paging throughput stops growing.
+
+    Concurrency is doubled from 1 until a step fails to raise throughput by
+    more than `SATURATION_TOLERANCE`, or `max_concurrency` is reached. The
+    search then bisects back down, between the lowest level on the plateau
+    so far and the highest level below it, to find the smallest concurrency
+    whose throughput is on the plateau: the saturation point, beyond which
+    more requests in flight only add latency.
+
+    Parameters
+    ----------
+    max_concurrency : int
+        Highest concurrency to try, e.g. the size of the connection pool.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.steps: List[ConcurrencyStep] = []
+
+        self._next: Optional[int] = 1
+        self._bisecting = False
+
+    def next_concurrency(self) -> Optional[int]:
+        """
+        Concurrency of the next step, or None when the search is over.
+        """
+        return self._next
+
+    def _peak(self) -> float:
+        return max(step.throughput for step in self.steps)
+
+    def _on_plateau(self, step: ConcurrencyStep) -> bool:
+        return step.throughput >= (1 - SATURATION_TOLERANCE) * self._peak()
+
+    def record(self, step: ConcurrencyStep) -> None:
+        """
+        Records the measurements of the step just run, and chooses the next.
+        """
+        previous_peak = self._peak() if len(self.steps) > 0 else 0.0
+        self.steps.append(step)
+
+        if not self._bisecting:
+            if step.throughput <= (1 + SATURATION_TOLERANCE) * previous_peak:
+                self._bisecting = True
+            elif step.concurrency < self.max_concurrency:
+                self._next = min(step.concurrency * 2, self.max_concurrency)
+                return
+            else:
+                self._next = None
+                return
+
+        # The lowest level on the plateau so far, and the highest level
+        # below it, bracket the saturation point
+        high = min(step.concurrency for step in self.steps if self._on_plateau(step))
+        low = max((step.concurrency for step in self.steps if step.concurrency < high), default=0)
+        middle = (low + high) // 2
+        self._next = middle if middle > low else None
+
+    def get_summary(self) -> ConcurrencySearchSummary:
+        """
+        The saturation point, i.e. the lowest concurrency on the throughput
+        plateau, and the concurrency with the highest throughput.
+        """
+        if len(self.steps) == 0:
+            raise RuntimeError("No steps have been run, therefore cannot summarize the concurrency search")
+
+        best = max(self.steps, key=lambda step: (step.throughput, -step.concurrency))
+        saturation = min(
+            (step for step in self.steps if self._on_plateau(step)), key=lambda step: step.concurrency
+        )
+
+        return ConcurrencySearchSummary(
+            saturation_concurrency=saturation.concurrency,
+            saturation_throughput=round(saturation.throughput, 3),
+            best_concurrency=best.concurrency,
+            best_throughput=round(best.throughput, 3),
+            number_of_steps=len(self.steps),
+        )
+
+    def get_DataFrame(self) -> DataFrame:
+        """
+        One row per step, in the order the steps were run.
+        """
+        return DataFrame(
+            [
+                {
+                    "Concurrency": step.concurrency,
+                    "Seconds": round(step.seconds, 3),
+                    "NumberOfRequests": step.number_of_requests,
+                    "NumberOfErrors": step.number_of_errors,
+                    "Throughput": round(step.throughput, 3),
+                    **step.latencies,
+                }
+                for step in self.steps
+            ]
+        )
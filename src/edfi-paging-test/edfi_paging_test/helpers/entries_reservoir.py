@@ -0,0 +1,63 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import random
+from typing import Any, Dict, List, Optional
+
+
+class EntriesReservoir:
+
+    def __init__(self, capacity: Optional[int] = None, seed: Optional[int] = None):
+        """
+        Counts the entries of a resource page by page, keeping at most
+        `capacity` of them as a uniform random sample (reservoir sampling).
+        Pages are not retained, so memory use does not grow with the size of
+        the resource.
+
+        Args:
+            capacity: Maximum number of entries to keep. None keeps every
+                entry and 0 only counts them.
+            seed: Optional seed for the random sampling
+        """
+
+        self.capacity = capacity
+        self.count = 0
+        self.entries: List[Dict[str, Any]] = []
+        self._random = random.Random(seed)
+
+    def add(self, page_items: Any, count: Optional[int] = None) -> None:
+        """
+        Counts and samples the entries of one page.
+
+        Args:
+            page_items: Entries of the page. Anything other than a list, e.g.
+                an error response from the API, is ignored.
+            count: Number of entries of the page, when they were counted
+                without being decoded and `page_items` is empty
+        """
+
+        if not isinstance(page_items, list):
+            return
+
+        if count is not None and len(page_items) == 0:
+            self.count += count
+            return
+
+        if self.capacity is None:
+            self.entries.extend(page_items)
+            self.count += len(page_items)
+            return
+
+        for entry in page_items:
+            self.count += 1
+
+            if len(self.entries) < self.capacity:
+                self.entries.append(entry)
+                continue
+
+            # Keep the n-th entry with probability capacity / n
+            slot = self._random.randrange(self.count)
+            if slot < self.capacity:
+                self.entries[slot] = entry
@@ -0,0 +1,201 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from itertools import chain, combinations
+import logging
+from typing import Dict, List, Set, Tuple
+
+from edfi_paging_test.helpers.resource_entries_cache import ResourceEntriesCache
+
+logger = logging.getLogger(__name__)
+
+# Entries queried per filter combination when no request budget is set
+DEFAULT_ENTRIES_PER_COMBINATION = 10
+
+# Every filter pair is covered by at least one planned combination
+COVERAGE_STRENGTH = 2
+
+FilterPlan = List[Tuple[Tuple[str, ...], int]]
+
+
+def get_filter_combinations(filters: List[str], combination_size_limit):
+    """
+    Generates combinations of filters.
+
+    Args:
+        filters: List of filters that a resource supports
+        combination_size_limit: The generated combinations will be of size 1 up to this limit
+
+    Returns:
+        List containing different combinations of filters
+    """
+
+    return list(chain(*[combinations(filters, i + 1) for i in range(combination_size_limit)]))
+
+
+def _cover(
+    filters: List[str],
+    combination_size_limit: int,
+    strength: int,
+    entries_cache: ResourceEntriesCache,
+) -> Tuple[List[Tuple[str, ...]], int]:
+    """
+    Greedily builds combinations until every filter tuple of size `strength`
+    that some entry can satisfy is covered by at least one of them. Each
+    combination starts from an uncovered tuple and is extended, up to the size
+    limit, with the filter that covers the most uncovered tuples while still
+    matching at least one entry.
+
+    Returns the combinations, and the number of tuples to cover.
+    """
+    uncovered: Set[Tuple[str, ...]] = {
+        group for group in combinations(filters, strength)
+        if entries_cache.count_entries_with_non_null_filters(group) > 0
+    }
+    total = len(uncovered)
+    order = {filter: index for index, filter in enumerate(filters)}
+
+    covering: List[Tuple[str, ...]] = []
+    while uncovered:
+        combination = list(min(uncovered, key=lambda group: [order[filter] for filter in group]))
+
+        while len(combination) < combination_size_limit:
+            best_gain = 0
+            best_matches = 0
+            best_filter = None
+            for filter in filters:
+                if filter in combination:
+                    continue
+
+                gain = sum(
+                    1 for others in combinations(combination, strength - 1)
+                    if tuple(sorted((*others, filter), key=order.__getitem__)) in uncovered
+                )
+                if gain < best_gain or gain == 0:
+                    continue
+
+                matches = entries_cache.count_entries_with_non_null_filters((*combination, filter))
+                if matches == 0:
+                    continue
+
+                if gain > best_gain or matches > best_matches:
+                    best_gain, best_matches, best_filter = gain, matches, filter
+
+            if best_filter is None:
+                break
+
+            combination.append(best_filter)
+
+        combination.sort(key=order.__getitem__)
+        uncovered.difference_update(combinations(combination, strength))
+        covering.append(tuple(combination))
+
+    return covering, total
+
+
+def _allocate(request_budget: int, weights: List[int], capacities: List[int]) -> List[int]:
+    """
+    Splits the budget across the combinations: one request each, and the rest
+    in proportion to their weights, never beyond their capacities.
+    """
+    counts = [1] * len(weights)
+    remaining = request_budget - len(weights)
+
+    while remaining > 0:
+        growable = [index for index, count in enumerate(counts) if count < capacities[index]]
+        if len(growable) == 0:
+            break
+
+        total_weight = sum(weights[index] for index in growable)
+        given = 0
+        for index in growable:
+            share = min(capacities[index] - counts[index], remaining * weights[index] // total_weight)
+            counts[index] += share
+            given += share
+
+        if given == 0:
+            # Too little left to share in proportion; hand out the rest one
+            # request at a time, heaviest combinations first
+            for index in sorted(growable, key=lambda index: -weights[index])[:remaining]:
+                counts[index] += 1
+                given += 1
+
+        remaining -= given
+
+    return counts
+
+
+def plan_filter_combinations(
+    resource_name: str,
+    filters: List[str],
+    combination_size_limit: int,
+    request_budget: int,
+    entries_cache: ResourceEntriesCache,
+) -> FilterPlan:
+    """
+    Plans the filter combinations to query for a resource, and how many
+    entries to query for each.
+
+    Without a budget, every combination of size 1 up to the size limit is
+    planned, with `DEFAULT_ENTRIES_PER_COMBINATION` entries each. With a
+    budget, every filter is planned on its own, highest cardinality first,
+    followed by a covering set of larger combinations in which every pair of
+    filters that some entry can satisfy appears at least once. When the budget
+    allows more than one request per combination, the rest is shared in
+    proportion to the logarithm of the number of distinct values each
+    combination can take, estimated by the highest cardinality among its
+    filters, and never beyond the number of distinct values of a single
+    filter or the number of entries matching a combination.
+
+    Args:
+        resource_name: Resource being planned, for logging
+        filters: List of filters that the resource supports
+        combination_size_limit: The planned combinations will be of size 1 up to this limit
+        request_budget: Maximum number of requests for the resource; 0 for no limit
+        entries_cache: Index of the resource entries to take filter values from
+
+    Returns:
+        List of filter combinations with the number of entries to query for each
+    """
+
+    if request_budget <= 0:
+        return [
+            (combination, DEFAULT_ENTRIES_PER_COMBINATION)
+            for combination in get_filter_combinations(filters, combination_size_limit)
+        ]
+
+    usable = [filter for filter in filters if entries_cache.count_entries_with_non_null_filters((filter,)) > 0]
+    cardinality: Dict[str, int] = {filter: entries_cache.get_cardinality(filter) for filter in usable}
+
+    singles: List[Tuple[str, ...]] = [(filter,) for filter in sorted(usable, key=lambda filter: -cardinality[filter])]
+    covering: List[Tuple[str, ...]] = []
+    pairs = 0
+    if combination_size_limit >= COVERAGE_STRENGTH:
+        covering, pairs = _cover(usable, combination_size_limit, COVERAGE_STRENGTH, entries_cache)
+
+    planned = singles + covering
+    if len(planned) > request_budget:
+        logger.warning(
+            f"{resource_name}: a request budget of {request_budget} cannot cover every filter and filter pair, "
+            f"which takes {len(planned)} requests."
+        )
+        planned = planned[:request_budget]
+
+    # Logarithmic, so that a unique key does not take the whole budget from
+    # filters with a handful of values
+    weights = [max(cardinality[filter] for filter in combination).bit_length() for combination in planned]
+    capacities = [
+        cardinality[combination[0]] if len(combination) == 1
+        else entries_cache.count_entries_with_non_null_filters(combination)
+        for combination in planned
+    ]
+    counts = _allocate(request_budget, weights, capacities)
+
+    logger.debug(
+        f"{resource_name}: planned {len(planned)} filter combinations covering {len(usable)} filters "
+        f"and {pairs} filter pairs in {sum(counts)} requests."
+    )
+
+    return list(zip(planned, counts))
@@ -0,0 +1,44 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import json
+import logging
+from typing import Any, Callable
+
+from edfi_paging_test.helpers.case_insensitive_enum import CaseInsensitiveEnum
+
+logger = logging.getLogger(__name__)
+
+
+class JsonDecoder(CaseInsensitiveEnum):
+    # orjson when installed, else the standard library
+    AUTO = "AUTO"
+    JSON = "JSON"
+    ORJSON = "ORJSON"
+
+
+def get_json_loads(decoder: JsonDecoder) -> Callable[[bytes], Any]:
+    """
+    The function for decoding response bodies. orjson is an optional
+    dependency, installed with the package's `orjson` extra.
+
+    Raises
+    -------
+    RuntimeError
+        If ORJSON is requested but orjson is not installed
+    """
+    if decoder == JsonDecoder.JSON:
+        return json.loads
+
+    try:
+        import orjson  # type: ignore
+    except ImportError:
+        if decoder == JsonDecoder.ORJSON:
+            raise RuntimeError("The orjson decoder requires the orjson package; install the 'orjson' extra.")
+
+        logger.debug("orjson is not installed, decoding with the standard library.")
+        return json.loads
+
+    return orjson.loads
@@ -0,0 +1,44 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import logging
+import sys
+from typing import Optional
+
+from edfi_paging_test.helpers.log_level import LogLevel
+
+
+def _redefine_debug_as_verbose(log_level: LogLevel, logger: str) -> None:
+    requests_logger = logging.getLogger(logger)
+    if log_level == LogLevel.VERBOSE:
+        requests_logger.setLevel(logging.DEBUG)
+    else:
+        requests_logger.setLevel(logging.INFO)
+
+
+def configure_logging(log_level: LogLevel, worker: Optional[int] = None) -> None:
+    """
+    Sends log output to the console. The output of a worker process names
+    the worker.
+    """
+
+    # Verbose is not a real Python log level, so convert back to DEBUG. Verbose
+    # is used for quieting other loggers when in DEBUG mode.
+    level = str(LogLevel.DEBUG if log_level == LogLevel.VERBOSE else log_level)
+    source = "%(name)s" if worker is None else f"worker {worker} - %(name)s"
+
+    logging.basicConfig(
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+        ],
+        format=f"%(asctime)s - %(levelname)s - {source} - %(message)s",
+        level=level,
+    )
+
+    # These two loggers produce far more than we really want to see in debug
+    # mode. Therefore we'll redefine _their_ debug modes as "verbose" for our
+    # purposes.
+    _redefine_debug_as_verbose(log_level, "requests_oauthlib.oauth2_session")
+    _redefine_debug_as_verbose(log_level, "urllib3.connectionpool")
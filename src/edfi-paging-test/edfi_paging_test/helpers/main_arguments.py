@@ -4,10 +4,13 @@
 # See the LICENSE and NOTICES files in the project root for more information.
 
 from typing import List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+from edfi_paging_test.helpers.json_decoder import JsonDecoder
 from edfi_paging_test.helpers.output_format import OutputFormat
 from edfi_paging_test.helpers.log_level import LogLevel
+from edfi_paging_test.helpers.metadata_cache import DEFAULT_CACHE_DIR
+from edfi_paging_test.helpers.request_engine import RequestEngine
 from edfi_paging_test.helpers.test_type import TestType
 
 
@@ -30,3 +33,33 @@ class MainArguments:
     log_level: LogLevel = LogLevel.INFO
     test_type: TestType = TestType.DEEP_PAGING
     combination_size_limit: int = 6
+    request_engine: RequestEngine = RequestEngine.THREADS
+    page_fan_out: int = 1
+    filter_sample_size: int = 0
+    partition_count: int = 10
+    detail_flush_interval: int = 5
+    request_budget: int = 0
+    arrival_rate: str = ""
+    concurrency_search: bool = False
+    search_step_seconds: int = 10
+    # Every page size of a sweep; pageSize is the first of them
+    page_sizes: List[int] = field(default_factory=list)
+    # Empty to download the API metadata on every run
+    metadata_cache_dir: str = DEFAULT_CACHE_DIR
+    # Name of an interrupted run to resume
+    resume: str = ""
+    json_decoder: JsonDecoder = JsonDecoder.AUTO
+    # Processes to spread the requests across, each with connectionLimit connections
+    workers: int = 1
+    # Retries of the responses of an overloaded API; see RetryPolicy
+    max_retries: int = 0
+    retry_backoff: float = 0.5
+    # 0 for half the connection limit
+    retry_concurrency: int = 0
+    # Failures in a row that pause the requests of a resource, 0 for never
+    breaker_threshold: int = 0
+    breaker_cooldown: float = 5.0
+    # Port serving the live metrics on localhost, 0 for none; see MetricsServer
+    metrics_port: int = 0
+    # Seconds between snapshots of the live metrics, 0 for none
+    snapshot_interval: int = 0
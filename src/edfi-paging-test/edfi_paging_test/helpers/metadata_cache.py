@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from dataclasses import asdict, dataclass
+from hashlib import sha256
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+# Bump when the layout of a cache file changes, so that older files are
+# ignored rather than misread
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_DIR = "~/.cache/edfi-paging-test"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedMetadata:
+    """
+    What the paging test needs from an API's resource metadata, together with
+    the validators for revalidating it.
+    """
+
+    base_url: str
+    api_version: str
+    resource_metadata_url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    filters_by_resource_name: Dict[str, List[str]]
+    partitioned_resource_names: List[str]
+
+
+class MetadataCache:
+    """
+    Keeps `CachedMetadata` on disk between runs, one file per base URL and
+    API version.
+
+    Parameters
+    ----------
+    directory : str
+        Directory for the cache files. Created on first write; `~` is expanded.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = os.path.expanduser(directory)
+
+    def _get_path(self, base_url: str, api_version: str) -> str:
+        key = sha256(f"{base_url}|{api_version}".encode()).hexdigest()[:32]
+        return os.path.join(self.directory, f"metadata-{key}.json")
+
+    def load(self, base_url: str, api_version: str) -> Optional[CachedMetadata]:
+        """
+        The cached metadata of the API, or None when there is none, or it
+        cannot be read, or it was written by another version of the cache.
+        """
+        path = self._get_path(base_url, api_version)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, encoding="utf-8") as file:
+                content = json.load(file)
+
+            if content.pop("formatVersion", None) != CACHE_FORMAT_VERSION:
+                return None
+
+            metadata = CachedMetadata(**content)
+        except (OSError, ValueError, TypeError) as err:
+            logger.debug(f"Ignoring unreadable metadata cache file {path}: {err}")
+            return None
+
+        if metadata.base_url != base_url or metadata.api_version != api_version:
+            return None
+
+        return metadata
+
+    def save(self, metadata: CachedMetadata) -> None:
+        """
+        Writes the metadata, replacing any previous file for the same API.
+        Failing to write is logged and otherwise ignored: the cache only
+        saves time.
+        """
+        path = self._get_path(metadata.base_url, metadata.api_version)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                json.dump({"formatVersion": CACHE_FORMAT_VERSION, **asdict(metadata)}, file)
+
+            # Readers see either the old file or the new one, never a partial write
+            os.replace(temporary_path, path)
+        except OSError as err:
+            logger.warning(f"Unable to write the metadata cache file {path}: {err}")
@@ -9,3 +9,4 @@ from edfi_paging_test.helpers.case_insensitive_enum import CaseInsensitiveEnum
 class OutputFormat(CaseInsensitiveEnum):
     JSON = "JSON"
     CSV = "CSV"
+    PARQUET = "PARQUET"
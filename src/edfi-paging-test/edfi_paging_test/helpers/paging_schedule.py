@@ -0,0 +1,154 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+from math import ceil
+from timeit import default_timer
+from typing import Dict, List, Optional
+
+# Ranges shorter than this are not worth splitting a resource for
+MIN_RANGE_PAGES = 10
+
+# Seconds between progress messages
+PROGRESS_INTERVAL_SECONDS = 10.0
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PageRange:
+    """
+    Pages of a resource to read one after another, from `first_page` to
+    `last_page`. The last range of a resource has no `last_page`: it goes on
+    until a page comes back shorter than the page size, in case records were
+    added after counting.
+    """
+
+    resource_name: str
+    first_page: int
+    last_page: Optional[int]
+    number_of_pages: int
+
+
+def plan_page_ranges(total_count_by_resource_name: Dict[str, int], page_size: int, workers: int) -> List[PageRange]:
+    """
+    Splits the pages of the resources into ranges for `workers` workers to
+    read, longest first (LPT scheduling), so that no worker is left reading a
+    large resource long after the others have finished. A resource with more
+    pages than an equal share of all the pages is split into ranges of about
+    that share; the rest are read whole.
+
+    Parameters
+    ----------
+    total_count_by_resource_name : Dict[str, int]
+        Total count of each resource, as returned by `get_total`.
+    page_size : int
+        Records per page.
+    workers : int
+        Number of ranges read at once.
+
+    Returns
+    -------
+    List[PageRange]
+        The ranges in the order to read them, longest first.
+    """
+    page_counts = {
+        resource_name: max(1, ceil(total_count / page_size))
+        for resource_name, total_count in total_count_by_resource_name.items()
+    }
+    share = max(MIN_RANGE_PAGES, ceil(sum(page_counts.values()) / max(1, workers)))
+
+    page_ranges: List[PageRange] = []
+    for resource_name, page_count in page_counts.items():
+        number_of_ranges = ceil(page_count / share)
+        range_size = ceil(page_count / number_of_ranges)
+        for first_page in range(1, page_count + 1, range_size):
+            last_page = first_page + range_size - 1
+            page_ranges.append(
+                PageRange(
+                    resource_name=resource_name,
+                    first_page=first_page,
+                    last_page=last_page if last_page < page_count else None,
+                    number_of_pages=min(range_size, page_count - first_page + 1),
+                )
+            )
+
+    # Sorting is stable: equal ranges keep the order of the resources
+    return sorted(page_ranges, key=lambda page_range: -page_range.number_of_pages)
+
+
+def count_range_records(page_range: PageRange, total_count: int, page_size: int) -> int:
+    """
+    Number of the resource's records, out of `total_count`, that the pages
+    of the range hold.
+    """
+    first_record = (page_range.first_page - 1) * page_size
+    end_record = total_count if page_range.last_page is None else min(total_count, page_range.last_page * page_size)
+
+    return max(0, end_record - first_record)
+
+
+def log_schedule(total_count_by_resource_name: Dict[str, int], page_ranges: List[PageRange]) -> None:
+    """
+    Logs the records of each resource, in the order they will be read.
+    """
+    ranges_by_resource_name: Dict[str, int] = {}
+    for page_range in page_ranges:
+        ranges_by_resource_name[page_range.resource_name] = ranges_by_resource_name.get(page_range.resource_name, 0) + 1
+
+    logger.info(
+        f"Reading {sum(total_count_by_resource_name.values())} records of {len(total_count_by_resource_name)} "
+        "resources, largest first:"
+    )
+    for resource_name, number_of_ranges in ranges_by_resource_name.items():
+        split = f", in {number_of_ranges} page ranges" if number_of_ranges > 1 else ""
+        logger.info(f"  {resource_name}: {total_count_by_resource_name[resource_name]} records{split}")
+
+
+class PagingProgress:
+    """
+    Counts the records read so far against the total expected, logging at
+    most every `interval` seconds how far the run has got and an estimate of
+    the time left, extrapolated from the rate so far.
+
+    Parameters
+    ----------
+    total_records : int
+        Number of records expected.
+    interval : float
+        Minimum seconds between progress messages.
+    """
+
+    def __init__(self, total_records: int, interval: float = PROGRESS_INTERVAL_SECONDS) -> None:
+        self.total_records = total_records
+        self.records = 0
+        self.interval = interval
+        self._start = default_timer()
+        self._last_logged = self._start
+
+    def get_seconds_left(self, now: float) -> Optional[float]:
+        """
+        Estimated seconds until every record is read, or None before the
+        first record.
+        """
+        if self.records == 0:
+            return None
+
+        return max(0.0, (now - self._start) * (self.total_records - self.records) / self.records)
+
+    def add(self, records: int) -> None:
+        self.records += records
+
+        now = default_timer()
+        if now - self._last_logged < self.interval:
+            return
+        self._last_logged = now
+
+        seconds_left = self.get_seconds_left(now)
+        percent = 100 * self.records / self.total_records if self.total_records > 0 else 100.0
+        eta = f", about {timedelta(seconds=round(seconds_left))} left" if seconds_left is not None else ""
+        logger.info(f"Read {self.records} of {self.total_records} records ({percent:.0f}%){eta}.")
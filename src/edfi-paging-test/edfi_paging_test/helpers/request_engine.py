@@ -0,0 +1,11 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from edfi_paging_test.helpers.case_insensitive_enum import CaseInsensitiveEnum
+
+
+class RequestEngine(CaseInsensitiveEnum):
+    THREADS = "THREADS"
+    ASYNC = "ASYNC"
@@ -3,60 +3,112 @@
 # The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
 # See the LICENSE and NOTICES files in the project root for more information.
 
-import random
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Number of set bits in each possible byte
+_BITS_SET = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.int64)
+
+# Position, from the most significant bit, of the n-th set bit of each byte
+_NTH_BIT_SET = np.array(
+    [[position for position in range(8) if byte & (0x80 >> position)] + [0] * (8 - bin(byte).count("1"))
+     for byte in range(256)],
+    dtype=np.int64,
+)
 
 
 class ResourceEntriesCache:
 
-    def __init__(self, entries: List[Dict[str, Any]], filters: List[str]):
+    def __init__(self, entries: List[Dict[str, Any]], filters: List[str], seed: Optional[int] = None):
         """
-        Stores the given resource entries in a columnar fashion to speed up local searches.
+        Indexes the given resource entries to speed up local searches. For
+        each filter, a bitmap holds one bit per entry, set when the entry has
+        a non-null value for the filter.
 
         Args:
             entries: Resource entries
             filters: List of filters that a resource supports
+            seed: Optional seed for choosing among the matching entries
+        """
+
+        self.entries = entries
+        self._random = np.random.default_rng(seed)
+        self._cardinality_by_filter_name: Dict[str, int] = {}
+
+        # One bit per entry, packed eight entries to a byte
+        self.bitmaps_by_filter_name: Dict[str, np.ndarray] = {
+            filter: np.packbits(
+                np.fromiter((entry.get(filter) is not None for entry in entries), dtype=bool, count=len(entries))
+            )
+            for filter in filters
+        }
+
+    def _get_bitmap(self, filters: Tuple[str, ...]) -> np.ndarray:
+        return np.bitwise_and.reduce([self.bitmaps_by_filter_name[filter] for filter in filters])
+
+    def count_entries_with_non_null_filters(self, filters: Tuple[str, ...]) -> int:
+        """
+        Counts the resource entries that have non-null values for all the
+        specified filters.
+
+        Args:
+            filters: The required filters
+        """
+
+        if len(filters) == 0:
+            return len(self.entries)
+
+        return int(_BITS_SET[self._get_bitmap(filters)].sum())
+
+    def get_cardinality(self, filter: str) -> int:
         """
+        Number of distinct non-null values of a filter among the entries,
+        computed on first use.
 
-        # Create a dictionary where the key is the filter name and the value is a list of entries
-        # with a non-null value for the given filter
-        self.resources_by_filter_name: Dict[str, list[Dict[str, Any]]] = {filter: [] for filter in filters}
+        Args:
+            filter: The filter name
+        """
 
-        for entry in entries:
-            for filter in filters:
-                if filter in entry and entry[filter] is not None:
-                    self.resources_by_filter_name[filter].append(entry)
+        cardinality = self._cardinality_by_filter_name.get(filter)
+        if cardinality is None:
+            values = {
+                # Object and array values are not hashable; compare them by text
+                repr(value) if isinstance(value, (dict, list)) else value
+                for value in (entry.get(filter) for entry in self.entries)
+                if value is not None
+            }
+            cardinality = self._cardinality_by_filter_name[filter] = len(values)
+
+        return cardinality
 
     def get_entries_with_non_null_filters(self, filters: Tuple[str, ...], count: int) -> List[Dict[str, Any]]:
         """
-        Searches through the resource entries to find the ones that have non-null values
-        for all the specified filters, up to the requested count.
+        Finds the resource entries that have non-null values for all the
+        specified filters, and returns up to the requested count of them,
+        chosen at random.
 
         Args:
             filters: The required filters
             count: Maximum number of matching entries to return
         """
 
-        # Get the filter with the highest cardinality
-        entries = list(self.resources_by_filter_name.items())[0][1]
-        for filter in filters:
-            if len(self.resources_by_filter_name[filter]) < len(entries):
-                entries = self.resources_by_filter_name[filter]
-
-        random.shuffle(entries)
+        if len(filters) == 0:
+            return self.entries[:count]
 
-        result: List[Dict[str, Any]] = []
-        for entry in entries:
-            has_all_non_null_filters = True
-            for filter in filters:
-                if filter not in entry or entry[filter] is None:
-                    has_all_non_null_filters = False
-                    break
+        bitmap = self._get_bitmap(filters)
 
-            if has_all_non_null_filters:
-                result.append(entry)
+        # Pick matching entries by rank among the set bits, e.g. the 3rd and
+        # the 17th match, then locate just those bits
+        bits_set_before = np.cumsum(_BITS_SET[bitmap])
+        matches = int(bits_set_before[-1]) if len(bitmap) > 0 else 0
+        if matches <= count:
+            ranks = np.arange(matches)
+        else:
+            ranks = np.sort(self._random.choice(matches, size=count, replace=False))
 
-            if len(result) >= count:
-                break
+        byte_indexes = np.searchsorted(bits_set_before, ranks, side="right")
+        rank_in_byte = ranks - (bits_set_before[byte_indexes] - _BITS_SET[bitmap[byte_indexes]])
+        ordinals = byte_indexes * 8 + _NTH_BIT_SET[bitmap[byte_indexes], rank_in_byte]
 
-        return result
+        return [self.entries[ordinal] for ordinal in ordinals]
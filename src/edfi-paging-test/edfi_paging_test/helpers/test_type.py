@@ -9,6 +9,7 @@ from edfi_paging_test.helpers.case_insensitive_enum import CaseInsensitiveEnum
 class TestType(CaseInsensitiveEnum):
     DEEP_PAGING = "DEEP_PAGING"
     FILTERED_READ = "FILTERED_READ"
+    PARTITIONED_PAGING = "PARTITIONED_PAGING"
 
     def __eq__(self, other: object) -> bool:
         try:
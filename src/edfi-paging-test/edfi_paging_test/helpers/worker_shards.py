@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from dataclasses import dataclass, field
+import heapq
+from typing import Callable, Dict, List, Sequence, Tuple, TypeVar
+
+from edfi_paging_test.helpers.paging_schedule import PageRange, plan_page_ranges
+
+T = TypeVar("T")
+
+
+@dataclass
+class Shard:
+    """
+    The part of a run given to one worker process: the resources it reads,
+    with their total counts as read by the coordinator, so that the worker
+    does not request them again, and, when the pages of the resources are
+    split between the workers, the page ranges it reads at each page size.
+    Without page ranges, the worker reads its resources whole.
+    """
+
+    worker: int
+    resource_names: List[str] = field(default_factory=list)
+    page_ranges_by_page_size: Dict[int, List[PageRange]] = field(default_factory=dict)
+    total_count_by_resource_name: Dict[str, int] = field(default_factory=dict)
+
+
+def _assign_largest_first(items: Sequence[T], size: Callable[[T], int], workers: int) -> List[List[T]]:
+    """
+    Assigns each item, largest first, to the worker with the least assigned
+    so far (LPT scheduling).
+    """
+    assigned: List[List[T]] = [[] for _ in range(workers)]
+    loads: List[Tuple[int, int]] = [(0, worker) for worker in range(workers)]
+    for item in sorted(items, key=lambda item: -size(item)):
+        load, worker = heapq.heappop(loads)
+        assigned[worker].append(item)
+        heapq.heappush(loads, (load + size(item), worker))
+
+    return assigned
+
+
+def plan_resource_shards(total_count_by_resource_name: Dict[str, int], workers: int) -> List[Shard]:
+    """
+    Splits the resources between `workers` workers, balancing their total
+    counts. Workers left without a resource are dropped.
+    """
+    assigned = _assign_largest_first(
+        list(total_count_by_resource_name), lambda resource_name: total_count_by_resource_name[resource_name], workers
+    )
+
+    assigned = [resource_names for resource_names in assigned if len(resource_names) > 0]
+    return [
+        Shard(
+            worker,
+            resource_names,
+            total_count_by_resource_name={resource_name: total_count_by_resource_name[resource_name] for resource_name in resource_names},
+        )
+        for worker, resource_names in enumerate(assigned, start=1)
+    ]
+
+
+def plan_page_range_shards(
+    total_count_by_resource_name: Dict[str, int], page_sizes: List[int], connections: int, workers: int
+) -> List[Shard]:
+    """
+    Splits the pages of the resources between `workers` workers, at each
+    page size. The pages are planned into ranges for `connections` times
+    `workers` connections, as for a single process, and the ranges are then
+    assigned to the workers, balancing their number of pages. Workers left
+    without a range are dropped.
+    """
+    shards = [Shard(worker) for worker in range(1, workers + 1)]
+    for page_size in page_sizes:
+        page_ranges = plan_page_ranges(total_count_by_resource_name, page_size, connections * workers)
+        assigned = _assign_largest_first(page_ranges, lambda page_range: page_range.number_of_pages, workers)
+        for shard, shard_ranges in zip(shards, assigned):
+            shard.page_ranges_by_page_size[page_size] = shard_ranges
+
+    for shard in shards:
+        resource_names = {
+            page_range.resource_name
+            for page_ranges in shard.page_ranges_by_page_size.values()
+            for page_range in page_ranges
+        }
+        shard.resource_names = [resource_name for resource_name in total_count_by_resource_name if resource_name in resource_names]
+        shard.total_count_by_resource_name = {
+            resource_name: total_count_by_resource_name[resource_name] for resource_name in shard.resource_names
+        }
+
+    shards = [shard for shard in shards if len(shard.resource_names) > 0]
+    for worker, shard in enumerate(shards, start=1):
+        shard.worker = worker
+
+    return shards
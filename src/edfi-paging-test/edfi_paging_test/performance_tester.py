@@ -3,76 +3,707 @@
 # The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
 # See the LICENSE and NOTICES files in the project root for more information.
 
+from abc import ABC, abstractmethod
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import replace
 from datetime import datetime
-from itertools import chain, combinations
+from http import HTTPStatus
+from itertools import count
 import logging
+from math import ceil
+import multiprocessing
+from os import path
+from queue import Queue
 import time
-from typing import Any, Dict, List, Tuple
+from timeit import default_timer
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
-from pandas import DataFrame, Series
+from errorhandler import ErrorHandler
+from pandas import DataFrame
 
+from edfi_paging_test.api.async_request_client import AsyncRequestClient
+from edfi_paging_test.api.paginated_result import PaginatedResult
 from edfi_paging_test.api.request_client import RequestClient
+from edfi_paging_test.api.request_client_base import RequestClientBase
 from edfi_paging_test.reporter import reporter
 from edfi_paging_test.helpers.main_arguments import MainArguments
 from edfi_paging_test.helpers.output_format import OutputFormat
-from edfi_paging_test.helpers.api_metadata import get_filters_by_resource_name
+from edfi_paging_test.helpers.api_metadata import get_filters_by_resource_name, get_partitioned_resource_names
+from edfi_paging_test.helpers.arrival_profile import ArrivalProfile
+from edfi_paging_test.helpers.concurrency_search import ConcurrencySearch, ConcurrencyStep
 from edfi_paging_test.reporter.summary import Summary
+from edfi_paging_test.reporter.detail_writer import DetailSource, DetailStreamer, DetailWriter
+from edfi_paging_test.reporter.depth_model import fit_depth_model, log_worst_resources
+from edfi_paging_test.reporter.latency_histogram import LatencyHistogram
+from edfi_paging_test.helpers.request_engine import RequestEngine
 from edfi_paging_test.helpers.test_type import TestType
 from edfi_paging_test.helpers.resource_entries_cache import ResourceEntriesCache
+from edfi_paging_test.helpers.filter_planner import plan_filter_combinations
+from edfi_paging_test.helpers.entries_reservoir import EntriesReservoir
+from edfi_paging_test.helpers.paging_schedule import (
+    PageRange,
+    PagingProgress,
+    count_range_records,
+    log_schedule,
+    plan_page_ranges,
+)
+from edfi_paging_test.helpers.checkpoint import Checkpoint
+from edfi_paging_test.helpers.log_configuration import configure_logging
+from edfi_paging_test.helpers.worker_shards import Shard, plan_page_range_shards, plan_resource_shards
 
-from edfi_paging_test.reporter.paging_request_logger import PaggingRequestLogger
+from edfi_paging_test.reporter.paging_request_logger import LOG_REQUEST_COLUMNS, PaggingRequestLogger
 from edfi_paging_test.reporter.filtered_read_request_logger import FilteredReadRequestLogger
+from edfi_paging_test.reporter.partition_request_logger import PartitionRequestLogger
+from edfi_paging_test.reporter.live_metrics import LiveMetrics
+from edfi_paging_test.reporter.metrics_server import MetricsServer
+from edfi_paging_test.reporter.snapshot_writer import SnapshotWriter
 
 logger = logging.getLogger(__name__)
 
 
-def _generate_output_reports(args: MainArguments, df: DataFrame, statistics: Series) -> None:
-    run_name = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
-    create_detail_out = {
-        OutputFormat.CSV: reporter.create_detail_csv,
-        OutputFormat.JSON: reporter.create_detail_json,
-    }
-    create_detail_out[args.contentType](df, args.output, run_name)
-
+def _generate_output_reports(
+    args: MainArguments,
+    run_name: str,
+    statistics: DataFrame,
+    breakdown: DataFrame,
+    depth_model: Optional[DataFrame],
+    concurrency_search: Optional[ConcurrencySearch] = None,
+) -> None:
     create_statistics_out = {
         OutputFormat.CSV: reporter.create_statistics_csv,
         OutputFormat.JSON: reporter.create_statistics_json,
+        OutputFormat.PARQUET: reporter.create_statistics_parquet,
     }
     create_statistics_out[args.contentType](statistics, args.output, run_name)
+
+    create_breakdown_out = {
+        OutputFormat.CSV: reporter.create_breakdown_csv,
+        OutputFormat.JSON: reporter.create_breakdown_json,
+        OutputFormat.PARQUET: reporter.create_breakdown_parquet,
+    }
+    create_breakdown_out[args.contentType](breakdown, args.output, run_name)
+
+    if depth_model is not None:
+        create_depth_model_out = {
+            OutputFormat.CSV: reporter.create_depth_model_csv,
+            OutputFormat.JSON: reporter.create_depth_model_json,
+            OutputFormat.PARQUET: reporter.create_depth_model_parquet,
+        }
+        create_depth_model_out[args.contentType](depth_model, args.output, run_name)
+
+    if concurrency_search is not None:
+        create_concurrency_search_out = {
+            OutputFormat.CSV: reporter.create_concurrency_search_csv,
+            OutputFormat.JSON: reporter.create_concurrency_search_json,
+            OutputFormat.PARQUET: reporter.create_concurrency_search_parquet,
+        }
+        create_concurrency_search_out[args.contentType](concurrency_search.get_DataFrame(), args.output, run_name)
+
     summary = Summary(
-        run_name=run_name, run_configration=args
+        run_name=run_name,
+        run_configration=args,
+        concurrency_search=concurrency_search.get_summary() if concurrency_search is not None else None,
     )
     reporter.create_summary_json(summary.get_DataFrame(), args.output, run_name)
 
 
-def fetch_resource_entries(request_client: RequestClient, resource_name: str, pagingRequestLogger: PaggingRequestLogger) -> Tuple[str, List[Dict[str, Any]]]:
-    entries = request_client.get_all(resource_name, pagingRequestLogger)
-    total_count = request_client.get_total(resource_name)
+def _get_sample_capacity(args: MainArguments) -> Optional[int]:
+    """
+    Number of entries to keep per resource while paging. Deep paging only
+    counts records; filtered reads need entries to take filter values from.
+    """
+    if args.test_type != TestType.FILTERED_READ:
+        return 0
+
+    return args.filter_sample_size if args.filter_sample_size > 0 else None
+
+
+def _get_page_sizes(args: MainArguments) -> List[int]:
+    """
+    Page sizes to page the resources at, one after the other.
+    """
+    return args.page_sizes if len(args.page_sizes) > 0 else [args.pageSize]
+
 
-    if len(entries) != total_count:
+def _log_page_size_step(request_logger: Any, page_size: int, number_of_records: int, seconds: float) -> None:
+    """
+    Logs the throughput and request latency of one page size of a sweep.
+    """
+    percentiles = request_logger.get_page_size_percentiles().get(page_size, {})
+    records_per_second = number_of_records / seconds if seconds > 0 else 0.0
+    logger.info(
+        f"Page size {page_size}: {number_of_records} records in {seconds:.3f} seconds "
+        f"({records_per_second:.1f} records per second); request latency P50 {percentiles.get('P50', 0.0)}, "
+        f"P95 {percentiles.get('P95', 0.0)} seconds."
+    )
+
+
+def _warn_on_count_mismatch(resource_name: str, total_count: int, count: int) -> None:
+    if count != total_count:
         logger.warn(
-            f"{resource_name}: expected {total_count} results, got: {len(entries)}"
+            f"{resource_name}: expected {total_count} results, got: {count}"
+        )
+
+
+class _Transport(ABC):
+    """
+    The requests of a run as awaitables, whichever request engine sends them,
+    so that every mode of a run is driven by the same code. `client` is the
+    request client, whose page size and settings the run changes as it goes.
+    The `read_*` methods hand each page to `on_page` as it arrives, from the
+    thread that reads it.
+
+    Parameters
+    ----------
+    total_counts : Optional[Dict[str, int]]
+        Total counts already read, e.g. by the coordinator of worker
+        processes, which `get_total` returns without a request.
+    """
+
+    client: RequestClientBase
+
+    def __init__(self, total_counts: Optional[Dict[str, int]] = None) -> None:
+        self.total_counts = dict(total_counts or {})
+
+    async def get_total(self, resource_name: str) -> int:
+        total_count = self.total_counts.get(resource_name)
+        if total_count is None:
+            total_count = await self._get_total(resource_name)
+        return total_count
+
+    @abstractmethod
+    async def _get_total(self, resource_name: str) -> int:
+        ...
+
+    @abstractmethod
+    async def get_page(
+        self, resource_name: str, paggingRequestLogger: PaggingRequestLogger, page: int, scheduled_at: Optional[float] = None
+    ) -> PaginatedResult:
+        ...
+
+    @abstractmethod
+    async def read_pages(
+        self, resource_name: str, paggingRequestLogger: PaggingRequestLogger, on_page: Callable[[PaginatedResult], None]
+    ) -> None:
+        ...
+
+    @abstractmethod
+    async def read_pages_parallel(
+        self,
+        resource_name: str,
+        paggingRequestLogger: PaggingRequestLogger,
+        total_count: int,
+        window: int,
+        on_page: Callable[[PaginatedResult], None],
+    ) -> None:
+        ...
+
+    @abstractmethod
+    async def filtered_get(
+        self, resource_name: str, filters: Dict[str, str], limit: int, filteredReadRequestLogger: FilteredReadRequestLogger
+    ) -> List[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    async def get_partition_page_tokens(self, resource_name: str, number: int) -> List[str]:
+        ...
+
+    @abstractmethod
+    async def read_partition_pages(
+        self,
+        resource_name: str,
+        partitionRequestLogger: PartitionRequestLogger,
+        partition: int,
+        page_token: str,
+        on_page: Callable[[PaginatedResult], None],
+    ) -> None:
+        ...
+
+
+class _ThreadTransport(_Transport):
+    """
+    Runs the blocking calls of a RequestClient on the threads of an
+    executor, one thread per connection of the client's pool. The pages of
+    a `read_*` call are all read on one thread.
+    """
+
+    def __init__(
+        self, client: RequestClient, executor: ThreadPoolExecutor, total_counts: Optional[Dict[str, int]] = None
+    ) -> None:
+        super().__init__(total_counts)
+        self.client = client
+        self._request_client = client
+        self._executor = executor
+        self._loop = asyncio.get_event_loop()
+
+    def _call(self, function: Callable[..., Any], *args: Any) -> Awaitable[Any]:
+        return self._loop.run_in_executor(self._executor, function, *args)
+
+    async def _read(self, pages: Iterator[PaginatedResult], on_page: Callable[[PaginatedResult], None]) -> None:
+        def read() -> None:
+            for page in pages:
+                on_page(page)
+
+        await self._call(read)
+
+    async def _get_total(self, resource_name: str) -> int:
+        return await self._call(self._request_client.get_total, resource_name)
+
+    async def get_page(
+        self, resource_name: str, paggingRequestLogger: PaggingRequestLogger, page: int, scheduled_at: Optional[float] = None
+    ) -> PaginatedResult:
+        return await self._call(self._request_client.get_page, resource_name, paggingRequestLogger, page, scheduled_at)
+
+    async def read_pages(
+        self, resource_name: str, paggingRequestLogger: PaggingRequestLogger, on_page: Callable[[PaginatedResult], None]
+    ) -> None:
+        await self._read(self._request_client.iter_pages(resource_name, paggingRequestLogger), on_page)
+
+    async def read_pages_parallel(
+        self,
+        resource_name: str,
+        paggingRequestLogger: PaggingRequestLogger,
+        total_count: int,
+        window: int,
+        on_page: Callable[[PaginatedResult], None],
+    ) -> None:
+        await self._read(
+            self._request_client.iter_pages_parallel(resource_name, paggingRequestLogger, total_count, window), on_page
+        )
+
+    async def filtered_get(
+        self, resource_name: str, filters: Dict[str, str], limit: int, filteredReadRequestLogger: FilteredReadRequestLogger
+    ) -> List[Dict[str, Any]]:
+        return await self._call(self._request_client.filtered_get, resource_name, filters, limit, filteredReadRequestLogger)
+
+    async def get_partition_page_tokens(self, resource_name: str, number: int) -> List[str]:
+        return await self._call(self._request_client.get_partition_page_tokens, resource_name, number)
+
+    async def read_partition_pages(
+        self,
+        resource_name: str,
+        partitionRequestLogger: PartitionRequestLogger,
+        partition: int,
+        page_token: str,
+        on_page: Callable[[PaginatedResult], None],
+    ) -> None:
+        await self._read(
+            self._request_client.iter_partition_pages(resource_name, partitionRequestLogger, partition, page_token), on_page
+        )
+
+
+class _AsyncTransport(_Transport):
+    """
+    Awaits the calls of an open AsyncRequestClient on the event loop.
+    """
+
+    def __init__(self, client: AsyncRequestClient, total_counts: Optional[Dict[str, int]] = None) -> None:
+        super().__init__(total_counts)
+        self.client = client
+        self._request_client = client
+
+    async def _read(self, pages: AsyncIterator[PaginatedResult], on_page: Callable[[PaginatedResult], None]) -> None:
+        async for page in pages:
+            on_page(page)
+
+    async def _get_total(self, resource_name: str) -> int:
+        return await self._request_client.get_total(resource_name)
+
+    async def get_page(
+        self, resource_name: str, paggingRequestLogger: PaggingRequestLogger, page: int, scheduled_at: Optional[float] = None
+    ) -> PaginatedResult:
+        return await self._request_client.get_page(resource_name, paggingRequestLogger, page, scheduled_at)
+
+    async def read_pages(
+        self, resource_name: str, paggingRequestLogger: PaggingRequestLogger, on_page: Callable[[PaginatedResult], None]
+    ) -> None:
+        await self._read(self._request_client.iter_pages(resource_name, paggingRequestLogger), on_page)
+
+    async def read_pages_parallel(
+        self,
+        resource_name: str,
+        paggingRequestLogger: PaggingRequestLogger,
+        total_count: int,
+        window: int,
+        on_page: Callable[[PaginatedResult], None],
+    ) -> None:
+        await self._read(
+            self._request_client.iter_pages_parallel(resource_name, paggingRequestLogger, total_count, window), on_page
+        )
+
+    async def filtered_get(
+        self, resource_name: str, filters: Dict[str, str], limit: int, filteredReadRequestLogger: FilteredReadRequestLogger
+    ) -> List[Dict[str, Any]]:
+        return await self._request_client.filtered_get(resource_name, filters, limit, filteredReadRequestLogger)
+
+    async def get_partition_page_tokens(self, resource_name: str, number: int) -> List[str]:
+        return await self._request_client.get_partition_page_tokens(resource_name, number)
+
+    async def read_partition_pages(
+        self,
+        resource_name: str,
+        partitionRequestLogger: PartitionRequestLogger,
+        partition: int,
+        page_token: str,
+        on_page: Callable[[PaginatedResult], None],
+    ) -> None:
+        await self._read(
+            self._request_client.iter_partition_pages(resource_name, partitionRequestLogger, partition, page_token), on_page
+        )
+
+
+@asynccontextmanager
+async def _open_transport(
+    args: MainArguments, total_counts: Optional[Dict[str, int]] = None
+) -> AsyncIterator[_Transport]:
+    """
+    Opens the request client of the request engine of `args`, for the
+    duration of an `async with` block.
+    """
+    if args.request_engine == RequestEngine.ASYNC:
+        async with AsyncRequestClient(args) as async_request_client:
+            yield _AsyncTransport(async_request_client, total_counts)
+    else:
+        executor = ThreadPoolExecutor(max_workers=args.connectionLimit)
+        try:
+            yield _ThreadTransport(RequestClient(args), executor, total_counts)
+        finally:
+            executor.shutdown(wait=False)
+
+
+async def fetch_resource_entries(transport: _Transport, resource_name: str, pagingRequestLogger: PaggingRequestLogger, page_fan_out: int = 1, sample_capacity: Optional[int] = None) -> Tuple[str, EntriesReservoir]:
+    """
+    Pages through every entry of the resource. Each page is counted and
+    sampled into an `EntriesReservoir` and then discarded.
+    """
+    reservoir = EntriesReservoir(sample_capacity)
+
+    def on_page(page: PaginatedResult) -> None:
+        reservoir.add(page.current_page_items, page.size)
+
+    if page_fan_out > 1:
+        total_count = await transport.get_total(resource_name)
+        await transport.read_pages_parallel(resource_name, pagingRequestLogger, total_count, page_fan_out, on_page)
+    else:
+        await transport.read_pages(resource_name, pagingRequestLogger, on_page)
+        total_count = await transport.get_total(resource_name)
+
+    _warn_on_count_mismatch(resource_name, total_count, reservoir.count)
+
+    return (resource_name, reservoir)
+
+
+def _interleave_pages(page_counts: Dict[str, int]) -> Iterator[Tuple[str, int]]:
+    """
+    Every page of every resource: the first page of each resource, then the
+    second page of each, and so on, so that all resources are read at once
+    and each one from its shallowest page to its deepest.
+    """
+    active = list(page_counts.keys())
+    for page in count(1):
+        active = [resource_name for resource_name in active if page_counts[resource_name] >= page]
+        if len(active) == 0:
+            return
+
+        for resource_name in active:
+            yield (resource_name, page)
+
+
+async def fetch_resources_entries_at_arrival_rate(
+    resource_names: List[str],
+    profile: ArrivalProfile,
+    get_total: Callable[[str], Awaitable[int]],
+    get_page: Callable[[str, int, float], Awaitable[PaginatedResult]],
+    page_size: int,
+    sample_capacity: Optional[int] = None,
+) -> Dict[str, EntriesReservoir]:
+    """
+    Pages through every entry of the resources in an open model: page
+    requests are sent on the schedule of the arrival profile whether or not
+    the earlier requests have returned, so a slower server faces the same
+    load instead of a lighter one. Page offsets are derived from the total
+    count of each resource, and `get_page` is given the time at which each
+    request was due, to measure its elapsed time from then.
+    """
+    totals = await asyncio.gather(*[get_total(resource_name) for resource_name in resource_names])
+    total_count_by_resource_name = dict(zip(resource_names, totals))
+    reservoirs = {resource_name: EntriesReservoir(sample_capacity) for resource_name in resource_names}
+    page_counts = {
+        resource_name: max(1, ceil(total_count / page_size))
+        for resource_name, total_count in total_count_by_resource_name.items()
+    }
+
+    logger.info(
+        f"Sending {sum(page_counts.values())} page requests on schedule, starting at {profile.start_rate} "
+        f"and ending at {profile.final_rate} requests per second..."
+    )
+
+    in_flight: Dict[asyncio.Future, str] = {}
+    failed: List[asyncio.Future] = []
+
+    def collect(task: asyncio.Future) -> None:
+        # Called by the event loop as each request completes, so that the
+        # schedule never waits on a scan of the requests in flight
+        resource_name = in_flight.pop(task)
+        if task.cancelled() or task.exception() is not None:
+            failed.append(task)
+            return
+        reservoirs[resource_name].add(task.result().current_page_items, task.result().size)
+
+    start = default_timer()
+    sent = 0
+    max_lag = 0.0
+    for (resource_name, page), send_time in zip(_interleave_pages(page_counts), profile.send_times()):
+        scheduled_at = start + send_time
+
+        # Always yield to the event loop, even when behind schedule, so that
+        # the requests already sent keep making progress
+        await asyncio.sleep(max(scheduled_at - default_timer(), 0))
+        max_lag = max(max_lag, default_timer() - scheduled_at)
+
+        task = asyncio.ensure_future(get_page(resource_name, page, scheduled_at))
+        in_flight[task] = resource_name
+        task.add_done_callback(collect)
+        sent += 1
+        if len(failed) > 0:
+            # Raises the error of the first failed request
+            failed[0].result()
+
+    duration = default_timer() - start
+    if len(in_flight) > 0:
+        await asyncio.wait(list(in_flight))
+    if len(failed) > 0:
+        failed[0].result()
+
+    logger.info(f"Sent {sent} page requests in {duration:.1f} seconds, {sent / max(duration, 1e-9):.1f} requests per second.")
+    if max_lag > 1:
+        logger.warning(
+            f"Requests were sent up to {max_lag:.1f} seconds behind schedule: the client could not keep up with the "
+            "arrival rate. Their elapsed times still count from when they were due."
         )
 
-    return (resource_name, entries)
+    for resource_name, reservoir in reservoirs.items():
+        _warn_on_count_mismatch(resource_name, total_count_by_resource_name[resource_name], reservoir.count)
+
+    return reservoirs
+
+
+async def fetch_resources_entries_largest_first(
+    resource_names: List[str],
+    get_total: Callable[[str], Awaitable[int]],
+    get_page: Callable[[str, int], Awaitable[PaginatedResult]],
+    page_size: int,
+    workers: int,
+    sample_capacity: Optional[int] = None,
+    checkpoint: Optional[Checkpoint] = None,
+    plan_ranges: Callable[[Dict[str, int], int, int], List[PageRange]] = plan_page_ranges,
+) -> Dict[str, EntriesReservoir]:
+    """
+    Pages through every entry of the resources with `workers` workers. The
+    total count of every resource is read first, and the pages are then
+    planned into ranges by `plan_ranges`, largest first, with the largest
+    resources split across workers. Each worker reads one range at a time,
+    page after page. In a worker process, `plan_ranges` gives the ranges the
+    coordinator assigned to it, which may be parts of a resource only.
+
+    Progress is recorded in `checkpoint`. When the checkpoint already holds
+    ranges for this page size, i.e. when resuming, the ranges are read on
+    from where they were left instead.
+    """
+    # Bound apart from the optional argument, for read_ranges to see it as set
+    run_checkpoint = checkpoint if checkpoint is not None else Checkpoint()
+
+    ranges = run_checkpoint.get_ranges(page_size)
+    resuming = ranges is not None
+    if ranges is not None:
+        total_count_by_resource_name = run_checkpoint.total_count_by_resource_name
+        logger.info(f"Resuming with {len([r for r in ranges if not r.finished])} unfinished page ranges...")
+    else:
+        totals = await asyncio.gather(*[get_total(resource_name) for resource_name in resource_names])
+        total_count_by_resource_name = dict(zip(resource_names, totals))
+        ranges = run_checkpoint.start_page_size(
+            page_size, total_count_by_resource_name, plan_ranges(total_count_by_resource_name, page_size, workers)
+        )
+
+    # The records the ranges hold, which are all the records of a resource
+    # unless its pages are split with other worker processes
+    expected_by_resource_name: Dict[str, int] = {}
+    for range_progress in ranges:
+        resource_name = range_progress.page_range.resource_name
+        expected_by_resource_name[resource_name] = expected_by_resource_name.get(resource_name, 0) + count_range_records(
+            range_progress.page_range, total_count_by_resource_name[resource_name], page_size
+        )
+    if not resuming:
+        log_schedule(expected_by_resource_name, [range_progress.page_range for range_progress in ranges])
+
+    reservoirs = {resource_name: EntriesReservoir(sample_capacity) for resource_name in expected_by_resource_name}
+    for range_progress in ranges:
+        reservoirs[range_progress.page_range.resource_name].count += range_progress.records
+
+    unfinished = deque(range_progress for range_progress in ranges if not range_progress.finished)
+    paging_progress = PagingProgress(
+        sum(expected_by_resource_name.values()) - sum(range_progress.records for range_progress in ranges)
+    )
+
+    async def read_ranges() -> None:
+        while len(unfinished) > 0:
+            range_progress = unfinished.popleft()
+            page_range = range_progress.page_range
+
+            page = range_progress.next_page
+            while page_range.last_page is None or page <= page_range.last_page:
+                pagination_result = await get_page(page_range.resource_name, page)
+                reservoirs[page_range.resource_name].add(pagination_result.current_page_items, pagination_result.size)
+                paging_progress.add(pagination_result.size)
+                run_checkpoint.record_page(range_progress, pagination_result.size)
 
+                # As in iter_pages, the second page is always requested
+                if page > 1 and pagination_result.size < page_size:
+                    break
+                page += 1
 
-def fetch_filtered_resources_entries(request_client: RequestClient, resource_name: str, resource: Dict[str, Any], filters: Tuple[str, ...], filteredReadRequestLogger: FilteredReadRequestLogger):
+            run_checkpoint.finish_range(range_progress)
+
+    await asyncio.gather(*[read_ranges() for _ in range(min(workers, len(unfinished)))])
+    run_checkpoint.finish_page_size()
+
+    for resource_name, reservoir in reservoirs.items():
+        _warn_on_count_mismatch(resource_name, expected_by_resource_name[resource_name], reservoir.count)
+
+    return reservoirs
+
+
+async def search_concurrency(
+    search: ConcurrencySearch,
+    resource_names: List[str],
+    get_total: Callable[[str], Awaitable[int]],
+    get_page: Callable[[str, int], Awaitable[PaginatedResult]],
+    page_size: int,
+    step_seconds: float,
+) -> None:
+    """
+    Runs the steps of the concurrency search in turn. Each step keeps as many
+    page requests in flight as its concurrency, sending a new one as soon as
+    one returns, for `step_seconds`. Pages are read from every resource at
+    once, from the shallowest to the deepest, and read again from the start
+    when the search outlasts them. Requests still in flight when a step ends
+    are counted in the next step.
+    """
+    # Otherwise there would be no page to repeat, and the search would never
+    # send a request nor finish
+    if len(resource_names) == 0:
+        raise RuntimeError("The concurrency search needs at least one resource to read.")
+
+    totals = await asyncio.gather(*[get_total(resource_name) for resource_name in resource_names])
+    page_counts = {
+        resource_name: max(1, ceil(total_count / page_size))
+        for resource_name, total_count in zip(resource_names, totals)
+    }
+
+    def repeat_pages() -> Iterator[Tuple[str, int]]:
+        while True:
+            yield from _interleave_pages(page_counts)
+
+    pages = repeat_pages()
+
+    async def timed_get_page(resource_name: str, page: int) -> Tuple[float, PaginatedResult]:
+        start = default_timer()
+        result = await get_page(resource_name, page)
+        return (default_timer() - start, result)
+
+    in_flight: Set[asyncio.Future] = set()
+    concurrency = search.next_concurrency()
+    while concurrency is not None:
+        histogram = LatencyHistogram()
+        errors = 0
+        step_start = default_timer()
+        step_end = step_start + step_seconds
+
+        while True:
+            # After a step down, requests are not replaced until fewer than
+            # the new concurrency are in flight
+            while len(in_flight) < concurrency:
+                in_flight.add(asyncio.ensure_future(timed_get_page(*next(pages))))
+
+            remaining = step_end - default_timer()
+            if remaining <= 0:
+                break
+
+            done, in_flight = await asyncio.wait(in_flight, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                elapsed, result = task.result()
+                histogram.record(elapsed)
+                if result.status_code >= HTTPStatus.BAD_REQUEST:
+                    errors += 1
+
+        step = ConcurrencyStep(concurrency, histogram.count, errors, default_timer() - step_start, histogram.get_percentiles())
+        search.record(step)
+        logger.info(
+            f"Concurrency {concurrency}: {step.throughput:.1f} requests per second, "
+            f"P50 {step.latencies['P50']:.3f}s, P95 {step.latencies['P95']:.3f}s, P99 {step.latencies['P99']:.3f}s"
+        )
+
+        concurrency = search.next_concurrency()
+
+    if len(in_flight) > 0:
+        await asyncio.wait(in_flight)
+
+
+async def fetch_filtered_resources_entries(transport: _Transport, resource_name: str, resource: Dict[str, Any], filters: Tuple[str, ...], filteredReadRequestLogger: FilteredReadRequestLogger):
     """
     Retrieves the first 100 entries that match the given filters.
     The filter values are taken from the provided resource entry.
     """
 
     params = {filter: resource[filter] for filter in filters}
-    entries = request_client.filtered_get(resource_name, params, 100, filteredReadRequestLogger)
+    entries = await transport.filtered_get(resource_name, params, 100, filteredReadRequestLogger)
 
     if len(entries) == 0:
         logger.warning(
             f'Expected at least 1 entry to be returned while filtering the resource "{resource_name}"')
 
 
+async def fetch_partition_page_tokens(transport: _Transport, resource_name: str, partition_count: int) -> Tuple[str, int, List[str]]:
+    """
+    Reads the total count of the resource and asks the API to split it into
+    `partition_count` partitions.
+    """
+    total_count = await transport.get_total(resource_name)
+    page_tokens = await transport.get_partition_page_tokens(resource_name, partition_count)
+
+    return (resource_name, total_count, page_tokens)
+
+
+async def fetch_partition_entries(transport: _Transport, resource_name: str, partition: int, page_token: str, partitionRequestLogger: PartitionRequestLogger) -> Tuple[str, int]:
+    """
+    Pages through every entry of one partition of the resource, counting them.
+    """
+    reservoir = EntriesReservoir(0)
+    await transport.read_partition_pages(
+        resource_name, partitionRequestLogger, partition, page_token, lambda page: reservoir.add(page.current_page_items, page.size)
+    )
+
+    return (resource_name, reservoir.count)
+
+
+def _warn_on_partition_count_mismatch(
+    page_tokens_by_resource_name: List[Tuple[str, int, List[str]]], counts_by_partition: List[Tuple[str, int]]
+) -> None:
+    """
+    The partitions of a resource should, together, hold every entry of the
+    resource exactly once.
+    """
+    for resource_name, total_count, page_tokens in page_tokens_by_resource_name:
+        if len(page_tokens) == 0:
+            continue
+
+        count = sum(partition_count for name, partition_count in counts_by_partition if name == resource_name)
+        _warn_on_count_mismatch(resource_name, total_count, count)
+
+
 def invalid_resources(
     openapi_resources: List[str], resources_to_check: List[str]
 ) -> List[str]:
@@ -83,31 +714,411 @@ def capitalize_first(text):
     return text[0].upper() + text[1:]
 
 
-def get_filter_combinations(filters: List[str], combination_size_limit):
+def _build_filtered_queries(
+    args: MainArguments,
+    filters_by_resource_name: Dict[str, List[str]],
+    entries_by_resource_name: Dict[str, EntriesReservoir],
+) -> List[Tuple[str, Dict[str, Any], Tuple[str, ...]]]:
+    entries_to_query: List[Tuple[str, Dict[str, Any], Tuple[str, ...]]] = []
+
+    for resource_name, reservoir in entries_by_resource_name.items():
+        entries = reservoir.entries
+        if len(entries) == 0:
+            continue
+
+        supported_filters = filters_by_resource_name[resource_name]
+        entriesCache = ResourceEntriesCache(entries, supported_filters)
+
+        filter_plan = plan_filter_combinations(
+            resource_name, supported_filters, args.combination_size_limit, args.request_budget, entriesCache
+        )
+
+        for filter_combination, entry_count in filter_plan:
+            entries_with_non_null_filters = entriesCache.get_entries_with_non_null_filters(
+                filter_combination, entry_count)
+
+            if len(entries_with_non_null_filters) == 0:
+                continue
+
+            entries_to_query.extend([(resource_name, entry, filter_combination)
+                                    for entry in entries_with_non_null_filters])
+
+    return entries_to_query
+
+
+async def _run_requests(
+    args: MainArguments,
+    filters_by_resource_name: Dict[str, List[str]],
+    paggingRequestLogger: PaggingRequestLogger,
+    filteredReadRequestLogger: FilteredReadRequestLogger,
+    checkpoint: Optional[Checkpoint] = None,
+    plan_ranges: Callable[[Dict[str, int], int, int], List[PageRange]] = plan_page_ranges,
+    total_counts: Optional[Dict[str, int]] = None,
+) -> None:
+    async with _open_transport(args, total_counts) as transport:
+        # Deep paging only counts the records, without decoding them
+        transport.client.count_only = _get_sample_capacity(args) == 0
+        transport.client.live_metrics = paggingRequestLogger.live_metrics
+
+        page_sizes = _get_page_sizes(args)
+        entries_by_resource_name: Dict[str, EntriesReservoir] = {}
+        for page_size in page_sizes:
+            if checkpoint is not None and page_size in checkpoint.finished_page_sizes:
+                logger.info(f"Skipping page size {page_size}, finished before resuming.")
+                continue
+
+            # The same client, and so the same token and connections, for every page size
+            transport.client.page_size = page_size
+            step_start = default_timer()
+
+            if args.arrival_rate != "":
+                entries_by_resource_name = await fetch_resources_entries_at_arrival_rate(
+                    args.resourceList,
+                    ArrivalProfile.parse(args.arrival_rate),
+                    transport.get_total,
+                    lambda resource_name, page, scheduled_at: transport.get_page(
+                        resource_name, paggingRequestLogger, page, scheduled_at
+                    ),
+                    page_size,
+                    _get_sample_capacity(args),
+                )
+            elif args.page_fan_out == 1:
+                # One worker per connection
+                entries_by_resource_name = await fetch_resources_entries_largest_first(
+                    args.resourceList,
+                    transport.get_total,
+                    lambda resource_name, page: transport.get_page(resource_name, paggingRequestLogger, page),
+                    page_size,
+                    args.connectionLimit,
+                    _get_sample_capacity(args),
+                    checkpoint,
+                    plan_ranges,
+                )
+            else:
+                entries_by_resource_name = dict(
+                    await asyncio.gather(
+                        *[
+                            fetch_resource_entries(
+                                transport, target_resource, paggingRequestLogger, args.page_fan_out, _get_sample_capacity(args)
+                            )
+                            for target_resource in args.resourceList
+                        ]
+                    )
+                )
+
+            if len(page_sizes) > 1:
+                _log_page_size_step(
+                    paggingRequestLogger,
+                    page_size,
+                    sum(reservoir.count for reservoir in entries_by_resource_name.values()),
+                    default_timer() - step_start,
+                )
+
+        if args.test_type == TestType.FILTERED_READ:
+            logger.info("Starting filtered read tests...")
+
+            entries_to_query = _build_filtered_queries(args, filters_by_resource_name, entries_by_resource_name)
+
+            await asyncio.gather(
+                *[
+                    fetch_filtered_resources_entries(
+                        transport, resource_name, entry, filter_combination, filteredReadRequestLogger
+                    )
+                    for (resource_name, entry, filter_combination) in entries_to_query
+                ]
+            )
+
+
+async def _run_partitions(
+    args: MainArguments, partitionRequestLogger: PartitionRequestLogger, total_counts: Optional[Dict[str, int]] = None
+) -> None:
+    async with _open_transport(args, total_counts) as transport:
+        transport.client.count_only = True
+        transport.client.live_metrics = partitionRequestLogger.live_metrics
+        page_tokens_by_resource_name: List[Tuple[str, int, List[str]]] = await asyncio.gather(
+            *[
+                fetch_partition_page_tokens(transport, target_resource, args.partition_count)
+                for target_resource in args.resourceList
+            ]
+        )
+
+        page_sizes = _get_page_sizes(args)
+        for page_size in page_sizes:
+            transport.client.page_size = page_size
+            step_start = default_timer()
+
+            # Every partition of every resource is paged concurrently
+            counts_by_partition: List[Tuple[str, int]] = await asyncio.gather(
+                *[
+                    fetch_partition_entries(transport, resource_name, partition, page_token, partitionRequestLogger)
+                    for (resource_name, _, page_tokens) in page_tokens_by_resource_name
+                    for partition, page_token in enumerate(page_tokens, start=1)
+                ]
+            )
+
+            _warn_on_partition_count_mismatch(page_tokens_by_resource_name, counts_by_partition)
+            if len(page_sizes) > 1:
+                _log_page_size_step(
+                    partitionRequestLogger, page_size, sum(count for _, count in counts_by_partition), default_timer() - step_start
+                )
+
+
+async def _run_concurrency_search(args: MainArguments, paggingRequestLogger: PaggingRequestLogger) -> ConcurrencySearch:
+    search = ConcurrencySearch(args.connectionLimit)
+    logger.info(f"Searching for the saturation point, up to {args.connectionLimit} requests in flight...")
+
+    async with _open_transport(args) as transport:
+        transport.client.count_only = True
+        transport.client.live_metrics = paggingRequestLogger.live_metrics
+        await search_concurrency(
+            search,
+            args.resourceList,
+            transport.get_total,
+            lambda resource_name, page: transport.get_page(resource_name, paggingRequestLogger, page),
+            args.pageSize,
+            args.search_step_seconds,
+        )
+
+    summary = search.get_summary()
+    logger.info(
+        f"Throughput saturates at concurrency {summary.saturation_concurrency} "
+        f"({summary.saturation_throughput} requests per second); the highest throughput was at concurrency "
+        f"{summary.best_concurrency} ({summary.best_throughput} requests per second)."
+    )
+
+    return search
+
+
+async def _run_shard(
+    args: MainArguments, shard: Shard, filters_by_resource_name: Dict[str, List[str]], rows: "Queue[DataFrame]"
+) -> int:
+    paggingRequestLogger = PaggingRequestLogger()
+    filteredReadRequestLogger = FilteredReadRequestLogger()
+    partitionRequestLogger = PartitionRequestLogger()
+
+    request_logger: DetailSource = paggingRequestLogger
+    if args.test_type == TestType.FILTERED_READ:
+        request_logger = filteredReadRequestLogger
+    elif args.test_type == TestType.PARTITIONED_PAGING:
+        request_logger = partitionRequestLogger
+
+    def plan_shard_ranges(total_count_by_resource_name: Dict[str, int], page_size: int, workers: int) -> List[PageRange]:
+        # Planned by the coordinator, for every worker at once
+        return shard.page_ranges_by_page_size[page_size]
+
+    plan_ranges = plan_shard_ranges if len(shard.page_ranges_by_page_size) > 0 else plan_page_ranges
+
+    streamer = DetailStreamer(request_logger, rows, args.detail_flush_interval)
+    streamer.start()
+    try:
+        if args.test_type == TestType.PARTITIONED_PAGING:
+            await _run_partitions(args, partitionRequestLogger, shard.total_count_by_resource_name)
+        else:
+            await _run_requests(
+                args,
+                filters_by_resource_name,
+                paggingRequestLogger,
+                filteredReadRequestLogger,
+                None,
+                plan_ranges,
+                shard.total_count_by_resource_name,
+            )
+    finally:
+        # Whatever happened, hand over the detail of every request that completed
+        streamer.close()
+
+    return streamer.rows_written
+
+
+def run_worker(
+    args: MainArguments, shard: Shard, filters_by_resource_name: Dict[str, List[str]], rows: "Queue[DataFrame]"
+) -> Tuple[int, bool]:
+    """
+    Runs one shard of a run, in a worker process of `_run_with_workers`,
+    with a request client and request logger of its own. The detail of the
+    requests is put on `rows` as the run goes, in batches.
+
+    Returns
+    -------
+    Tuple[int, bool]
+        The number of requests sent, and whether an error was logged
+    """
+    configure_logging(args.log_level, shard.worker)
+    error_tracker = ErrorHandler()
+
+    requests = asyncio.run(_run_shard(args, shard, filters_by_resource_name, rows))
+
+    return (requests, error_tracker.fired)
+
+
+async def _get_total_counts(args: MainArguments) -> Dict[str, int]:
+    async with _open_transport(args) as transport:
+        totals = await asyncio.gather(*[transport.get_total(resource_name) for resource_name in args.resourceList])
+
+    return dict(zip(args.resourceList, totals))
+
+
+async def _run_with_workers(
+    args: MainArguments, filters_by_resource_name: Dict[str, List[str]], request_logger: Any
+) -> None:
+    """
+    Spreads the run across `args.workers` worker processes, so that decoding
+    and measuring the responses is not limited to one core. Deep paging
+    splits the pages of the resources between the workers; the other test
+    types split the resources, balanced by their total counts. The total
+    counts are read once, here, and handed to the workers with their shards.
+    The measurements of each worker are logged to `request_logger` in
+    batches as the worker goes, as if they had been taken in this process,
+    so the detail writer keeps the detail file up to date.
     """
-    Generates combinations of filters.
+    total_count_by_resource_name = await _get_total_counts(args)
+    if args.test_type == TestType.DEEP_PAGING and args.page_fan_out == 1:
+        shards = plan_page_range_shards(
+            total_count_by_resource_name, _get_page_sizes(args), args.connectionLimit, args.workers
+        )
+    else:
+        shards = plan_resource_shards(total_count_by_resource_name, args.workers)
+
+    logger.info(f"Starting {len(shards)} worker processes, each with up to {args.connectionLimit} connections...")
+    loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+
+    async def log_rows(rows: "Queue[DataFrame]") -> None:
+        # Until the None put once every worker is done
+        while True:
+            detail: Optional[DataFrame] = await loop.run_in_executor(None, rows.get)
+            if detail is None:
+                return
+            for row in detail.itertuples(index=False):
+                request_logger.log_request(*row)
+
+    # Spawned rather than forked on every platform, as this process already
+    # runs threads, e.g. the detail writer's
+    context = multiprocessing.get_context("spawn")
+    with context.Manager() as manager, ProcessPoolExecutor(max_workers=len(shards), mp_context=context) as executor:
+        rows: "Queue[DataFrame]" = manager.Queue()
+        logging_rows = asyncio.ensure_future(log_rows(rows))
+
+        pending: Dict[asyncio.Future, Shard] = {
+            loop.run_in_executor(
+                executor,
+                run_worker,
+                replace(args, resourceList=shard.resource_names, workers=1),
+                shard,
+                {resource_name: filters_by_resource_name.get(resource_name, []) for resource_name in shard.resource_names},
+                rows,
+            ): shard
+            for shard in shards
+        }
+
+        while len(pending) > 0:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for call in done:
+                shard = pending.pop(call)
+                try:
+                    requests, error_logged = call.result()
+                except Exception as err:
+                    logger.error(f"Worker {shard.worker} failed: {err}")
+                    continue
+
+                logger.info(f"Worker {shard.worker} finished with {requests} requests.")
+                if error_logged:
+                    logger.error(f"Worker {shard.worker} logged an error, please review its log output.")
 
-    Args:
-        filters: List of filters that a resource supports
-        combination_size_limit: The generated combinations will be of size 1 up to this limit
+        rows.put(None)  # type: ignore[arg-type]
+        await logging_rows
 
-    Returns:
-        List containing different combinations of filters
+
+def _can_checkpoint(args: MainArguments) -> bool:
+    """
+    Only the largest-first schedule of a deep-paging run records its
+    progress in a checkpoint.
+    """
+    return (
+        args.test_type == TestType.DEEP_PAGING
+        and args.page_fan_out == 1
+        and args.arrival_rate == ""
+        and not args.concurrency_search
+        and args.workers == 1
+    )
+
+
+def _restore_measurements(
+    args: MainArguments, run_name: str, checkpoint: Checkpoint, paggingRequestLogger: PaggingRequestLogger
+) -> int:
     """
+    Reloads the measurements of an interrupted run from its detail file,
+    keeping only those of the pages that the checkpoint counts as read; the
+    others are read again. The detail file is rewritten with the rows kept,
+    for the resumed run to append to.
 
-    return list(chain(*[combinations(filters, i + 1) for i in range(combination_size_limit)]))
+    Returns
+    -------
+    int
+        Number of measurements restored
+    """
+    read_detail_out = {
+        OutputFormat.CSV: reporter.read_detail_csv,
+        OutputFormat.JSON: reporter.read_detail_json,
+        OutputFormat.PARQUET: reporter.read_detail_parquet,
+    }
+    df = read_detail_out[args.contentType](args.output, run_name)
+    if len(df) > 0:
+        df = df.loc[[checkpoint.is_read(*key) for key in zip(df["Resource"], df["PageSize"], df["PageNumber"])]]
+
+    reporter.remove_detail(args.output, run_name)
+    if len(df) == 0:
+        return 0
+
+    for row in df[LOG_REQUEST_COLUMNS].itertuples(index=False):
+        paggingRequestLogger.log_request(*row)
+
+    create_detail_out = {
+        OutputFormat.CSV: reporter.create_detail_csv,
+        OutputFormat.JSON: reporter.create_detail_json,
+        OutputFormat.PARQUET: reporter.create_detail_parquet,
+    }
+    create_detail_out[args.contentType](df, args.output, run_name)
+
+    return len(df)
+
+
+def _get_partitioned_resources(args: MainArguments) -> List[str]:
+    """
+    Resources to run the PARTITIONED_PAGING test against: the requested ones
+    that expose a partitions endpoint, or all that do when none are requested.
+    """
+    partitioned_resource_names = get_partitioned_resource_names(
+        args.baseUrl, not args.ignoreCertificateErrors, args.metadata_cache_dir or None
+    )
+
+    if len(args.resourceList) == 0:
+        return partitioned_resource_names
+
+    not_partitioned = invalid_resources(partitioned_resource_names, args.resourceList)
+    if len(not_partitioned) != 0:
+        logger.warning(
+            f"Resources without a partitions endpoint will be skipped: {','.join(not_partitioned)}"
+        )
+
+    return [r for r in args.resourceList if r not in not_partitioned]
 
 
 async def run(args: MainArguments) -> None:
 
+    detail_writer: Optional[DetailWriter] = None
+    snapshot_writer: Optional[SnapshotWriter] = None
+    metrics_server: Optional[MetricsServer] = None
+    checkpoint: Optional[Checkpoint] = None
+    finished = False
     try:
         logger.info("Starting paging volume test...")
         start = time.time()
         paggingRequestLogger = PaggingRequestLogger()
         filteredReadRequestLogger = FilteredReadRequestLogger()
+        partitionRequestLogger = PartitionRequestLogger()
 
         filters_by_resource_name = get_filters_by_resource_name(
-            args.baseUrl, not args.ignoreCertificateErrors)
+            args.baseUrl, not args.ignoreCertificateErrors, args.metadata_cache_dir or None)
 
         resource_names: List[str] = list(filters_by_resource_name.keys())
         if len(args.resourceList) == 0:
@@ -122,68 +1133,115 @@ async def run(args: MainArguments) -> None:
                     f"Invalid resources found: {','.join(invalid_env_resources)}"
                 )
 
-        request_client: RequestClient = RequestClient(args)
+        if len(args.page_sizes) > 1 and (args.test_type == TestType.FILTERED_READ or args.concurrency_search):
+            logger.warning(f"Only the first page size, {args.pageSize}, is used by a filtered read or concurrency search.")
+            args.page_sizes = [args.pageSize]
 
-        executor: ThreadPoolExecutor = ThreadPoolExecutor(
-            max_workers=args.connectionLimit
-        )
-        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        if args.concurrency_search:
+            if args.test_type != TestType.DEEP_PAGING:
+                raise RuntimeError("The concurrency search is for use with the 'DEEP_PAGING' testType only.")
+            if args.arrival_rate != "":
+                raise RuntimeError("The concurrency search cannot be combined with an arrival rate.")
+            if args.max_retries > 0 or args.breaker_threshold > 0:
+                # Both would hide the errors that mark the saturation point
+                raise RuntimeError("The concurrency search cannot be combined with retries or a circuit breaker.")
 
-        fetch_resource_calls: List[asyncio.Future] = [
-            loop.run_in_executor(
-                executor, fetch_resource_entries, request_client, target_resource, paggingRequestLogger
-            )
-            for target_resource in args.resourceList
-        ]
+        if args.contentType == OutputFormat.PARQUET:
+            reporter.check_parquet_support()
 
-        completed_fetch_resource_calls, _ = await asyncio.wait(fetch_resource_calls)
+        if args.workers > 1 and (args.concurrency_search or args.arrival_rate != "" or args.resume != ""):
+            raise RuntimeError("Worker processes cannot be combined with a concurrency search, an arrival rate or resuming a run.")
 
+        request_logger: Any = paggingRequestLogger
         if args.test_type == TestType.FILTERED_READ:
-            logger.info("Starting filtered read tests...")
+            request_logger = filteredReadRequestLogger
+        elif args.test_type == TestType.PARTITIONED_PAGING:
+            request_logger = partitionRequestLogger
 
-            entries_by_resource_name: Dict[str, List[Dict[str, Any]]] = {
-                call.result()[0]: call.result()[1] for call in completed_fetch_resource_calls}
+        concurrency_search: Optional[ConcurrencySearch] = None
+        run_name = args.resume if args.resume != "" else datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        run_dir = path.join(args.output, run_name)
 
-            entries_to_query: List[Tuple[str, Dict[str, Any], Tuple[str, ...]]] = []
-
-            for resource_name, entries in entries_by_resource_name.items():
-                if len(entries) == 0:
-                    continue
+        rows_restored = 0
+        if args.resume != "":
+            if not _can_checkpoint(args):
+                raise RuntimeError(
+                    "Only DEEP_PAGING runs with a page fan-out of 1, and without an arrival rate, can be resumed."
+                )
 
-                supported_filters = filters_by_resource_name[resource_name]
-                filter_combinations = get_filter_combinations(supported_filters, args.combination_size_limit)
+            checkpoint = Checkpoint.load(run_dir)
+            rows_restored = _restore_measurements(args, run_name, checkpoint, paggingRequestLogger)
+            logger.info(f"Resuming {run_name} with the measurements of {rows_restored} requests...")
+        elif _can_checkpoint(args):
+            checkpoint = Checkpoint()
 
-                entriesCache = ResourceEntriesCache(entries, supported_filters)
+        detail_writer = DetailWriter(
+            request_logger, args.output, run_name, args.contentType, args.detail_flush_interval, checkpoint, rows_restored
+        )
+        detail_writer.start()
 
-                for filter_combination in filter_combinations:
+        if args.metrics_port > 0 or args.snapshot_interval > 0:
+            # Only counts the requests from here on, not those of a resumed run
+            live_metrics = LiveMetrics()
+            paggingRequestLogger.live_metrics = live_metrics
+            filteredReadRequestLogger.live_metrics = live_metrics
+            partitionRequestLogger.live_metrics = live_metrics
 
-                    # Limit to 10 entries per combination (configurable in future versions)
-                    entries_with_non_null_filters = entriesCache.get_entries_with_non_null_filters(
-                        filter_combination, 10)
+            if args.metrics_port > 0:
+                metrics_server = MetricsServer(live_metrics, args.metrics_port)
+                metrics_server.start()
+            if args.snapshot_interval > 0:
+                snapshot_writer = SnapshotWriter(live_metrics, args.output, run_name, args.contentType, args.snapshot_interval)
+                snapshot_writer.start()
 
-                    if len(entries_with_non_null_filters) == 0:
-                        continue
+        if args.test_type == TestType.PARTITIONED_PAGING:
+            if args.arrival_rate != "":
+                logger.warning("The arrival rate is ignored by PARTITIONED_PAGING: each page needs the token of the page before it.")
 
-                    entries_to_query.extend([(resource_name, entry, filter_combination)
-                                            for entry in entries_with_non_null_filters])
+            args.resourceList = _get_partitioned_resources(args)
 
-            query_resource_calls: List[asyncio.Future] = [
-                loop.run_in_executor(
-                    executor, fetch_filtered_resources_entries, request_client, resource_name, entry, filter_combination, filteredReadRequestLogger
-                )
-                for (resource_name, entry, filter_combination) in entries_to_query
-            ]
+            if args.workers > 1:
+                await _run_with_workers(args, filters_by_resource_name, partitionRequestLogger)
+            else:
+                await _run_partitions(args, partitionRequestLogger)
+        elif args.concurrency_search:
+            concurrency_search = await _run_concurrency_search(args, paggingRequestLogger)
+        elif args.workers > 1:
+            await _run_with_workers(args, filters_by_resource_name, request_logger)
+        else:
+            await _run_requests(args, filters_by_resource_name, paggingRequestLogger, filteredReadRequestLogger, checkpoint)
 
-            await asyncio.wait(query_resource_calls)
+        statistics = request_logger.get_statistics()
+        breakdown = request_logger.get_breakdown()
 
-        dt = paggingRequestLogger.get_DataFrame(
-        ) if args.test_type == TestType.DEEP_PAGING else filteredReadRequestLogger.get_DataFrame()
-        statistics = paggingRequestLogger.get_statistics(
-        ) if args.test_type == TestType.DEEP_PAGING else filteredReadRequestLogger.get_statistics()
+        depth_model: Optional[DataFrame] = None
+        if args.test_type == TestType.DEEP_PAGING:
+            depth_model = fit_depth_model(paggingRequestLogger.get_DataFrame())
+            log_worst_resources(depth_model)
 
-        _generate_output_reports(args, dt, statistics)
+        _generate_output_reports(args, run_name, statistics, breakdown, depth_model, concurrency_search)
         logger.info(
             f"Finished with paging volume test in {time.time() - start} seconds."
         )
+        finished = True
     except BaseException as err:
         logger.error(err)
+    finally:
+        # Whatever happened, keep the detail of every request that completed
+        if detail_writer is not None:
+            try:
+                detail_writer.close()
+            except BaseException as err:
+                logger.error(err)
+
+        try:
+            if snapshot_writer is not None:
+                snapshot_writer.close()
+            if metrics_server is not None:
+                metrics_server.close()
+        except BaseException as err:
+            logger.error(err)
+
+        # A finished run has nothing left to resume
+        if finished and checkpoint is not None:
+            Checkpoint.remove(run_dir)
@@ -0,0 +1,126 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import logging
+from typing import Any, Dict, List
+
+import numpy as np
+from pandas import DataFrame
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = [
+    "Resource",
+    "PageSize",
+    "NumberOfPages",
+    "NumberOfDepthBuckets",
+    "MaxOffset",
+    "BaseTime",
+    "SlopePerThousandRows",
+    "DoublingOffset",
+    "DoublingPage",
+    "RSquared",
+    "Rank",
+]
+
+
+def _fit(offsets: np.ndarray, times: np.ndarray) -> Dict[str, float]:
+    """
+    Least-squares line through the median time of each depth bucket.
+    """
+    if len(offsets) < 2:
+        return {"BaseTime": times[0] if len(times) > 0 else np.nan, "Slope": np.nan, "RSquared": np.nan}
+
+    slope, intercept = np.polyfit(offsets, times, 1)
+
+    residuals = times - (slope * offsets + intercept)
+    total = ((times - times.mean()) ** 2).sum()
+    r_squared = 1 - (residuals ** 2).sum() / total if total > 0 else np.nan
+
+    # Noise can put the intercept at or below zero; fall back to the
+    # shallowest bucket as the baseline
+    base_time = intercept if intercept > 0 else times[0]
+
+    return {"BaseTime": base_time, "Slope": slope, "RSquared": r_squared}
+
+
+def fit_depth_model(detail: DataFrame) -> DataFrame:
+    """
+    Models how the time to read a page grows with its offset, for each
+    resource and page size of a DEEP_PAGING run.
+
+    Successful requests are grouped into page-depth buckets (pages 1, 2-3,
+    4-7, 8-15 and so on) and a straight line is fitted through the median
+    time of each bucket against the bucket's median offset. Offset paging
+    typically costs time in proportion to the offset, so the slope is the
+    extra time per row skipped, and the doubling offset is the offset at
+    which a page takes twice as long as the first page.
+
+    Parameters
+    ----------
+    detail : DataFrame
+        Detail of the run, as returned by `PaggingRequestLogger.get_DataFrame`
+
+    Returns
+    -------
+    DataFrame
+        One row per resource and page size, ranked from the fastest to the
+        slowest doubling; resources with too few pages to fit are ranked last
+    """
+    df = detail[detail["StatusCode"] < 400][["Resource", "PageSize", "PageNumber", "ElapsedTime"]].copy()
+    df["Resource"] = df["Resource"].astype(str)
+    df["Offset"] = (df["PageNumber"] - 1) * df["PageSize"]
+    df["DepthBucket"] = np.floor(np.log2(np.maximum(df["PageNumber"].to_numpy(), 1))).astype(int)
+
+    buckets = df.groupby(["Resource", "PageSize", "DepthBucket"], as_index=False).agg(
+        {"Offset": "median", "ElapsedTime": "median"}
+    )
+
+    rows: List[Dict[str, Any]] = []
+    for (resource, page_size), group in buckets.groupby(["Resource", "PageSize"]):
+        pages = df[(df["Resource"] == resource) & (df["PageSize"] == page_size)]
+        fit = _fit(group["Offset"].to_numpy(dtype=float), group["ElapsedTime"].to_numpy(dtype=float))
+        slope = fit["Slope"]
+        doubling_offset = fit["BaseTime"] / slope if slope > 0 else np.nan
+
+        rows.append(
+            {
+                "Resource": resource,
+                "PageSize": page_size,
+                "NumberOfPages": len(pages),
+                "NumberOfDepthBuckets": len(group),
+                "MaxOffset": pages["Offset"].max(),
+                "BaseTime": round(fit["BaseTime"], 6),
+                "SlopePerThousandRows": round(slope * 1000, 9) if not np.isnan(slope) else np.nan,
+                "DoublingOffset": round(doubling_offset) if not np.isnan(doubling_offset) else np.nan,
+                "DoublingPage": int(doubling_offset // page_size) + 1 if not np.isnan(doubling_offset) else np.nan,
+                "RSquared": round(fit["RSquared"], 4) if not np.isnan(fit["RSquared"]) else np.nan,
+            }
+        )
+
+    model = DataFrame(rows, columns=COLUMNS[:-1])
+    # Resources that do not slow down have no doubling offset, and sort last
+    model.sort_values(by=["DoublingOffset", "Resource"], inplace=True)
+    model["Rank"] = range(1, len(model) + 1)
+
+    return model
+
+
+def log_worst_resources(model: DataFrame, count: int = 5) -> None:
+    """
+    Logs the resources whose page time doubles at the shallowest offset.
+    """
+    worst = model[model["DoublingOffset"].notnull()].head(count)
+    if len(worst) == 0:
+        logger.info("No resource slows down with paging depth.")
+        return
+
+    logger.info("Resources that slow down the most with paging depth:")
+    for row in worst.to_dict("records"):
+        logger.info(
+            f"  {row['Rank']}. {row['Resource']} (page size {row['PageSize']}): page time doubles by offset "
+            f"{int(row['DoublingOffset'])} (page {int(row['DoublingPage'])}), "
+            f"+{row['SlopePerThousandRows']:.6f}s per 1000 rows skipped"
+        )
@@ -0,0 +1,148 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import logging
+from os import path
+from queue import Queue
+import threading
+from typing import Optional, Protocol
+
+from pandas import DataFrame
+
+from edfi_paging_test.helpers.checkpoint import Checkpoint, write_checkpoint
+from edfi_paging_test.helpers.output_format import OutputFormat
+from edfi_paging_test.reporter import reporter
+
+logger = logging.getLogger(__name__)
+
+
+class DetailSource(Protocol):
+    def get_detail(self, start: int = 0) -> DataFrame:
+        ...
+
+
+class DetailWriter:
+    """
+    Writes the detail file of a run while the run is in progress. A
+    background thread appends the measurements logged since the previous
+    flush every `flush_interval` seconds, so an interrupted run still leaves
+    a valid detail file with every measurement up to the last flush. Rows are
+    written in the order the measurements were logged.
+
+    Parameters
+    ----------
+    request_logger : DetailSource
+        The request logger whose measurements make up the detail.
+    output_dir : str
+        Directory for writing results.
+    run_name : str
+        Name of the run, i.e. of its directory under `output_dir`.
+    output_format : OutputFormat
+        Content type of the detail file.
+    flush_interval : float
+        Seconds between flushes. 0 only writes when the writer is closed.
+    checkpoint : Optional[Checkpoint]
+        Progress of the run, saved to the run directory with every flush.
+    rows_written : int
+        Rows already in the detail file, e.g. of a resumed run.
+    """
+
+    def __init__(
+        self,
+        request_logger: DetailSource,
+        output_dir: str,
+        run_name: str,
+        output_format: OutputFormat,
+        flush_interval: float,
+        checkpoint: Optional[Checkpoint] = None,
+        rows_written: int = 0,
+    ) -> None:
+        self.request_logger = request_logger
+        self.output_dir = output_dir
+        self.run_name = run_name
+        self.flush_interval = flush_interval
+        self.checkpoint = checkpoint
+        self.rows_written = rows_written
+
+        append_detail_out = {
+            OutputFormat.CSV: reporter.append_detail_csv,
+            OutputFormat.JSON: reporter.append_detail_json,
+            OutputFormat.PARQUET: reporter.append_detail_parquet,
+        }
+        self._append = append_detail_out[output_format]
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.flush_interval > 0:
+            self._thread = threading.Thread(target=self._run, name="detail-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as err:
+                # Keep the run going; the rows are retried on the next flush
+                logger.warning(f"Unable to write the detail file: {err}")
+
+    def flush(self) -> int:
+        """
+        Appends the measurements logged since the previous flush.
+
+        Returns
+        -------
+        int
+            Number of rows written
+        """
+        with self._lock:
+            # Taken before the detail, so that every page the checkpoint
+            # counts as read already has its row in the detail file
+            checkpoint = self.checkpoint.to_dict() if self.checkpoint is not None else None
+
+            df = self.request_logger.get_detail(self.rows_written)
+            if len(df) > 0:
+                self._append(df, self.output_dir, self.run_name)
+                self.rows_written += len(df)
+
+            if checkpoint is not None:
+                write_checkpoint(checkpoint, path.join(self.output_dir, self.run_name))
+
+            return len(df)
+
+    def close(self) -> None:
+        """
+        Stops the background thread and writes the remaining measurements.
+        Safe to call more than once.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.flush()
+
+
+class DetailStreamer(DetailWriter):
+    """
+    Hands the measurements of a worker process over to the process that
+    started it, on a queue, the way a `DetailWriter` writes them to the
+    detail file: every `flush_interval` seconds and when closed. A worker
+    that fails has still handed over every measurement up to its last flush.
+
+    Parameters
+    ----------
+    request_logger : DetailSource
+        The request logger of the worker.
+    rows : Queue[DataFrame]
+        Queue shared with the process that started the worker.
+    flush_interval : float
+        Seconds between flushes. 0 only hands over when the streamer is closed.
+    """
+
+    def __init__(self, request_logger: DetailSource, rows: "Queue[DataFrame]", flush_interval: float) -> None:
+        super().__init__(request_logger, "", "", OutputFormat.CSV, flush_interval)
+        self._append = lambda df, output_dir, run_name: rows.put(df)
@@ -1,14 +1,49 @@
-from typing import List
+from typing import Dict, Hashable, List, Optional
 
 from pandas import DataFrame, Series
 
 from edfi_paging_test.reporter.filtered_read_measurement import FilteredReadMeasurement
+from edfi_paging_test.reporter.measurement_store import MeasurementStore
+from edfi_paging_test.reporter.latency_histogram import LatencyHistograms, get_percentile_columns
+from edfi_paging_test.reporter.live_metrics import LiveMetrics
+from edfi_paging_test.reporter.timing_breakdown import add_mean_timings
+
+
+DETAIL_COLUMNS: Dict[Hashable, str] = {
+    "resource": "Resource",
+    "filter_count": "NumberOfFilters",
+    "elapsed_time": "ElapsedTime",
+    "http_status_code": "StatusCode",
+    "time_to_first_byte": "TimeToFirstByte",
+    "transfer_time": "TransferTime",
+    "response_bytes": "ResponseBytes",
+    "decode_time": "DecodeTime",
+    "token_refreshed": "TokenRefreshed",
+    "auth_time": "AuthTime",
+    "attempt": "Attempt",
+    "backoff_time": "BackoffTime",
+    "final_attempt": "FinalAttempt",
+}
 
 
 class FilteredReadRequestLogger:
 
     def __init__(self):
-        self.request_log: List[FilteredReadMeasurement] = []
+        self._store: MeasurementStore[FilteredReadMeasurement] = MeasurementStore(FilteredReadMeasurement)
+        self._histograms = LatencyHistograms()
+        # When set, every request logged is also counted in the live metrics
+        self.live_metrics: Optional[LiveMetrics] = None
+
+    @property
+    def request_log(self) -> List[FilteredReadMeasurement]:
+        return self._store.to_list()
+
+    @request_log.setter
+    def request_log(self, measurements: List[FilteredReadMeasurement]) -> None:
+        self._store.clear()
+        self._histograms.clear()
+        for m in measurements:
+            self.log_request(*vars(m).values())
 
     def log_request(
         self,
@@ -17,16 +52,48 @@ class FilteredReadRequestLogger:
         filter_count: int,
         elapsed: float,
         status_code: int,
+        time_to_first_byte: float = 0.0,
+        transfer_time: float = 0.0,
+        response_bytes: int = 0,
+        decode_time: float = 0.0,
+        token_refreshed: bool = False,
+        auth_time: float = 0.0,
+        attempt: int = 1,
+        backoff_time: float = 0.0,
+        final_attempt: bool = True,
     ) -> None:
-        m = FilteredReadMeasurement(
+        if self.live_metrics is not None:
+            self.live_metrics.record(resource, elapsed, status_code, 0, attempt == 1)
+
+        # Percentiles are of first tries, retries being counted apart
+        if attempt == 1:
+            self._histograms.record((resource, filter_count), elapsed)
+        self._store.append(
             resource,
             base_url,
             filter_count,
             elapsed,
             status_code,
+            time_to_first_byte,
+            transfer_time,
+            response_bytes,
+            decode_time,
+            token_refreshed,
+            auth_time,
+            attempt,
+            backoff_time,
+            final_attempt,
         )
 
-        self.request_log.append(m)
+    def get_detail(self, start: int = 0) -> DataFrame:
+        """
+        Converts the Measurements logged so far, from `start` on, to a
+        DataFrame with the detail column names, in the order they were logged.
+        """
+        df = self._store.get_DataFrame(start)
+        df.rename(columns=DETAIL_COLUMNS, inplace=True)
+
+        return df
 
     def get_DataFrame(self) -> DataFrame:
         """
@@ -44,22 +111,12 @@ class FilteredReadRequestLogger:
         DataFrame
             A new DataFrame, or the modified Dataframe if `df` is provided
         """
-        if len(self.request_log) == 0:
+        if len(self._store) == 0:
             raise RuntimeError(
                 "No measurements have been captured, therefore cannot create a DataFrame"
             )
 
-        df = DataFrame(data=self.request_log)
-        df.rename(
-            {
-                "resource": "Resource",
-                "filter_count": "NumberOfFilters",
-                "elapsed_time": "ElapsedTime",
-                "http_status_code": "StatusCode",
-            },
-            inplace=True,
-            axis=1,
-        )
+        df = self.get_detail()
 
         df.sort_values(by=["Resource"], inplace=True)
 
@@ -68,27 +125,63 @@ class FilteredReadRequestLogger:
     def get_statistics(self):
         summary = self.get_DataFrame()
 
-        # Need multiple columns in order to perform three different aggregations
-        summary["MeanTime"] = summary["ElapsedTime"]
-        summary["StDeviation"] = summary["ElapsedTime"]
+        # Need multiple columns in order to perform three different aggregations.
+        # The mean and standard deviation are of first tries, as are the
+        # percentiles; retries are counted apart
+        summary["MeanTime"] = summary["ElapsedTime"].where(summary["Attempt"] == 1)
+        summary["StDeviation"] = summary["MeanTime"]
 
         # This is a fascinating capability. Found mention in Medium article,
         # though not at all clear from the Pandas documentation. Type check
         # does not like it, because not covered in the type stub
-        summary = summary.groupby(by=["Resource"], as_index=False).apply(
+        summary = summary.groupby(by=["Resource"], as_index=False, observed=True).apply(
             lambda s: Series(
                 {
-                    "NumberOfRecords": len(s),
+                    "NumberOfRecords": s["FinalAttempt"].sum(),
                     "TotalTime": s["ElapsedTime"].sum(),
                     "MeanTime": s["MeanTime"].mean(),
                     # "Unbiased" estimate of standard deviation for a sample
                     # (ddof=1, panda's default). Equivalent of Excel STDEV.S()
                     "StDeviation": s["StDeviation"].std().round(6),  # type: ignore
-                    "NumberOfErrors": s[(s["StatusCode"] >= 400)]["StatusCode"].count(),
+                    # Requests that failed in the end, whatever the retries
+                    "NumberOfErrors": s[(s["StatusCode"] >= 400) & s["FinalAttempt"]]["StatusCode"].count(),
+                    "NumberOfRetries": (s["Attempt"] > 1).sum(),
                 }
             )
         )  # type: ignore
 
         summary.fillna(value=0, inplace=True)
 
+        histograms = self._histograms.merged(lambda key: key[0])  # type: ignore
+        for name, values in get_percentile_columns(summary["Resource"].astype(str), histograms).items():
+            summary[name] = values
+
         return summary
+
+    def get_breakdown(self) -> DataFrame:
+        """
+        Latency percentiles by resource and number of filters, read from histograms that are
+        updated as requests are logged, next to the mean time to first byte, transfer and decode time.
+
+        Returns
+        -------
+        DataFrame
+            A new DataFrame
+        """
+        rows = []
+        for key, histogram in self._histograms.items():
+            resource, filter_count = key  # type: ignore
+            rows.append(
+                {
+                    "Resource": resource,
+                    "NumberOfFilters": filter_count,
+                    "NumberOfRequests": histogram.count,
+                    **histogram.get_percentiles(),
+                }
+            )
+
+        df = DataFrame(rows)
+        if len(df) > 0:
+            df.sort_values(by=["Resource", "NumberOfFilters"], inplace=True)
+
+        return add_mean_timings(df, self.get_detail(), ["Resource", "NumberOfFilters"])
@@ -0,0 +1,153 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from math import floor, log
+import threading
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Latencies from 1 microsecond up to 1 hour, in buckets 1% wide, so that a
+# percentile read from the histogram is within 0.5% of the exact value
+LOWEST_SECONDS = 1e-6
+HIGHEST_SECONDS = 3600.0
+BUCKET_GROWTH = 1.01
+
+_LOG_GROWTH = log(BUCKET_GROWTH)
+BUCKET_COUNT = int(floor(log(HIGHEST_SECONDS / LOWEST_SECONDS) / _LOG_GROWTH)) + 2
+
+PERCENTILES = {
+    "P50": 50.0,
+    "P90": 90.0,
+    "P95": 95.0,
+    "P99": 99.0,
+}
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed histogram of request latencies, in seconds. Memory use is
+    fixed however many latencies are recorded, and histograms can be merged,
+    e.g. to combine the page depths of a resource, without losing accuracy.
+    """
+
+    def __init__(self) -> None:
+        self.counts = np.zeros(BUCKET_COUNT, dtype=np.int64)
+        self.count = 0
+        self.max = 0.0
+
+    @staticmethod
+    def _bucket(seconds: float) -> int:
+        if seconds <= LOWEST_SECONDS:
+            return 0
+
+        return min(int(log(seconds / LOWEST_SECONDS) / _LOG_GROWTH) + 1, BUCKET_COUNT - 1)
+
+    @staticmethod
+    def _bucket_value(bucket: int) -> float:
+        if bucket == 0:
+            return LOWEST_SECONDS
+
+        # Geometric middle of the bucket
+        return LOWEST_SECONDS * BUCKET_GROWTH ** (bucket - 0.5)
+
+    def record(self, seconds: float) -> None:
+        self.counts[self._bucket(seconds)] += 1
+        self.count += 1
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.counts += other.counts
+        self.count += other.count
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float:
+        """
+        Latency below which `percent` percent of the recorded latencies fall,
+        accurate to within half a bucket. 0 when nothing was recorded.
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = max(1, int(np.ceil(self.count * percent / 100)))
+        bucket = int(np.searchsorted(np.cumsum(self.counts), rank))
+
+        # Never report more than the largest latency actually recorded
+        return min(self._bucket_value(bucket), self.max)
+
+    def get_percentiles(self) -> Dict[str, float]:
+        """
+        The reported percentiles, and the maximum, rounded to the microsecond.
+        """
+        values = {name: self.percentile(percent) for name, percent in PERCENTILES.items()}
+        values["Max"] = self.max
+
+        return {name: round(value, 6) for name, value in values.items()}
+
+
+class LatencyHistograms:
+    """
+    Latency histograms by key, e.g. by resource and page depth. Recording is
+    safe from any number of threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: Dict[Hashable, LatencyHistogram] = {}
+
+    def record(self, key: Hashable, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+
+            histogram.record(seconds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms = {}
+
+    def merged(self, group: Callable[[Hashable], Hashable]) -> Dict[Hashable, LatencyHistogram]:
+        """
+        Merges the histograms whose keys fall in the same group, as given by
+        `group`, e.g. every page depth of a resource.
+        """
+        merged: Dict[Hashable, LatencyHistogram] = {}
+        with self._lock:
+            for key, histogram in self._histograms.items():
+                target = merged.setdefault(group(key), LatencyHistogram())
+                target.merge(histogram)
+
+        return merged
+
+    def items(self) -> List[Tuple[Hashable, LatencyHistogram]]:
+        with self._lock:
+            return list(self._histograms.items())
+
+
+def get_percentile_columns(
+    keys: Iterable[Hashable], histograms: Dict[Hashable, LatencyHistogram]
+) -> Dict[str, List[float]]:
+    """
+    Percentile columns for a statistics DataFrame, one value per key, in the
+    order of `keys`. Keys without a histogram get zeros.
+    """
+    columns: Dict[str, List[float]] = {name: [] for name in [*PERCENTILES.keys(), "Max"]}
+    empty = LatencyHistogram()
+
+    for key in keys:
+        histogram: Optional[LatencyHistogram] = histograms.get(key)
+        for name, value in (histogram or empty).get_percentiles().items():
+            columns[name].append(value)
+
+    return columns
+
+
+def get_depth_bucket(page: int) -> int:
+    """
+    First page of the page-depth bucket of a page: 1, 2-3, 4-7, 8-15 and so
+    on, so that each bucket reaches twice as deep as the one before.
+    """
+    return 1 << (max(page, 1).bit_length() - 1)
@@ -0,0 +1,220 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from collections import deque
+from http import HTTPStatus
+from math import isnan, nan
+import threading
+from timeit import default_timer
+from typing import Callable, Deque, Dict, List, Tuple
+
+import numpy as np
+from pandas import DataFrame
+
+# Seconds of completed requests that the rates and latencies are read from
+WINDOW_SECONDS = 60.0
+
+METRIC_PREFIX = "edfi_paging_"
+
+SNAPSHOT_COLUMNS = [
+    "Time",
+    "Resource",
+    "InFlight",
+    "NumberOfRequests",
+    "NumberOfErrors",
+    "NumberOfRecords",
+    "ExpectedRecords",
+    "RequestsPerSecond",
+    "ErrorsPerSecond",
+    "P95",
+]
+
+
+class _ResourceCounters:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.records = 0
+        self.expected_records = 0
+        # (completed at, elapsed time of a first try or nan, failed) of the
+        # requests completed within the window, oldest first
+        self.window: Deque[Tuple[float, float, bool]] = deque()
+
+
+class LiveMetrics:
+    """
+    Counters of the requests of a run, kept while it is in progress so that
+    a long run can be watched: per resource, the requests in flight, the
+    requests, errors and records so far, against the records its total
+    count promises, and the rate and 95th percentile latency of the requests
+    completed in the last `window` seconds. As in the statistics, the
+    latency is of first tries only, whereas every attempt counts towards the
+    rates.
+
+    Updated from any number of threads: the request clients count the
+    requests in flight and the expected records, and the request loggers the
+    completed requests.
+
+    Parameters
+    ----------
+    window : float
+        Seconds of completed requests that rates and latencies are read from.
+    clock : Callable[[], float]
+        Source of the current time, in seconds.
+    """
+
+    def __init__(self, window: float = WINDOW_SECONDS, clock: Callable[[], float] = default_timer) -> None:
+        self.window = window
+        self._clock = clock
+        self._start = clock()
+        self._lock = threading.Lock()
+        self._counters: Dict[str, _ResourceCounters] = {}
+
+    def _get_counters(self, resource: str) -> _ResourceCounters:
+        # Only called with the lock held
+        counters = self._counters.get(resource)
+        if counters is None:
+            counters = self._counters[resource] = _ResourceCounters()
+        return counters
+
+    def request_started(self, resource: str) -> None:
+        with self._lock:
+            self._get_counters(resource).in_flight += 1
+
+    def request_finished(self, resource: str) -> None:
+        with self._lock:
+            self._get_counters(resource).in_flight -= 1
+
+    def add_expected_records(self, resource: str, records: int) -> None:
+        """
+        Adds the total count of a resource to the records expected of it.
+        A page size sweep reads every resource once per page size, and
+        expects its records as many times.
+        """
+        with self._lock:
+            self._get_counters(resource).expected_records += records
+
+    def record(self, resource: str, elapsed: float, status_code: int, records: int, first_attempt: bool = True) -> None:
+        now = self._clock()
+        failed = status_code >= HTTPStatus.BAD_REQUEST
+        with self._lock:
+            counters = self._get_counters(resource)
+            counters.requests += 1
+            counters.errors += int(failed)
+            counters.records += records
+            counters.window.append((now, elapsed if first_attempt else nan, failed))
+            self._expire(counters, now)
+
+    def _expire(self, counters: _ResourceCounters, now: float) -> None:
+        while len(counters.window) > 0 and counters.window[0][0] < now - self.window:
+            counters.window.popleft()
+
+    def _get_window_seconds(self, now: float) -> float:
+        # Early in the run, the rates are over the time since it started
+        return max(min(self.window, now - self._start), 1e-9)
+
+    @staticmethod
+    def _get_p95(latencies: List[float]) -> float:
+        latencies = [latency for latency in latencies if not isnan(latency)]
+        return round(float(np.percentile(latencies, 95)), 6) if len(latencies) > 0 else 0.0
+
+    def get_snapshot(self) -> DataFrame:
+        """
+        One row per resource, in the order they were first seen, with the
+        `SNAPSHOT_COLUMNS`. `Time` is the seconds since the metrics were
+        created, i.e. since the run started.
+        """
+        now = self._clock()
+        seconds = self._get_window_seconds(now)
+        rows = []
+        with self._lock:
+            for resource, counters in self._counters.items():
+                self._expire(counters, now)
+                rows.append(
+                    [
+                        round(now - self._start, 3),
+                        resource,
+                        counters.in_flight,
+                        counters.requests,
+                        counters.errors,
+                        counters.records,
+                        counters.expected_records,
+                        round(len(counters.window) / seconds, 3),
+                        round(sum(failed for _, _, failed in counters.window) / seconds, 3),
+                        self._get_p95([elapsed for _, elapsed, _ in counters.window]),
+                    ]
+                )
+
+        return DataFrame(rows, columns=SNAPSHOT_COLUMNS)
+
+    def get_totals(self) -> Dict[str, float]:
+        """
+        The rates and latency of every resource together, and the records
+        read and expected so far.
+        """
+        now = self._clock()
+        seconds = self._get_window_seconds(now)
+        with self._lock:
+            for counters in self._counters.values():
+                self._expire(counters, now)
+            window = [entry for counters in self._counters.values() for entry in counters.window]
+
+            return {
+                "InFlight": sum(counters.in_flight for counters in self._counters.values()),
+                "NumberOfRecords": sum(counters.records for counters in self._counters.values()),
+                "ExpectedRecords": sum(counters.expected_records for counters in self._counters.values()),
+                "RequestsPerSecond": round(len(window) / seconds, 3),
+                "ErrorsPerSecond": round(sum(failed for _, _, failed in window) / seconds, 3),
+                "P95": self._get_p95([elapsed for _, elapsed, _ in window]),
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        The metrics in the Prometheus text exposition format: rates and
+        latency across every resource, and the counters of each resource,
+        labelled with its name.
+        """
+        totals = self.get_totals()
+        snapshot = self.get_snapshot()
+
+        lines: List[str] = []
+
+        def add(name: str, kind: str, help: str, samples: List[Tuple[str, float]]) -> None:
+            lines.append(f"# HELP {METRIC_PREFIX}{name} {help}")
+            lines.append(f"# TYPE {METRIC_PREFIX}{name} {kind}")
+            lines.extend(f"{METRIC_PREFIX}{name}{labels} {value}" for labels, value in samples)
+
+        def by_resource(column: str) -> List[Tuple[str, float]]:
+            return [
+                (f'{{resource="{_escape_label(resource)}"}}', value)
+                for resource, value in zip(snapshot["Resource"], snapshot[column])
+            ]
+
+        window = f"over the last {self.window:g} seconds"
+        add("requests_per_second", "gauge", f"Requests completed per second {window}.", [("", totals["RequestsPerSecond"])])
+        add("errors_per_second", "gauge", f"Requests failed per second {window}.", [("", totals["ErrorsPerSecond"])])
+        add(
+            "request_latency_seconds",
+            "gauge",
+            f"95th percentile latency of the first tries completed {window}.",
+            [('{quantile="0.95"}', totals["P95"])] + [
+                (f'{{quantile="0.95",resource="{_escape_label(resource)}"}}', value)
+                for resource, value, rate in zip(snapshot["Resource"], snapshot["P95"], snapshot["RequestsPerSecond"])
+                # A resource without recent requests has no latency to report
+                if rate > 0
+            ],
+        )
+        add("requests_in_flight", "gauge", "Requests sent and not yet completed.", by_resource("InFlight"))
+        add("requests_total", "counter", "Requests completed, including retries.", by_resource("NumberOfRequests"))
+        add("errors_total", "counter", "Requests completed with an error status.", by_resource("NumberOfErrors"))
+        add("records_read_total", "counter", "Records read.", by_resource("NumberOfRecords"))
+        add("records_expected", "gauge", "Records expected, from the total counts read so far.", by_resource("ExpectedRecords"))
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
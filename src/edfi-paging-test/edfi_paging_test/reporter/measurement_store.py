@@ -0,0 +1,153 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from dataclasses import fields
+import threading
+from typing import Any, Dict, Generic, List, Type, TypeVar
+
+import numpy as np
+from pandas import Categorical, DataFrame  # type: ignore[attr-defined]
+
+T = TypeVar("T")
+
+INITIAL_CAPACITY = 1024
+
+_COLUMN_DTYPES: Dict[Any, Any] = {
+    int: np.int64,
+    float: np.float64,
+    bool: np.bool_,
+    # Strings are interned and stored as codes into a table of distinct values
+    str: np.int32,
+}
+
+
+class MeasurementStore(Generic[T]):
+    """
+    Column-oriented store for the measurements of a request logger. Each field
+    of the measurement dataclass becomes a preallocated numpy column, grown by
+    doubling; string fields, e.g. the resource name, are interned so that each
+    distinct value is held only once.
+
+    Appends are safe from any number of threads. The lock is held only while
+    one row is written into the columns, so contention stays negligible next
+    to the cost of an HTTP request. Rows are never modified once written, and
+    growing or clearing the store allocates new columns, so DataFrames can be
+    built over views of the columns without copying them.
+
+    Parameters
+    ----------
+    measurement_type : Type[T]
+        The measurement dataclass; its fields, in order, are the columns.
+    """
+
+    def __init__(self, measurement_type: Type[T]) -> None:
+        self.measurement_type = measurement_type
+        self.names = [f.name for f in fields(measurement_type)]  # type: ignore
+        self._dtypes = [_COLUMN_DTYPES[f.type] for f in fields(measurement_type)]  # type: ignore
+        self._is_string = [f.type is str for f in fields(measurement_type)]  # type: ignore
+        self._defaults = [f.default for f in fields(measurement_type)]  # type: ignore
+
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._size = 0
+        self._columns = [np.empty(INITIAL_CAPACITY, dtype=dtype) for dtype in self._dtypes]
+        self._codes: List[Dict[str, int]] = [{} for _ in self.names]
+        self._strings: List[List[str]] = [[] for _ in self.names]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _intern(self, column: int, value: str) -> int:
+        code = self._codes[column].get(value)
+        if code is None:
+            code = len(self._strings[column])
+            self._codes[column][value] = code
+            self._strings[column].append(value)
+
+        return code
+
+    def _grow(self) -> None:
+        for index, column in enumerate(self._columns):
+            grown = np.empty(len(column) * 2, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[index] = grown
+
+    def append(self, *values: Any) -> None:
+        """
+        Appends one measurement, given as its field values in field order.
+        Trailing fields may be left out when they have a default, as when
+        constructing the dataclass.
+        """
+        values = (*values, *self._defaults[len(values):])
+        with self._lock:
+            if self._size == len(self._columns[0]):
+                self._grow()
+
+            row = self._size
+            for index, value in enumerate(values):
+                self._columns[index][row] = self._intern(index, value) if self._is_string[index] else value
+
+            self._size = row + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def to_list(self) -> List[T]:
+        """
+        Materializes the stored measurements as dataclass instances.
+        """
+        with self._lock:
+            columns = [self._column_values(index) for index in range(len(self.names))]
+
+        return [self.measurement_type(*row) for row in zip(*columns)]
+
+    def _column_values(self, index: int) -> List[Any]:
+        values = self._columns[index][:self._size]
+        if self._is_string[index]:
+            strings = self._strings[index]
+            return [strings[code] for code in values]
+
+        return values.tolist()
+
+    def get_DataFrame(self, start: int = 0) -> DataFrame:
+        """
+        Builds a DataFrame, with one column per measurement field, over views
+        of the numpy columns. String columns become categoricals over the
+        interned values, ordered alphabetically so that sorting by them
+        behaves as it does for plain strings.
+
+        Parameters
+        ----------
+        start : int
+            Index of the first measurement to include; measurements are kept
+            in the order they were appended.
+
+        Returns
+        -------
+        DataFrame
+            A new DataFrame
+        """
+        data: Dict[str, Any] = {}
+        with self._lock:
+            for index, name in enumerate(self.names):
+                values = self._columns[index][start:self._size]
+                if self._is_string[index]:
+                    data[name] = self._to_categorical(values, self._strings[index])
+                else:
+                    data[name] = values
+
+        # Without copy=False, pandas copies every column out of the dict
+        return DataFrame(data, copy=False)  # type: ignore[call-arg]
+
+    def _to_categorical(self, codes: np.ndarray, strings: List[str]) -> Categorical:
+        categories = np.array(strings, dtype=object)
+        order = np.argsort(categories, kind="stable")
+        rank = np.empty(len(order), dtype=np.int32)
+        rank[order] = np.arange(len(order), dtype=np.int32)
+
+        return Categorical.from_codes(rank[codes], categories=categories[order])
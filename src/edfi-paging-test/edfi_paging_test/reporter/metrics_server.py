@@ -0,0 +1,78 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import logging
+import threading
+from typing import Any, Optional
+
+from edfi_paging_test.reporter.live_metrics import LiveMetrics
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsServer:
+    """
+    Serves the live metrics of a run at `/metrics`, in the Prometheus text
+    format, from a background thread, for a dashboard or `curl` to follow
+    the run. Only listens on localhost by default.
+
+    Parameters
+    ----------
+    metrics : LiveMetrics
+        The metrics to serve.
+    port : int
+        Port to listen on; 0 for any free port, see `port` once started.
+    host : str
+        Interface to listen on.
+    """
+
+    def __init__(self, metrics: LiveMetrics, port: int, host: str = "127.0.0.1") -> None:
+        self.metrics = metrics
+        self.port = port
+        self.host = host
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(HTTPStatus.NOT_FOUND)
+                    return
+
+                body = metrics.to_prometheus().encode("utf-8")
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug(format % args)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Serving live metrics on http://{self.host}:{self.port}/metrics")
+
+    def close(self) -> None:
+        """
+        Stops serving. Safe to call more than once.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
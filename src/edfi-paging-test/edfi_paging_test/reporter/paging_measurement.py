@@ -10,3 +10,14 @@ class PagingMeasurement:
     number_of_records: int
     elapsed_time: float
     http_status_code: int
+    # Where the time went; see RequestTiming
+    time_to_first_byte: float = 0.0
+    transfer_time: float = 0.0
+    response_bytes: int = 0
+    decode_time: float = 0.0
+    token_refreshed: bool = False
+    auth_time: float = 0.0
+    # Every attempt at a request is measured; see RetryPolicy
+    attempt: int = 1
+    backoff_time: float = 0.0
+    final_attempt: bool = True
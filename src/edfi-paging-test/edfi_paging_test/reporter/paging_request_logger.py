@@ -1,14 +1,57 @@
-from typing import List
+from dataclasses import fields
+from typing import Dict, Hashable, List, Optional
 
 from pandas import DataFrame, Series
 
 from edfi_paging_test.reporter.paging_measurement import PagingMeasurement
+from edfi_paging_test.reporter.measurement_store import MeasurementStore
+from edfi_paging_test.reporter.latency_histogram import LatencyHistograms, get_depth_bucket, get_percentile_columns
+from edfi_paging_test.reporter.live_metrics import LiveMetrics
+from edfi_paging_test.reporter.timing_breakdown import add_mean_timings
+
+
+# Keyed by Hashable, as the pandas stubs expect of a column mapper
+DETAIL_COLUMNS: Dict[Hashable, str] = {
+    "resource": "Resource",
+    "page_number": "PageNumber",
+    "page_size": "PageSize",
+    "number_of_records": "NumberOfRecords",
+    "elapsed_time": "ElapsedTime",
+    "http_status_code": "StatusCode",
+    "time_to_first_byte": "TimeToFirstByte",
+    "transfer_time": "TransferTime",
+    "response_bytes": "ResponseBytes",
+    "decode_time": "DecodeTime",
+    "token_refreshed": "TokenRefreshed",
+    "auth_time": "AuthTime",
+    "attempt": "Attempt",
+    "backoff_time": "BackoffTime",
+    "final_attempt": "FinalAttempt",
+}
+
+# The detail columns in the order of the measurement fields, which is also
+# the order of the arguments of `log_request`
+LOG_REQUEST_COLUMNS: List[str] = [str(DETAIL_COLUMNS.get(field.name, field.name)) for field in fields(PagingMeasurement)]
 
 
 class PaggingRequestLogger:
 
     def __init__(self):
-        self.request_log: List[PagingMeasurement] = []
+        self._store: MeasurementStore[PagingMeasurement] = MeasurementStore(PagingMeasurement)
+        self._histograms = LatencyHistograms()
+        # When set, every request logged is also counted in the live metrics
+        self.live_metrics: Optional[LiveMetrics] = None
+
+    @property
+    def request_log(self) -> List[PagingMeasurement]:
+        return self._store.to_list()
+
+    @request_log.setter
+    def request_log(self, measurements: List[PagingMeasurement]) -> None:
+        self._store.clear()
+        self._histograms.clear()
+        for m in measurements:
+            self.log_request(*vars(m).values())
 
     def log_request(
         self,
@@ -19,8 +62,23 @@ class PaggingRequestLogger:
         number_of_records: int,
         elapsed: float,
         status_code: int,
+        time_to_first_byte: float = 0.0,
+        transfer_time: float = 0.0,
+        response_bytes: int = 0,
+        decode_time: float = 0.0,
+        token_refreshed: bool = False,
+        auth_time: float = 0.0,
+        attempt: int = 1,
+        backoff_time: float = 0.0,
+        final_attempt: bool = True,
     ) -> None:
-        m = PagingMeasurement(
+        if self.live_metrics is not None:
+            self.live_metrics.record(resource, elapsed, status_code, number_of_records, attempt == 1)
+
+        # Percentiles are of first tries, retries being counted apart
+        if attempt == 1:
+            self._histograms.record((resource, page_size, get_depth_bucket(page)), elapsed)
+        self._store.append(
             resource,
             base_url,
             page,
@@ -28,9 +86,26 @@ class PaggingRequestLogger:
             number_of_records,
             elapsed,
             status_code,
+            time_to_first_byte,
+            transfer_time,
+            response_bytes,
+            decode_time,
+            token_refreshed,
+            auth_time,
+            attempt,
+            backoff_time,
+            final_attempt,
         )
 
-        self.request_log.append(m)
+    def get_detail(self, start: int = 0) -> DataFrame:
+        """
+        Converts the Measurements logged so far, from `start` on, to a
+        DataFrame with the detail column names, in the order they were logged.
+        """
+        df = self._store.get_DataFrame(start)
+        df.rename(columns=DETAIL_COLUMNS, inplace=True)
+
+        return df
 
     def get_DataFrame(self) -> DataFrame:
         """
@@ -48,24 +123,12 @@ class PaggingRequestLogger:
         DataFrame
             A new DataFrame, or the modified Dataframe if `df` is provided
         """
-        if len(self.request_log) == 0:
+        if len(self._store) == 0:
             raise RuntimeError(
                 "No measurements have been captured, therefore cannot create a DataFrame"
             )
 
-        df = DataFrame(data=self.request_log)
-        df.rename(
-            {
-                "resource": "Resource",
-                "page_number": "PageNumber",
-                "page_size": "PageSize",
-                "number_of_records": "NumberOfRecords",
-                "elapsed_time": "ElapsedTime",
-                "http_status_code": "StatusCode",
-            },
-            inplace=True,
-            axis=1,
-        )
+        df = self.get_detail()
 
         df.sort_values(by=["Resource", "PageNumber"], inplace=True)
 
@@ -74,28 +137,78 @@ class PaggingRequestLogger:
     def get_statistics(self):
         summary = self.get_DataFrame()
 
-        # Need multiple columns in order to perform three different aggregations
-        summary["MeanTime"] = summary["ElapsedTime"]
-        summary["StDeviation"] = summary["ElapsedTime"]
+        # Need multiple columns in order to perform three different aggregations.
+        # The mean and standard deviation are of first tries, as are the
+        # percentiles; retries are counted apart
+        summary["MeanTime"] = summary["ElapsedTime"].where(summary["Attempt"] == 1)
+        summary["StDeviation"] = summary["MeanTime"]
 
         # This is a fascinating capability. Found mention in Medium article,
         # though not at all clear from the Pandas documentation. Type check
         # does not like it, because not covered in the type stub
-        summary = summary.groupby(by=["Resource", "PageSize"], as_index=False).apply(
+        summary = summary.groupby(by=["Resource", "PageSize"], as_index=False, observed=True).apply(
             lambda s: Series(
                 {
                     "NumberOfPages": s[s["StatusCode"] < 400]["PageNumber"].count(),
                     "NumberOfRecords": s["NumberOfRecords"].sum(),
                     "TotalTime": s["ElapsedTime"].sum(),
+                    # Records per second of request time, comparable across page sizes
+                    "RecordsPerSecond": round(s["NumberOfRecords"].sum() / s["ElapsedTime"].sum(), 3)
+                    if s["ElapsedTime"].sum() > 0 else 0.0,
                     "MeanTime": s["MeanTime"].mean(),
                     # "Unbiased" estimate of standard deviation for a sample
                     # (ddof=1, panda's default). Equivalent of Excel STDEV.S()
                     "StDeviation": s["StDeviation"].std().round(6),  # type: ignore
-                    "NumberOfErrors": s[(s["StatusCode"] >= 400)]["StatusCode"].count(),
+                    # Requests that failed in the end, whatever the retries
+                    "NumberOfErrors": s[(s["StatusCode"] >= 400) & s["FinalAttempt"]]["StatusCode"].count(),
+                    "NumberOfRetries": (s["Attempt"] > 1).sum(),
                 }
             )
         )  # type: ignore
 
         summary.fillna(value=0, inplace=True)
 
+        histograms = self._histograms.merged(lambda key: key[:2])  # type: ignore
+        for name, values in get_percentile_columns(zip(summary["Resource"].astype(str), summary["PageSize"].astype(int)), histograms).items():
+            summary[name] = values
+
         return summary
+
+    def get_page_size_percentiles(self) -> Dict[int, Dict[str, float]]:
+        """
+        Latency percentiles of the requests of every resource together, by page size.
+        """
+        histograms = self._histograms.merged(lambda key: key[1])  # type: ignore
+        return {page_size: histogram.get_percentiles() for page_size, histogram in histograms.items()}  # type: ignore
+
+    def get_breakdown(self) -> DataFrame:
+        """
+        Latency percentiles by resource, page size and page depth (pages 1, 2-3, 4-7, ...), read from histograms that are
+        updated as requests are logged, next to the mean time to first byte, transfer and decode time at each depth.
+
+        Returns
+        -------
+        DataFrame
+            A new DataFrame
+        """
+        rows = []
+        for key, histogram in self._histograms.items():
+            resource, page_size, first_page = key  # type: ignore
+            rows.append(
+                {
+                    "Resource": resource,
+                    "PageSize": page_size,
+                    "FirstPage": first_page,
+                    "LastPage": first_page * 2 - 1,
+                    "NumberOfRequests": histogram.count,
+                    **histogram.get_percentiles(),
+                }
+            )
+
+        df = DataFrame(rows)
+        if len(df) > 0:
+            df.sort_values(by=["Resource", "PageSize", "FirstPage"], inplace=True)
+
+        detail = self.get_detail()
+        detail["FirstPage"] = detail["PageNumber"].map(get_depth_bucket)
+        return add_mean_timings(df, detail, ["Resource", "PageSize", "FirstPage"])
@@ -0,0 +1,206 @@
+from typing import Dict, Hashable, List, Optional
+
+from pandas import DataFrame, Series
+
+from edfi_paging_test.reporter.partition_measurement import PartitionMeasurement
+from edfi_paging_test.reporter.measurement_store import MeasurementStore
+from edfi_paging_test.reporter.latency_histogram import LatencyHistograms, get_depth_bucket, get_percentile_columns
+from edfi_paging_test.reporter.live_metrics import LiveMetrics
+from edfi_paging_test.reporter.timing_breakdown import add_mean_timings
+
+
+DETAIL_COLUMNS: Dict[Hashable, str] = {
+    "resource": "Resource",
+    "partition": "Partition",
+    "page_number": "PageNumber",
+    "page_size": "PageSize",
+    "number_of_records": "NumberOfRecords",
+    "elapsed_time": "ElapsedTime",
+    "http_status_code": "StatusCode",
+    "time_to_first_byte": "TimeToFirstByte",
+    "transfer_time": "TransferTime",
+    "response_bytes": "ResponseBytes",
+    "decode_time": "DecodeTime",
+    "token_refreshed": "TokenRefreshed",
+    "auth_time": "AuthTime",
+    "attempt": "Attempt",
+    "backoff_time": "BackoffTime",
+    "final_attempt": "FinalAttempt",
+}
+
+
+class PartitionRequestLogger:
+
+    def __init__(self):
+        self._store: MeasurementStore[PartitionMeasurement] = MeasurementStore(PartitionMeasurement)
+        self._histograms = LatencyHistograms()
+        # When set, every request logged is also counted in the live metrics
+        self.live_metrics: Optional[LiveMetrics] = None
+
+    @property
+    def request_log(self) -> List[PartitionMeasurement]:
+        return self._store.to_list()
+
+    @request_log.setter
+    def request_log(self, measurements: List[PartitionMeasurement]) -> None:
+        self._store.clear()
+        self._histograms.clear()
+        for m in measurements:
+            self.log_request(*vars(m).values())
+
+    def log_request(
+        self,
+        resource: str,
+        base_url: str,
+        partition: int,
+        page: int,
+        page_size: int,
+        number_of_records: int,
+        elapsed: float,
+        status_code: int,
+        time_to_first_byte: float = 0.0,
+        transfer_time: float = 0.0,
+        response_bytes: int = 0,
+        decode_time: float = 0.0,
+        token_refreshed: bool = False,
+        auth_time: float = 0.0,
+        attempt: int = 1,
+        backoff_time: float = 0.0,
+        final_attempt: bool = True,
+    ) -> None:
+        if self.live_metrics is not None:
+            self.live_metrics.record(resource, elapsed, status_code, number_of_records, attempt == 1)
+
+        # Percentiles are of first tries, retries being counted apart
+        if attempt == 1:
+            self._histograms.record((resource, page_size, get_depth_bucket(page)), elapsed)
+        self._store.append(
+            resource,
+            base_url,
+            partition,
+            page,
+            page_size,
+            number_of_records,
+            elapsed,
+            status_code,
+            time_to_first_byte,
+            transfer_time,
+            response_bytes,
+            decode_time,
+            token_refreshed,
+            auth_time,
+            attempt,
+            backoff_time,
+            final_attempt,
+        )
+
+    def get_detail(self, start: int = 0) -> DataFrame:
+        """
+        Converts the Measurements logged so far, from `start` on, to a
+        DataFrame with the detail column names, in the order they were logged.
+        """
+        df = self._store.get_DataFrame(start)
+        df.rename(columns=DETAIL_COLUMNS, inplace=True)
+
+        return df
+
+    def get_DataFrame(self) -> DataFrame:
+        """
+        Converts the list of Measurements to a DataFrame.
+
+        Returns
+        -------
+        DataFrame
+            A new DataFrame
+        """
+        if len(self._store) == 0:
+            raise RuntimeError(
+                "No measurements have been captured, therefore cannot create a DataFrame"
+            )
+
+        df = self.get_detail()
+
+        df.sort_values(by=["Resource", "Partition", "PageNumber"], inplace=True)
+
+        return df
+
+    def get_statistics(self):
+        summary = self.get_DataFrame()
+
+        # Need multiple columns in order to perform three different aggregations.
+        # The mean and standard deviation are of first tries, as are the
+        # percentiles; retries are counted apart
+        summary["MeanTime"] = summary["ElapsedTime"].where(summary["Attempt"] == 1)
+        summary["StDeviation"] = summary["MeanTime"]
+
+        summary = summary.groupby(by=["Resource", "PageSize"], as_index=False, observed=True).apply(
+            lambda s: Series(
+                {
+                    "NumberOfPartitions": s["Partition"].nunique(),
+                    "NumberOfPages": s[s["StatusCode"] < 400]["PageNumber"].count(),
+                    "NumberOfRecords": s["NumberOfRecords"].sum(),
+                    "TotalTime": s["ElapsedTime"].sum(),
+                    # Records per second of request time, comparable across page sizes
+                    "RecordsPerSecond": round(s["NumberOfRecords"].sum() / s["ElapsedTime"].sum(), 3)
+                    if s["ElapsedTime"].sum() > 0 else 0.0,
+                    "MeanTime": s["MeanTime"].mean(),
+                    # "Unbiased" estimate of standard deviation for a sample
+                    # (ddof=1, panda's default). Equivalent of Excel STDEV.S()
+                    "StDeviation": s["StDeviation"].std().round(6),  # type: ignore
+                    # Partitions are read in parallel, so the slowest partition
+                    # bounds the time to read the whole resource
+                    "MeanPartitionTime": s.groupby("Partition")["ElapsedTime"].sum().mean(),
+                    "MaxPartitionTime": s.groupby("Partition")["ElapsedTime"].sum().max(),
+                    # Requests that failed in the end, whatever the retries
+                    "NumberOfErrors": s[(s["StatusCode"] >= 400) & s["FinalAttempt"]]["StatusCode"].count(),
+                    "NumberOfRetries": (s["Attempt"] > 1).sum(),
+                }
+            )
+        )  # type: ignore
+
+        summary.fillna(value=0, inplace=True)
+
+        histograms = self._histograms.merged(lambda key: key[:2])  # type: ignore
+        for name, values in get_percentile_columns(zip(summary["Resource"].astype(str), summary["PageSize"].astype(int)), histograms).items():
+            summary[name] = values
+
+        return summary
+
+    def get_page_size_percentiles(self) -> Dict[int, Dict[str, float]]:
+        """
+        Latency percentiles of the requests of every resource together, by page size.
+        """
+        histograms = self._histograms.merged(lambda key: key[1])  # type: ignore
+        return {page_size: histogram.get_percentiles() for page_size, histogram in histograms.items()}  # type: ignore
+
+    def get_breakdown(self) -> DataFrame:
+        """
+        Latency percentiles by resource, page size and page depth within the partition (pages 1, 2-3, 4-7, ...), read from histograms that are
+        updated as requests are logged, next to the mean time to first byte, transfer and decode time at each depth.
+
+        Returns
+        -------
+        DataFrame
+            A new DataFrame
+        """
+        rows = []
+        for key, histogram in self._histograms.items():
+            resource, page_size, first_page = key  # type: ignore
+            rows.append(
+                {
+                    "Resource": resource,
+                    "PageSize": page_size,
+                    "FirstPage": first_page,
+                    "LastPage": first_page * 2 - 1,
+                    "NumberOfRequests": histogram.count,
+                    **histogram.get_percentiles(),
+                }
+            )
+
+        df = DataFrame(rows)
+        if len(df) > 0:
+            df.sort_values(by=["Resource", "PageSize", "FirstPage"], inplace=True)
+
+        detail = self.get_detail()
+        detail["FirstPage"] = detail["PageNumber"].map(get_depth_bucket)
+        return add_mean_timings(df, detail, ["Resource", "PageSize", "FirstPage"])
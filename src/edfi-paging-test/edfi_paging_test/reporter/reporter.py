@@ -1,5 +1,10 @@
-from pandas import DataFrame, Series
-from os import path, makedirs
+from pandas import DataFrame, read_csv, read_json, read_parquet
+from os import SEEK_END, listdir, path, makedirs, remove, replace
+from shutil import rmtree
+from typing import Any, Tuple
+
+# Columns with few distinct values, dictionary encoded in Parquet files
+DICTIONARY_COLUMNS = ["Resource", "URL"]
 
 
 def _create_if_not_exists(directory: str) -> None:
@@ -7,6 +12,52 @@ def _create_if_not_exists(directory: str) -> None:
         makedirs(directory)
 
 
+def _import_pyarrow() -> Tuple[Any, Any]:
+    """
+    pyarrow and its parquet module. pyarrow is an optional dependency,
+    installed with the package's `parquet` extra.
+
+    Raises
+    -------
+    RuntimeError
+        If pyarrow is not installed
+    """
+    try:
+        import pyarrow  # type: ignore
+        import pyarrow.parquet  # type: ignore
+    except ImportError:
+        raise RuntimeError("The PARQUET content type requires the pyarrow package; install the 'parquet' extra.")
+
+    return (pyarrow, pyarrow.parquet)
+
+
+def check_parquet_support() -> None:
+    """
+    Raises
+    -------
+    RuntimeError
+        If Parquet files cannot be written, as pyarrow is not installed
+    """
+    _import_pyarrow()
+
+
+def _write_parquet(df: DataFrame, file_path: str) -> None:
+    """
+    Writes a zstd compressed Parquet file. The `DICTIONARY_COLUMNS` are
+    stored as dictionaries, which are read back as categoricals, so that
+    every file of a run has the same schema whatever their contents.
+    """
+    pa, pq = _import_pyarrow()
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    dictionary_columns = [name for name in DICTIONARY_COLUMNS if name in table.column_names]
+    for name in dictionary_columns:
+        index = table.schema.get_field_index(name)
+        table = table.set_column(index, name, table.column(name).cast(pa.dictionary(pa.int32(), pa.string())))
+
+    pq.write_table(table, file_path, compression="zstd", use_dictionary=dictionary_columns)
+
+
 def create_detail_csv(df: DataFrame, output_dir: str, run_name: str) -> None:
     run_dir = path.join(output_dir, run_name)
     _create_if_not_exists(run_dir)
@@ -25,7 +76,144 @@ def create_detail_json(df: DataFrame, output_dir: str, run_name: str) -> None:
     df.to_json(file_path, orient="records")  # type: ignore
 
 
-def create_statistics_csv(statistics: Series, output_dir: str, run_name: str) -> None:
+def _append_csv(df: DataFrame, output_dir: str, run_name: str, file_name: str) -> None:
+    """
+    Appends rows to a CSV file, creating it with a header row first if
+    needed. Each batch is written with a single write, so the file only ever
+    holds whole rows.
+    """
+    run_dir = path.join(output_dir, run_name)
+    _create_if_not_exists(run_dir)
+
+    file_path = path.join(run_dir, file_name)
+    rows = df.to_csv(index=False, header=not path.exists(file_path))
+    # Without a path, to_csv returns the rows instead of writing them
+    assert rows is not None
+
+    with open(file_path, "a", newline="") as f:
+        f.write(rows)
+
+
+def _append_json(df: DataFrame, output_dir: str, run_name: str, file_name: str) -> None:
+    """
+    Appends records to the array in a JSON file, creating it if needed. The
+    closing bracket is overwritten by the new records and a new closing
+    bracket in a single write, so the file is a valid JSON array after every
+    batch.
+    """
+    run_dir = path.join(output_dir, run_name)
+    _create_if_not_exists(run_dir)
+
+    file_path = path.join(run_dir, file_name)
+
+    # Apparently to_json is not in the type stub
+    records: str = df.to_json(orient="records")  # type: ignore
+
+    if not path.exists(file_path):
+        with open(file_path, "wb") as f:
+            f.write(records.encode("utf-8"))
+        return
+
+    with open(file_path, "rb+") as f:
+        f.seek(-1, SEEK_END)
+        f.write(("," + records[1:]).encode("utf-8"))
+
+
+def _append_parquet(df: DataFrame, output_dir: str, run_name: str, dataset_name: str) -> None:
+    """
+    Appends rows to a Parquet dataset, a directory holding one Parquet file,
+    and row group, per batch. A Parquet file cannot be appended to once
+    written, but the files of the directory read as one table, in the order
+    they were written. Each file is written under a hidden name, which
+    readers skip, and then renamed, so the dataset only ever holds whole
+    files.
+    """
+    dataset_dir = path.join(output_dir, run_name, dataset_name)
+    _create_if_not_exists(dataset_dir)
+
+    part = len([name for name in listdir(dataset_dir) if not name.startswith(".")])
+    file_name = f"part-{part:05d}.parquet"
+    temp_path = path.join(dataset_dir, "." + file_name)
+    _write_parquet(df, temp_path)
+    replace(temp_path, path.join(dataset_dir, file_name))
+
+
+def append_detail_csv(df: DataFrame, output_dir: str, run_name: str) -> None:
+    _append_csv(df, output_dir, run_name, "detail.csv")
+
+
+def append_detail_json(df: DataFrame, output_dir: str, run_name: str) -> None:
+    _append_json(df, output_dir, run_name, "detail.json")
+
+
+def append_detail_parquet(df: DataFrame, output_dir: str, run_name: str) -> None:
+    _append_parquet(df, output_dir, run_name, "detail.parquet")
+
+
+def create_detail_parquet(df: DataFrame, output_dir: str, run_name: str) -> None:
+    detail_dir = path.join(output_dir, run_name, "detail.parquet")
+    if path.exists(detail_dir):
+        rmtree(detail_dir)
+
+    append_detail_parquet(df, output_dir, run_name)
+
+
+def read_detail_csv(output_dir: str, run_name: str) -> DataFrame:
+    """
+    Reads back the detail file of a run; empty when there is none.
+    """
+    file_path = path.join(output_dir, run_name, "detail.csv")
+    return read_csv(file_path) if path.exists(file_path) else DataFrame()
+
+
+def read_detail_json(output_dir: str, run_name: str) -> DataFrame:
+    """
+    Reads back the detail file of a run; empty when there is none.
+    """
+    file_path = path.join(output_dir, run_name, "detail.json")
+    if not path.exists(file_path):
+        return DataFrame()
+
+    # An array of records always reads as a DataFrame, which the stub cannot tell
+    return read_json(file_path, orient="records")  # type: ignore[return-value]
+
+
+def read_detail_parquet(output_dir: str, run_name: str) -> DataFrame:
+    """
+    Reads back the detail file of a run; empty when there is none.
+    """
+    detail_dir = path.join(output_dir, run_name, "detail.parquet")
+    if not path.exists(detail_dir):
+        return DataFrame()
+
+    _import_pyarrow()
+    return read_parquet(detail_dir)
+
+
+def remove_detail(output_dir: str, run_name: str) -> None:
+    for file_name in ["detail.csv", "detail.json"]:
+        file_path = path.join(output_dir, run_name, file_name)
+        if path.exists(file_path):
+            remove(file_path)
+
+    detail_dir = path.join(output_dir, run_name, "detail.parquet")
+    if path.exists(detail_dir):
+        rmtree(detail_dir)
+
+
+def append_snapshots_csv(snapshots: DataFrame, output_dir: str, run_name: str) -> None:
+    _append_csv(snapshots, output_dir, run_name, "snapshots.csv")
+
+
+def append_snapshots_json(snapshots: DataFrame, output_dir: str, run_name: str) -> None:
+    _append_json(snapshots, output_dir, run_name, "snapshots.json")
+
+
+def append_snapshots_parquet(snapshots: DataFrame, output_dir: str, run_name: str) -> None:
+    _append_parquet(snapshots, output_dir, run_name, "snapshots.parquet")
+
+
+def create_statistics_csv(statistics: DataFrame, output_dir: str, run_name: str) -> None:
     run_dir = path.join(output_dir, run_name)
     _create_if_not_exists(run_dir)
 
@@ -33,7 +221,7 @@ def create_statistics_csv(statistics: Series, output_dir: str, run_name: str) ->
     statistics.to_csv(file_path, index=False)
 
 
-def create_statistics_json(statistics: Series, output_dir: str, run_name: str) -> None:
+def create_statistics_json(statistics: DataFrame, output_dir: str, run_name: str) -> None:
     run_dir = path.join(output_dir, run_name)
     _create_if_not_exists(run_dir)
 
@@ -43,6 +231,88 @@ def create_statistics_json(statistics: Series, output_dir: str, run_name: str) -
     statistics.to_json(file_path, orient="records")  # type: ignore
 
 
+def create_statistics_parquet(statistics: DataFrame, output_dir: str, run_name: str) -> None:
+    run_dir = path.join(output_dir, run_name)
+    _create_if_not_exists(run_dir)
+
+    _write_parquet(statistics, path.join(run_dir, "statistics.parquet"))
+
+
+def create_breakdown_csv(breakdown: DataFrame, output_dir: str, run_name: str) -> None:
+    run_dir = path.join(output_dir, run_name)
+    _create_if_not_exists(run_dir)
+
+    file_path = path.join(run_dir, "breakdown.csv")
+    breakdown.to_csv(file_path, index=False)
+
+
+def create_breakdown_json(breakdown: DataFrame, output_dir: str, run_name: str) -> None:
+    run_dir = path.join(output_dir, run_name)
+    _create_if_not_exists(run_dir)
+
+    file_path = path.join(run_dir, "breakdown.json")
+
+    # Apparently to_json is not in the type stub
+    breakdown.to_json(file_path, orient="records")  # type: ignore
+
+
+def create_breakdown_parquet(breakdown: DataFrame, output_dir: str, run_name: str) -> None:
+    run_dir = path.join(output_dir, run_name)
+    _create_if_not_exists(run_dir)
+
+    _write_parquet(breakdown, path.join(run_dir, "breakdown.parquet"))
+
+
+def create_depth_model_csv(model: DataFrame, output_dir: str, run_name: str) -> None:
+    run_dir = path.join(output_dir, run_name)
+    _create_if_not_exists(run_dir)
+
+    file_path = path.join(run_dir, "depth_model.csv")
+    model.to_csv(file_path, index=False)
+
+
+def create_depth_model_json(model: DataFrame, output_dir: str, run_name: str) -> None:
+    run_dir = path.join(output_dir, run_name)
+    _create_if_not_exists(run_dir)
+
+    file_path = path.join(run_dir, "depth_model.json")
+
+    # Apparently to_json is not in the type stub
+    model.to_json(file_path, orient="records")  # type: ignore
+
+
+def create_depth_model_parquet(model: DataFrame, output_dir: str, run_name: str) -> None:
+    run_dir = path.join(output_dir, run_name)
+    _create_if_not_exists(run_dir)
+
+    _write_parquet(model, path.join(run_dir, "depth_model.parquet"))
+
+
+def create_concurrency_search_csv(steps: DataFrame, output_dir: str, run_name: str) -> None:
+    run_dir = path.join(output_dir, run_name)
+    _create_if_not_exists(run_dir)
+
+    file_path = path.join(run_dir, "concurrency_search.csv")
+    steps.to_csv(file_path, index=False)
+
+
+def create_concurrency_search_json(steps: DataFrame, output_dir: str, run_name: str) -> None:
+    run_dir = path.join(output_dir, run_name)
+    _create_if_not_exists(run_dir)
+
+    file_path = path.join(run_dir, "concurrency_search.json")
+
+    # Apparently to_json is not in the type stub
+    steps.to_json(file_path, orient="records")  # type: ignore
+
+
+def create_concurrency_search_parquet(steps: DataFrame, output_dir: str, run_name: str) -> None:
+    run_dir = path.join(output_dir, run_name)
+    _create_if_not_exists(run_dir)
+
+    _write_parquet(steps, path.join(run_dir, "concurrency_search.parquet"))
+
+
 def create_summary_json(df: DataFrame, output_dir: str, run_name: str) -> None:
     run_dir = path.join(output_dir, run_name)
     _create_if_not_exists(run_dir)
@@ -0,0 +1,105 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import logging
+import threading
+from typing import Optional
+
+from edfi_paging_test.helpers.output_format import OutputFormat
+from edfi_paging_test.reporter import reporter
+from edfi_paging_test.reporter.live_metrics import LiveMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotWriter:
+    """
+    Takes a snapshot of the live metrics every `interval` seconds, from a
+    background thread: appends a row per resource to the snapshots file of
+    the run, and logs the rates and latency across every resource. The rows
+    show how the API held up over the course of the run, e.g. a latency that
+    creeps up hours in.
+
+    Parameters
+    ----------
+    metrics : LiveMetrics
+        The metrics to take snapshots of.
+    output_dir : str
+        Directory for writing results.
+    run_name : str
+        Name of the run, i.e. of its directory under `output_dir`.
+    output_format : OutputFormat
+        Content type of the snapshots file.
+    interval : float
+        Seconds between snapshots.
+    """
+
+    def __init__(
+        self,
+        metrics: LiveMetrics,
+        output_dir: str,
+        run_name: str,
+        output_format: OutputFormat,
+        interval: float,
+    ) -> None:
+        self.metrics = metrics
+        self.output_dir = output_dir
+        self.run_name = run_name
+        self.interval = interval
+        self.snapshots_written = 0
+
+        append_snapshots_out = {
+            OutputFormat.CSV: reporter.append_snapshots_csv,
+            OutputFormat.JSON: reporter.append_snapshots_json,
+            OutputFormat.PARQUET: reporter.append_snapshots_parquet,
+        }
+        self._append = append_snapshots_out[output_format]
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.write()
+            except Exception as err:
+                # Keep the run going; the next snapshot is taken as usual
+                logger.warning(f"Unable to write the metrics snapshot: {err}")
+
+    def write(self) -> None:
+        snapshot = self.metrics.get_snapshot()
+        if len(snapshot) == 0:
+            return
+
+        self._append(snapshot, self.output_dir, self.run_name)
+        self.snapshots_written += 1
+
+        totals = self.metrics.get_totals()
+        progress = ""
+        if totals["ExpectedRecords"] > 0:
+            progress = f", {100 * totals['NumberOfRecords'] / totals['ExpectedRecords']:.0f}% of the records read"
+        logger.info(
+            f"Last {self.metrics.window:g} seconds: {totals['RequestsPerSecond']:.1f} requests per second, "
+            f"{totals['ErrorsPerSecond']:.1f} errors per second, P95 {totals['P95']:.3f}s; "
+            f"{totals['InFlight']} requests in flight{progress}."
+        )
+
+    def close(self) -> None:
+        """
+        Stops the background thread and takes a last snapshot, of the run as
+        it finished. Safe to call more than once.
+        """
+        if self._stopped.is_set():
+            return
+
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.write()
@@ -4,6 +4,8 @@
 # See the LICENSE and NOTICES files in the project root for more information.
 
 from dataclasses import dataclass
+from typing import Optional
+from edfi_paging_test.helpers.concurrency_search import ConcurrencySearchSummary
 from edfi_paging_test.helpers.main_arguments import MainArguments
 from pandas import DataFrame
 import pandas as pd
@@ -16,6 +18,7 @@ class Summary:
     run_name: str
     run_configration: MainArguments
     machine_name : str = socket.gethostname()
+    concurrency_search: Optional[ConcurrencySearchSummary] = None
 
     def __post_init__(self):
         if (self.run_configration):
@@ -23,6 +26,8 @@ class Summary:
             self.run_configration.contentType = self.run_configration.contentType.value  # type: ignore
             self.run_configration.log_level = self.run_configration.log_level.value  # type: ignore
             self.run_configration.test_type = self.run_configration.test_type.value  # type: ignore
+            self.run_configration.request_engine = self.run_configration.request_engine.value  # type: ignore
+            self.run_configration.json_decoder = self.run_configration.json_decoder.value  # type: ignore
 
     def get_DataFrame(self) -> DataFrame:
         """
@@ -38,4 +43,9 @@ class Summary:
         json_summary = json.loads(df.to_json(orient="records"))  # type: ignore
         df = pd.json_normalize(json_summary)  # type: ignore
         df.columns = df.columns.str.title().str.replace("_", "")  # type: ignore
+
+        # Only runs that searched for the saturation point report it
+        if self.concurrency_search is None:
+            df = df.drop(columns=["ConcurrencySearch"])
+
         return df
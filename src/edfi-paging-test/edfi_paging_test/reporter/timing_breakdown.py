@@ -0,0 +1,42 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from typing import List
+
+from pandas import DataFrame
+
+# Mean of each detail column, by breakdown column name
+MEAN_TIMING_COLUMNS = {
+    "MeanTimeToFirstByte": "TimeToFirstByte",
+    "MeanTransferTime": "TransferTime",
+    "MeanDecodeTime": "DecodeTime",
+    "MeanResponseBytes": "ResponseBytes",
+    "MeanAuthTime": "AuthTime",
+}
+
+
+def add_mean_timings(breakdown: DataFrame, detail: DataFrame, by: List[str]) -> DataFrame:
+    """
+    Adds, to each row of a breakdown, where the time of its requests went on
+    average, i.e. time to first byte versus transfer and decode time, and how
+    many of them waited for a token refresh and for how long. `detail` holds
+    one row per request attempt, with the detail column names and the `by`
+    columns of the breakdown; only first tries are counted, as in the
+    percentiles.
+    """
+    if len(breakdown) == 0:
+        return breakdown
+
+    groups = detail[detail["Attempt"] == 1].groupby(by=by, observed=True)
+    # DataFrame.round is missing from the stubs
+    timings = groups[list(MEAN_TIMING_COLUMNS.values())].mean().round(6)  # type: ignore[operator]
+    timings.columns = list(MEAN_TIMING_COLUMNS.keys())
+    timings["TokenRefreshes"] = groups["TokenRefreshed"].sum()
+    timings.reset_index(inplace=True)
+
+    # Match the key types of the breakdown, whose resources are plain strings
+    timings["Resource"] = timings["Resource"].astype(str)
+
+    return breakdown.merge(timings, on=by, how="left")
@@ -0,0 +1,225 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import asyncio
+from http import HTTPStatus
+from timeit import default_timer
+from typing import Any, Awaitable, Callable, Dict, List, TypeVar
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import pytest
+
+from edfi_paging_test.api.async_request_client import AsyncRequestClient
+from edfi_paging_test.api.paginated_result import PaginatedResult
+from edfi_paging_test.api.token_manager import Credentials
+from edfi_paging_test.helpers.argparser import MainArguments
+from edfi_paging_test.helpers.output_format import OutputFormat
+from edfi_paging_test.reporter.filtered_read_request_logger import FilteredReadRequestLogger
+from edfi_paging_test.reporter.paging_request_logger import PaggingRequestLogger
+
+
+FAKE_KEY = "TEST_KEY"
+FAKE_SECRET = "TEST_SECRET"
+FAKE_ENDPOINT = "ENDPOINT"
+OVERLOADED_ENDPOINT = "OVERLOADED"
+SLOW_ENDPOINT = "SLOW"
+SLOW_SECONDS = 1.0
+ITEMS = [{"id": "a"}, {"id": "b"}, {"id": "c"}, {"id": "d"}]
+PAGE_SIZE = 2
+TOKEN = "038f4cb947c04fb4851fc3792c6b004f"
+
+T = TypeVar("T")
+
+
+def _create_app(token_requests: List[int]) -> web.Application:
+    async def version(request: web.Request) -> web.Response:
+        base = str(request.url.origin())
+        return web.json_response(
+            {
+                "version": "a",
+                "dataModels": "c",
+                "urls": {
+                    "oauth": f"{base}/oauth/token/",
+                    "dataManagementApi": f"{base}/data/v3/",
+                },
+            }
+        )
+
+    async def token(request: web.Request) -> web.Response:
+        token_requests.append(1)
+        return web.json_response(
+            {"access_token": TOKEN, "expires_in": 1800, "token_type": "bearer"},
+            status=HTTPStatus.CREATED,
+        )
+
+    async def resource(request: web.Request) -> web.Response:
+        if request.headers.get("Authorization") != f"Bearer {TOKEN}":
+            return web.json_response({"error": "unauthorized"}, status=HTTPStatus.UNAUTHORIZED)
+
+        if "name" in request.query:
+            return web.json_response([i for i in ITEMS if i["id"] == request.query["name"]])
+
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query.get("limit", 25))
+        return web.json_response(
+            ITEMS[offset:offset + limit], headers={"total-count": str(len(ITEMS))}
+        )
+
+    overloaded_requests: List[int] = []
+
+    async def overloaded(request: web.Request) -> web.Response:
+        # Only every other request gets through
+        overloaded_requests.append(1)
+        if len(overloaded_requests) % 2 == 1:
+            return web.json_response({}, status=HTTPStatus.SERVICE_UNAVAILABLE)
+
+        return web.json_response(ITEMS[:PAGE_SIZE])
+
+    async def slow(request: web.Request) -> web.Response:
+        await asyncio.sleep(SLOW_SECONDS)
+        return web.json_response([], headers={"total-count": "0"})
+
+    app = web.Application()
+    app.router.add_get("/", version)
+    app.router.add_post("/oauth/token/", token)
+    app.router.add_get(f"/data/v3/ed-fi/{FAKE_ENDPOINT}", resource)
+    app.router.add_get(f"/data/v3/ed-fi/{OVERLOADED_ENDPOINT}", overloaded)
+    app.router.add_get(f"/data/v3/ed-fi/{SLOW_ENDPOINT}", slow)
+    return app
+
+
+def _run_against_server(
+    act: Callable[[AsyncRequestClient], Awaitable[T]], token_requests: List[int], max_retries: int = 0
+) -> T:
+    async def _scenario() -> T:
+        async with TestServer(_create_app(token_requests)) as server:
+            args = MainArguments(
+                str(server.make_url("")).rstrip("/"),
+                4,
+                FAKE_KEY,
+                FAKE_SECRET,
+                True,
+                "doesn't matter",
+                "description",
+                OutputFormat.CSV,
+                [],
+                PAGE_SIZE,
+                max_retries=max_retries,
+                retry_backoff=0.01,
+            )
+            async with AsyncRequestClient(args) as request_client:
+                return await act(request_client)
+
+    return asyncio.run(_scenario())
+
+
+def describe_testing_AsyncRequestClient_class():
+    def describe_when_getting_total_count():
+        def it_returns_the_total_count():
+            async def act(client: AsyncRequestClient) -> int:
+                return await client.get_total(FAKE_ENDPOINT)
+
+            assert _run_against_server(act, []) == len(ITEMS)
+
+    def describe_when_getting_all_pages():
+        @pytest.fixture
+        def logger() -> PaggingRequestLogger:
+            return PaggingRequestLogger()
+
+        @pytest.fixture
+        def result(logger: PaggingRequestLogger) -> List[Dict[str, Any]]:
+            async def act(client: AsyncRequestClient) -> List[Dict[str, Any]]:
+                return await client.get_all(FAKE_ENDPOINT, logger)
+
+            return _run_against_server(act, [])
+
+        def it_should_return_all_available_items(result: List[Dict[str, Any]]):
+            assert result == ITEMS
+
+        def it_logs_one_measurement_per_page(result, logger: PaggingRequestLogger):
+            df = logger.get_DataFrame()
+            assert list(df["PageNumber"]) == [1, 2, 3]
+            assert list(df["NumberOfRecords"]) == [2, 2, 0]
+            assert (df["StatusCode"] == HTTPStatus.OK).all()
+
+        def it_records_where_the_time_went(result, logger: PaggingRequestLogger):
+            df = logger.get_DataFrame()
+            assert list(df["ResponseBytes"]) == [len('[{"id": "a"}, {"id": "b"}]'), len('[{"id": "c"}, {"id": "d"}]'), 2]
+            assert (df["TimeToFirstByte"] > 0).all()
+            assert (df["TimeToFirstByte"].to_numpy() + df["TransferTime"].to_numpy() <= df["ElapsedTime"].to_numpy()).all()
+
+        def it_flags_the_request_that_waited_for_the_token(result, logger: PaggingRequestLogger):
+            assert list(logger.get_DataFrame()["TokenRefreshed"]) == [True, False, False]
+
+    def describe_when_getting_all_pages_in_parallel():
+        def it_should_return_all_items_in_page_order():
+            async def act(client: AsyncRequestClient) -> List[Dict[str, Any]]:
+                return await client.get_all_parallel(FAKE_ENDPOINT, PaggingRequestLogger(), len(ITEMS), 4)
+
+            assert _run_against_server(act, []) == ITEMS
+
+    def describe_when_getting_filtered_results():
+        @pytest.fixture
+        def logger() -> FilteredReadRequestLogger:
+            return FilteredReadRequestLogger()
+
+        def it_returns_the_matching_entries(logger: FilteredReadRequestLogger):
+            async def act(client: AsyncRequestClient) -> List[Dict[str, Any]]:
+                return await client.filtered_get(FAKE_ENDPOINT, {"name": "c"}, 100, logger)
+
+            assert _run_against_server(act, []) == [{"id": "c"}]
+            assert logger.get_DataFrame().iloc[0]["NumberOfFilters"] == 1
+
+    def describe_when_many_requests_are_sent_concurrently():
+        def it_authenticates_only_once():
+            token_requests: List[int] = []
+
+            async def act(client: AsyncRequestClient) -> List[int]:
+                return await asyncio.gather(*[client.get_total(FAKE_ENDPOINT) for _ in range(20)])
+
+            assert _run_against_server(act, token_requests) == [len(ITEMS)] * 20
+            assert len(token_requests) == 1
+
+    def describe_when_every_connection_is_busy():
+        def it_fetches_a_token_without_waiting_for_one():
+            token_requests: List[int] = []
+
+            async def act(client: AsyncRequestClient) -> None:
+                await client.get_total(FAKE_ENDPOINT)
+                # As many slow requests as the connection limit
+                slow = [asyncio.ensure_future(client.get_total(SLOW_ENDPOINT)) for _ in range(4)]
+                await asyncio.sleep(SLOW_SECONDS / 5)
+
+                await asyncio.wait_for(client._fetch_token(Credentials(FAKE_KEY, FAKE_SECRET)), SLOW_SECONDS / 2)
+                await asyncio.gather(*slow)
+
+            _run_against_server(act, token_requests)
+
+            assert len(token_requests) == 2
+
+    def describe_when_getting_a_scheduled_page():
+        def it_measures_the_elapsed_time_from_the_scheduled_time():
+            logger = PaggingRequestLogger()
+
+            async def act(client: AsyncRequestClient) -> None:
+                await client.get_page(FAKE_ENDPOINT, logger, 1, default_timer() - 0.5)
+
+            _run_against_server(act, [])
+
+            assert logger.get_DataFrame()["ElapsedTime"].iloc[0] >= 0.5
+
+    def describe_when_the_api_is_overloaded():
+        def it_retries_and_records_every_attempt():
+            logger = PaggingRequestLogger()
+
+            async def act(client: AsyncRequestClient) -> PaginatedResult:
+                return await client.get_page(OVERLOADED_ENDPOINT, logger, 1)
+
+            assert _run_against_server(act, [], max_retries=1).size == PAGE_SIZE
+
+            df = logger.get_detail()
+            assert list(df["StatusCode"]) == [HTTPStatus.SERVICE_UNAVAILABLE, HTTPStatus.OK]
+            assert list(df["FinalAttempt"]) == [False, True]
@@ -0,0 +1,42 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import json
+
+from edfi_paging_test.api.item_counter import count_items
+
+
+def describe_when_counting_items() -> None:
+    def describe_given_an_empty_array() -> None:
+        def it_counts_none() -> None:
+            assert count_items(b" [ ] ") == 0
+
+    def describe_given_a_single_number() -> None:
+        def it_counts_one() -> None:
+            assert count_items(b"[1]") == 1
+
+    def describe_given_a_single_literal() -> None:
+        def it_counts_one() -> None:
+            assert count_items(b"[true]") == 1
+
+    def describe_given_an_array_of_objects() -> None:
+        def it_counts_the_objects() -> None:
+            items = [{"id": str(i), "schoolId": i, "grades": [1, 2, {"a": None}]} for i in range(25)]
+
+            assert count_items(json.dumps(items).encode()) == 25
+
+    def describe_given_strings_holding_commas_and_brackets() -> None:
+        def it_ignores_them() -> None:
+            content = b'[{"name": "a, [b], {c}"}, {"name": "d\\\\"}, {"name": "e \\" ,]"}]'
+
+            assert count_items(content) == len(json.loads(content)) == 3
+
+    def describe_given_an_object() -> None:
+        def it_cannot_count() -> None:
+            assert count_items(b'{"message": "Invalid page size"}') is None
+
+    def describe_given_a_truncated_array() -> None:
+        def it_cannot_count() -> None:
+            assert count_items(b'[{"id": "1"}, {"id": "2"]') is None
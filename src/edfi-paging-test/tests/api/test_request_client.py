@@ -5,16 +5,21 @@
 
 import json
 from time import sleep
+from timeit import default_timer
 from typing import Tuple
 
 import pytest
+import requests
 import requests_mock
 from http import HTTPStatus
 
 from edfi_paging_test.api.request_client import RequestClient, timeit
+from edfi_paging_test.api.request_timing import RequestTiming
 from edfi_paging_test.helpers.argparser import MainArguments
 from edfi_paging_test.helpers.output_format import OutputFormat
+from edfi_paging_test.reporter.live_metrics import LiveMetrics
 from edfi_paging_test.reporter.paging_request_logger import PaggingRequestLogger
+from edfi_paging_test.reporter.partition_request_logger import PartitionRequestLogger
 
 
 FAKE_KEY = "TEST_KEY"
@@ -111,11 +116,173 @@ def describe_testing_RequestClient_class():
 
                     # Act
                     relative_url = "/" + FAKE_ENDPOINT
-                    result = default_request_client._get(relative_url)
+                    result = default_request_client._get(relative_url, RequestTiming())
 
                     # Assert
                     assert result.text == CONTENT
 
+    def describe_when_getting_a_page():
+        @pytest.fixture
+        def logger(default_request_client: RequestClient) -> PaggingRequestLogger:
+            logger = PaggingRequestLogger()
+            with requests_mock.Mocker() as m:
+                m.post(OAUTH_URL, status_code=201, text=json.dumps(TOKEN_RESPONSE))
+                m.get(API_BASE_URL, status_code=HTTPStatus.OK, text=json.dumps(VERSION_INFO))
+                m.get(
+                    f"{API_BASE_URL}/data/v3/ed-fi/{FAKE_ENDPOINT}",
+                    status_code=HTTPStatus.OK,
+                    text=json.dumps(FAKE_API_RESPONSE_PAGE1),
+                )
+
+                default_request_client.get_page(FAKE_ENDPOINT, logger, 1)
+                default_request_client.get_page(FAKE_ENDPOINT, logger, 2)
+
+            return logger
+
+        def it_records_the_size_of_the_response(logger: PaggingRequestLogger):
+            assert list(logger.get_DataFrame()["ResponseBytes"]) == [len(json.dumps(FAKE_API_RESPONSE_PAGE1))] * 2
+
+        def it_flags_the_request_that_waited_for_the_token(logger: PaggingRequestLogger):
+            assert list(logger.get_DataFrame()["TokenRefreshed"]) == [True, False]
+
+        def it_keeps_the_elapsed_time_covering_every_phase(logger: PaggingRequestLogger):
+            df = logger.get_DataFrame()
+            assert (df["TimeToFirstByte"].to_numpy() + df["TransferTime"].to_numpy() <= df["ElapsedTime"].to_numpy()).all()
+
+        def it_records_the_wait_for_the_token_apart(logger: PaggingRequestLogger):
+            auth_time = list(logger.get_DataFrame()["AuthTime"])
+            assert auth_time[0] > 0 and auth_time[1] == 0
+
+    def describe_when_the_api_rejects_the_token():
+        def it_fetches_a_new_token_and_retries(default_request_client: RequestClient):
+            with requests_mock.Mocker() as m:
+                token = m.post(OAUTH_URL, status_code=201, text=json.dumps(TOKEN_RESPONSE))
+                m.get(API_BASE_URL, status_code=HTTPStatus.OK, text=json.dumps(VERSION_INFO))
+                m.get(
+                    f"{API_BASE_URL}/data/v3/ed-fi/{FAKE_ENDPOINT}",
+                    [
+                        {"status_code": HTTPStatus.UNAUTHORIZED, "text": "{}"},
+                        {"status_code": HTTPStatus.OK, "text": json.dumps(FAKE_API_RESPONSE_PAGE1)},
+                    ],
+                )
+
+                page = default_request_client.get_page(FAKE_ENDPOINT, PaggingRequestLogger(), 1)
+
+            assert page.status_code == HTTPStatus.OK
+            assert token.call_count == 2
+
+    def describe_when_the_api_is_overloaded():
+        @pytest.fixture
+        def request_client(default_request_client: RequestClient) -> RequestClient:
+            default_request_client.retry_policy.max_retries = 2
+            default_request_client.retry_policy.backoff = 0.01
+            return default_request_client
+
+        def _get_page(request_client: RequestClient, *responses) -> Tuple[int, PaggingRequestLogger]:
+            logger = PaggingRequestLogger()
+            with requests_mock.Mocker() as m:
+                m.post(OAUTH_URL, status_code=201, text=json.dumps(TOKEN_RESPONSE))
+                m.get(API_BASE_URL, status_code=HTTPStatus.OK, text=json.dumps(VERSION_INFO))
+                m.get(f"{API_BASE_URL}/data/v3/ed-fi/{FAKE_ENDPOINT}", list(responses))
+
+                page = request_client.get_page(FAKE_ENDPOINT, logger, 1)
+
+            return (page.size, logger)
+
+        def it_retries_and_records_every_attempt(request_client: RequestClient):
+            size, logger = _get_page(
+                request_client,
+                {"status_code": HTTPStatus.SERVICE_UNAVAILABLE, "text": "{}"},
+                {"status_code": HTTPStatus.OK, "text": json.dumps(FAKE_API_RESPONSE_PAGE1)},
+            )
+
+            df = logger.get_detail()
+            assert size == len(FAKE_API_RESPONSE_PAGE1)
+            assert list(df["Attempt"]) == [1, 2]
+            assert list(df["FinalAttempt"]) == [False, True]
+            assert list(df["NumberOfRecords"]) == [0, len(FAKE_API_RESPONSE_PAGE1)]
+            assert df["BackoffTime"].iloc[1] <= 0.02
+
+        def it_gives_up_after_the_last_retry(request_client: RequestClient):
+            size, logger = _get_page(
+                request_client, {"status_code": HTTPStatus.TOO_MANY_REQUESTS, "text": "{}", "headers": {"Retry-After": "0"}}
+            )
+
+            df = logger.get_detail()
+            assert size == 0
+            assert list(df["Attempt"]) == [1, 2, 3]
+            assert list(df["StatusCode"]) == [HTTPStatus.TOO_MANY_REQUESTS] * 3
+
+        def describe_given_the_breaker_is_open():
+            COOLDOWN = 0.1
+
+            @pytest.fixture
+            def breaker_client(request_client: RequestClient) -> RequestClient:
+                request_client.retry_policy.max_retries = 0
+                request_client.breaker_threshold = 1
+                request_client.breaker_cooldown = COOLDOWN
+                return request_client
+
+            def it_lets_another_request_through_when_the_one_let_through_raises(breaker_client: RequestClient):
+                with requests_mock.Mocker() as m:
+                    m.post(OAUTH_URL, status_code=201, text=json.dumps(TOKEN_RESPONSE))
+                    m.get(API_BASE_URL, status_code=HTTPStatus.OK, text=json.dumps(VERSION_INFO))
+                    m.get(
+                        f"{API_BASE_URL}/data/v3/ed-fi/{FAKE_ENDPOINT}",
+                        [
+                            {"status_code": HTTPStatus.SERVICE_UNAVAILABLE, "text": "{}"},
+                            {"exc": requests.exceptions.ConnectionError},
+                            {"status_code": HTTPStatus.OK, "text": json.dumps(FAKE_API_RESPONSE_PAGE1)},
+                        ],
+                    )
+
+                    breaker_client.get_page(FAKE_ENDPOINT, PaggingRequestLogger(), 1)
+                    with pytest.raises(requests.exceptions.ConnectionError):
+                        breaker_client.get_page(FAKE_ENDPOINT, PaggingRequestLogger(), 1)
+
+                    # Paused again, rather than waiting on the outcome of the raised request
+                    breaker = breaker_client._get_breaker(FAKE_ENDPOINT)
+                    assert breaker is not None and breaker.get_delay() > COOLDOWN / 2
+
+                    assert breaker_client.get_page(FAKE_ENDPOINT, PaggingRequestLogger(), 1).size == len(FAKE_API_RESPONSE_PAGE1)
+
+            def it_keeps_the_wait_out_of_the_elapsed_time_of_a_scheduled_request(breaker_client: RequestClient):
+                logger = PaggingRequestLogger()
+                with requests_mock.Mocker() as m:
+                    m.post(OAUTH_URL, status_code=201, text=json.dumps(TOKEN_RESPONSE))
+                    m.get(API_BASE_URL, status_code=HTTPStatus.OK, text=json.dumps(VERSION_INFO))
+                    m.get(
+                        f"{API_BASE_URL}/data/v3/ed-fi/{FAKE_ENDPOINT}",
+                        [
+                            {"status_code": HTTPStatus.SERVICE_UNAVAILABLE, "text": "{}"},
+                            {"status_code": HTTPStatus.OK, "text": json.dumps(FAKE_API_RESPONSE_PAGE1)},
+                        ],
+                    )
+
+                    breaker_client.get_page(FAKE_ENDPOINT, PaggingRequestLogger(), 1)
+                    breaker_client.get_page(FAKE_ENDPOINT, logger, 1, scheduled_at=default_timer())
+
+                row = logger.get_detail().to_dict("records")[0]
+                assert row["BackoffTime"] >= COOLDOWN / 2
+                assert row["ElapsedTime"] < COOLDOWN / 2
+
+    def describe_when_only_counting_the_items_of_a_page():
+        def it_returns_the_size_without_the_items(default_request_client: RequestClient):
+            default_request_client.count_only = True
+            with requests_mock.Mocker() as m:
+                m.post(OAUTH_URL, status_code=201, text=json.dumps(TOKEN_RESPONSE))
+                m.get(API_BASE_URL, status_code=HTTPStatus.OK, text=json.dumps(VERSION_INFO))
+                m.get(
+                    f"{API_BASE_URL}/data/v3/ed-fi/{FAKE_ENDPOINT}",
+                    status_code=HTTPStatus.OK,
+                    text=json.dumps(FAKE_API_RESPONSE_PAGE1),
+                )
+
+                page = default_request_client.get_page(FAKE_ENDPOINT, PaggingRequestLogger(), 1)
+
+            assert page.current_page_items == []
+            assert page.size == len(FAKE_API_RESPONSE_PAGE1)
+
     def describe_when_getting_total_count():
         def describe_given_there_is_total_count_in_the_header():
             def it_returns_the_total_count(default_request_client: RequestClient):
@@ -136,6 +303,29 @@ def describe_testing_RequestClient_class():
                     # Assert
                     assert result == 2
 
+    def describe_when_watching_live_metrics():
+        def it_counts_the_records_read_against_the_total_count(default_request_client: RequestClient):
+            metrics = LiveMetrics()
+            logger = PaggingRequestLogger()
+            logger.live_metrics = metrics
+            default_request_client.live_metrics = metrics
+            with requests_mock.Mocker() as m:
+                m.post(OAUTH_URL, status_code=201, text=json.dumps(TOKEN_RESPONSE))
+                m.get(API_BASE_URL, status_code=HTTPStatus.OK, text=json.dumps(VERSION_INFO))
+                m.get(
+                    f"{API_BASE_URL}/data/v3/ed-fi/{FAKE_ENDPOINT}",
+                    status_code=HTTPStatus.OK,
+                    text=json.dumps(FAKE_API_RESPONSE_PAGE1),
+                    headers={"total-count": str(TOTAL_COUNT)},
+                )
+
+                default_request_client.get_total(FAKE_ENDPOINT)
+                default_request_client.get_page(FAKE_ENDPOINT, logger, 1)
+                default_request_client.get_page(FAKE_ENDPOINT, logger, 2)
+
+            row = metrics.get_snapshot().to_dict("records")[0]
+            assert (row["NumberOfRequests"], row["NumberOfRecords"], row["ExpectedRecords"], row["InFlight"]) == (2, 4, 4, 0)
+
     def describe_when_getting_total_count_with_trailing_slash_on_url():
         def describe_given_there_is_total_count_in_the_header():
             def it_returns_the_total_count(default_request_client: RequestClient):
@@ -181,6 +371,102 @@ def describe_testing_RequestClient_class():
 
                 assert len(result) == TOTAL_COUNT
 
+    def describe_when_getting_all_pages_in_parallel():
+        def _mock_pages(m, pages) -> None:
+            m.get(API_BASE_URL, status_code=HTTPStatus.OK, text=json.dumps(VERSION_INFO))
+            m.post(OAUTH_URL, status_code=201, text=json.dumps(TOKEN_RESPONSE))
+            for index, page in enumerate(pages):
+                m.get(
+                    f"https://localhost:54746/data/v3/ed-fi/ENDPOINT?offset={index * PAGE_SIZE}&limit={PAGE_SIZE}",
+                    status_code=HTTPStatus.OK,
+                    text=json.dumps(page),
+                )
+
+        def describe_given_the_total_count_is_accurate():
+            def it_should_return_all_items_in_page_order(default_request_client: RequestClient):
+                with requests_mock.Mocker() as m:
+                    _mock_pages(m, [FAKE_API_RESPONSE_PAGE1, FAKE_API_RESPONSE_PAGE2, []])
+
+                    result = default_request_client.get_all_parallel(
+                        FAKE_ENDPOINT, PaggingRequestLogger(), TOTAL_COUNT, 4
+                    )
+
+                    assert result == FAKE_API_RESPONSE_PAGE1 + FAKE_API_RESPONSE_PAGE2
+
+        def describe_given_a_page_comes_back_short():
+            def it_should_stop_at_the_short_page(default_request_client: RequestClient):
+                with requests_mock.Mocker() as m:
+                    _mock_pages(m, [FAKE_API_RESPONSE_PAGE1, [{"id": "c"}], FAKE_API_RESPONSE_PAGE2])
+
+                    result = default_request_client.get_all_parallel(
+                        FAKE_ENDPOINT, PaggingRequestLogger(), 6, 1
+                    )
+
+                    assert result == FAKE_API_RESPONSE_PAGE1 + [{"id": "c"}]
+                    assert not any("offset=4" in request.url for request in m.request_history)
+
+    def describe_when_getting_partition_page_tokens():
+        def describe_given_the_resource_can_be_partitioned():
+            def it_returns_the_page_tokens(default_request_client: RequestClient):
+                with requests_mock.Mocker() as m:
+                    m.get(API_BASE_URL, status_code=HTTPStatus.OK, text=json.dumps(VERSION_INFO))
+                    m.post(OAUTH_URL, status_code=201, text=json.dumps(TOKEN_RESPONSE))
+                    m.get(
+                        "https://localhost:54746/data/v3/ed-fi/ENDPOINT/partitions?number=2",
+                        status_code=HTTPStatus.OK,
+                        text=json.dumps({"pageTokens": ["t1", "t2"]}),
+                    )
+
+                    assert default_request_client.get_partition_page_tokens(FAKE_ENDPOINT, 2) == ["t1", "t2"]
+
+        def describe_given_the_resource_cannot_be_partitioned():
+            def it_returns_no_page_tokens(default_request_client: RequestClient):
+                with requests_mock.Mocker() as m:
+                    m.get(API_BASE_URL, status_code=HTTPStatus.OK, text=json.dumps(VERSION_INFO))
+                    m.post(OAUTH_URL, status_code=201, text=json.dumps(TOKEN_RESPONSE))
+                    m.get(
+                        "https://localhost:54746/data/v3/ed-fi/ENDPOINT/partitions?number=2",
+                        status_code=HTTPStatus.NOT_FOUND,
+                        text="",
+                    )
+
+                    assert default_request_client.get_partition_page_tokens(FAKE_ENDPOINT, 2) == []
+
+    def describe_when_getting_all_pages_of_a_partition():
+        @pytest.fixture
+        def logger() -> PartitionRequestLogger:
+            return PartitionRequestLogger()
+
+        @pytest.fixture
+        def result(default_request_client: RequestClient, logger: PartitionRequestLogger):
+            with requests_mock.Mocker() as m:
+                m.get(API_BASE_URL, status_code=HTTPStatus.OK, text=json.dumps(VERSION_INFO))
+                m.post(OAUTH_URL, status_code=201, text=json.dumps(TOKEN_RESPONSE))
+                m.get(
+                    "https://localhost:54746/data/v3/ed-fi/ENDPOINT?pageToken=t%2B1&pageSize=2",
+                    status_code=HTTPStatus.OK,
+                    text=json.dumps(FAKE_API_RESPONSE_PAGE1),
+                    headers={"Next-Page-Token": "t2"},
+                )
+                m.get(
+                    "https://localhost:54746/data/v3/ed-fi/ENDPOINT?pageToken=t2&pageSize=2",
+                    status_code=HTTPStatus.OK,
+                    text=json.dumps(FAKE_API_RESPONSE_PAGE2),
+                )
+
+                return [
+                    page.current_page_items
+                    for page in default_request_client.iter_partition_pages(FAKE_ENDPOINT, logger, 3, "t+1")
+                ]
+
+        def it_follows_the_next_page_token(result):
+            assert result == [FAKE_API_RESPONSE_PAGE1, FAKE_API_RESPONSE_PAGE2]
+
+        def it_logs_the_partition_of_each_page(result, logger: PartitionRequestLogger):
+            df = logger.get_DataFrame()
+            assert list(df["Partition"]) == [3, 3]
+            assert list(df["PageNumber"]) == [1, 2]
+
     def describe_when_get_method_is_called():
         def describe_given_error_occurs():
             def it_continues_normal_operation(default_request_client):
@@ -206,7 +492,7 @@ def describe_testing_RequestClient_class():
 
                     # Act
                     relative_url = "/" + FAKE_ENDPOINT
-                    response = default_request_client._get(relative_url)
+                    response = default_request_client._get(relative_url, RequestTiming())
 
                     # Assert
                     assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -231,3 +517,9 @@ def describe_when_timing_a_callback():
 
     def it_returns_callback_response(time_response: Tuple[float, dict]):
         assert time_response[1] == RESPONSE
+
+    def describe_given_a_start_time() -> None:
+        def it_measures_from_the_start_time() -> None:
+            elapsed, _ = timeit(lambda: RESPONSE, default_timer() - SLEEP_TIME)
+
+            assert SLEEP_TIME <= elapsed < SLEEP_TIME * 1.2
@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from http import HTTPStatus
+from time import sleep
+
+import pytest
+
+from edfi_paging_test.api.retry_policy import MAX_BACKOFF, CircuitBreaker, RetryPolicy
+from edfi_paging_test.helpers.main_arguments import MainArguments
+from edfi_paging_test.helpers.output_format import OutputFormat
+
+
+def describe_given_a_retry_policy() -> None:
+    @pytest.fixture
+    def policy() -> RetryPolicy:
+        return RetryPolicy(max_retries=2, backoff=1.0)
+
+    def describe_when_the_api_is_overloaded() -> None:
+        @pytest.mark.parametrize("status_code", [429, 502, 503, 504])
+        def it_retries(policy: RetryPolicy, status_code: int) -> None:
+            assert policy.should_retry(status_code, 1)
+
+        def it_stops_after_the_last_retry(policy: RetryPolicy) -> None:
+            assert policy.should_retry(HTTPStatus.SERVICE_UNAVAILABLE, 2)
+            assert not policy.should_retry(HTTPStatus.SERVICE_UNAVAILABLE, 3)
+
+    def describe_when_the_request_is_at_fault() -> None:
+        @pytest.mark.parametrize("status_code", [200, 400, 404, 500])
+        def it_does_not_retry(policy: RetryPolicy, status_code: int) -> None:
+            assert not policy.should_retry(status_code, 1)
+
+    def describe_when_backing_off() -> None:
+        def it_waits_up_to_twice_as_long_on_every_retry(policy: RetryPolicy) -> None:
+            waits = [policy.get_backoff(3) for _ in range(200)]
+
+            assert all(0 <= wait <= 4.0 for wait in waits)
+            assert max(waits) > 2.0
+
+        def it_caps_the_wait(policy: RetryPolicy) -> None:
+            assert policy.get_backoff(20) <= MAX_BACKOFF
+
+        def it_waits_as_long_as_the_api_asks(policy: RetryPolicy) -> None:
+            assert policy.get_backoff(1, "7") == 7.0
+            assert policy.get_backoff(1, "3600") == MAX_BACKOFF
+
+    def describe_when_reading_the_arguments() -> None:
+        def it_defaults_to_half_the_connections_for_retries() -> None:
+            args = MainArguments("url", 5, "key", "secret", True, "out", "", OutputFormat.CSV, [])
+
+            assert RetryPolicy.from_arguments(args).concurrency == 3
+
+
+def describe_given_a_circuit_breaker() -> None:
+    @pytest.fixture
+    def breaker() -> CircuitBreaker:
+        return CircuitBreaker("students", threshold=2, cooldown=0.1)
+
+    def describe_when_requests_succeed() -> None:
+        def it_lets_them_through(breaker: CircuitBreaker) -> None:
+            breaker.record(True)
+            breaker.record(False)
+            breaker.record(True)
+
+            assert breaker.get_delay() == 0
+
+    def describe_when_too_many_requests_fail_in_a_row() -> None:
+        @pytest.fixture(autouse=True)
+        def open_breaker(breaker: CircuitBreaker) -> None:
+            breaker.record(True)
+            breaker.record(True)
+
+        def it_pauses_the_requests(breaker: CircuitBreaker) -> None:
+            assert 0 < breaker.get_delay() <= 0.1
+            assert breaker.times_opened == 1
+
+        def it_lets_one_request_through_after_the_cooldown(breaker: CircuitBreaker) -> None:
+            sleep(0.1)
+
+            assert breaker.get_delay() == 0
+            assert breaker.get_delay() > 0
+
+        def it_resumes_the_requests_once_one_succeeds(breaker: CircuitBreaker) -> None:
+            sleep(0.1)
+            breaker.get_delay()
+            breaker.record(False)
+
+            assert breaker.get_delay() == 0
+            assert breaker.get_delay() == 0
+
+        def it_pauses_again_when_the_request_let_through_fails(breaker: CircuitBreaker) -> None:
+            sleep(0.1)
+            breaker.get_delay()
+            breaker.record(True)
+
+            assert breaker.get_delay() > 0.05
@@ -0,0 +1,171 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from math import inf
+from threading import Event
+from time import sleep
+from timeit import default_timer
+from typing import List
+
+import pytest
+
+from edfi_paging_test.api.token_manager import (
+    AsyncTokenManager,
+    Credentials,
+    Token,
+    TokenManager,
+    parse_credentials,
+    read_token,
+)
+
+
+class FakeTokenEndpoint:
+    """
+    Hands out tokens named after the key and a sequence number, after a
+    delay, with the given lifetime.
+    """
+
+    def __init__(self, lifetime: float = inf, delay: float = 0.0) -> None:
+        self.lifetime = lifetime
+        self.delay = delay
+        self.keys: List[str] = []
+
+    def _issue(self, credentials: Credentials) -> Token:
+        self.keys.append(credentials.key)
+        return read_token(
+            {"access_token": f"{credentials.key}-{len(self.keys)}", "expires_in": self.lifetime}, default_timer()
+        )
+
+    def fetch(self, credentials: Credentials) -> Token:
+        sleep(self.delay)
+        return self._issue(credentials)
+
+    async def fetch_async(self, credentials: Credentials) -> Token:
+        await asyncio.sleep(self.delay)
+        return self._issue(credentials)
+
+
+def describe_when_parsing_credentials() -> None:
+    def it_pairs_the_keys_and_secrets() -> None:
+        assert parse_credentials("a, b", "x, y") == [Credentials("a", "x"), Credentials("b", "y")]
+
+    def it_rejects_more_keys_than_secrets() -> None:
+        with pytest.raises(ValueError):
+            parse_credentials("a,b", "x")
+
+
+def describe_when_reading_a_token() -> None:
+    def it_refreshes_ahead_of_the_expiry() -> None:
+        token = read_token({"access_token": "t", "expires_in": 100}, 1000.0)
+
+        assert token == Token("t", 1090.0, 1100.0)
+
+    def it_keeps_a_token_without_a_lifetime() -> None:
+        assert read_token({"access_token": "t"}, 1000.0).expires_at == inf
+
+
+def describe_given_a_token_manager() -> None:
+    def describe_when_many_threads_need_a_token_at_once() -> None:
+        def it_fetches_only_one() -> None:
+            endpoint = FakeTokenEndpoint(delay=0.1)
+            manager = TokenManager([Credentials("a", "x")], endpoint.fetch)
+
+            with ThreadPoolExecutor(max_workers=10) as executor:
+                results = list(executor.map(lambda _: manager.get_token(), range(10)))
+
+            assert {token for token, _ in results} == {"a-1"}
+            assert endpoint.keys == ["a"]
+            assert all(waited > 0 for _, waited in results)
+
+    def describe_when_a_token_is_at_hand() -> None:
+        def it_reports_no_wait() -> None:
+            manager = TokenManager([Credentials("a", "x")], FakeTokenEndpoint().fetch)
+            manager.get_token()
+
+            assert manager.get_token() == ("a-1", 0.0)
+
+    def describe_when_the_token_is_due_for_a_refresh() -> None:
+        def it_refreshes_in_the_background() -> None:
+            endpoint = FakeTokenEndpoint(lifetime=1.0)
+            manager = TokenManager([Credentials("a", "x")], endpoint.fetch)
+            manager.get_token()
+
+            sleep(0.95)
+            token, waited = manager.get_token()
+
+            assert (token, waited) == ("a-1", 0.0)
+            deadline = default_timer() + 1
+            while manager.tokens_fetched < 2 and default_timer() < deadline:
+                sleep(0.01)
+            assert manager.get_token()[0] == "a-2"
+
+    def describe_when_the_background_refresh_fails() -> None:
+        def it_keeps_the_current_token() -> None:
+            endpoint = FakeTokenEndpoint(lifetime=1.0)
+            failed = Event()
+
+            def fetch(credentials: Credentials) -> Token:
+                if len(endpoint.keys) > 0:
+                    failed.set()
+                    raise RuntimeError("Authentication failed with status 500")
+                return endpoint.fetch(credentials)
+
+            manager = TokenManager([Credentials("a", "x")], fetch)
+            manager.get_token()
+            sleep(0.95)
+            manager.get_token()
+
+            assert failed.wait(1)
+            assert manager.get_token() == ("a-1", 0.0)
+
+    def describe_given_several_credentials() -> None:
+        def it_takes_them_in_turn() -> None:
+            endpoint = FakeTokenEndpoint()
+            manager = TokenManager(parse_credentials("a,b", "x,y"), endpoint.fetch)
+
+            tokens = [manager.get_token()[0] for _ in range(4)]
+
+            assert tokens == ["a-1", "b-2", "a-1", "b-2"]
+
+    def describe_when_a_token_is_rejected() -> None:
+        def it_fetches_a_new_one() -> None:
+            endpoint = FakeTokenEndpoint()
+            manager = TokenManager([Credentials("a", "x")], endpoint.fetch)
+            token, _ = manager.get_token()
+
+            manager.invalidate(token)
+
+            assert manager.get_token()[0] == "a-2"
+
+
+def describe_given_an_async_token_manager() -> None:
+    def describe_when_many_tasks_need_a_token_at_once() -> None:
+        def it_fetches_only_one() -> None:
+            endpoint = FakeTokenEndpoint(delay=0.1)
+
+            async def act() -> List[str]:
+                manager = AsyncTokenManager([Credentials("a", "x")], endpoint.fetch_async)
+                results = await asyncio.gather(*[manager.get_token() for _ in range(10)])
+                return [token for token, _ in results]
+
+            assert asyncio.run(act()) == ["a-1"] * 10
+            assert endpoint.keys == ["a"]
+
+    def describe_when_the_token_is_due_for_a_refresh() -> None:
+        def it_refreshes_in_the_background() -> None:
+            endpoint = FakeTokenEndpoint(lifetime=1.0)
+
+            async def act() -> List[str]:
+                manager = AsyncTokenManager([Credentials("a", "x")], endpoint.fetch_async)
+                await manager.get_token()
+                await asyncio.sleep(0.95)
+                current, waited = await manager.get_token()
+                assert waited == 0.0
+                await asyncio.sleep(0.01)
+                return [current, (await manager.get_token())[0]]
+
+            assert asyncio.run(act()) == ["a-1", "a-2"]
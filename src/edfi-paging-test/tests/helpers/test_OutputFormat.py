@@ -17,6 +17,7 @@ def describe_when_parsing_enum() -> None:
             ("CsV", OutputFormat.CSV),
             ("CSV", OutputFormat.CSV),
             ("csv", OutputFormat.CSV),
+            ("Parquet", OutputFormat.PARQUET),
         ])
         def it_translates_correctly(input: str, expected: OutputFormat) -> None:
             assert OutputFormat(input) == expected
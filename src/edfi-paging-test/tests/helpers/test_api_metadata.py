@@ -4,14 +4,19 @@
 # # See the LICENSE and NOTICES files in the project root for more information.
 
 
-from typing import Dict, List
+from typing import Dict, Iterator, List
 import pytest
 from pathlib import Path
 import pook
+import requests_mock
 from edfi_paging_test.helpers.api_metadata import (
+    get_cached_metadata,
     get_filters_by_resource_name,
+    get_partitioned_resource_names,
+    get_partitioned_resources,
     normalize_resource_path,
 )
+from edfi_paging_test.helpers.metadata_cache import MetadataCache
 
 MOCK_BASE_URL: str = "https://example.com/v5.3/api"
 
@@ -24,11 +29,12 @@ fake_openapi_metadata_json: str = Path(
 fake_resource_metadata_json: str = Path(
     "tests/helpers/api_metadata/resource_metadata.json"
 ).read_text()
+RESOURCE_METADATA_URL: str = f"{MOCK_BASE_URL}/metadata/data/v3/resources/swagger.json"
 
 
 def describe_when_requesting_resource_paths():
     @pytest.fixture
-    def resource_paths() -> Dict[str, List[str]]:
+    def resource_paths() -> Iterator[Dict[str, List[str]]]:
         # arrange
         pook.activate()
         pook.get(
@@ -48,7 +54,11 @@ def describe_when_requesting_resource_paths():
         )
 
         # act
-        return get_filters_by_resource_name(MOCK_BASE_URL, True)
+        yield get_filters_by_resource_name(MOCK_BASE_URL, True)
+
+        # Stop intercepting, so later tests can make real requests, e.g. to a
+        # metrics server on localhost
+        pook.off()
 
     def it_should_have_correct_length(resource_paths):
         assert len(resource_paths) == 129
@@ -113,3 +123,79 @@ def describe_when_normalizing_paths():
 
     def it_should_remove_leading_slash():
         assert normalize_resource_path("/tpdm/candidates") == "tpdm/candidates"
+
+
+def describe_when_finding_partitioned_resources():
+    def it_should_return_the_resources_with_a_partitions_endpoint():
+        paths = [
+            "/ed-fi/students",
+            "/ed-fi/students/{id}",
+            "/ed-fi/students/partitions",
+            "/ed-fi/schools",
+            "/tpdm/candidates/partitions",
+        ]
+
+        assert get_partitioned_resources(paths) == ["students", "tpdm/candidates"]
+
+
+def describe_when_requesting_filters_with_a_metadata_cache():
+    def _mock_api(m: requests_mock.Mocker) -> None:
+        m.get(MOCK_BASE_URL, text=fake_base_api_metadata_json)
+        m.get(f"{MOCK_BASE_URL}/metadata/", text=fake_openapi_metadata_json)
+        m.get(RESOURCE_METADATA_URL, text=fake_resource_metadata_json, headers={"ETag": '"v1"'})
+
+    @pytest.fixture
+    def cache_dir(tmp_path) -> str:
+        # Fill the cache, as a previous run would
+        with requests_mock.Mocker() as m:
+            _mock_api(m)
+            get_filters_by_resource_name(MOCK_BASE_URL, True, str(tmp_path))
+
+        # And forget it in process, as a new run would
+        get_cached_metadata.cache_clear()
+        return str(tmp_path)
+
+    def describe_given_an_empty_cache():
+        def it_returns_the_filters(tmp_path):
+            with requests_mock.Mocker() as m:
+                _mock_api(m)
+                filters = get_filters_by_resource_name(MOCK_BASE_URL, True, str(tmp_path))
+
+            assert len(filters) == 129
+
+        def it_saves_the_metadata_with_its_etag(cache_dir):
+            cached = MetadataCache(cache_dir).load(MOCK_BASE_URL, "5.3/5.3.1146.0")
+
+            assert cached is not None
+            assert cached.etag == '"v1"'
+            assert len(cached.filters_by_resource_name) == 129
+
+    def describe_given_cached_metadata_that_has_not_changed():
+        def it_revalidates_and_uses_the_cached_filters(cache_dir):
+            with requests_mock.Mocker() as m:
+                # The OpenAPI metadata is not requested at all
+                m.get(MOCK_BASE_URL, text=fake_base_api_metadata_json)
+                swagger = m.get(RESOURCE_METADATA_URL, status_code=304, request_headers={"If-None-Match": '"v1"'})
+
+                filters = get_filters_by_resource_name(MOCK_BASE_URL, True, cache_dir)
+
+            assert swagger.call_count == 1
+            assert len(filters) == 129
+            assert filters["academicWeeks"] == ['weekIdentifier', 'schoolId', 'beginDate', 'endDate', 'totalInstructionalDays']
+
+    def describe_given_cached_metadata_that_has_changed():
+        def it_replaces_the_cached_filters(cache_dir):
+            changed = """{"paths": {"/ed-fi/students": {"get": {"parameters": [{"name": "birthDate", "in": "query"}]}},
+                                    "/ed-fi/students/partitions": {"get": {"parameters": []}}}}"""
+            with requests_mock.Mocker() as m:
+                m.get(MOCK_BASE_URL, text=fake_base_api_metadata_json)
+                m.get(RESOURCE_METADATA_URL, text=changed, headers={"ETag": '"v2"'})
+
+                filters = get_filters_by_resource_name(MOCK_BASE_URL, True, cache_dir)
+                partitioned = get_partitioned_resource_names(MOCK_BASE_URL, True, cache_dir)
+
+            cached = MetadataCache(cache_dir).load(MOCK_BASE_URL, "5.3/5.3.1146.0")
+
+            assert filters == {"students": ["birthDate"]}
+            assert partitioned == ["students"]
+            assert cached is not None and cached.etag == '"v2"'
@@ -10,9 +10,11 @@ import sys
 import pytest
 
 from edfi_paging_test.helpers.argparser import parse_main_arguments
+from edfi_paging_test.helpers.json_decoder import JsonDecoder
 from edfi_paging_test.helpers.main_arguments import MainArguments
 from edfi_paging_test.helpers.output_format import OutputFormat
 from edfi_paging_test.helpers.log_level import LogLevel
+from edfi_paging_test.helpers.request_engine import RequestEngine
 
 
 BASEURL = "http://localhost:54746"
@@ -61,7 +63,17 @@ def describe_when_parsing_from_command_line_args() -> None:
                 "-r", "academicWeeks", "students",
                 "-p", "42",
                 "-l", "debug",
-                "-d", "test run"
+                "-d", "test run",
+                "--requestEngine", "async",
+                "--pageFanOut", "8",
+                "--filterSampleSize", "1000",
+                "--partitionCount", "16",
+                "--detailFlushInterval", "30",
+                "--requestBudget", "250",
+                "--arrivalRate", "10,100:60",
+                "--concurrencySearch",
+                "--searchStepSeconds", "20",
+                "--metadataCacheDir", "metadata",
             ]
 
             return parse_main_arguments()
@@ -99,6 +111,282 @@ def describe_when_parsing_from_command_line_args() -> None:
         def it_sets_description(main_arguments: MainArguments) -> None:
             assert main_arguments.description == "test run"
 
+        def it_sets_request_engine(main_arguments: MainArguments) -> None:
+            assert main_arguments.request_engine == RequestEngine.ASYNC
+
+        def it_sets_page_fan_out(main_arguments: MainArguments) -> None:
+            assert main_arguments.page_fan_out == 8
+
+        def it_sets_filter_sample_size(main_arguments: MainArguments) -> None:
+            assert main_arguments.filter_sample_size == 1000
+
+        def it_sets_partition_count(main_arguments: MainArguments) -> None:
+            assert main_arguments.partition_count == 16
+
+        def it_sets_detail_flush_interval(main_arguments: MainArguments) -> None:
+            assert main_arguments.detail_flush_interval == 30
+
+        def it_sets_request_budget(main_arguments: MainArguments) -> None:
+            assert main_arguments.request_budget == 250
+
+        def it_sets_arrival_rate(main_arguments: MainArguments) -> None:
+            assert main_arguments.arrival_rate == "10,100:60"
+
+        def it_sets_concurrency_search(main_arguments: MainArguments) -> None:
+            assert main_arguments.concurrency_search is True
+
+        def it_sets_search_step_seconds(main_arguments: MainArguments) -> None:
+            assert main_arguments.search_step_seconds == 20
+
+        def it_sets_metadata_cache_dir(main_arguments: MainArguments) -> None:
+            assert main_arguments.metadata_cache_dir == "metadata"
+
+    def describe_given_several_page_sizes() -> None:
+        @pytest.fixture()
+        def main_arguments() -> MainArguments:
+            sys.argv = [
+                "pytest",
+                *_baseUrl_args(),
+                *_key_args(),
+                *_secret_args(),
+                "-p", "25,100,500",
+            ]
+
+            return parse_main_arguments()
+
+        def it_sets_the_page_size_to_the_first(main_arguments: MainArguments) -> None:
+            assert main_arguments.pageSize == 25
+
+        def it_sets_every_page_size(main_arguments: MainArguments) -> None:
+            assert main_arguments.page_sizes == [25, 100, 500]
+
+    def describe_given_an_invalid_page_size() -> None:
+        def it_should_show_help(capsys) -> None:
+            with pytest.raises(SystemExit):
+                sys.argv = [
+                    "pytest",
+                    *_baseUrl_args(),
+                    *_key_args(),
+                    *_secret_args(),
+                    "-p", "25,0",
+                ]
+
+                parse_main_arguments()
+                _assert_error_message(capsys)
+
+    def describe_given_a_run_to_resume() -> None:
+        def it_sets_the_run_name() -> None:
+            sys.argv = [
+                "pytest",
+                *_baseUrl_args(),
+                *_key_args(),
+                *_secret_args(),
+                "--resume", "2026-10-18-09-30-00",
+            ]
+
+            assert parse_main_arguments().resume == "2026-10-18-09-30-00"
+
+    def describe_given_a_json_decoder() -> None:
+        def it_sets_the_decoder() -> None:
+            sys.argv = [
+                "pytest",
+                *_baseUrl_args(),
+                *_key_args(),
+                *_secret_args(),
+                "--jsonDecoder", "json",
+            ]
+
+            assert parse_main_arguments().json_decoder == JsonDecoder.JSON
+
+    def describe_given_workers() -> None:
+        def it_sets_the_number_of_worker_processes() -> None:
+            sys.argv = [
+                "pytest",
+                *_baseUrl_args(),
+                *_key_args(),
+                *_secret_args(),
+                "--workers", "8",
+            ]
+
+            assert parse_main_arguments().workers == 8
+
+    def describe_given_no_workers() -> None:
+        def it_should_show_help(capsys) -> None:
+            with pytest.raises(SystemExit):
+                sys.argv = [
+                    "pytest",
+                    *_baseUrl_args(),
+                    *_key_args(),
+                    *_secret_args(),
+                    "--workers", "0",
+                ]
+
+                parse_main_arguments()
+                _assert_error_message(capsys)
+
+    def describe_given_a_retry_policy() -> None:
+        @pytest.fixture
+        def main_arguments() -> MainArguments:
+            sys.argv = [
+                "pytest",
+                *_baseUrl_args(),
+                *_key_args(),
+                *_secret_args(),
+                "--maxRetries", "3",
+                "--retryBackoff", "0.25",
+                "--retryConcurrency", "2",
+                "--breakerThreshold", "5",
+                "--breakerCooldown", "10",
+            ]
+
+            return parse_main_arguments()
+
+        def it_sets_the_retries(main_arguments: MainArguments) -> None:
+            assert (main_arguments.max_retries, main_arguments.retry_backoff, main_arguments.retry_concurrency) == (3, 0.25, 2)
+
+        def it_sets_the_circuit_breaker(main_arguments: MainArguments) -> None:
+            assert (main_arguments.breaker_threshold, main_arguments.breaker_cooldown) == (5, 10.0)
+
+    def describe_given_a_negative_number_of_retries() -> None:
+        def it_should_show_help(capsys) -> None:
+            with pytest.raises(SystemExit):
+                sys.argv = [
+                    "pytest",
+                    *_baseUrl_args(),
+                    *_key_args(),
+                    *_secret_args(),
+                    "--maxRetries", "-1",
+                ]
+
+                parse_main_arguments()
+                _assert_error_message(capsys)
+
+    def describe_given_live_metrics() -> None:
+        def it_sets_the_port_and_snapshot_interval() -> None:
+            sys.argv = [
+                "pytest",
+                *_baseUrl_args(),
+                *_key_args(),
+                *_secret_args(),
+                "--metricsPort", "9100",
+                "--snapshotInterval", "30",
+            ]
+
+            main_arguments = parse_main_arguments()
+
+            assert (main_arguments.metrics_port, main_arguments.snapshot_interval) == (9100, 30)
+
+    def describe_given_no_page_fan_out() -> None:
+        def it_should_show_help(capsys) -> None:
+            with pytest.raises(SystemExit):
+                sys.argv = [
+                    "pytest",
+                    *_baseUrl_args(),
+                    *_key_args(),
+                    *_secret_args(),
+                    "--pageFanOut", "0",
+                ]
+
+                parse_main_arguments()
+                _assert_error_message(capsys)
+
+    def describe_given_no_partitions() -> None:
+        def it_should_show_help(capsys) -> None:
+            with pytest.raises(SystemExit):
+                sys.argv = [
+                    "pytest",
+                    *_baseUrl_args(),
+                    *_key_args(),
+                    *_secret_args(),
+                    "--partitionCount", "0",
+                ]
+
+                parse_main_arguments()
+                _assert_error_message(capsys)
+
+    def describe_given_a_negative_detail_flush_interval() -> None:
+        def it_should_show_help(capsys) -> None:
+            with pytest.raises(SystemExit):
+                sys.argv = [
+                    "pytest",
+                    *_baseUrl_args(),
+                    *_key_args(),
+                    *_secret_args(),
+                    "--detailFlushInterval", "-1",
+                ]
+
+                parse_main_arguments()
+                _assert_error_message(capsys)
+
+    def describe_given_a_negative_filter_sample_size() -> None:
+        def it_should_show_help(capsys) -> None:
+            with pytest.raises(SystemExit):
+                sys.argv = [
+                    "pytest",
+                    *_baseUrl_args(),
+                    *_key_args(),
+                    *_secret_args(),
+                    "--filterSampleSize", "-1",
+                ]
+
+                parse_main_arguments()
+                _assert_error_message(capsys)
+
+    def describe_given_a_negative_request_budget() -> None:
+        def it_should_show_help(capsys) -> None:
+            with pytest.raises(SystemExit):
+                sys.argv = [
+                    "pytest",
+                    *_baseUrl_args(),
+                    *_key_args(),
+                    *_secret_args(),
+                    "--requestBudget", "-1",
+                ]
+
+                parse_main_arguments()
+                _assert_error_message(capsys)
+
+    def describe_given_no_search_step_seconds() -> None:
+        def it_should_show_help(capsys) -> None:
+            with pytest.raises(SystemExit):
+                sys.argv = [
+                    "pytest",
+                    *_baseUrl_args(),
+                    *_key_args(),
+                    *_secret_args(),
+                    "--searchStepSeconds", "0",
+                ]
+
+                parse_main_arguments()
+                _assert_error_message(capsys)
+
+    def describe_given_more_keys_than_secrets() -> None:
+        def it_should_show_help(capsys) -> None:
+            with pytest.raises(SystemExit):
+                sys.argv = [
+                    "pytest",
+                    *_baseUrl_args(),
+                    "--key", "key1,key2",
+                    "--secret", "secret1",
+                ]
+
+                parse_main_arguments()
+                _assert_error_message(capsys)
+
+    def describe_given_an_invalid_arrival_rate() -> None:
+        def it_should_show_help(capsys) -> None:
+            with pytest.raises(SystemExit):
+                sys.argv = [
+                    "pytest",
+                    *_baseUrl_args(),
+                    *_key_args(),
+                    *_secret_args(),
+                    "--arrivalRate", "10,100",
+                ]
+
+                parse_main_arguments()
+                _assert_error_message(capsys)
+
     def describe_given_arguments_do_not_include_baseUrl() -> None:
         def it_should_show_help(capsys) -> None:
             with pytest.raises(SystemExit):
@@ -186,3 +474,12 @@ def describe_when_parsing_from_env_vars() -> None:
 
     def it_sets_ignore_certificate_errors(main_arguments: MainArguments) -> None:
         assert main_arguments.ignoreCertificateErrors is True
+
+    def it_defaults_to_the_threaded_request_engine(main_arguments: MainArguments) -> None:
+        assert main_arguments.request_engine == RequestEngine.THREADS
+
+    def it_does_not_retry_by_default(main_arguments: MainArguments) -> None:
+        assert (main_arguments.max_retries, main_arguments.breaker_threshold) == (0, 0)
+
+    def it_neither_takes_snapshots_nor_serves_metrics_by_default(main_arguments: MainArguments) -> None:
+        assert (main_arguments.metrics_port, main_arguments.snapshot_interval) == (0, 0)
@@ -0,0 +1,66 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from itertools import islice
+from typing import List
+
+import pytest
+
+from edfi_paging_test.helpers.arrival_profile import ArrivalProfile
+
+
+def _send_times(text: str, count: int) -> List[float]:
+    return list(islice(ArrivalProfile.parse(text).send_times(), count))
+
+
+def describe_when_parsing_an_arrival_profile() -> None:
+    def describe_given_a_fixed_rate() -> None:
+        def it_has_no_stages() -> None:
+            profile = ArrivalProfile.parse("50")
+
+            assert profile.start_rate == 50
+            assert profile.stages == []
+
+    def describe_given_ramp_stages() -> None:
+        def it_reads_each_stage() -> None:
+            profile = ArrivalProfile.parse("10,100:60,100:300")
+
+            assert profile.start_rate == 10
+            assert profile.stages == [(100, 60), (100, 300)]
+            assert profile.final_rate == 100
+
+    @pytest.mark.parametrize("text", ["", "fast", "10,100", "10,100:0", "-1", "10,0:60", "0"])
+    def describe_given_an_invalid_profile() -> None:
+        def it_raises_a_value_error(text: str) -> None:
+            with pytest.raises(ValueError):
+                ArrivalProfile.parse(text)
+
+
+def describe_when_getting_send_times() -> None:
+    def describe_given_a_fixed_rate() -> None:
+        def it_spaces_requests_evenly() -> None:
+            assert _send_times("4", 5) == [0, 0.25, 0.5, 0.75, 1]
+
+    def describe_given_a_ramp_from_zero() -> None:
+        def it_sends_the_area_under_the_ramp() -> None:
+            # Ramping from 0 to 10 requests per second over 10 seconds sends
+            # 50 requests, the nth at sqrt(2n) seconds
+            times = _send_times("0,10:10", 60)
+
+            assert times[8] == pytest.approx(4)
+            assert times[50] == pytest.approx(10)
+
+        def it_holds_the_final_rate_after_the_last_stage() -> None:
+            times = _send_times("0,10:10", 60)
+
+            assert times[55] == pytest.approx(10.5)
+
+    def describe_given_a_ramp_down() -> None:
+        def it_sends_requests_further_and_further_apart() -> None:
+            times = _send_times("10,1:10", 40)
+            gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+
+            assert gaps == sorted(gaps)
+            assert all(times[index] < times[index + 1] for index in range(len(times) - 1))
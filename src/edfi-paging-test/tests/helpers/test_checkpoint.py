@@ -0,0 +1,76 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import json
+
+import pytest
+
+from edfi_paging_test.helpers.checkpoint import CHECKPOINT_FILE, Checkpoint, write_checkpoint
+from edfi_paging_test.helpers.paging_schedule import PageRange
+
+PAGE_SIZE = 100
+
+
+@pytest.fixture
+def checkpoint() -> Checkpoint:
+    checkpoint = Checkpoint()
+    checkpoint.start_page_size(50, {"schools": 70}, [PageRange("schools", 1, None, 2)])
+    checkpoint.finish_page_size()
+
+    ranges = checkpoint.start_page_size(
+        PAGE_SIZE,
+        {"students": 2000, "schools": 70},
+        [PageRange("students", 1, 10, 10), PageRange("students", 11, None, 10), PageRange("schools", 1, None, 1)],
+    )
+    checkpoint.record_page(ranges[0], PAGE_SIZE)
+    checkpoint.record_page(ranges[0], PAGE_SIZE)
+    checkpoint.record_page(ranges[2], 70)
+    checkpoint.finish_range(ranges[2])
+    return checkpoint
+
+
+def describe_when_checking_whether_a_page_was_read() -> None:
+    def it_counts_the_pages_of_a_finished_page_size(checkpoint: Checkpoint) -> None:
+        assert checkpoint.is_read("schools", 50, 2)
+
+    def it_counts_the_pages_before_the_next_page_of_a_range(checkpoint: Checkpoint) -> None:
+        assert [checkpoint.is_read("students", PAGE_SIZE, page) for page in [1, 2, 3, 11]] == [
+            True, True, False, False
+        ]
+
+    def it_does_not_count_the_pages_of_another_page_size(checkpoint: Checkpoint) -> None:
+        assert not checkpoint.is_read("students", 500, 1)
+
+
+def describe_when_saving_and_loading() -> None:
+    def describe_given_a_saved_checkpoint() -> None:
+        def it_restores_the_progress(tmp_path, checkpoint: Checkpoint) -> None:
+            write_checkpoint(checkpoint.to_dict(), str(tmp_path / "run"))
+
+            loaded = Checkpoint.load(str(tmp_path / "run"))
+
+            assert loaded.to_dict() == checkpoint.to_dict()
+            assert [(r.next_page, r.records, r.finished) for r in loaded.get_ranges(PAGE_SIZE) or []] == [
+                (3, 200, False), (11, 0, False), (2, 70, True)
+            ]
+
+        def it_is_removed_once_the_run_finishes(tmp_path, checkpoint: Checkpoint) -> None:
+            write_checkpoint(checkpoint.to_dict(), str(tmp_path))
+
+            Checkpoint.remove(str(tmp_path))
+
+            assert not (tmp_path / CHECKPOINT_FILE).exists()
+
+    def describe_given_no_checkpoint() -> None:
+        def it_raises(tmp_path) -> None:
+            with pytest.raises(RuntimeError):
+                Checkpoint.load(str(tmp_path))
+
+    def describe_given_a_checkpoint_of_another_format() -> None:
+        def it_raises(tmp_path, checkpoint: Checkpoint) -> None:
+            (tmp_path / CHECKPOINT_FILE).write_text(json.dumps({**checkpoint.to_dict(), "formatVersion": 0}))
+
+            with pytest.raises(RuntimeError):
+                Checkpoint.load(str(tmp_path))
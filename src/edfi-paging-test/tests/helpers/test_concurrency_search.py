@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from typing import Callable, List
+
+import pytest
+
+from edfi_paging_test.helpers.concurrency_search import ConcurrencySearch, ConcurrencyStep
+
+
+def _search(throughput: Callable[[int], float], max_concurrency: int) -> ConcurrencySearch:
+    search = ConcurrencySearch(max_concurrency)
+
+    concurrency = search.next_concurrency()
+    while concurrency is not None:
+        search.record(ConcurrencyStep(concurrency, int(throughput(concurrency) * 10), 0, 10.0, {"P50": 0.1}))
+        concurrency = search.next_concurrency()
+
+    return search
+
+
+def _levels(search: ConcurrencySearch) -> List[int]:
+    return [step.concurrency for step in search.steps]
+
+
+def describe_when_searching_for_the_saturation_point() -> None:
+    def describe_given_throughput_that_flattens() -> None:
+        @pytest.fixture
+        def search() -> ConcurrencySearch:
+            return _search(lambda concurrency: min(concurrency * 10, 75), 64)
+
+        def it_doubles_concurrency_and_then_bisects_back_down(search: ConcurrencySearch) -> None:
+            assert _levels(search) == [1, 2, 4, 8, 16, 6, 7]
+
+        def it_finds_the_lowest_concurrency_on_the_plateau(search: ConcurrencySearch) -> None:
+            summary = search.get_summary()
+
+            assert summary.saturation_concurrency == 7
+            assert summary.saturation_throughput == 70
+
+        def it_finds_the_best_concurrency(search: ConcurrencySearch) -> None:
+            summary = search.get_summary()
+
+            assert summary.best_concurrency == 8
+            assert summary.best_throughput == 75
+            assert summary.number_of_steps == 7
+
+    def describe_given_throughput_that_falls_past_the_peak() -> None:
+        def it_finds_the_saturation_point_below_the_peak() -> None:
+            search = _search(lambda concurrency: min(concurrency * 10, 100) - max(0, concurrency - 20) * 3, 128)
+
+            assert search.get_summary().saturation_concurrency == 9
+            assert search.get_summary().best_concurrency == 10
+
+    def describe_given_throughput_that_never_flattens() -> None:
+        def it_stops_at_the_maximum_concurrency() -> None:
+            search = _search(lambda concurrency: concurrency * 10, 12)
+
+            assert _levels(search) == [1, 2, 4, 8, 12]
+            assert search.get_summary().saturation_concurrency == 12
+
+    def describe_given_a_maximum_concurrency_of_one() -> None:
+        def it_runs_a_single_step() -> None:
+            assert _levels(_search(lambda concurrency: 10, 1)) == [1]
+
+    def describe_given_no_steps() -> None:
+        def it_cannot_summarize() -> None:
+            with pytest.raises(RuntimeError):
+                ConcurrencySearch(8).get_summary()
+
+
+def describe_when_getting_the_steps_as_a_DataFrame() -> None:
+    def it_has_one_row_per_step_with_throughput_and_latencies() -> None:
+        df = _search(lambda concurrency: min(concurrency * 10, 75), 64).get_DataFrame()
+
+        assert list(df["Concurrency"]) == [1, 2, 4, 8, 16, 6, 7]
+        assert list(df.columns) == [
+            "Concurrency", "Seconds", "NumberOfRequests", "NumberOfErrors", "Throughput", "P50"
+        ]
+        assert df["Throughput"].iloc[2] == 40
@@ -0,0 +1,58 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from typing import Any, Dict, List
+
+from edfi_paging_test.helpers.entries_reservoir import EntriesReservoir
+
+
+def _page(start: int, size: int) -> List[Dict[str, Any]]:
+    return [{"id": i} for i in range(start, start + size)]
+
+
+def describe_when_adding_pages() -> None:
+    def describe_given_no_capacity() -> None:
+        def it_keeps_every_entry() -> None:
+            reservoir = EntriesReservoir()
+            reservoir.add(_page(0, 3))
+            reservoir.add(_page(3, 2))
+
+            assert reservoir.count == 5
+            assert reservoir.entries == _page(0, 5)
+
+    def describe_given_a_capacity_of_zero() -> None:
+        def it_only_counts_the_entries() -> None:
+            reservoir = EntriesReservoir(0)
+            reservoir.add(_page(0, 100))
+
+            assert reservoir.count == 100
+            assert reservoir.entries == []
+
+    def describe_given_more_entries_than_the_capacity() -> None:
+        def it_keeps_a_sample_of_the_capacity() -> None:
+            reservoir = EntriesReservoir(10, seed=42)
+            for start in range(0, 1000, 100):
+                reservoir.add(_page(start, 100))
+
+            ids = [entry["id"] for entry in reservoir.entries]
+            assert reservoir.count == 1000
+            assert len(ids) == 10
+            assert len(set(ids)) == 10
+            # A uniform sample should not be limited to the first page
+            assert max(ids) >= 100
+
+    def describe_given_an_error_response() -> None:
+        def it_ignores_the_page() -> None:
+            reservoir = EntriesReservoir()
+            reservoir.add({"message": "error"})
+
+            assert reservoir.count == 0
+
+    def describe_given_a_page_counted_without_decoding() -> None:
+        def it_adds_the_count() -> None:
+            reservoir = EntriesReservoir(0)
+            reservoir.add([], 100)
+
+            assert reservoir.count == 100
@@ -0,0 +1,114 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from itertools import combinations
+from typing import Any, Dict, List
+
+import pytest
+
+from edfi_paging_test.helpers.filter_planner import (
+    DEFAULT_ENTRIES_PER_COMBINATION,
+    FilterPlan,
+    get_filter_combinations,
+    plan_filter_combinations,
+)
+from edfi_paging_test.helpers.resource_entries_cache import ResourceEntriesCache
+
+FILTERS = [f"f{index}" for index in range(12)]
+
+
+def _entries(count: int) -> List[Dict[str, Any]]:
+    # f0 takes a distinct value per entry, f1 only two values, and f10 and
+    # f11 are never set together
+    entries: List[Dict[str, Any]] = []
+    for index in range(count):
+        entry: Dict[str, Any] = {filter: index % (position + 2) for position, filter in enumerate(FILTERS)}
+        entry["f0"] = index
+        entry["f1"] = index % 2
+        entry["f10" if index % 2 else "f11"] = None
+        entries.append(entry)
+
+    return entries
+
+
+ENTRIES = _entries(400)
+
+
+def _plan(request_budget: int, combination_size_limit: int = 4, filters: List[str] = FILTERS) -> FilterPlan:
+    return plan_filter_combinations(
+        "students", filters, combination_size_limit, request_budget, ResourceEntriesCache(ENTRIES, filters, seed=1)
+    )
+
+
+def _covered_pairs(plan: FilterPlan):
+    return {pair for combination, _ in plan for pair in combinations(combination, 2)}
+
+
+def _satisfiable_pairs(filters: List[str]):
+    cache = ResourceEntriesCache(ENTRIES, filters)
+    return {pair for pair in combinations(filters, 2) if cache.count_entries_with_non_null_filters(pair) > 0}
+
+
+def describe_when_planning_filter_combinations() -> None:
+    def describe_given_no_request_budget() -> None:
+        def it_plans_every_combination_with_the_default_entry_count() -> None:
+            plan = _plan(0)
+
+            assert [combination for combination, _ in plan] == get_filter_combinations(FILTERS, 4)
+            assert {count for _, count in plan} == {DEFAULT_ENTRIES_PER_COMBINATION}
+
+    def describe_given_a_request_budget() -> None:
+        @pytest.mark.parametrize("request_budget", [60, 200, 1000])
+        def it_stays_within_the_budget(request_budget: int) -> None:
+            assert sum(count for _, count in _plan(request_budget)) <= request_budget
+
+        def it_plans_far_fewer_combinations_than_exhaustive_enumeration() -> None:
+            assert len(_plan(200)) * 10 < len(get_filter_combinations(FILTERS, 4))
+
+        def it_plans_every_filter_on_its_own_by_descending_cardinality() -> None:
+            singles = [combination[0] for combination, _ in _plan(200) if len(combination) == 1]
+
+            assert singles[0] == "f0"
+            assert singles[-1] == "f1"
+            assert sorted(singles) == sorted(FILTERS)
+
+        def it_covers_every_satisfiable_filter_pair() -> None:
+            assert _covered_pairs(_plan(200)) == _satisfiable_pairs(FILTERS)
+
+        def it_plans_only_combinations_that_some_entry_matches() -> None:
+            cache = ResourceEntriesCache(ENTRIES, FILTERS)
+
+            assert all(cache.count_entries_with_non_null_filters(combination) > 0 for combination, _ in _plan(200))
+
+        def it_respects_the_combination_size_limit() -> None:
+            assert max(len(combination) for combination, _ in _plan(200, combination_size_limit=3)) == 3
+
+        def it_gives_more_entries_to_higher_cardinality_filters() -> None:
+            counts = {combination[0]: count for combination, count in _plan(200) if len(combination) == 1}
+
+            assert counts["f0"] > counts["f5"] > counts["f1"]
+
+        def it_never_queries_more_entries_than_a_filter_has_values() -> None:
+            counts = {combination[0]: count for combination, count in _plan(100000) if len(combination) == 1}
+
+            assert counts["f1"] == 2
+
+    def describe_given_a_budget_smaller_than_the_coverage() -> None:
+        def it_plans_one_entry_for_each_of_the_first_combinations() -> None:
+            plan = _plan(15)
+
+            assert len(plan) == 15
+            assert {count for _, count in plan} == {1}
+            assert sorted(combination[0] for combination, _ in plan[:12]) == sorted(FILTERS)
+
+    def describe_given_a_combination_size_limit_of_one() -> None:
+        def it_plans_single_filters_only() -> None:
+            assert {len(combination) for combination, _ in _plan(200, combination_size_limit=1)} == {1}
+
+    def describe_given_a_filter_that_no_entry_has() -> None:
+        def it_leaves_the_filter_out() -> None:
+            plan = _plan(200, filters=[*FILTERS, "missing"])
+
+            assert all("missing" not in combination for combination, _ in plan)
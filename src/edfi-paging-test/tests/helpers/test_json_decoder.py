@@ -0,0 +1,35 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import json
+import sys
+
+import pytest
+
+from edfi_paging_test.helpers.json_decoder import JsonDecoder, get_json_loads
+
+
+def describe_when_getting_the_json_decoder() -> None:
+    def describe_given_the_standard_library() -> None:
+        def it_uses_json() -> None:
+            assert get_json_loads(JsonDecoder.JSON) is json.loads
+
+    def describe_given_orjson_is_installed() -> None:
+        def it_uses_orjson_by_default() -> None:
+            orjson = pytest.importorskip("orjson")
+
+            assert get_json_loads(JsonDecoder.AUTO) is orjson.loads
+
+    def describe_given_orjson_is_not_installed() -> None:
+        @pytest.fixture(autouse=True)
+        def without_orjson(monkeypatch) -> None:
+            monkeypatch.setitem(sys.modules, "orjson", None)
+
+        def it_falls_back_to_json() -> None:
+            assert get_json_loads(JsonDecoder.AUTO) is json.loads
+
+        def it_refuses_orjson() -> None:
+            with pytest.raises(RuntimeError):
+                get_json_loads(JsonDecoder.ORJSON)
@@ -0,0 +1,64 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import json
+import os
+
+from edfi_paging_test.helpers.metadata_cache import CachedMetadata, MetadataCache
+
+BASE_URL = "https://example.com/v5.3/api"
+METADATA = CachedMetadata(
+    base_url=BASE_URL,
+    api_version="5.3/5.3.1146.0",
+    resource_metadata_url=f"{BASE_URL}/metadata/data/v3/resources/swagger.json",
+    etag='"v1"',
+    last_modified=None,
+    filters_by_resource_name={"students": ["studentUniqueId", "birthDate"]},
+    partitioned_resource_names=["students"],
+)
+
+
+def describe_when_loading_cached_metadata() -> None:
+    def describe_given_nothing_was_saved() -> None:
+        def it_returns_None(tmp_path) -> None:
+            assert MetadataCache(str(tmp_path)).load(BASE_URL, METADATA.api_version) is None
+
+    def describe_given_the_metadata_was_saved() -> None:
+        def it_returns_the_saved_metadata(tmp_path) -> None:
+            MetadataCache(str(tmp_path / "cache")).save(METADATA)
+
+            assert MetadataCache(str(tmp_path / "cache")).load(BASE_URL, METADATA.api_version) == METADATA
+
+        def it_returns_None_for_another_api_version(tmp_path) -> None:
+            MetadataCache(str(tmp_path)).save(METADATA)
+
+            assert MetadataCache(str(tmp_path)).load(BASE_URL, "7.1/7.1.0") is None
+
+        def it_returns_None_for_another_base_url(tmp_path) -> None:
+            MetadataCache(str(tmp_path)).save(METADATA)
+
+            assert MetadataCache(str(tmp_path)).load("https://example.com/other", METADATA.api_version) is None
+
+    def describe_given_a_file_from_another_cache_format() -> None:
+        def it_returns_None(tmp_path) -> None:
+            cache = MetadataCache(str(tmp_path))
+            cache.save(METADATA)
+            [path] = [os.path.join(tmp_path, name) for name in os.listdir(tmp_path)]
+            with open(path) as file:
+                content = json.load(file)
+            with open(path, "w") as file:
+                json.dump({**content, "formatVersion": 0}, file)
+
+            assert cache.load(BASE_URL, METADATA.api_version) is None
+
+    def describe_given_a_corrupt_file() -> None:
+        def it_returns_None(tmp_path) -> None:
+            cache = MetadataCache(str(tmp_path))
+            cache.save(METADATA)
+            [path] = [os.path.join(tmp_path, name) for name in os.listdir(tmp_path)]
+            with open(path, "w") as file:
+                file.write('{"formatVersion": 1, "base_url": ')
+
+            assert cache.load(BASE_URL, METADATA.api_version) is None
@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from typing import List
+
+import pytest
+
+from edfi_paging_test.helpers.paging_schedule import PageRange, PagingProgress, count_range_records, plan_page_ranges
+
+PAGE_SIZE = 100
+
+
+def describe_when_planning_page_ranges() -> None:
+    def describe_given_resources_of_similar_size() -> None:
+        @pytest.fixture
+        def page_ranges() -> List[PageRange]:
+            return plan_page_ranges({"schools": 500, "students": 900, "sections": 700}, PAGE_SIZE, 2)
+
+        def it_reads_each_resource_whole(page_ranges: List[PageRange]) -> None:
+            assert [page_range.last_page for page_range in page_ranges] == [None, None, None]
+
+        def it_reads_the_largest_first(page_ranges: List[PageRange]) -> None:
+            assert [page_range.resource_name for page_range in page_ranges] == ["students", "sections", "schools"]
+
+    def describe_given_one_resource_larger_than_the_rest_together() -> None:
+        @pytest.fixture
+        def page_ranges() -> List[PageRange]:
+            return plan_page_ranges({"schools": 1000, "students": 100000, "sections": 3000}, PAGE_SIZE, 4)
+
+        def it_splits_it_into_ranges_of_about_an_equal_share(page_ranges: List[PageRange]) -> None:
+            students = [page_range for page_range in page_ranges if page_range.resource_name == "students"]
+
+            assert [(r.first_page, r.last_page, r.number_of_pages) for r in students] == [
+                (1, 250, 250), (251, 500, 250), (501, 750, 250), (751, None, 250)
+            ]
+
+        def it_leaves_the_last_range_open_ended(page_ranges: List[PageRange]) -> None:
+            assert page_ranges[3].last_page is None
+
+        def it_reads_the_ranges_before_the_smaller_resources(page_ranges: List[PageRange]) -> None:
+            assert [page_range.resource_name for page_range in page_ranges] == [
+                "students", "students", "students", "students", "sections", "schools"
+            ]
+
+    def describe_given_a_single_worker() -> None:
+        def it_never_splits() -> None:
+            page_ranges = plan_page_ranges({"schools": 1000, "students": 100000}, PAGE_SIZE, 1)
+
+            assert len(page_ranges) == 2
+
+    def describe_given_an_empty_resource() -> None:
+        def it_still_reads_its_first_page() -> None:
+            assert plan_page_ranges({"schools": 0}, PAGE_SIZE, 4) == [PageRange("schools", 1, None, 1)]
+
+
+def describe_when_counting_the_records_of_a_range() -> None:
+    def describe_given_a_range_in_the_middle() -> None:
+        def it_counts_full_pages() -> None:
+            assert count_range_records(PageRange("students", 3, 5, 3), 950, PAGE_SIZE) == 300
+
+    def describe_given_the_last_range() -> None:
+        def it_counts_up_to_the_total() -> None:
+            assert count_range_records(PageRange("students", 6, None, 5), 950, PAGE_SIZE) == 450
+
+    def describe_given_a_range_past_the_total() -> None:
+        def it_counts_nothing() -> None:
+            assert count_range_records(PageRange("students", 11, None, 1), 950, PAGE_SIZE) == 0
+
+
+def describe_when_tracking_progress() -> None:
+    def describe_given_no_records_read() -> None:
+        def it_has_no_estimate() -> None:
+            assert PagingProgress(1000).get_seconds_left(100.0) is None
+
+    def describe_given_a_quarter_of_the_records_read() -> None:
+        def it_estimates_three_times_the_time_so_far() -> None:
+            progress = PagingProgress(1000, interval=3600)
+            progress.add(250)
+
+            assert progress.get_seconds_left(progress._start + 10) == pytest.approx(30)
+
+    def describe_given_the_interval_has_passed() -> None:
+        def it_logs_the_progress(caplog) -> None:
+            progress = PagingProgress(1000, interval=0)
+            with caplog.at_level("INFO"):
+                progress.add(500)
+
+            assert "Read 500 of 1000 records (50%)" in caplog.text
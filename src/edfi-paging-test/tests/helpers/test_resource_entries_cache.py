@@ -0,0 +1,75 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import random
+from typing import Any, Dict, List
+
+import pytest
+
+from edfi_paging_test.helpers.resource_entries_cache import ResourceEntriesCache
+
+FILTERS = ["a", "b", "c"]
+
+
+def _entries(count: int) -> List[Dict[str, Any]]:
+    generator = random.Random(7)
+    return [
+        {"id": index, **{filter: index for filter in FILTERS if generator.random() < 0.6}, "c": None if index % 5 else index}
+        for index in range(count)
+    ]
+
+
+def _matching(entries: List[Dict[str, Any]], filters) -> List[Dict[str, Any]]:
+    return [entry for entry in entries if all(entry.get(filter) is not None for filter in filters)]
+
+
+def describe_when_getting_entries_with_non_null_filters() -> None:
+    ENTRIES = _entries(1003)
+
+    @pytest.fixture()
+    def cache() -> ResourceEntriesCache:
+        return ResourceEntriesCache(ENTRIES, FILTERS, seed=1)
+
+    @pytest.mark.parametrize("filters", [("a",), ("a", "b"), ("a", "b", "c"), ("c",)])
+    def describe_given_fewer_matches_than_requested() -> None:
+        def it_returns_every_match(cache: ResourceEntriesCache, filters) -> None:
+            assert cache.get_entries_with_non_null_filters(filters, 10000) == _matching(ENTRIES, filters)
+
+    @pytest.mark.parametrize("filters", [("a",), ("a", "b"), ("b", "c")])
+    def describe_given_more_matches_than_requested() -> None:
+        def it_returns_the_requested_count_of_distinct_matches(cache: ResourceEntriesCache, filters) -> None:
+            result = cache.get_entries_with_non_null_filters(filters, 10)
+
+            assert len(result) == 10
+            assert len({entry["id"] for entry in result}) == 10
+            assert all(entry in _matching(ENTRIES, filters) for entry in result)
+
+    def describe_given_repeated_lookups() -> None:
+        def it_samples_different_matches(cache: ResourceEntriesCache) -> None:
+            first = cache.get_entries_with_non_null_filters(("a",), 10)
+            second = cache.get_entries_with_non_null_filters(("a",), 10)
+
+            assert first != second
+
+    def describe_given_no_entries() -> None:
+        def it_returns_nothing() -> None:
+            assert ResourceEntriesCache([], FILTERS).get_entries_with_non_null_filters(("a",), 10) == []
+
+
+def describe_when_counting_entries_with_non_null_filters() -> None:
+    ENTRIES = _entries(1003)
+
+    @pytest.mark.parametrize("filters", [(), ("a",), ("a", "b"), ("a", "b", "c")])
+    def it_counts_every_match(filters) -> None:
+        cache = ResourceEntriesCache(ENTRIES, FILTERS)
+
+        assert cache.count_entries_with_non_null_filters(filters) == len(_matching(ENTRIES, filters))
+
+
+def describe_when_getting_the_cardinality_of_a_filter() -> None:
+    def it_counts_distinct_non_null_values() -> None:
+        entries: List[Dict[str, Any]] = [{"a": 1}, {"a": 2}, {"a": 1}, {"a": None}, {"b": 3}, {"a": {"id": 1}}, {"a": {"id": 1}}]
+
+        assert ResourceEntriesCache(entries, ["a"]).get_cardinality("a") == 3
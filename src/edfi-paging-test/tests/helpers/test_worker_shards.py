@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from typing import List
+
+import pytest
+
+from edfi_paging_test.helpers.worker_shards import Shard, plan_page_range_shards, plan_resource_shards
+
+PAGE_SIZE = 100
+
+
+def describe_when_splitting_resources_between_workers() -> None:
+    def describe_given_more_resources_than_workers() -> None:
+        def it_balances_the_records() -> None:
+            shards = plan_resource_shards({"schools": 500, "students": 900, "sections": 700, "staffs": 300}, 2)
+
+            assert [shard.resource_names for shard in shards] == [["students", "staffs"], ["sections", "schools"]]
+
+        def it_hands_each_worker_the_totals_of_its_resources() -> None:
+            shards = plan_resource_shards({"schools": 500, "students": 900, "sections": 700, "staffs": 300}, 2)
+
+            assert [shard.total_count_by_resource_name for shard in shards] == [
+                {"students": 900, "staffs": 300},
+                {"sections": 700, "schools": 500},
+            ]
+
+    def describe_given_more_workers_than_resources() -> None:
+        def it_drops_the_workers_left_without_one() -> None:
+            shards = plan_resource_shards({"schools": 500, "students": 900}, 4)
+
+            assert [(shard.worker, shard.resource_names) for shard in shards] == [(1, ["students"]), (2, ["schools"])]
+
+
+def describe_when_splitting_pages_between_workers() -> None:
+    TOTALS = {"schools": 1000, "students": 100000, "sections": 3000}
+
+    @pytest.fixture
+    def shards() -> List[Shard]:
+        return plan_page_range_shards(TOTALS, [PAGE_SIZE, 500], 2, 3)
+
+    def it_splits_the_largest_resource_between_every_worker(shards: List[Shard]) -> None:
+        assert all("students" in shard.resource_names for shard in shards)
+
+    def it_reads_every_page_once_at_each_page_size(shards: List[Shard]) -> None:
+        for page_size in (PAGE_SIZE, 500):
+            first_pages = sorted(
+                page_range.first_page
+                for shard in shards
+                for page_range in shard.page_ranges_by_page_size[page_size]
+                if page_range.resource_name == "students"
+            )
+            number_of_pages = sum(
+                page_range.number_of_pages
+                for shard in shards
+                for page_range in shard.page_ranges_by_page_size[page_size]
+                if page_range.resource_name == "students"
+            )
+
+            assert first_pages[0] == 1
+            assert number_of_pages == 100000 // page_size
+
+    def it_hands_each_worker_the_totals_of_its_resources(shards: List[Shard]) -> None:
+        for shard in shards:
+            assert shard.total_count_by_resource_name == {
+                resource_name: TOTALS[resource_name] for resource_name in shard.resource_names
+            }
+
+    def it_balances_the_pages(shards: List[Shard]) -> None:
+        pages = [sum(r.number_of_pages for r in shard.page_ranges_by_page_size[PAGE_SIZE]) for shard in shards]
+
+        assert max(pages) - min(pages) <= 200
+
+    def describe_given_more_workers_than_ranges() -> None:
+        def it_drops_the_workers_left_without_one() -> None:
+            shards = plan_page_range_shards({"schools": 50}, [PAGE_SIZE], 2, 3)
+
+            assert [(shard.worker, shard.resource_names) for shard in shards] == [(1, ["schools"])]
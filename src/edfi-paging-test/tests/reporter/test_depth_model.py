@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import numpy as np
+from pandas import DataFrame, concat
+import pytest
+
+from edfi_paging_test.reporter.depth_model import fit_depth_model
+
+PAGE_SIZE = 100
+
+
+def _pages(resource: str, count: int, time_at_offset, status_code: int = 200) -> DataFrame:
+    pages = np.arange(1, count + 1)
+    return DataFrame(
+        {
+            "Resource": [resource] * count,
+            "URL": ["url"] * count,
+            "PageNumber": pages,
+            "PageSize": [PAGE_SIZE] * count,
+            "NumberOfRecords": [PAGE_SIZE] * count,
+            "ElapsedTime": time_at_offset((pages - 1) * PAGE_SIZE),
+            "StatusCode": [status_code] * count,
+        }
+    )
+
+
+def describe_when_fitting_the_depth_model() -> None:
+    @pytest.fixture()
+    def model() -> DataFrame:
+        detail = concat(
+            [
+                # Twice as slow by offset 10,000
+                _pages("slow", 200, lambda offset: 0.01 + 0.000001 * offset),
+                # Twice as slow by offset 2,000
+                _pages("slower", 200, lambda offset: 0.01 + 0.000005 * offset),
+                _pages("flat", 200, lambda offset: 0.01 + 0 * offset),
+                _pages("single", 1, lambda offset: 0.01 + 0 * offset),
+                # Errors are left out of the model
+                _pages("slow", 3, lambda offset: 10 + 0 * offset, status_code=500),
+            ]
+        )
+        return fit_depth_model(detail)
+
+    def it_has_one_row_per_resource(model: DataFrame) -> None:
+        assert len(model) == 4
+
+    def it_reports_the_slope(model: DataFrame) -> None:
+        slow = model[model["Resource"] == "slow"].iloc[0]
+        assert slow["SlopePerThousandRows"] == pytest.approx(0.001)
+
+    def it_reports_the_doubling_depth(model: DataFrame) -> None:
+        slow = model[model["Resource"] == "slow"].iloc[0]
+        assert slow["DoublingOffset"] == pytest.approx(10000, rel=0.01)
+        assert slow["DoublingPage"] == pytest.approx(101, abs=1)
+
+    def it_ranks_the_worst_resources_first(model: DataFrame) -> None:
+        assert list(model["Resource"][:2]) == ["slower", "slow"]
+        assert list(model["Rank"]) == [1, 2, 3, 4]
+
+    def it_reports_no_doubling_for_a_flat_resource(model: DataFrame) -> None:
+        assert np.isnan(model[model["Resource"] == "flat"].iloc[0]["DoublingOffset"])
+
+    def it_does_not_fit_a_single_page(model: DataFrame) -> None:
+        single = model[model["Resource"] == "single"].iloc[0]
+        assert np.isnan(single["SlopePerThousandRows"])
+        assert single["BaseTime"] == 0.01
@@ -0,0 +1,130 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import json
+from pathlib import Path
+from queue import Queue
+import time
+
+from pandas import read_csv, read_parquet
+import pytest
+
+from edfi_paging_test.helpers.checkpoint import Checkpoint
+from edfi_paging_test.helpers.output_format import OutputFormat
+from edfi_paging_test.helpers.paging_schedule import PageRange
+from edfi_paging_test.reporter.detail_writer import DetailStreamer, DetailWriter
+from edfi_paging_test.reporter.paging_request_logger import PaggingRequestLogger
+
+RUN_NAME = "run"
+
+
+def _log(request_logger: PaggingRequestLogger, resource: str, page: int) -> None:
+    request_logger.log_request(resource, f"https://localhost/{resource}?page={page}", page, 2, 2, 0.5, 200)
+
+
+def describe_when_writing_the_detail_in_batches() -> None:
+    @pytest.fixture()
+    def request_logger() -> PaggingRequestLogger:
+        return PaggingRequestLogger()
+
+    def describe_given_csv_output() -> None:
+        def it_writes_one_header_and_every_row(tmp_path: Path, request_logger: PaggingRequestLogger) -> None:
+            writer = DetailWriter(request_logger, str(tmp_path), RUN_NAME, OutputFormat.CSV, 0)
+
+            _log(request_logger, "students", 1)
+            assert writer.flush() == 1
+            _log(request_logger, "schools", 1)
+            _log(request_logger, "students", 2)
+            writer.close()
+
+            df = read_csv(tmp_path / RUN_NAME / "detail.csv")
+            assert list(df["Resource"]) == ["students", "schools", "students"]
+            assert list(df.columns) == list(request_logger.get_DataFrame().columns)
+
+    def describe_given_json_output() -> None:
+        def it_leaves_a_valid_array_after_each_flush(tmp_path: Path, request_logger: PaggingRequestLogger) -> None:
+            writer = DetailWriter(request_logger, str(tmp_path), RUN_NAME, OutputFormat.JSON, 0)
+            file = tmp_path / RUN_NAME / "detail.json"
+
+            _log(request_logger, "students", 1)
+            writer.flush()
+            assert [r["PageNumber"] for r in json.loads(file.read_text())] == [1]
+
+            _log(request_logger, "students", 2)
+            _log(request_logger, "students", 3)
+            writer.flush()
+            assert [r["PageNumber"] for r in json.loads(file.read_text())] == [1, 2, 3]
+
+    def describe_given_parquet_output() -> None:
+        def it_writes_a_file_per_flush_that_read_as_one(tmp_path: Path, request_logger: PaggingRequestLogger) -> None:
+            pytest.importorskip("pyarrow")
+            writer = DetailWriter(request_logger, str(tmp_path), RUN_NAME, OutputFormat.PARQUET, 0)
+            dataset = tmp_path / RUN_NAME / "detail.parquet"
+
+            for page in range(1, 13):
+                _log(request_logger, "students", page)
+                writer.flush()
+            writer.close()
+
+            df = read_parquet(dataset)
+            assert len(list(dataset.iterdir())) == 12
+            assert list(df["PageNumber"]) == list(range(1, 13))
+            assert str(df.dtypes["Resource"]) == "category"
+
+    def describe_given_nothing_new_was_logged() -> None:
+        def it_writes_nothing(tmp_path: Path, request_logger: PaggingRequestLogger) -> None:
+            writer = DetailWriter(request_logger, str(tmp_path), RUN_NAME, OutputFormat.CSV, 0)
+
+            writer.close()
+            writer.close()
+
+            assert not (tmp_path / RUN_NAME).exists()
+
+    def describe_given_a_flush_interval() -> None:
+        def it_writes_while_the_run_is_in_progress(tmp_path: Path, request_logger: PaggingRequestLogger) -> None:
+            writer = DetailWriter(request_logger, str(tmp_path), RUN_NAME, OutputFormat.CSV, 0.01)
+            writer.start()
+
+            _log(request_logger, "students", 1)
+            deadline = time.time() + 5
+            while writer.rows_written == 0 and time.time() < deadline:
+                time.sleep(0.01)
+
+            assert (tmp_path / RUN_NAME / "detail.csv").exists()
+            writer.close()
+            assert writer.rows_written == 1
+
+    def describe_given_a_checkpoint() -> None:
+        def it_saves_the_checkpoint_with_each_flush(tmp_path: Path, request_logger: PaggingRequestLogger) -> None:
+            checkpoint = Checkpoint()
+            writer = DetailWriter(request_logger, str(tmp_path), RUN_NAME, OutputFormat.CSV, 0, checkpoint)
+
+            checkpoint.start_page_size(2, {"students": 4}, [PageRange("students", 1, None, 2)])
+            writer.flush()
+
+            assert Checkpoint.load(str(tmp_path / RUN_NAME)).total_count_by_resource_name == {"students": 4}
+
+
+def describe_when_streaming_the_detail_of_a_worker() -> None:
+    def it_puts_the_rows_logged_since_the_previous_flush_on_the_queue() -> None:
+        request_logger = PaggingRequestLogger()
+        rows: Queue = Queue()
+        streamer = DetailStreamer(request_logger, rows, 0)
+
+        _log(request_logger, "students", 1)
+        streamer.flush()
+        _log(request_logger, "students", 2)
+        _log(request_logger, "schools", 1)
+        streamer.close()
+
+        assert [list(rows.get_nowait()["PageNumber"]) for _ in range(rows.qsize())] == [[1], [2, 1]]
+
+    def it_puts_nothing_when_nothing_new_was_logged() -> None:
+        rows: Queue = Queue()
+        streamer = DetailStreamer(PaggingRequestLogger(), rows, 0)
+
+        streamer.close()
+
+        assert rows.empty()
@@ -0,0 +1,62 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import numpy as np
+import pytest
+
+from edfi_paging_test.reporter.latency_histogram import (
+    LatencyHistogram,
+    LatencyHistograms,
+    get_depth_bucket,
+)
+
+
+def _histogram_of(latencies) -> LatencyHistogram:
+    histogram = LatencyHistogram()
+    for latency in latencies:
+        histogram.record(latency)
+
+    return histogram
+
+
+def describe_when_reading_percentiles() -> None:
+    LATENCIES = np.random.default_rng(42).lognormal(mean=-3, sigma=1, size=10000)
+
+    @pytest.mark.parametrize("percent", [50, 90, 95, 99])
+    def it_is_within_half_a_percent_of_the_exact_value(percent: float) -> None:
+        exact = np.percentile(LATENCIES, percent, method="inverted_cdf")
+
+        assert _histogram_of(LATENCIES).percentile(percent) == pytest.approx(exact, rel=0.005)
+
+    def it_reports_the_exact_maximum() -> None:
+        assert _histogram_of(LATENCIES).get_percentiles()["Max"] == round(LATENCIES.max(), 6)
+
+    def it_reports_zeros_when_empty() -> None:
+        assert set(LatencyHistogram().get_percentiles().values()) == {0.0}
+
+
+def describe_when_merging_histograms() -> None:
+    def it_is_the_same_as_recording_everything_in_one() -> None:
+        merged = _histogram_of([0.1, 0.2])
+        merged.merge(_histogram_of([0.3, 2.5]))
+
+        assert merged.get_percentiles() == _histogram_of([0.1, 0.2, 0.3, 2.5]).get_percentiles()
+
+    def it_merges_by_group() -> None:
+        histograms = LatencyHistograms()
+        histograms.record(("students", 1), 0.1)
+        histograms.record(("students", 2), 0.2)
+        histograms.record(("schools", 1), 0.3)
+
+        merged = histograms.merged(lambda key: key[0])  # type: ignore
+
+        assert merged["students"].count == 2
+        assert merged["schools"].count == 1
+
+
+def describe_when_bucketing_page_depth() -> None:
+    @pytest.mark.parametrize("page, bucket", [(1, 1), (2, 2), (3, 2), (4, 4), (7, 4), (8, 8), (1000, 512)])
+    def it_groups_pages_by_doubling_depth(page: int, bucket: int) -> None:
+        assert get_depth_bucket(page) == bucket
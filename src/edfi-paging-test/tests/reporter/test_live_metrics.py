@@ -0,0 +1,79 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from typing import List
+
+import pytest
+
+from edfi_paging_test.reporter.live_metrics import LiveMetrics
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def metrics(clock: FakeClock) -> LiveMetrics:
+    return LiveMetrics(window=10, clock=clock)
+
+
+def describe_when_requests_complete() -> None:
+    @pytest.fixture(autouse=True)
+    def act(clock: FakeClock, metrics: LiveMetrics) -> None:
+        metrics.add_expected_records("students", 400)
+        clock.now += 5
+        for elapsed in [0.1, 0.2, 0.3, 0.4]:
+            metrics.record("students", elapsed, 200, 100)
+        metrics.record("students", 2.0, 503, 0)
+        metrics.record("students", 0.5, 200, 0, first_attempt=False)
+        metrics.request_started("schools")
+
+    def it_counts_the_requests_and_records_of_each_resource(metrics: LiveMetrics) -> None:
+        snapshot = {row["Resource"]: row for row in metrics.get_snapshot().to_dict("records")}
+
+        students = snapshot["students"]
+        assert (students["NumberOfRequests"], students["NumberOfErrors"], students["NumberOfRecords"], students["ExpectedRecords"]) == (6, 1, 400, 400)
+        assert snapshot["schools"]["InFlight"] == 1
+
+    def it_reads_the_rates_over_the_time_since_the_start(metrics: LiveMetrics) -> None:
+        totals = metrics.get_totals()
+
+        assert (totals["RequestsPerSecond"], totals["ErrorsPerSecond"]) == (1.2, 0.2)
+
+    def it_reads_the_latency_of_first_tries_only(metrics: LiveMetrics) -> None:
+        assert metrics.get_totals()["P95"] == pytest.approx(1.68)
+
+    def describe_given_the_window_has_passed() -> None:
+        def it_forgets_the_rates_but_not_the_counts(clock: FakeClock, metrics: LiveMetrics) -> None:
+            clock.now += 11
+
+            totals = metrics.get_totals()
+
+            assert (totals["RequestsPerSecond"], totals["P95"], totals["NumberOfRecords"]) == (0.0, 0.0, 400)
+
+
+def describe_when_exposing_the_metrics() -> None:
+    @pytest.fixture
+    def lines(metrics: LiveMetrics) -> List[str]:
+        metrics.record('tpdm/"candidates"', 0.25, 200, 10)
+        return metrics.to_prometheus().splitlines()
+
+    def it_describes_every_metric(lines: List[str]) -> None:
+        names = [line.split()[2] for line in lines if line.startswith("# TYPE")]
+
+        assert "edfi_paging_requests_per_second" in names
+        assert "edfi_paging_requests_in_flight" in names
+
+    def it_labels_the_samples_with_the_escaped_resource(lines: List[str]) -> None:
+        assert 'edfi_paging_records_read_total{resource="tpdm/\\"candidates\\""} 10' in lines
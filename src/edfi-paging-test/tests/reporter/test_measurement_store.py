@@ -0,0 +1,87 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from pandas import DataFrame
+import pytest
+
+from edfi_paging_test.reporter.filtered_read_measurement import FilteredReadMeasurement
+from edfi_paging_test.reporter.measurement_store import INITIAL_CAPACITY, MeasurementStore
+
+
+def _store_with(*resources: str) -> MeasurementStore[FilteredReadMeasurement]:
+    store = MeasurementStore(FilteredReadMeasurement)
+    for index, resource in enumerate(resources):
+        store.append(resource, f"url{index}", index, float(index), 200)
+
+    return store
+
+
+def describe_when_appending_measurements() -> None:
+    def describe_given_more_than_the_initial_capacity() -> None:
+        @pytest.fixture()
+        def store() -> MeasurementStore[FilteredReadMeasurement]:
+            return _store_with(*["students"] * (INITIAL_CAPACITY * 2 + 1))
+
+        def it_keeps_every_measurement(store: MeasurementStore[FilteredReadMeasurement]) -> None:
+            assert len(store) == INITIAL_CAPACITY * 2 + 1
+            assert store.to_list()[-1] == FilteredReadMeasurement(
+                "students", f"url{INITIAL_CAPACITY * 2}", INITIAL_CAPACITY * 2, float(INITIAL_CAPACITY * 2), 200
+            )
+
+        def it_interns_repeated_strings(store: MeasurementStore[FilteredReadMeasurement]) -> None:
+            assert store._strings[0] == ["students"]
+
+    def describe_given_many_threads() -> None:
+        def it_keeps_every_measurement() -> None:
+            store = MeasurementStore(FilteredReadMeasurement)
+
+            def append(thread: int) -> None:
+                for index in range(1000):
+                    store.append(f"resource{thread}", "url", index, 0.1, 200)
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(append, range(8)))
+
+            df = store.get_DataFrame()
+            assert len(df) == 8000
+            assert (df.groupby("resource")["filter_count"].sum() == sum(range(1000))).all()
+
+
+def describe_when_converting_to_a_DataFrame() -> None:
+    @pytest.fixture()
+    def store() -> MeasurementStore[FilteredReadMeasurement]:
+        return _store_with("students", "academicWeeks", "schools", "academicWeeks")
+
+    @pytest.fixture()
+    def df(store: MeasurementStore[FilteredReadMeasurement]) -> DataFrame:
+        return store.get_DataFrame()
+
+    def it_has_one_column_per_field(df: DataFrame) -> None:
+        assert list(df.columns) == [
+            "resource", "URL", "filter_count", "elapsed_time", "http_status_code",
+            "time_to_first_byte", "transfer_time", "response_bytes", "decode_time", "token_refreshed",
+            "auth_time", "attempt", "backoff_time", "final_attempt",
+        ]
+
+    def it_fills_fields_left_out_with_their_defaults(df: DataFrame) -> None:
+        assert list(df["token_refreshed"]) == [False] * 4
+
+    def it_maps_the_strings(df: DataFrame) -> None:
+        assert list(df["resource"]) == ["students", "academicWeeks", "schools", "academicWeeks"]
+
+    def it_sorts_strings_alphabetically(df: DataFrame) -> None:
+        assert list(df.sort_values(by="resource")["resource"]) == ["academicWeeks", "academicWeeks", "schools", "students"]
+
+    def it_does_not_copy_the_numeric_columns(store: MeasurementStore[FilteredReadMeasurement], df: DataFrame) -> None:
+        assert np.shares_memory(df["elapsed_time"].values, store._columns[3])
+
+    def it_is_not_affected_by_later_appends(store: MeasurementStore[FilteredReadMeasurement], df: DataFrame) -> None:
+        store.clear()
+        store.append("tpdm/candidates", "url", 9, 9.0, 500)
+
+        assert list(df["filter_count"]) == [0, 1, 2, 3]
@@ -0,0 +1,37 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from typing import Iterator
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from edfi_paging_test.reporter.live_metrics import LiveMetrics
+from edfi_paging_test.reporter.metrics_server import MetricsServer
+
+
+def describe_given_a_metrics_server() -> None:
+    @pytest.fixture
+    def server() -> Iterator[MetricsServer]:
+        metrics = LiveMetrics()
+        metrics.record("students", 0.25, 200, 10)
+        server = MetricsServer(metrics, 0)
+        server.start()
+        yield server
+        server.close()
+
+    def it_serves_the_metrics(server: MetricsServer) -> None:
+        with urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+            body = response.read().decode("utf-8")
+
+        assert response.headers["Content-Type"].startswith("text/plain")
+        assert 'edfi_paging_records_read_total{resource="students"} 10' in body
+
+    def it_serves_nothing_else(server: MetricsServer) -> None:
+        with pytest.raises(HTTPError) as error:
+            urlopen(f"http://127.0.0.1:{server.port}/", timeout=5)
+
+        assert error.value.code == 404
@@ -0,0 +1,95 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from pandas import DataFrame
+import pytest
+
+from edfi_paging_test.reporter.partition_measurement import PartitionMeasurement
+from edfi_paging_test.reporter.partition_request_logger import PartitionRequestLogger
+
+
+MEASUREMENTS = [
+    PartitionMeasurement("students", "https://localhost/WebApi/data/v3/", 2, 1, 100, 100, 0.5, 200),
+    PartitionMeasurement("students", "https://localhost/WebApi/data/v3/", 1, 1, 100, 100, 1.0, 200),
+    PartitionMeasurement("students", "https://localhost/WebApi/data/v3/", 1, 2, 100, 20, 2.0, 200),
+    PartitionMeasurement("students", "https://localhost/WebApi/data/v3/", 2, 2, 100, 0, 0.5, 500),
+]
+
+
+def describe_when_converting_to_a_DataFrame() -> None:
+    def describe_given_an_empty_request_log() -> None:
+        def it_raises_a_RuntimeError() -> None:
+            with pytest.raises(RuntimeError):
+                PartitionRequestLogger().get_DataFrame()
+
+    def describe_given_pages_of_several_partitions() -> None:
+        @pytest.fixture()
+        def df() -> DataFrame:
+            partitionRequestLogger = PartitionRequestLogger()
+            partitionRequestLogger.request_log = MEASUREMENTS
+
+            return partitionRequestLogger.get_DataFrame()
+
+        def it_has_seventeen_columns(df: DataFrame) -> None:
+            assert df.shape[1] == 17
+
+        def it_sorts_by_partition_and_page(df: DataFrame) -> None:
+            assert list(zip(df["Partition"], df["PageNumber"])) == [(1, 1), (1, 2), (2, 1), (2, 2)]
+
+
+def describe_when_getting_statistics() -> None:
+    @pytest.fixture()
+    def statistics() -> DataFrame:
+        partitionRequestLogger = PartitionRequestLogger()
+        for m in MEASUREMENTS:
+            partitionRequestLogger.log_request(
+                m.resource, m.URL, m.partition, m.page_number, m.page_size, m.number_of_records, m.elapsed_time, m.http_status_code
+            )
+
+        return partitionRequestLogger.get_statistics()
+
+    def it_has_one_row_per_resource(statistics: DataFrame) -> None:
+        assert statistics.shape[0] == 1
+
+    def it_counts_the_partitions(statistics: DataFrame) -> None:
+        assert statistics.iloc[0]["NumberOfPartitions"] == 2
+
+    def it_sums_the_records(statistics: DataFrame) -> None:
+        assert statistics.iloc[0]["NumberOfRecords"] == 220
+
+    def it_counts_the_errors(statistics: DataFrame) -> None:
+        assert statistics.iloc[0]["NumberOfErrors"] == 1
+
+    def it_reports_the_records_per_second_of_request_time(statistics: DataFrame) -> None:
+        assert statistics.iloc[0]["RecordsPerSecond"] == 55.0
+
+    def it_reports_the_slowest_partition(statistics: DataFrame) -> None:
+        assert statistics.iloc[0]["MaxPartitionTime"] == 3.0
+
+    def it_reports_the_mean_partition_time(statistics: DataFrame) -> None:
+        assert statistics.iloc[0]["MeanPartitionTime"] == 2.0
+
+
+def describe_when_getting_the_breakdown() -> None:
+    def it_has_one_row_per_page_depth() -> None:
+        partitionRequestLogger = PartitionRequestLogger()
+        partitionRequestLogger.request_log = MEASUREMENTS
+
+        breakdown = partitionRequestLogger.get_breakdown()
+
+        assert list(breakdown["FirstPage"]) == [1, 2]
+        assert list(breakdown["NumberOfRequests"]) == [2, 2]
+
+    def it_reports_the_mean_auth_time_and_token_refreshes() -> None:
+        partitionRequestLogger = PartitionRequestLogger()
+        partitionRequestLogger.log_request(
+            "students", "https://localhost/WebApi/data/v3/", 1, 1, 100, 100, 0.5, 200, token_refreshed=True, auth_time=0.25
+        )
+        partitionRequestLogger.log_request("students", "https://localhost/WebApi/data/v3/", 2, 1, 100, 100, 0.5, 200)
+
+        breakdown = partitionRequestLogger.get_breakdown()
+
+        assert breakdown.iloc[0]["MeanAuthTime"] == 0.125
+        assert breakdown.iloc[0]["TokenRefreshes"] == 1
@@ -1,7 +1,8 @@
 import pytest
 import re
-from pandas import DataFrame, read_csv, read_json
+from pandas import DataFrame, read_csv, read_json, read_parquet
 from os import path
+from pathlib import Path
 from edfi_paging_test.reporter.summary import Summary
 from edfi_paging_test.helpers.main_arguments import MainArguments
 from edfi_paging_test.helpers.log_level import LogLevel
@@ -14,6 +15,11 @@ from edfi_paging_test.reporter.reporter import (
     create_detail_json,
     create_statistics_json,
     create_summary_json,
+    append_detail_parquet,
+    create_detail_parquet,
+    create_statistics_parquet,
+    read_detail_parquet,
+    remove_detail,
 )
 from edfi_paging_test.reporter.paging_request_logger import PaggingRequestLogger
 from edfi_paging_test.helpers.test_type import TestType
@@ -145,6 +151,10 @@ def describe_when_creating_statistics_csv() -> None:
                 ]
             )
 
+            # Every page was read at the first attempt
+            df["Attempt"] = 1
+            df["FinalAttempt"] = True
+
             pagingRequestLogger = PaggingRequestLogger()
             mocker.patch.object(pagingRequestLogger, 'get_DataFrame', return_value=df)
 
@@ -165,6 +175,7 @@ def describe_when_creating_statistics_csv() -> None:
                 ("NumberOfPages", 3),
                 ("NumberOfRecords", 8),
                 ("TotalTime", 5.73),
+                ("RecordsPerSecond", 1.396),
                 ("MeanTime", 1.4325),
                 ("StDeviation", 0.532314),
                 ("NumberOfErrors", 1),
@@ -186,6 +197,7 @@ def describe_when_creating_statistics_csv() -> None:
                 ("NumberOfPages", 2),
                 ("NumberOfRecords", 999),
                 ("TotalTime", 4.3646),
+                ("RecordsPerSecond", 228.887),
                 ("MeanTime", 2.1823),
                 ("StDeviation", 0.212132),
                 ("NumberOfErrors", 0),
@@ -208,6 +220,7 @@ def describe_when_creating_statistics_csv() -> None:
                 ("NumberOfPages", 1),
                 ("NumberOfRecords", 40),
                 ("TotalTime", 1.532),
+                ("RecordsPerSecond", 26.11),
                 ("MeanTime", 1.532),
                 ("StDeviation", 0),
                 ("NumberOfErrors", 0),
@@ -346,6 +359,10 @@ def describe_when_creating_statistics_json() -> None:
                 ]
             )
 
+            # Every page was read at the first attempt
+            df["Attempt"] = 1
+            df["FinalAttempt"] = True
+
             pagingRequestLogger = PaggingRequestLogger()
             mocker.patch.object(pagingRequestLogger, 'get_DataFrame', return_value=df)
 
@@ -366,6 +383,7 @@ def describe_when_creating_statistics_json() -> None:
                 ("NumberOfPages", 3),
                 ("NumberOfRecords", 8),
                 ("TotalTime", 5.73),
+                ("RecordsPerSecond", 1.396),
                 ("MeanTime", 1.4325),
                 ("StDeviation", 0.532314),
                 ("NumberOfErrors", 1),
@@ -387,6 +405,7 @@ def describe_when_creating_statistics_json() -> None:
                 ("NumberOfPages", 2),
                 ("NumberOfRecords", 999),
                 ("TotalTime", 4.3646),
+                ("RecordsPerSecond", 228.887),
                 ("MeanTime", 2.1823),
                 ("StDeviation", 0.212132),
                 ("NumberOfErrors", 0),
@@ -409,6 +428,7 @@ def describe_when_creating_statistics_json() -> None:
                 ("NumberOfPages", 1),
                 ("NumberOfRecords", 40),
                 ("TotalTime", 1.532),
+                ("RecordsPerSecond", 26.11),
                 ("MeanTime", 1.532),
                 ("StDeviation", 0),
                 ("NumberOfErrors", 0),
@@ -451,7 +471,28 @@ def describe_when_creating_summary_json() -> None:
             "RunConfigration.Pagesize":100,
             "RunConfigration.LogLevel":"DEBUG",
             "RunConfigration.TestType":"DEEP_PAGING",
-            "RunConfigration.CombinationSizeLimit":1
+            "RunConfigration.CombinationSizeLimit":1,
+            "RunConfigration.RequestEngine":"THREADS",
+            "RunConfigration.PageFanOut":1,
+            "RunConfigration.FilterSampleSize":0,
+            "RunConfigration.PartitionCount":10,
+            "RunConfigration.DetailFlushInterval":5,
+            "RunConfigration.RequestBudget":0,
+            "RunConfigration.ArrivalRate":"",
+            "RunConfigration.ConcurrencySearch":false,
+            "RunConfigration.SearchStepSeconds":10,
+            "RunConfigration.PageSizes":[],
+            "RunConfigration.MetadataCacheDir":"~\\/.cache\\/edfi-paging-test",
+            "RunConfigration.Resume":"",
+            "RunConfigration.JsonDecoder":"AUTO",
+            "RunConfigration.Workers":1,
+            "RunConfigration.MaxRetries":0,
+            "RunConfigration.RetryBackoff":0.5,
+            "RunConfigration.RetryConcurrency":0,
+            "RunConfigration.BreakerThreshold":0,
+            "RunConfigration.BreakerCooldown":5.0,
+            "RunConfigration.MetricsPort":0,
+            "RunConfigration.SnapshotInterval":0
             }]"""
 
         @pytest.fixture(autouse=True)
@@ -487,3 +528,39 @@ def describe_when_creating_summary_json() -> None:
                 actual = f.read()
 
                 assert actual == re.sub('\\s+', '', CONTENTS)
+
+
+def describe_when_creating_statistics_parquet() -> None:
+    def it_keeps_the_values_and_types(tmp_path: Path) -> None:
+        pytest.importorskip("pyarrow")
+        statistics = DataFrame([{"Resource": "a", "PageSize": 3, "MeanTime": 1.4325, "NumberOfErrors": 1}])
+
+        create_statistics_parquet(statistics, str(tmp_path), "1243")
+
+        file = read_parquet(tmp_path / "1243" / "statistics.parquet")
+        assert file.astype({"Resource": str}).to_dict("records") == statistics.to_dict("records")
+        assert str(file.dtypes["Resource"]) == "category"
+
+
+def describe_when_rewriting_the_detail_parquet() -> None:
+    @pytest.fixture(autouse=True)
+    def pyarrow() -> None:
+        pytest.importorskip("pyarrow")
+
+    def _detail(*pages: int) -> DataFrame:
+        return DataFrame([{"Resource": "a", "URL": f"https://localhost/a?page={p}", "PageNumber": p} for p in pages])
+
+    def it_replaces_the_rows_appended_before(tmp_path: Path) -> None:
+        append_detail_parquet(_detail(1, 2), str(tmp_path), "1243")
+        append_detail_parquet(_detail(3), str(tmp_path), "1243")
+
+        create_detail_parquet(_detail(1), str(tmp_path), "1243")
+
+        assert list(read_detail_parquet(str(tmp_path), "1243")["PageNumber"]) == [1]
+
+    def it_reads_nothing_once_removed(tmp_path: Path) -> None:
+        append_detail_parquet(_detail(1), str(tmp_path), "1243")
+
+        remove_detail(str(tmp_path), "1243")
+
+        assert len(read_detail_parquet(str(tmp_path), "1243")) == 0
@@ -74,8 +74,8 @@ def describe_when_converting_to_a_DataFrame() -> None:
         def it_has_two_rows(df: DataFrame) -> None:
             assert df.shape[0] == 2
 
-        def it_has_seven_columns(df: DataFrame) -> None:
-            assert df.shape[1] == 7
+        def it_has_sixteen_columns(df: DataFrame) -> None:
+            assert df.shape[1] == 16
 
         @pytest.mark.parametrize(
             "index, expected",
@@ -131,3 +131,97 @@ def describe_when_converting_to_a_DataFrame() -> None:
             df: DataFrame, index: int, expected: str
         ) -> None:
             assert df.iloc[index]["StatusCode"] == expected
+
+
+def describe_when_getting_statistics() -> None:
+    @pytest.fixture()
+    def statistics() -> DataFrame:
+        paggingRequestLogger = PaggingRequestLogger()
+        for page, elapsed in enumerate([0.1, 0.2, 0.3, 4.0], start=1):
+            paggingRequestLogger.log_request("students", "url", page, 100, 100, elapsed, 200)
+
+        return paggingRequestLogger.get_statistics()
+
+    @pytest.mark.parametrize("field, value", [("P50", 0.2), ("P90", 4.0), ("P99", 4.0)])
+    def it_reports_latency_percentiles(statistics: DataFrame, field: str, value: float) -> None:
+        assert statistics.iloc[0][field] == pytest.approx(value, rel=0.005)
+
+    def it_reports_the_maximum(statistics: DataFrame) -> None:
+        assert statistics.iloc[0]["Max"] == 4.0
+
+
+def describe_when_getting_statistics_of_retried_requests() -> None:
+    @pytest.fixture()
+    def statistics() -> DataFrame:
+        paggingRequestLogger = PaggingRequestLogger()
+
+        def log(page: int, elapsed: float, status_code: int, attempt: int, final: bool) -> None:
+            records = 100 if status_code == 200 else 0
+            paggingRequestLogger.log_request(
+                "students", "url", page, 100, records, elapsed, status_code, 0.0, 0.0, 0, 0.0, False, 0.0, attempt, 0.5, final
+            )
+
+        # Page 1 succeeds on its second attempt, page 2 fails every attempt
+        log(1, 0.1, 503, 1, False)
+        log(1, 0.4, 200, 2, True)
+        log(2, 0.3, 503, 1, False)
+        log(2, 0.2, 503, 2, True)
+
+        return paggingRequestLogger.get_statistics()
+
+    @pytest.mark.parametrize(
+        "field, value",
+        [("NumberOfPages", 1), ("NumberOfRecords", 100), ("NumberOfErrors", 1), ("NumberOfRetries", 2), ("TotalTime", 1.0)],
+    )
+    def it_counts_the_final_outcome_of_each_request(statistics: DataFrame, field: str, value: float) -> None:
+        assert statistics.iloc[0][field] == pytest.approx(value)
+
+    def it_reports_the_mean_of_first_tries(statistics: DataFrame) -> None:
+        assert statistics.iloc[0]["MeanTime"] == pytest.approx(0.2)
+
+    def it_reports_percentiles_of_first_tries(statistics: DataFrame) -> None:
+        assert statistics.iloc[0]["Max"] == pytest.approx(0.3, rel=0.005)
+
+
+def describe_when_getting_the_breakdown() -> None:
+    @pytest.fixture()
+    def breakdown() -> DataFrame:
+        paggingRequestLogger = PaggingRequestLogger()
+        for page in range(1, 6):
+            paggingRequestLogger.log_request("students", "url", page, 100, 100, page / 10, 200)
+
+        return paggingRequestLogger.get_breakdown()
+
+    def it_groups_pages_by_depth(breakdown: DataFrame) -> None:
+        assert list(zip(breakdown["FirstPage"], breakdown["LastPage"])) == [(1, 1), (2, 3), (4, 7)]
+
+    def it_counts_the_requests_per_depth(breakdown: DataFrame) -> None:
+        assert list(breakdown["NumberOfRequests"]) == [1, 2, 2]
+
+    def it_reports_the_slowest_request_per_depth(breakdown: DataFrame) -> None:
+        assert list(breakdown["Max"]) == [0.1, 0.3, 0.5]
+
+
+def describe_when_getting_the_timing_breakdown() -> None:
+    @pytest.fixture()
+    def breakdown() -> DataFrame:
+        paggingRequestLogger = PaggingRequestLogger()
+        for page in range(1, 4):
+            paggingRequestLogger.log_request(
+                "students", "url", page, 100, 100, page / 10, 200, page / 20, 0.01, 1000 * page, 0.02, page == 1,
+                0.3 if page == 1 else 0.0,
+            )
+
+        return paggingRequestLogger.get_breakdown()
+
+    def it_reports_the_mean_time_to_first_byte_per_depth(breakdown: DataFrame) -> None:
+        assert list(breakdown["MeanTimeToFirstByte"]) == [0.05, 0.125]
+
+    def it_reports_the_mean_response_size_per_depth(breakdown: DataFrame) -> None:
+        assert list(breakdown["MeanResponseBytes"]) == [1000, 2500]
+
+    def it_counts_the_token_refreshes_per_depth(breakdown: DataFrame) -> None:
+        assert list(breakdown["TokenRefreshes"]) == [1, 0]
+
+    def it_reports_the_mean_auth_time_per_depth(breakdown: DataFrame) -> None:
+        assert list(breakdown["MeanAuthTime"]) == [0.3, 0.0]
@@ -0,0 +1,38 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+from pathlib import Path
+
+from pandas import read_csv
+
+from edfi_paging_test.helpers.output_format import OutputFormat
+from edfi_paging_test.reporter.live_metrics import SNAPSHOT_COLUMNS, LiveMetrics
+from edfi_paging_test.reporter.snapshot_writer import SnapshotWriter
+
+RUN_NAME = "run"
+
+
+def describe_when_taking_snapshots() -> None:
+    def it_appends_a_row_per_resource_each_time(tmp_path: Path) -> None:
+        metrics = LiveMetrics()
+        writer = SnapshotWriter(metrics, str(tmp_path), RUN_NAME, OutputFormat.CSV, 60)
+        metrics.record("students", 0.25, 200, 10)
+        metrics.record("schools", 0.5, 200, 5)
+
+        writer.write()
+        metrics.record("students", 0.25, 200, 10)
+        writer.close()
+        writer.close()
+
+        df = read_csv(tmp_path / RUN_NAME / "snapshots.csv")
+        assert list(df.columns) == SNAPSHOT_COLUMNS
+        assert list(df["Resource"]) == ["students", "schools", "students", "schools"]
+        assert list(df["NumberOfRecords"]) == [10, 5, 20, 5]
+
+    def describe_given_nothing_was_recorded() -> None:
+        def it_writes_nothing(tmp_path: Path) -> None:
+            SnapshotWriter(LiveMetrics(), str(tmp_path), RUN_NAME, OutputFormat.CSV, 60).close()
+
+            assert not (tmp_path / RUN_NAME).exists()
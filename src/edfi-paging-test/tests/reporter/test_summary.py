@@ -7,6 +7,7 @@ from edfi_paging_test.helpers.log_level import LogLevel
 from edfi_paging_test.helpers.output_format import OutputFormat
 import pytest
 from edfi_paging_test.reporter.summary import Summary
+from edfi_paging_test.helpers.concurrency_search import ConcurrencySearchSummary
 from edfi_paging_test.helpers.main_arguments import MainArguments
 import socket
 
@@ -92,3 +93,47 @@ def describe_when_initializing_summary() -> None:
 
         def it_sets_system_name(summary_without_host: Summary) -> None:
             assert summary_without_host.machine_name == socket.gethostname()
+
+
+def describe_when_getting_summary_DataFrame() -> None:
+    def _summary(**kwargs) -> Summary:
+        return Summary(
+            run_name="123",
+            machine_name="m1",
+            run_configration=MainArguments(
+                "http://api.ed-fi.org/v5.1",
+                4,
+                "populatedTemplateX",
+                "populatedSecretX",
+                True,
+                "test_outputX",
+                "test",
+                OutputFormat.CSV,
+                ["resource1"],
+                100,
+                LogLevel.DEBUG,
+            ),
+            **kwargs,
+        )
+
+    def describe_given_a_concurrency_search() -> None:
+        def it_reports_the_saturation_point() -> None:
+            df = _summary(
+                concurrency_search=ConcurrencySearchSummary(
+                    saturation_concurrency=8,
+                    saturation_throughput=120.5,
+                    best_concurrency=16,
+                    best_throughput=125.0,
+                    number_of_steps=6,
+                )
+            ).get_DataFrame()
+
+            assert df["ConcurrencySearch.SaturationConcurrency"].iloc[0] == 8
+            assert df["ConcurrencySearch.BestConcurrency"].iloc[0] == 16
+            assert df["ConcurrencySearch.BestThroughput"].iloc[0] == 125.0
+
+    def describe_given_no_concurrency_search() -> None:
+        def it_leaves_out_the_concurrency_search() -> None:
+            df = _summary().get_DataFrame()
+
+            assert not any(column.startswith("ConcurrencySearch") for column in df.columns)
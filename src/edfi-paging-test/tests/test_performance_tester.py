@@ -0,0 +1,357 @@
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Ed-Fi Alliance under one or more agreements.
+# The Ed-Fi Alliance licenses this file to you under the Apache License, Version 2.0.
+# See the LICENSE and NOTICES files in the project root for more information.
+
+import asyncio
+from pathlib import Path
+from timeit import default_timer
+from typing import Dict, List, Tuple
+from unittest.mock import AsyncMock
+
+import pytest
+
+from edfi_paging_test.api.paginated_result import PaginatedResult
+from edfi_paging_test.helpers.arrival_profile import ArrivalProfile
+from edfi_paging_test.helpers.checkpoint import Checkpoint
+from edfi_paging_test.helpers.concurrency_search import ConcurrencySearch
+from edfi_paging_test.helpers.entries_reservoir import EntriesReservoir
+from edfi_paging_test.helpers.main_arguments import MainArguments
+from edfi_paging_test.helpers.output_format import OutputFormat
+from edfi_paging_test.helpers.paging_schedule import PageRange, plan_page_ranges
+from edfi_paging_test.reporter import reporter
+from edfi_paging_test.reporter.paging_request_logger import PaggingRequestLogger
+from edfi_paging_test.performance_tester import (
+    _AsyncTransport,
+    _restore_measurements,
+    fetch_resources_entries_at_arrival_rate,
+    fetch_resources_entries_largest_first,
+    search_concurrency,
+)
+
+PAGE_SIZE = 10
+TOTALS = {"students": 95, "schools": 20}
+RATE = 50
+SERVER_TIME = 0.3
+
+
+def describe_when_fetching_resources_at_an_arrival_rate() -> None:
+    @pytest.fixture(scope="module")
+    def run() -> Tuple[Dict[str, EntriesReservoir], List[Tuple[str, int, float, float]]]:
+        sent: List[Tuple[str, int, float, float]] = []
+
+        async def get_total(resource_name: str) -> int:
+            return TOTALS[resource_name]
+
+        async def get_page(resource_name: str, page: int, scheduled_at: float) -> PaginatedResult:
+            sent.append((resource_name, page, scheduled_at, default_timer()))
+
+            # Each request takes far longer than the gap between requests
+            await asyncio.sleep(SERVER_TIME)
+            count = min(PAGE_SIZE, TOTALS[resource_name] - (page - 1) * PAGE_SIZE)
+            return PaginatedResult(
+                resource_name=resource_name,
+                current_page=page,
+                page_size=PAGE_SIZE,
+                api_response=[{"id": index} for index in range(count)],
+                status_code=200,
+            )
+
+        reservoirs = asyncio.run(
+            fetch_resources_entries_at_arrival_rate(
+                list(TOTALS.keys()), ArrivalProfile.parse(str(RATE)), get_total, get_page, PAGE_SIZE
+            )
+        )
+        return (reservoirs, sent)
+
+    def it_reads_every_entry(run) -> None:
+        reservoirs, _ = run
+
+        assert {name: reservoir.count for name, reservoir in reservoirs.items()} == TOTALS
+
+    def it_interleaves_the_resources_in_page_order(run) -> None:
+        _, sent = run
+
+        assert [(name, page) for name, page, _, _ in sent][:5] == [
+            ("students", 1), ("schools", 1), ("students", 2), ("schools", 2), ("students", 3)
+        ]
+
+    def it_schedules_requests_at_the_arrival_rate(run) -> None:
+        _, sent = run
+        scheduled = [scheduled_at for _, _, scheduled_at, _ in sent]
+
+        assert [later - earlier for earlier, later in zip(scheduled, scheduled[1:])] == pytest.approx(
+            [1 / RATE] * (len(sent) - 1)
+        )
+
+    def it_does_not_wait_for_earlier_requests_to_return(run) -> None:
+        _, sent = run
+
+        assert all(actual - scheduled_at < SERVER_TIME / 2 for _, _, scheduled_at, actual in sent)
+
+    def describe_given_a_request_fails() -> None:
+        def it_raises_the_error() -> None:
+            async def get_total(resource_name: str) -> int:
+                return TOTALS[resource_name]
+
+            async def get_page(resource_name: str, page: int, scheduled_at: float) -> PaginatedResult:
+                raise RuntimeError("Unable to read the page")
+
+            with pytest.raises(RuntimeError, match="Unable to read the page"):
+                asyncio.run(
+                    fetch_resources_entries_at_arrival_rate(
+                        list(TOTALS.keys()), ArrivalProfile.parse(str(RATE)), get_total, get_page, PAGE_SIZE
+                    )
+                )
+
+
+def describe_when_searching_for_the_concurrency_saturation_point() -> None:
+    SERVER_CAPACITY = 4
+    SERVICE_TIME = 0.02
+
+    @pytest.fixture(scope="module")
+    def run() -> Tuple[ConcurrencySearch, List[Tuple[str, int]]]:
+        requested: List[Tuple[str, int]] = []
+
+        async def _search() -> ConcurrencySearch:
+            # A server that handles a fixed number of requests at a time, so
+            # that throughput stops growing at that concurrency
+            server = asyncio.Semaphore(SERVER_CAPACITY)
+
+            async def get_total(resource_name: str) -> int:
+                return TOTALS[resource_name]
+
+            async def get_page(resource_name: str, page: int) -> PaginatedResult:
+                requested.append((resource_name, page))
+                async with server:
+                    await asyncio.sleep(SERVICE_TIME)
+                return PaginatedResult(resource_name=resource_name, current_page=page, page_size=PAGE_SIZE, api_response=[], status_code=200)
+
+            search = ConcurrencySearch(16)
+            await search_concurrency(search, list(TOTALS.keys()), get_total, get_page, PAGE_SIZE, 0.25)
+            return search
+
+        return (asyncio.run(_search()), requested)
+
+    def it_finds_the_server_capacity(run) -> None:
+        search, _ = run
+
+        assert search.get_summary().saturation_concurrency == SERVER_CAPACITY
+
+    def it_steps_concurrency_up_and_back_down(run) -> None:
+        search, _ = run
+        levels = [step.concurrency for step in search.steps]
+
+        assert levels[:4] == [1, 2, 4, 8]
+        assert min(levels[4:]) < 8
+
+    def it_reads_the_pages_again_when_the_search_outlasts_them(run) -> None:
+        _, requested = run
+
+        assert requested.count(("students", 1)) > 1
+
+    def describe_given_no_resources() -> None:
+        def it_fails_rather_than_waiting_forever() -> None:
+            async def get_total(resource_name: str) -> int:
+                return 0
+
+            async def get_page(resource_name: str, page: int) -> PaginatedResult:
+                return PaginatedResult(resource_name=resource_name, current_page=page, page_size=PAGE_SIZE, api_response=[], status_code=200)
+
+            with pytest.raises(RuntimeError):
+                asyncio.run(search_concurrency(ConcurrencySearch(16), [], get_total, get_page, PAGE_SIZE, 0.25))
+
+
+def describe_when_fetching_resources_largest_first() -> None:
+    # One resource far larger than the rest together
+    SIZES = {"schools": 30, "students": 400, "sections": 50}
+    WORKERS = 4
+
+    @pytest.fixture(scope="module")
+    def run() -> Tuple[Dict[str, EntriesReservoir], List[Tuple[str, int]]]:
+        requested: List[Tuple[str, int]] = []
+
+        async def get_total(resource_name: str) -> int:
+            return SIZES[resource_name]
+
+        async def get_page(resource_name: str, page: int) -> PaginatedResult:
+            requested.append((resource_name, page))
+            await asyncio.sleep(0.001)
+            count = max(0, min(PAGE_SIZE, SIZES[resource_name] - (page - 1) * PAGE_SIZE))
+            return PaginatedResult(
+                resource_name=resource_name,
+                current_page=page,
+                page_size=PAGE_SIZE,
+                api_response=[{"id": index} for index in range(count)],
+                status_code=200,
+            )
+
+        reservoirs = asyncio.run(
+            fetch_resources_entries_largest_first(list(SIZES.keys()), get_total, get_page, PAGE_SIZE, WORKERS)
+        )
+        return (reservoirs, requested)
+
+    def it_reads_every_entry(run) -> None:
+        reservoirs, _ = run
+
+        assert {name: reservoir.count for name, reservoir in reservoirs.items()} == SIZES
+
+    def it_starts_with_the_largest_resource_on_every_worker(run) -> None:
+        _, requested = run
+
+        assert [name for name, _ in requested[:WORKERS]] == ["students"] * WORKERS
+
+    def it_requests_every_page_once_and_one_past_the_end(run) -> None:
+        _, requested = run
+
+        assert sorted(page for name, page in requested if name == "students") == list(range(1, 42))
+
+
+def describe_when_fetching_the_page_ranges_of_a_worker() -> None:
+    SIZES = {"schools": 30, "students": 400}
+    # The second half of students, the rest being read by another worker
+    PAGE_RANGES = [PageRange("students", 21, None, 20), PageRange("schools", 1, None, 3)]
+
+    @pytest.fixture
+    def run() -> Tuple[Dict[str, EntriesReservoir], List[Tuple[str, int]]]:
+        requested: List[Tuple[str, int]] = []
+
+        async def get_total(resource_name: str) -> int:
+            return SIZES[resource_name]
+
+        async def get_page(resource_name: str, page: int) -> PaginatedResult:
+            requested.append((resource_name, page))
+            count = max(0, min(PAGE_SIZE, SIZES[resource_name] - (page - 1) * PAGE_SIZE))
+            return PaginatedResult(
+                resource_name=resource_name,
+                current_page=page,
+                page_size=PAGE_SIZE,
+                api_response=[{"id": index} for index in range(count)],
+                status_code=200,
+            )
+
+        reservoirs = asyncio.run(
+            fetch_resources_entries_largest_first(
+                list(SIZES.keys()), get_total, get_page, PAGE_SIZE, 2, plan_ranges=lambda *_: PAGE_RANGES
+            )
+        )
+        return (reservoirs, requested)
+
+    def it_only_requests_the_pages_of_its_ranges(run) -> None:
+        _, requested = run
+
+        assert sorted(page for name, page in requested if name == "students") == list(range(21, 42))
+
+    def it_counts_the_entries_of_its_ranges(run) -> None:
+        reservoirs, _ = run
+
+        assert {name: reservoir.count for name, reservoir in reservoirs.items()} == {"students": 200, "schools": 30}
+
+    def it_expects_no_more_than_its_ranges_hold(caplog, run) -> None:
+        # The fixture runs, and logs, during the setup of the test
+        assert not any("expected" in record.getMessage() for record in caplog.get_records("setup"))
+
+
+def describe_when_resuming_from_a_checkpoint() -> None:
+    SIZES = {"schools": 30, "students": 400}
+    WORKERS = 2
+
+    @pytest.fixture(scope="module")
+    def run() -> Tuple[Dict[str, EntriesReservoir], List[Tuple[str, int]], Checkpoint]:
+        requested: List[Tuple[str, int]] = []
+
+        async def get_total(resource_name: str) -> int:
+            raise AssertionError("The totals come from the checkpoint")
+
+        async def get_page(resource_name: str, page: int) -> PaginatedResult:
+            requested.append((resource_name, page))
+            count = max(0, min(PAGE_SIZE, SIZES[resource_name] - (page - 1) * PAGE_SIZE))
+            return PaginatedResult(
+                resource_name=resource_name,
+                current_page=page,
+                page_size=PAGE_SIZE,
+                api_response=[{"id": index} for index in range(count)],
+                status_code=200,
+            )
+
+        # Interrupted after the first 5 pages of the first students range,
+        # with schools already read
+        checkpoint = Checkpoint()
+        ranges = checkpoint.start_page_size(PAGE_SIZE, SIZES, plan_page_ranges(SIZES, PAGE_SIZE, WORKERS))
+        for progress in ranges:
+            if progress.page_range.resource_name == "schools":
+                for _ in range(3):
+                    checkpoint.record_page(progress, PAGE_SIZE)
+                checkpoint.finish_range(progress)
+            elif progress.page_range.first_page == 1:
+                for _ in range(5):
+                    checkpoint.record_page(progress, PAGE_SIZE)
+
+        reservoirs = asyncio.run(
+            fetch_resources_entries_largest_first(
+                list(SIZES.keys()), get_total, get_page, PAGE_SIZE, WORKERS, checkpoint=checkpoint
+            )
+        )
+        return (reservoirs, requested, checkpoint)
+
+    def it_counts_every_entry(run) -> None:
+        reservoirs, _, _ = run
+
+        assert {name: reservoir.count for name, reservoir in reservoirs.items()} == SIZES
+
+    def it_only_requests_the_pages_not_read_before(run) -> None:
+        _, requested, _ = run
+
+        assert sorted(requested) == [("students", page) for page in range(6, 42)]
+
+    def it_finishes_the_page_size(run) -> None:
+        _, _, checkpoint = run
+
+        assert checkpoint.finished_page_sizes == [PAGE_SIZE]
+
+
+def describe_when_restoring_the_measurements_of_an_interrupted_run() -> None:
+    RUN_NAME = "run"
+
+    def it_restores_every_column_of_the_pages_read(tmp_path: Path) -> None:
+        interrupted = PaggingRequestLogger()
+        for page in range(1, 4):
+            interrupted.log_request(
+                "students", f"https://localhost/students?page={page}", page, PAGE_SIZE, PAGE_SIZE, 0.5, 200,
+                0.25, 0.125, 1024, 0.0625, page == 1, 0.5 if page == 1 else 0.0, 1, 0.0, True,
+            )
+        reporter.create_detail_csv(interrupted.get_detail(), str(tmp_path), RUN_NAME)
+
+        # Interrupted after the first 2 pages
+        checkpoint = Checkpoint()
+        ranges = checkpoint.start_page_size(PAGE_SIZE, {"students": 30}, [PageRange("students", 1, None, 3)])
+        for _ in range(2):
+            checkpoint.record_page(ranges[0], PAGE_SIZE)
+
+        resumed = PaggingRequestLogger()
+        args = MainArguments("https://localhost", 1, "key", "secret", True, str(tmp_path), "", OutputFormat.CSV, [])
+
+        assert _restore_measurements(args, RUN_NAME, checkpoint, resumed) == 2
+        assert resumed.get_detail().astype(str).values.tolist() == interrupted.get_detail().astype(str).values.tolist()[:2]
+
+
+def describe_when_getting_a_total_count() -> None:
+    def describe_given_the_coordinator_already_read_it() -> None:
+        def it_does_not_request_it_again() -> None:
+            client = AsyncMock()
+            client.get_total.return_value = 7
+
+            transport = _AsyncTransport(client, {"students": 95})
+
+            assert asyncio.run(transport.get_total("students")) == 95
+            client.get_total.assert_not_called()
+
+    def describe_given_an_unknown_resource() -> None:
+        def it_requests_it() -> None:
+            client = AsyncMock()
+            client.get_total.return_value = 7
+
+            transport = _AsyncTransport(client, {"students": 95})
+
+            assert asyncio.run(transport.get_total("schools")) == 7
+            client.get_total.assert_awaited_once_with("schools")